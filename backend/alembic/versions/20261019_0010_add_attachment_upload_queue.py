@@ -0,0 +1,73 @@
+"""Add attachment upload queue
+
+Revision ID: 20261019_0010
+Revises: 20260416_0009
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261019_0010"
+down_revision: Union[str, None] = "20260416_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "attachments",
+        sa.Column(
+            "upload_status",
+            sa.String(length=20),
+            server_default="UPLOADED",
+            nullable=False,
+            comment="上传状态: PENDING_UPLOAD/UPLOADED/FAILED",
+        ),
+    )
+    op.alter_column("attachments", "ipfs_cid", existing_type=sa.String(length=100), nullable=True)
+
+    op.create_table(
+        "upload_tasks",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("attachment_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("asset_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("provider", sa.String(length=32), nullable=False),
+        sa.Column("spool_path", sa.String(length=500), nullable=False),
+        sa.Column("file_name", sa.String(length=255), nullable=False),
+        sa.Column("content_type", sa.String(length=100), nullable=False),
+        sa.Column("file_size", sa.BigInteger(), nullable=False),
+        sa.Column("upload_metadata", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["attachment_id"], ["attachments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_upload_tasks_attachment_id", "upload_tasks", ["attachment_id"])
+    op.create_index("ix_upload_tasks_asset_id", "upload_tasks", ["asset_id"])
+    op.create_index(
+        "ix_upload_tasks_status_next_attempt",
+        "upload_tasks",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_upload_tasks_status_next_attempt", table_name="upload_tasks")
+    op.drop_index("ix_upload_tasks_asset_id", table_name="upload_tasks")
+    op.drop_index("ix_upload_tasks_attachment_id", table_name="upload_tasks")
+    op.drop_table("upload_tasks")
+    op.execute("DELETE FROM attachments WHERE ipfs_cid IS NULL")
+    op.alter_column("attachments", "ipfs_cid", existing_type=sa.String(length=100), nullable=False)
+    op.drop_column("attachments", "upload_status")
@@ -0,0 +1,55 @@
+"""Add access token revocation tables
+
+Revision ID: 20261019_0011
+Revises: 20261019_0010
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261019_0011"
+down_revision: Union[str, None] = "20261019_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "revoked_access_tokens",
+        sa.Column("jti", sa.String(length=36), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index("ix_revoked_access_tokens_user_id", "revoked_access_tokens", ["user_id"])
+    op.create_index("ix_revoked_access_tokens_expires_at", "revoked_access_tokens", ["expires_at"])
+    op.create_index("ix_revoked_access_tokens_revoked_at", "revoked_access_tokens", ["revoked_at"])
+
+    op.create_table(
+        "user_token_watermarks",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("revoked_before", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index("ix_user_token_watermarks_updated_at", "user_token_watermarks", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_token_watermarks_updated_at", table_name="user_token_watermarks")
+    op.drop_table("user_token_watermarks")
+    op.drop_index("ix_revoked_access_tokens_revoked_at", table_name="revoked_access_tokens")
+    op.drop_index("ix_revoked_access_tokens_expires_at", table_name="revoked_access_tokens")
+    op.drop_index("ix_revoked_access_tokens_user_id", table_name="revoked_access_tokens")
+    op.drop_table("revoked_access_tokens")
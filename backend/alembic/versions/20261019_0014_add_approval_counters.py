@@ -0,0 +1,49 @@
+"""Add approval counters
+
+Revision ID: 20261019_0014
+Revises: 20261019_0013
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261019_0014"
+down_revision: Union[str, None] = "20261019_0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "approval_counters",
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="approvalstatus", create_type=False),
+            nullable=False,
+            comment="审批状态",
+        ),
+        sa.Column(
+            "type",
+            postgresql.ENUM(name="approvaltype", create_type=False),
+            nullable=False,
+            comment="审批类型",
+        ),
+        sa.Column("count", sa.Integer(), nullable=False, comment="审批数量"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="更新时间"),
+        sa.PrimaryKeyConstraint("status", "type"),
+    )
+    # 按现有审批回填计数
+    op.execute(
+        "INSERT INTO approval_counters (status, type, count, updated_at) "
+        "SELECT status, type, COUNT(*), now() FROM approvals GROUP BY status, type"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("approval_counters")
@@ -0,0 +1,74 @@
+"""Add dashboard rollups
+
+Revision ID: 20261019_0015
+Revises: 20261019_0014
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261019_0015"
+down_revision: Union[str, None] = "20261019_0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 汇总表由维护任务 dashboard_rollups 首次运行时回填
+    op.create_table(
+        "dashboard_asset_counts",
+        sa.Column("enterprise_id", postgresql.UUID(as_uuid=True), nullable=False, comment="企业 ID"),
+        sa.Column("type", postgresql.ENUM(name="assettype", create_type=False), nullable=False, comment="资产类型"),
+        sa.Column("status", postgresql.ENUM(name="assetstatus", create_type=False), nullable=False, comment="资产状态"),
+        sa.Column(
+            "legal_status",
+            postgresql.ENUM(name="legalstatus", create_type=False),
+            nullable=False,
+            comment="法律状态",
+        ),
+        sa.Column("count", sa.Integer(), nullable=False, comment="资产数量"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="更新时间"),
+        sa.ForeignKeyConstraint(["enterprise_id"], ["enterprises.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("enterprise_id", "type", "status", "legal_status"),
+    )
+    op.create_table(
+        "dashboard_transfer_daily",
+        sa.Column("day", sa.Date(), nullable=False, comment="日期（UTC，按记录创建时间）"),
+        sa.Column("enterprise_id", postgresql.UUID(as_uuid=True), nullable=False, comment="企业 ID"),
+        sa.Column("direction", sa.String(8), nullable=False, comment="方向: in, out"),
+        sa.Column("transfer_type", sa.String(20), nullable=False, comment="权属变更类型"),
+        sa.Column("count", sa.Integer(), nullable=False, comment="记录数量"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="更新时间"),
+        sa.ForeignKeyConstraint(["enterprise_id"], ["enterprises.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("day", "enterprise_id", "direction", "transfer_type"),
+    )
+    op.create_index(
+        "ix_dashboard_transfer_daily_enterprise_day",
+        "dashboard_transfer_daily",
+        ["enterprise_id", "day"],
+    )
+    op.create_table(
+        "dashboard_approval_backlog",
+        sa.Column("enterprise_id", postgresql.UUID(as_uuid=True), nullable=False, comment="企业 ID"),
+        sa.Column("type", postgresql.ENUM(name="approvaltype", create_type=False), nullable=False, comment="审批类型"),
+        sa.Column("count", sa.Integer(), nullable=False, comment="待审批数量"),
+        sa.Column("oldest_created_at", sa.DateTime(timezone=True), nullable=True, comment="最早的待审批提交时间"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="更新时间"),
+        sa.ForeignKeyConstraint(["enterprise_id"], ["enterprises.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("enterprise_id", "type"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("dashboard_approval_backlog")
+    op.drop_index("ix_dashboard_transfer_daily_enterprise_day", table_name="dashboard_transfer_daily")
+    op.drop_table("dashboard_transfer_daily")
+    op.drop_table("dashboard_asset_counts")
@@ -0,0 +1,29 @@
+"""Add assets enterprise created index
+
+Revision ID: 20261019_0016
+Revises: 20261019_0015
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261019_0016"
+down_revision: Union[str, None] = "20261019_0015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 企业资产导出按 created_at 倒序流式输出，反向扫描该索引即可，不必先对全部行排序
+    op.create_index(
+        "ix_assets_enterprise_created",
+        "assets",
+        ["enterprise_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_enterprise_created", table_name="assets")
@@ -0,0 +1,68 @@
+"""Add asset imports
+
+Revision ID: 20261019_0017
+Revises: 20261019_0016
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261019_0017"
+down_revision: Union[str, None] = "20261019_0016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "asset_import_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("enterprise_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("manifest_format", sa.String(length=10), nullable=False),
+        sa.Column("manifest_path", sa.String(length=500), nullable=False),
+        sa.Column("archive_path", sa.String(length=500), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("total_rows", sa.Integer(), nullable=True),
+        sa.Column("processed_rows", sa.Integer(), nullable=False),
+        sa.Column("imported_rows", sa.Integer(), nullable=False),
+        sa.Column("failed_rows", sa.Integer(), nullable=False),
+        sa.Column("attachments_enqueued", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["enterprise_id"], ["enterprises.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_asset_import_jobs_enterprise_id", "asset_import_jobs", ["enterprise_id"])
+    op.create_index("ix_asset_import_jobs_status_created", "asset_import_jobs", ["status", "created_at"])
+    op.create_table(
+        "asset_import_errors",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("row_number", sa.Integer(), nullable=False),
+        sa.Column("field", sa.String(length=100), nullable=True),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["asset_import_jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_asset_import_errors_job_row", "asset_import_errors", ["job_id", "row_number"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_asset_import_errors_job_row", table_name="asset_import_errors")
+    op.drop_table("asset_import_errors")
+    op.drop_index("ix_asset_import_jobs_status_created", table_name="asset_import_jobs")
+    op.drop_index("ix_asset_import_jobs_enterprise_id", table_name="asset_import_jobs")
+    op.drop_table("asset_import_jobs")
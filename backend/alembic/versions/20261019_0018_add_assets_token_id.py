@@ -0,0 +1,96 @@
+"""Add integer token id to assets
+
+Revision ID: 20261019_0018
+Revises: 20261019_0017
+Create Date: 2026-10-19
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261019_0018"
+down_revision: Union[str, None] = "20261019_0017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "assets",
+        sa.Column(
+            "token_id",
+            sa.BigInteger(),
+            nullable=True,
+            comment="NFT Token ID（整数，随 nft_token_id 写入；按 Token 查询走此列）",
+        ),
+    )
+
+    # 回填：只接受 1-18 位十进制数字（正数且不超出 BIGINT）；同一合约下同一 Token 有多条资产时，
+    # 按原查询的排序（最近完成铸造者优先）只保留一条，其余留空，与迁移前按 Token 查询的结果一致
+    op.execute(
+        """
+        WITH parsed AS (
+            SELECT id,
+                   nft_contract_address,
+                   mint_completed_at,
+                   mint_confirmed_at,
+                   updated_at,
+                   created_at,
+                   CASE
+                       WHEN btrim(nft_token_id) ~ '^[0-9]{1,18}$' THEN CAST(btrim(nft_token_id) AS BIGINT)
+                   END AS token_id
+            FROM assets
+            WHERE nft_token_id IS NOT NULL
+        ),
+        ranked AS (
+            SELECT id,
+                   token_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY nft_contract_address, token_id
+                       ORDER BY mint_completed_at DESC, mint_confirmed_at DESC, updated_at DESC, created_at DESC
+                   ) AS rn
+            FROM parsed
+            WHERE token_id > 0
+        )
+        UPDATE assets AS a
+        SET token_id = ranked.token_id
+        FROM ranked
+        WHERE a.id = ranked.id AND ranked.rn = 1
+        """
+    )
+
+    # 校验：报告未能回填的历史值（这些资产迁移前同样无法按 Token 查到）
+    bind = op.get_bind()
+    invalid = bind.execute(sa.text(
+        "SELECT COUNT(*) FROM assets "
+        "WHERE btrim(COALESCE(nft_token_id, '')) <> '' AND btrim(nft_token_id) !~ '^[0-9]{1,18}$'"
+    )).scalar_one()
+    skipped = bind.execute(sa.text(
+        "SELECT COUNT(*) FROM assets "
+        "WHERE token_id IS NULL AND btrim(COALESCE(nft_token_id, '')) ~ '^[0-9]{1,18}$'"
+    )).scalar_one()
+    if invalid:
+        logger.warning("assets.nft_token_id 有 %d 行不是合法的 Token ID，token_id 留空", invalid)
+    if skipped:
+        logger.warning("assets.nft_token_id 有 %d 行为 0 或与同合约的其他资产重复，token_id 留空", skipped)
+
+    op.create_index(
+        "ux_assets_token_contract",
+        "assets",
+        ["token_id", "nft_contract_address"],
+        unique=True,
+    )
+    # 按 Token 查询改走整数列，字符串列上的索引不再使用
+    op.drop_index("ix_assets_nft_token_id", table_name="assets")
+
+
+def downgrade() -> None:
+    op.create_index("ix_assets_nft_token_id", "assets", ["nft_token_id"])
+    op.drop_index("ux_assets_token_contract", table_name="assets")
+    op.drop_column("assets", "token_id")
@@ -0,0 +1,29 @@
+"""Allow attachments to share an IPFS CID
+
+Revision ID: 20261019_0019
+Revises: 20261019_0018
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261019_0019"
+down_revision: Union[str, None] = "20261019_0018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 内容相同的文件在 IPFS 上得到相同的 CID（如批量导入中多个资产附带同一份文件），
+    # 唯一索引会让后台上传的回填提交失败，改为普通索引
+    op.drop_index("ix_attachments_ipfs_cid", table_name="attachments")
+    op.create_index("ix_attachments_ipfs_cid", "attachments", ["ipfs_cid"], unique=False)
+
+
+def downgrade() -> None:
+    # 存在共用 CID 的附件时无法恢复唯一索引，需先人工处理重复行
+    op.drop_index("ix_attachments_ipfs_cid", table_name="attachments")
+    op.create_index("ix_attachments_ipfs_cid", "attachments", ["ipfs_cid"], unique=True)
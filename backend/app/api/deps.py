@@ -1,19 +1,33 @@
-from typing import Annotated
+from typing import Annotated, Any, Dict, Optional
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
+from fastapi.requests import HTTPConnection
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.core.security import decode_token
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.auth_cache import principal_cache
+from app.core.database import get_db, get_read_db, get_read_session_factory
+from app.core.security import verify_access_token
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
+from app.services.token_revocation_service import revocation_list
 
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
+DBSession = Annotated[AsyncSession, Depends(get_db)]
+"""数据库会话依赖类型注解。"""
+
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_db)]
+"""列表、统计等只读接口的数据库会话依赖类型注解（查询走只读库）。"""
+
+ReadSessionFactory = Annotated[async_sessionmaker, Depends(get_read_session_factory)]
+"""只读会话工厂依赖类型注解（流式响应自行管理会话生命周期时使用）。"""
+
 
 async def get_current_user_id(
-    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)]
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
+    db: DBSession,
 ) -> str:
     """Get current user ID from JWT token."""
     if credentials is None or not credentials.credentials:
@@ -30,8 +44,32 @@ async def get_current_user_id(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = credentials.credentials
-    payload = decode_token(token, expected_type="access")
+    payload = await verify_token_payload(credentials.credentials, db)
+    return payload["sub"]
+
+
+async def verify_token_payload(token: Optional[str], db: AsyncSession) -> Dict[str, Any]:
+    """
+    校验访问令牌（签名、有效期、载荷与撤销状态）。
+
+    Args:
+        token: 原始访问令牌
+        db: 数据库会话（撤销列表同步与回表确认时使用）
+
+    Returns:
+        Dict[str, Any]: 令牌载荷
+
+    Raises:
+        HTTPException: 令牌缺失、无效或已撤销时返回 401
+    """
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    payload = verify_access_token(token)
 
     if payload is None:
         raise HTTPException(
@@ -47,29 +85,88 @@ async def get_current_user_id(
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    if await revocation_list.is_revoked(db, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    return user_id
+    return payload
 
 
-# Type aliases for dependency injection
-DBSession = Annotated[AsyncSession, Depends(get_db)]
-"""数据库会话依赖类型注解。"""
+def get_stream_token(connection: HTTPConnection) -> Optional[str]:
+    """
+    读取长连接（SSE / WebSocket）携带的访问令牌。
+
+    浏览器的 EventSource 与 WebSocket 无法设置请求头，除 ``Authorization`` 外也接受 ``token`` 查询参数。
+    """
+    scheme, _, credentials = connection.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials.strip():
+        return credentials.strip()
+    return connection.query_params.get("token")
+
+
+async def get_stream_token_payload(
+    connection: HTTPConnection,
+    db: Annotated[AsyncSession, Depends(get_db, scope="function")],
+) -> Dict[str, Any]:
+    """
+    长连接的认证依赖，返回令牌载荷。
 
+    会话在认证后立即关闭，推送连接存续期间不占用数据库连接。
+    """
+    try:
+        return await verify_token_payload(get_stream_token(connection), db)
+    finally:
+        await db.close()
+
+
+# Type aliases for dependency injection
 CurrentUserId = Annotated[str, Depends(get_current_user_id)]
 """当前用户ID依赖类型注解。"""
 
 
+def _snapshot_user(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+
+
+def _restore_user(values: dict) -> User:
+    # 每次命中都构造新的游离对象，避免不同请求共享同一个 ORM 实例
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
 async def get_current_user(
     user_id: CurrentUserId,
     db: DBSession,
 ) -> User:
-    """Get current user object from user ID."""
+    """Get current user object from user ID (served from the principal cache when fresh)."""
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return _restore_user(cached)
+
     user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(UUID(user_id))
+    user = await user_repo.get_principal(UUID(user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    principal_cache.put(user_id, _snapshot_user(user))
     return user
 
+
+
+async def get_current_superuser(
+    user: Annotated[User, Depends(get_current_user)],
+) -> User:
+    """Require the current user to be a superuser (operational endpoints)."""
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Superuser privileges required",
+        )
+    return user
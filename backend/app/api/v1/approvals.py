@@ -5,11 +5,14 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_db, get_read_db
 from app.core.exceptions import AppException
 from app.models.approval import ApprovalAction, ApprovalStatus, ApprovalType
 from app.models.user import User
 from app.schemas.approval import (
+    ApprovalBatchItemResult,
+    ApprovalBatchProcessRequest,
+    ApprovalBatchProcessResponse,
     ApprovalCreateRequest,
     ApprovalProcessRequest,
     ApprovalResponse,
@@ -19,7 +22,7 @@ from app.schemas.approval import (
     NotificationListResponse,
 )
 from app.schemas.response import ApiResponse, PageResult
-from app.services.approval_service import ApprovalService
+from app.services.approval_service import ApprovalPermissionDeniedError, ApprovalService
 
 router = APIRouter(prefix="/approvals")
 
@@ -115,6 +118,79 @@ async def submit_enterprise_update_approval(
         )
 
 
+@router.post(
+    "/batch-process",
+    response_model=ApiResponse[ApprovalBatchProcessResponse],
+    status_code=status.HTTP_200_OK,
+    summary="批量处理审批申请",
+    description="管理员在一个事务内对多个审批申请执行相同的通过、拒绝或退回操作，逐项返回处理结果；本人提交的申请不予处理。",
+)
+async def batch_process_approvals(
+    request: ApprovalBatchProcessRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> ApiResponse[ApprovalBatchProcessResponse]:
+    """
+    批量处理审批申请。
+    
+    Args:
+        request: 批量审批处理请求数据
+        db: 数据库会话
+        current_user: 当前登录用户（必须是管理员）
+        
+    Returns:
+        ApiResponse[ApprovalBatchProcessResponse]: 逐项处理结果
+    """
+    try:
+        if not current_user.is_superuser:
+            raise ApprovalPermissionDeniedError("只有管理员可以批量处理审批申请")
+        
+        service = ApprovalService(db)
+        
+        action_map = {
+            "approve": ApprovalAction.APPROVE,
+            "reject": ApprovalAction.REJECT,
+            "return": ApprovalAction.RETURN,
+        }
+        action = action_map.get(request.action)
+        
+        if not action:
+            return ApiResponse(
+                code="INVALID_ACTION",
+                message="无效的审批操作，只支持: approve, reject, return",
+                data=None,
+            )
+        
+        results = await service.process_approvals_batch(
+            approval_ids=request.approval_ids,
+            operator_id=current_user.id,
+            action=action,
+            comment=request.comment,
+            attachments=[att.dict() for att in request.attachments] if request.attachments else None,
+            operator_role="admin",
+        )
+        
+        items = [ApprovalBatchItemResult(**item) for item in results]
+        succeeded = sum(1 for item in items if item.success)
+        
+        return ApiResponse(
+            code="SUCCESS",
+            message=f"批量审批完成：成功 {succeeded} 个，失败 {len(items) - succeeded} 个",
+            data=ApprovalBatchProcessResponse(
+                total=len(items),
+                succeeded=succeeded,
+                failed=len(items) - succeeded,
+                items=items,
+            ),
+        )
+    except AppException as e:
+        return ApiResponse(
+            code=e.code,
+            message=e.message,
+            data=None,
+        )
+
+
 @router.post(
     "/{approval_id}/process",
     response_model=ApiResponse[ApprovalResponse],
@@ -194,7 +270,7 @@ async def process_approval(
     description="获取审批统计数据，包括待处理、已通过、已拒绝等数量。",
 )
 async def get_approval_statistics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> ApiResponse[dict]:
     """
@@ -272,7 +348,7 @@ async def get_pending_approvals(
             code="SUCCESS",
             message="获取待审批列表成功",
             data=PageResult(
-                items=[ApprovalResponse.from_orm(a) for a in approvals],
+                items=approvals,
                 total=total,
                 page=page,
                 page_size=page_size,
@@ -299,7 +375,7 @@ async def get_approval_history(
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
     status_filter: Optional[str] = Query(None, alias="status", description="审批状态筛选"),
     approval_type: Optional[str] = Query(None, description="审批类型筛选"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> ApiResponse[PageResult[ApprovalResponse]]:
     """
@@ -343,7 +419,7 @@ async def get_approval_history(
             code="SUCCESS",
             message="获取审批历史成功",
             data=PageResult(
-                items=[ApprovalResponse.from_orm(a) for a in approvals],
+                items=approvals,
                 total=total,
                 page=page,
                 page_size=page_size,
@@ -0,0 +1,222 @@
+"""资产批量导入 API 路由。
+
+上传清单（CSV / JSON）与可选的附件压缩包（zip / tar）后立即返回导入任务，
+由后台工作进程分批导入；通过任务接口查询进度，通过错误接口查看被拒绝的行。
+"""
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import CurrentUserId, DBSession, ReadDBSession
+from app.api.v1.assets import parse_current_user_id
+from app.api.v1.dashboard import resolve_enterprise_scope
+from app.core.config import settings
+from app.models.asset_import import AssetImportJob
+from app.schemas.asset_import import AssetImportErrorResponse, AssetImportJobResponse
+from app.schemas.response import ApiResponse, PageResult
+from app.services.asset_import_service import (
+    AssetImportService,
+    archive_suffix_for,
+    manifest_format_for,
+    spool_import_file,
+)
+from app.services.upload_queue_service import remove_spool_file
+
+router = APIRouter(prefix="/asset-imports", tags=["Asset Imports"])
+logger = logging.getLogger(__name__)
+
+
+def error_detail(code: str, message: str) -> dict:
+    return {"code": code, "message": message}
+
+
+def _check_upload_size(upload: UploadFile) -> None:
+    if upload.size is not None and upload.size > settings.IMPORT_MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=error_detail(
+                "IMPORT_FILE_TOO_LARGE",
+                f"文件大小超过限制（最大 {settings.IMPORT_MAX_UPLOAD_SIZE // 1024 // 1024}MB）",
+            ),
+        )
+
+
+async def get_accessible_job(
+    service: AssetImportService,
+    db: AsyncSession,
+    current_user_id: str,
+    job_id: UUID,
+) -> AssetImportJob:
+    """
+    获取导入任务并校验当前用户是任务所属企业的成员。
+
+    Args:
+        service: 导入服务
+        db: 数据库会话
+        current_user_id: 当前用户 ID
+        job_id: 导入任务 ID
+
+    Returns:
+        AssetImportJob: 导入任务
+
+    Raises:
+        HTTPException: 任务不存在或无权访问
+    """
+    job = await service.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=error_detail("IMPORT_JOB_NOT_FOUND", "导入任务不存在"),
+        )
+    await resolve_enterprise_scope(db, current_user_id, job.enterprise_id)
+    return job
+
+
+@router.post(
+    "",
+    response_model=ApiResponse[AssetImportJobResponse],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="批量导入资产",
+    description="""
+    上传资产清单与附件压缩包，创建后台导入任务并立即返回。
+
+    清单格式：
+    - CSV：表头为 AssetCreateRequest 的字段名，inventors 与 files 列的多个值以分号分隔，
+      asset_metadata 列为 JSON 字符串
+    - JSON：对象数组，字段同 AssetCreateRequest，files 为字符串数组
+
+    files 中的路径指向压缩包（.zip / .tar / .tar.gz / .tgz）内的文件，第一个为主附件；
+    附件限制与单个创建接口相同。每行单独校验，失败的行不影响其他行。
+    """,
+)
+async def create_asset_import(
+    db: DBSession,
+    current_user_id: CurrentUserId,
+    enterprise_id: UUID = Query(..., description="导入到的企业 ID"),
+    manifest: UploadFile = File(..., description="资产清单（.csv / .json）"),
+    archive: Optional[UploadFile] = File(None, description="附件压缩包（.zip / .tar / .tar.gz / .tgz）"),
+) -> ApiResponse[AssetImportJobResponse]:
+    """
+    创建资产批量导入任务。
+
+    Args:
+        db: 数据库会话
+        current_user_id: 当前用户 ID
+        enterprise_id: 企业 ID
+        manifest: 资产清单
+        archive: 附件压缩包
+
+    Returns:
+        ApiResponse[AssetImportJobResponse]: 待处理的导入任务
+    """
+    await resolve_enterprise_scope(db, current_user_id, enterprise_id)
+    user_id = parse_current_user_id(current_user_id)
+
+    manifest_format = manifest_format_for(manifest.filename)
+    if manifest_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=error_detail("UNSUPPORTED_MANIFEST_FORMAT", "清单仅支持 .csv 或 .json 文件"),
+        )
+    archive_suffix = None
+    if archive is not None and archive.filename:
+        archive_suffix = archive_suffix_for(archive.filename)
+        if archive_suffix is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=error_detail("UNSUPPORTED_ARCHIVE_FORMAT", "附件压缩包仅支持 .zip、.tar、.tar.gz 或 .tgz"),
+            )
+        _check_upload_size(archive)
+    _check_upload_size(manifest)
+
+    manifest_path = await asyncio.to_thread(spool_import_file, manifest.file, f".{manifest_format}")
+    archive_path = None
+    try:
+        if archive_suffix:
+            archive_path = await asyncio.to_thread(spool_import_file, archive.file, archive_suffix)
+        job = await AssetImportService(db).create_job(
+            enterprise_id=enterprise_id,
+            created_by=user_id,
+            manifest_format=manifest_format,
+            manifest_path=manifest_path,
+            archive_path=archive_path,
+        )
+    except Exception:
+        for path in (manifest_path, archive_path):
+            if path:
+                await asyncio.to_thread(remove_spool_file, path)
+        raise
+
+    logger.info(
+        "asset_import_created",
+        extra={"job_id": str(job.id), "enterprise_id": str(enterprise_id), "format": manifest_format},
+    )
+    return ApiResponse(message="导入任务已创建", data=AssetImportJobResponse.model_validate(job))
+
+
+@router.get(
+    "/{job_id}",
+    response_model=ApiResponse[AssetImportJobResponse],
+    summary="查询导入任务进度",
+)
+async def get_asset_import(
+    job_id: UUID,
+    db: DBSession,
+    current_user_id: CurrentUserId,
+) -> ApiResponse[AssetImportJobResponse]:
+    """
+    查询导入任务状态与进度。
+
+    Args:
+        job_id: 导入任务 ID
+        db: 数据库会话
+        current_user_id: 当前用户 ID
+
+    Returns:
+        ApiResponse[AssetImportJobResponse]: 导入任务
+    """
+    job = await get_accessible_job(AssetImportService(db), db, current_user_id, job_id)
+    return ApiResponse(data=AssetImportJobResponse.model_validate(job))
+
+
+@router.get(
+    "/{job_id}/errors",
+    response_model=ApiResponse[PageResult[AssetImportErrorResponse]],
+    summary="查询导入任务的单行错误",
+)
+async def list_asset_import_errors(
+    job_id: UUID,
+    db: ReadDBSession,
+    current_user_id: CurrentUserId,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+) -> ApiResponse[PageResult[AssetImportErrorResponse]]:
+    """
+    分页查询导入任务中被拒绝的行（按行号排序）。
+
+    Args:
+        job_id: 导入任务 ID
+        page: 页码
+        page_size: 每页数量
+        db: 数据库会话
+        current_user_id: 当前用户 ID
+
+    Returns:
+        ApiResponse[PageResult[AssetImportErrorResponse]]: 单行错误分页结果
+    """
+    service = AssetImportService(db)
+    await get_accessible_job(service, db, current_user_id, job_id)
+    errors, total = await service.list_errors(job_id, page, page_size)
+    return ApiResponse(
+        data=PageResult(
+            items=[AssetImportErrorResponse.model_validate(error) for error in errors],
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=(total + page_size - 1) // page_size,
+        )
+    )
@@ -12,6 +12,7 @@ from app.repositories.enterprise_repository import (
 )
 from app.services.asset_service_with_ipfs import AssetServiceWithIPFS
 from app.services.pinata_service import PINATA_IPFS_GATEWAY
+from app.models.asset import AttachmentUploadStatus
 from app.schemas.asset import AssetCreateRequest, AssetResponse, AttachmentResponse
 from app.schemas.response import ApiResponse
 import json
@@ -51,15 +52,15 @@ def parse_current_user_id(current_user_id: str) -> UUID:
     "/with-attachments",
     response_model=ApiResponse[dict],
     status_code=status.HTTP_201_CREATED,
-    summary="创建资产并自动上传附件到IPFS",
+    summary="创建资产并将附件加入IPFS上传队列",
     description="""
-    创建资产并自动上传附件到IPFS。
+    创建资产并将附件加入IPFS后台上传队列。
     
     这个端点将资产创建和附件上传合并为一步操作：
     1. 接收资产基本信息和文件
     2. 创建资产记录
-    3. 自动将文件上传到IPFS
-    4. 创建附件记录并关联到资产
+    3. 将文件暂存到本地并写入上传队列，立即返回
+    4. 附件以 PENDING_UPLOAD 状态返回，后台上传完成后回填 CID
     
     支持的文件类型：
     - 图片：.jpg, .jpeg, .png, .gif, .webp
@@ -81,7 +82,7 @@ async def create_asset_with_attachments(
     files: Optional[List[UploadFile]] = File(None, description="附件文件列表"),
 ) -> ApiResponse[dict]:
     """
-    创建资产并自动上传附件到IPFS。
+    创建资产并将附件加入IPFS后台上传队列。
     
     Args:
         db: 数据库会话
@@ -188,6 +189,10 @@ async def create_asset_with_attachments(
         "summary": {
             "total_files": len(attachments),
             "total_size": sum(att.file_size for att in attachments),
+            "pending_uploads": sum(
+                1 for att in attachments
+                if att.upload_status == AttachmentUploadStatus.PENDING_UPLOAD
+            ),
             "gateway_base_url": f"{PINATA_IPFS_GATEWAY}/"
         }
     }
@@ -204,7 +209,7 @@ async def create_asset_with_attachments(
     
     return ApiResponse(
         code="SUCCESS",
-        message=f"资产创建成功，已上传 {len(attachments)} 个附件到IPFS",
+        message=f"资产创建成功，{len(attachments)} 个附件已加入IPFS上传队列",
         data=response_data
     )
 
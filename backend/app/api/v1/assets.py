@@ -1,12 +1,13 @@
 """资产管理 API 路由。"""
 from uuid import UUID
 from typing import Optional
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Request, Response
 from math import ceil
 from pydantic import ValidationError
 from fastapi.encoders import jsonable_encoder
 
-from app.api.deps import DBSession, CurrentUserId
+from app.api.deps import DBSession, ReadDBSession, CurrentUserId
+from app.core.http_cache import etag_matches, make_etag, not_modified, set_cache_headers
 from app.repositories.asset_repository import AssetRepository
 from app.repositories.enterprise_repository import (
     EnterpriseRepository,
@@ -122,7 +123,7 @@ async def create_asset(
     description="获取指定企业的资产列表，支持筛选和分页",
 )
 async def get_assets(
-    db: DBSession,
+    db: ReadDBSession,
     current_user_id: CurrentUserId,
     enterprise_id: UUID = Query(..., description="企业 ID"),
     asset_type: Optional[AssetType] = Query(None, description="资产类型筛选"),
@@ -156,19 +157,15 @@ async def get_assets(
     Raises:
         HTTPException: 企业不存在或用户无权限
     """
-    # 验证企业存在且用户是成员
-    enterprise_repo = EnterpriseRepository(db)
-    enterprise = await enterprise_repo.get_by_id(enterprise_id)
-    if not enterprise:
+    # 验证企业存在且用户是成员（企业实体会级联 selectin 加载成员及其资产，这里只判断存在）
+    if not await EnterpriseRepository(db).exists(enterprise_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="企业不存在",
         )
     
     user_id = parse_current_user_id(current_user_id)
-    member_repo = EnterpriseMemberRepository(db)
-    member = await member_repo.get_member(enterprise_id, user_id)
-    if not member:
+    if not await EnterpriseMemberRepository(db).is_member(enterprise_id, user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="您不是该企业的成员",
@@ -200,13 +197,14 @@ async def get_assets(
     # 计算总页数
     total_pages = ceil(total / page_size) if total > 0 else 0
     
-    return AssetListResponse(
-        items=[AssetResponse.model_validate(asset) for asset in assets],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-    )
+    # 投影行由响应模型在 pydantic-core 中一次性校验，不逐行构造 AssetResponse
+    return AssetListResponse.model_validate({
+        "items": assets,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+    })
 
 
 @router.get(
@@ -217,37 +215,55 @@ async def get_assets(
 )
 async def get_asset(
     asset_id: UUID,
+    request: Request,
+    response: Response,
     db: DBSession,
     current_user_id: CurrentUserId,
 ) -> AssetResponse:
     """
     获取资产详情。
-    
+
+    先只查询版本列生成 ETag 并校验权限，``If-None-Match`` 命中时直接返回 304，
+    不加载资产实体。
+
     Args:
         asset_id: 资产 ID
+        request: 当前请求
+        response: 响应（设置 ETag 与 Cache-Control）
         db: 数据库会话
         current_user_id: 当前用户 ID
-        
+
     Returns:
         AssetResponse: 资产详情
-        
+
     Raises:
         HTTPException: 资产不存在或用户无权限
     """
     asset_repo = AssetRepository(db)
-    asset_service = AssetService(asset_repo)
-    asset = await asset_service.get_asset(asset_id)
-    
-    # 验证用户是企业成员
+    version = await asset_repo.get_asset_version(asset_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="资产不存在",
+        )
+    enterprise_id, asset_version = version
+
+    # 验证用户是企业成员（先于 304，避免向非成员泄露资产是否变化）
     member_repo = EnterpriseMemberRepository(db)
     user_id = parse_current_user_id(current_user_id)
-    member = await member_repo.get_member(asset.enterprise_id, user_id)
-    if not member:
+    if not await member_repo.is_member(enterprise_id, user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="您无权访问该资产",
         )
-    
+
+    etag = make_etag(*asset_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    asset_service = AssetService(asset_repo)
+    asset = await asset_service.get_asset(asset_id)
+    set_cache_headers(response, etag)
     return AssetResponse.model_validate(asset)
 
 
@@ -1,9 +1,10 @@
 """Authentication API endpoints."""
-from typing import Optional
+from typing import Annotated, Optional
 from fastapi import APIRouter, status, Request, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import DBSession, CurrentUserId
+from app.api.deps import DBSession, CurrentUserId, security
 from app.schemas.auth import (
     UserRegisterRequest,
     UserLoginRequest,
@@ -122,15 +123,17 @@ async def refresh_token(
     "/logout",
     response_model=MessageResponse,
     summary="用户登出",
-    description="撤销当前刷新令牌",
+    description="撤销当前刷新令牌；携带访问令牌时一并撤销该访问令牌",
 )
 async def logout(
     data: RefreshTokenRequest,
     db: DBSession,
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)] = None,
 ) -> MessageResponse:
-    """Logout by revoking refresh token."""
+    """Logout by revoking refresh token (and the presented access token, if any)."""
     auth_service = AuthService(db)
-    success = await auth_service.logout(data.refresh_token)
+    access_token = credentials.credentials if credentials else None
+    success = await auth_service.logout(data.refresh_token, access_token)
     await db.commit()
     return MessageResponse(
         message="Logged out successfully" if success else "Token not found",
@@ -1,10 +1,112 @@
-from fastapi import APIRouter
+"""仪表盘 API 路由。
+
+数据来自维护任务定期刷新的汇总表，一次请求即可加载整个仪表盘，耗时不随数据量增长。
+未指定企业时统计当前用户所属的全部企业。
+"""
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.api.deps import ReadDBSession, CurrentUserId
+from app.api.v1.assets import parse_current_user_id
+from app.core.config import settings
+from app.repositories.enterprise_repository import EnterpriseRepository, EnterpriseMemberRepository
+from app.schemas.dashboard import DashboardAssetSummary, DashboardOverviewResponse
+from app.services.dashboard_service import DashboardService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
-@router.get("/assets")
-async def get_dashboard_assets():
-    """Get assets for dashboard with filtering."""
-    # TODO: Implement in Task 10.1
-    return {"message": "Dashboard assets endpoint - to be implemented"}
+async def resolve_enterprise_scope(
+    db: ReadDBSession,
+    current_user_id: str,
+    enterprise_id: Optional[UUID],
+) -> List[UUID]:
+    """
+    确定统计范围内的企业。
+
+    Args:
+        db: 数据库会话
+        current_user_id: 当前用户 ID
+        enterprise_id: 指定的企业 ID，None 表示用户所属的全部企业
+
+    Returns:
+        List[UUID]: 企业 ID 列表
+
+    Raises:
+        HTTPException: 企业不存在或用户不是该企业成员
+    """
+    user_id = parse_current_user_id(current_user_id)
+    member_repo = EnterpriseMemberRepository(db)
+    if enterprise_id is None:
+        return await member_repo.get_user_enterprise_ids(user_id)
+
+    # 企业实体会级联 selectin 加载成员、用户及其创建的全部资产，这里只需判断存在
+    if not await EnterpriseRepository(db).exists(enterprise_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="企业不存在",
+        )
+    if not await member_repo.is_member(enterprise_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="您不是该企业的成员",
+        )
+    return [enterprise_id]
+
+
+@router.get(
+    "",
+    response_model=DashboardOverviewResponse,
+    summary="获取仪表盘数据",
+    description="一次返回资产分布、铸造漏斗、每日转移量与各企业待审批积压",
+)
+async def get_dashboard(
+    db: ReadDBSession,
+    current_user_id: CurrentUserId,
+    enterprise_id: Optional[UUID] = Query(None, description="企业 ID，不指定时统计所属的全部企业"),
+    days: int = Query(30, ge=1, le=settings.DASHBOARD_MAX_DAYS, description="转移量统计天数"),
+) -> DashboardOverviewResponse:
+    """
+    获取仪表盘数据。
+
+    Args:
+        enterprise_id: 企业 ID
+        days: 转移量统计天数
+        db: 数据库会话
+        current_user_id: 当前用户 ID
+
+    Returns:
+        DashboardOverviewResponse: 仪表盘数据
+    """
+    enterprise_ids = await resolve_enterprise_scope(db, current_user_id, enterprise_id)
+    overview = await DashboardService(db).get_overview(enterprise_ids, days=days)
+    return DashboardOverviewResponse(**overview)
+
+
+@router.get(
+    "/assets",
+    response_model=DashboardAssetSummary,
+    summary="获取资产分布",
+    description="按资产类型、资产状态、法律状态统计资产数量，并给出铸造漏斗",
+)
+async def get_dashboard_assets(
+    db: ReadDBSession,
+    current_user_id: CurrentUserId,
+    enterprise_id: Optional[UUID] = Query(None, description="企业 ID，不指定时统计所属的全部企业"),
+) -> DashboardAssetSummary:
+    """
+    获取资产分布与铸造漏斗。
+
+    Args:
+        enterprise_id: 企业 ID
+        db: 数据库会话
+        current_user_id: 当前用户 ID
+
+    Returns:
+        DashboardAssetSummary: 资产分布与铸造漏斗
+    """
+    enterprise_ids = await resolve_enterprise_scope(db, current_user_id, enterprise_id)
+    summary = await DashboardService(db).get_asset_summary(enterprise_ids)
+    return DashboardAssetSummary(**summary)
@@ -0,0 +1,260 @@
+"""服务端推送 API（Server-Sent Events 与 WebSocket）。
+
+连接默认订阅当前用户的私有主题（通知、审批结果、铸造进度），
+可通过 ``topics`` 查询参数额外订阅公共主题（目前只有 ``approvals``：待审批队列变化）。
+事件只提示客户端刷新，不重放断线期间的事件，客户端重连后应重新拉取一次。
+连接存续期间每个心跳间隔复查一次令牌撤销状态，登出或全部登出后推送 ``token.revoked`` 并断开。
+"""
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_stream_token, get_stream_token_payload, verify_token_payload
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.events import APPROVALS_TOPIC, Event, Subscription, event_bus, user_topic
+from app.services.token_revocation_service import revocation_list
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/events")
+
+# 允许客户端额外订阅的公共主题
+PUBLIC_TOPICS = {APPROVALS_TOPIC}
+
+
+class TopicError(ValueError):
+    """请求了不允许订阅的主题。"""
+
+
+def resolve_topics(user_id: str, requested: Optional[str]) -> List[str]:
+    """
+    计算连接要订阅的主题。
+
+    Args:
+        user_id: 当前用户ID
+        requested: 逗号分隔的公共主题
+
+    Returns:
+        List[str]: 主题列表（总是包含用户私有主题）
+
+    Raises:
+        TopicError: 包含不允许订阅的主题
+    """
+    topics = [user_topic(user_id)]
+    for topic in (requested or "").split(","):
+        topic = topic.strip()
+        if not topic:
+            continue
+        if topic not in PUBLIC_TOPICS:
+            raise TopicError(f"不支持订阅主题: {topic}")
+        topics.append(topic)
+    return topics
+
+
+class RevocationWatch:
+    """
+    按心跳间隔复查推送连接的令牌是否已被撤销。
+
+    撤销列表的镜像在内存中，绝大多数复查不访问数据库；会话只在镜像需要同步或过滤器命中时才取连接。
+    """
+
+    def __init__(
+        self,
+        payload: Dict[str, Any],
+        interval: float,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        self.payload = payload
+        self.interval = interval
+        self._session_factory = session_factory
+        self._check_at = time.monotonic() + interval
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    async def revoked(self) -> bool:
+        """
+        到达复查时间时检查令牌是否已撤销，未到时间直接返回 False。
+
+        Returns:
+            bool: 令牌是否已撤销（复查出错时按未撤销处理，下个间隔重试）
+        """
+        now = time.monotonic()
+        if now < self._check_at:
+            return False
+        self._check_at = now + self.interval
+        try:
+            async with self.session_factory() as db:
+                return await revocation_list.is_revoked(db, self.payload)
+        except Exception as exc:
+            logger.warning(f"推送连接复查令牌撤销状态失败：{exc}")
+            return False
+
+
+def _check_capacity() -> bool:
+    return event_bus.connections < settings.EVENTS_MAX_CONNECTIONS
+
+
+def format_sse(evt: Event) -> str:
+    """把事件编码为 SSE 消息。"""
+    return f"id: {evt.id}\nevent: {evt.type}\ndata: {evt.to_json()}\n\n"
+
+
+async def sse_messages(
+    topics: List[str],
+    expires_at: Optional[float],
+    heartbeat: float,
+    watch: Optional[RevocationWatch] = None,
+) -> AsyncIterator[str]:
+    """
+    生成一个 SSE 连接的消息流：事件、心跳注释，令牌过期或被撤销时发送
+    ``token.expired`` / ``token.revoked`` 后结束。
+
+    订阅在生成器内创建，客户端断开（生成器被取消或关闭）时一定会被释放。
+
+    Args:
+        topics: 订阅的主题
+        expires_at: 令牌过期时间戳（秒）
+        heartbeat: 心跳间隔（秒）
+        watch: 令牌撤销复查器，None 表示不复查
+    """
+    with event_bus.subscribe(topics) as subscription:
+        # 立即发送一条注释，让代理与客户端尽快确认连接建立
+        yield "retry: 3000\n: connected\n\n"
+        while True:
+            timeout = _next_timeout(expires_at, heartbeat)
+            if timeout <= 0:
+                yield "event: token.expired\ndata: {}\n\n"
+                return
+            if watch is not None and await watch.revoked():
+                yield "event: token.revoked\ndata: {}\n\n"
+                return
+            evt = await subscription.get(timeout)
+            yield format_sse(evt) if evt is not None else ": ping\n\n"
+
+
+def _next_timeout(expires_at: Optional[float], heartbeat: float) -> float:
+    if expires_at is None:
+        return heartbeat
+    return min(heartbeat, expires_at - time.time())
+
+
+@router.get(
+    "/stream",
+    summary="事件流（SSE）",
+    description="以 text/event-stream 推送当前用户的通知、审批结果与铸造进度；"
+    "EventSource 无法设置请求头时可用 token 查询参数传递访问令牌。",
+)
+async def stream_events(
+    payload: Dict[str, Any] = Depends(get_stream_token_payload),
+    topics: Optional[str] = Query(None, description="额外订阅的公共主题，逗号分隔（approvals）"),
+    token: Optional[str] = Query(None, description="访问令牌（无法设置 Authorization 请求头时使用）"),
+) -> StreamingResponse:
+    """
+    建立 SSE 事件流。
+
+    Args:
+        payload: 已校验的令牌载荷
+        topics: 额外订阅的公共主题
+
+    Returns:
+        StreamingResponse: 事件流响应
+    """
+    try:
+        subscribed = resolve_topics(payload["sub"], topics)
+    except TopicError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not _check_capacity():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="推送连接数已达上限")
+
+    heartbeat = settings.EVENTS_HEARTBEAT_SECONDS
+    return StreamingResponse(
+        sse_messages(subscribed, payload.get("exp"), heartbeat, RevocationWatch(payload, heartbeat)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    topics: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db, scope="function"),
+) -> None:
+    """
+    建立 WebSocket 事件通道。
+
+    令牌通过 ``Authorization`` 请求头或 ``token`` 查询参数传递；认证失败以 1008 关闭，
+    连接数达到上限以 1013 关闭，令牌过期或被撤销时发送 ``token.expired`` / ``token.revoked``
+    后以 1008 关闭。
+    服务端每隔心跳间隔发送 ``{"type": "ping"}``。
+    """
+    # 先完成握手再以关闭码拒绝：握手前拒绝时浏览器只能看到 1006，无法区分认证失败与网络故障
+    await websocket.accept()
+    try:
+        payload = await verify_token_payload(get_stream_token(websocket), db)
+        subscribed = resolve_topics(payload["sub"], topics)
+    except (HTTPException, TopicError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        # 推送连接存续期间不占用数据库连接
+        await db.close()
+    if not _check_capacity():
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    watch = RevocationWatch(payload, settings.EVENTS_HEARTBEAT_SECONDS)
+    with event_bus.subscribe(subscribed) as subscription:
+        try:
+            await _pump_websocket(websocket, subscription, payload.get("exp"), watch)
+        except WebSocketDisconnect:
+            pass
+
+
+async def _pump_websocket(
+    websocket: WebSocket,
+    subscription: Subscription,
+    expires_at: Optional[float],
+    watch: RevocationWatch,
+) -> None:
+    # 同时读取客户端消息（内容忽略），断开时立即结束而不必等到下一次发送
+    receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+    heartbeat = settings.EVENTS_HEARTBEAT_SECONDS
+    try:
+        while True:
+            timeout = _next_timeout(expires_at, heartbeat)
+            if timeout <= 0:
+                await websocket.send_text('{"type": "token.expired"}')
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
+            if await watch.revoked():
+                await websocket.send_text('{"type": "token.revoked"}')
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
+            getter = asyncio.create_task(subscription.get(timeout))
+            await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver.done():
+                getter.cancel()
+                return
+            evt = getter.result()
+            await websocket.send_text(evt.to_json() if evt is not None else '{"type": "ping"}')
+    finally:
+        receiver.cancel()
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
@@ -0,0 +1,233 @@
+"""数据导出 API 路由。
+
+导出接口返回完整数据集（不分页），以分块传输编码流式输出 CSV 或 NDJSON，可选 gzip 压缩。
+筛选条件与对应的列表接口一致；响应头发出后查询出错只能中断连接，客户端应以完整接收为准。
+请求作用域会话只用于权限校验，导出数据从导出服务自行打开的会话读取。
+"""
+from datetime import date, datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.types import Receive, Scope, Send
+
+from app.api.deps import ReadDBSession, ReadSessionFactory, CurrentUserId
+from app.api.v1.dashboard import resolve_enterprise_scope
+from app.api.v1.ownership import ensure_token_member_access
+from app.models.asset import AssetStatus, AssetType, LegalStatus
+from app.schemas.asset import AssetFilterParams
+from app.services.export_service import (
+    ExportFormat,
+    ExportQuery,
+    ExportService,
+    ExportStream,
+    export_filename,
+    export_media_type,
+)
+from app.services.ownership_service import OwnershipService
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+class ExportStreamingResponse(StreamingResponse):
+    """流式导出响应：无论正常结束、客户端断开还是在首个分块前被取消，都关闭导出会话。"""
+
+    body_iterator: ExportStream
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
+
+async def stream_export(
+    service: ExportService,
+    export: ExportQuery,
+    export_format: ExportFormat,
+    compress: bool,
+) -> ExportStreamingResponse:
+    """
+    构造导出的流式响应。
+
+    Args:
+        service: 导出服务
+        export: 导出查询
+        export_format: 导出格式
+        compress: 是否 gzip 压缩
+
+    Returns:
+        ExportStreamingResponse: 以附件形式下载的流式响应
+    """
+    chunks = await service.open(export, export_format, compress)
+    filename = export_filename(export.name, export_format, compress, datetime.now(timezone.utc))
+    return ExportStreamingResponse(
+        chunks,
+        media_type=export_media_type(export_format, compress),
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get(
+    "/assets",
+    summary="导出企业资产",
+    description="按资产列表接口的筛选条件导出企业的全部资产",
+)
+async def export_assets(
+    db: ReadDBSession,
+    session_factory: ReadSessionFactory,
+    current_user_id: CurrentUserId,
+    enterprise_id: UUID = Query(..., description="企业 ID"),
+    asset_type: Optional[AssetType] = Query(None, description="资产类型筛选"),
+    asset_status: Optional[AssetStatus] = Query(None, description="资产状态筛选"),
+    legal_status: Optional[LegalStatus] = Query(None, description="法律状态筛选"),
+    start_date: Optional[date] = Query(None, description="创作日期起始"),
+    end_date: Optional[date] = Query(None, description="创作日期结束"),
+    search: Optional[str] = Query(None, max_length=200, description="搜索关键词"),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="导出格式：csv / ndjson"),
+    gzip: bool = Query(False, description="是否 gzip 压缩"),
+) -> StreamingResponse:
+    """
+    导出企业资产。
+
+    Args:
+        enterprise_id: 企业 ID
+        asset_type: 资产类型筛选
+        asset_status: 资产状态筛选
+        legal_status: 法律状态筛选
+        start_date: 创作日期起始
+        end_date: 创作日期结束
+        search: 搜索关键词
+        export_format: 导出格式
+        gzip: 是否 gzip 压缩
+        db: 数据库会话（权限校验）
+        session_factory: 导出会话工厂
+        current_user_id: 当前用户 ID
+
+    Returns:
+        StreamingResponse: 导出文件
+    """
+    await resolve_enterprise_scope(db, current_user_id, enterprise_id)
+    try:
+        filters = AssetFilterParams(
+            type=asset_type,
+            status=asset_status,
+            legal_status=legal_status,
+            start_date=start_date,
+            end_date=end_date,
+            search=search,
+        )
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=jsonable_encoder(exc.errors()),
+        )
+
+    service = ExportService(session_factory)
+    return await stream_export(service, service.assets_query(enterprise_id, filters), export_format, gzip)
+
+
+@router.get(
+    "/transfers",
+    summary="导出企业权属变更记录",
+    description="导出企业作为转出方或转入方的全部权属变更记录",
+)
+async def export_enterprise_transfers(
+    db: ReadDBSession,
+    session_factory: ReadSessionFactory,
+    current_user_id: CurrentUserId,
+    enterprise_id: UUID = Query(..., description="企业 ID"),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="导出格式：csv / ndjson"),
+    gzip: bool = Query(False, description="是否 gzip 压缩"),
+) -> StreamingResponse:
+    """
+    导出企业权属变更记录。
+
+    Args:
+        enterprise_id: 企业 ID
+        export_format: 导出格式
+        gzip: 是否 gzip 压缩
+        db: 数据库会话（权限校验）
+        session_factory: 导出会话工厂
+        current_user_id: 当前用户 ID
+
+    Returns:
+        StreamingResponse: 导出文件
+    """
+    await resolve_enterprise_scope(db, current_user_id, enterprise_id)
+    service = ExportService(session_factory)
+    return await stream_export(service, service.enterprise_transfers_query(enterprise_id), export_format, gzip)
+
+
+@router.get(
+    "/tokens/{token_id}/transfers",
+    summary="导出 NFT 权属变更历史",
+    description="导出单个 NFT 的完整权属变更历史",
+)
+async def export_token_transfers(
+    token_id: int,
+    db: ReadDBSession,
+    session_factory: ReadSessionFactory,
+    current_user_id: CurrentUserId,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="导出格式：csv / ndjson"),
+    gzip: bool = Query(False, description="是否 gzip 压缩"),
+) -> StreamingResponse:
+    """
+    导出 NFT 权属变更历史。
+
+    Args:
+        token_id: Token ID
+        export_format: 导出格式
+        gzip: 是否 gzip 压缩
+        db: 数据库会话（权限校验）
+        session_factory: 导出会话工厂
+        current_user_id: 当前用户 ID
+
+    Returns:
+        StreamingResponse: 导出文件
+    """
+    asset = await ensure_token_member_access(OwnershipService(db), token_id, current_user_id)
+    service = ExportService(session_factory)
+    export = service.token_transfers_query(token_id, asset.get("contract_address") or None)
+    return await stream_export(service, export, export_format, gzip)
+
+
+@router.get(
+    "/mint-history",
+    summary="导出铸造历史",
+    description="导出企业的全部 NFT 铸造记录",
+)
+async def export_mint_history(
+    db: ReadDBSession,
+    session_factory: ReadSessionFactory,
+    current_user_id: CurrentUserId,
+    enterprise_id: UUID = Query(..., description="企业 ID"),
+    record_status: Optional[str] = Query(None, description="按记录状态筛选：PENDING/SUCCESS/FAILED"),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="导出格式：csv / ndjson"),
+    gzip: bool = Query(False, description="是否 gzip 压缩"),
+) -> StreamingResponse:
+    """
+    导出铸造历史。
+
+    Args:
+        enterprise_id: 企业 ID
+        record_status: 记录状态筛选
+        export_format: 导出格式
+        gzip: 是否 gzip 压缩
+        db: 数据库会话（权限校验）
+        session_factory: 导出会话工厂
+        current_user_id: 当前用户 ID
+
+    Returns:
+        StreamingResponse: 导出文件
+    """
+    await resolve_enterprise_scope(db, current_user_id, enterprise_id)
+    service = ExportService(session_factory)
+    return await stream_export(service, service.mint_history_query(enterprise_id, record_status), export_format, gzip)
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, HTTPException, Response, status
 import logging
 from typing import Optional
 
+from app.core.http_cache import CACHE_IMMUTABLE, make_etag, set_cache_headers
 from app.services.pinata_service import (
     get_pinata_service,
     PinataUploadError,
@@ -230,12 +231,15 @@ async def delete_file_alias(cid: str):
 
 
 @router.get("/gateway/{cid}")
-async def get_gateway_url(cid: str):
+async def get_gateway_url(cid: str, response: Response):
     """
     获取文件的网关访问 URL。
+
+    CID 是内容寻址的，同一 CID 的结果不会变化，响应带长期缓存指令。
     
     参数：
         cid: IPFS CID
+        response: 响应（设置 ETag 与 Cache-Control）
         
     返回：
         网关 URL
@@ -243,6 +247,7 @@ async def get_gateway_url(cid: str):
     try:
         pinata_service = get_pinata_service()
         url = pinata_service.get_gateway_url(cid)
+        set_cache_headers(response, make_etag(cid, url), CACHE_IMMUTABLE)
         logger.info(
             "ipfs_gateway_url_resolved",
             extra={"asset_id": "", "cid": cid, "file_name": ""},
@@ -265,5 +270,5 @@ async def get_gateway_url(cid: str):
 
 
 @router.get("/files/{cid}/gateway", deprecated=True)
-async def get_gateway_url_alias(cid: str):
-    return await get_gateway_url(cid=cid)
+async def get_gateway_url_alias(cid: str, response: Response):
+    return await get_gateway_url(cid=cid, response=response)
@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.api.deps import get_current_user_id
 from app.core.exceptions import NotFoundException, ForbiddenException, BadRequestException, BlockchainException
 from app.models.asset import Asset
@@ -91,7 +91,7 @@ async def mint_nft(
             royalty_fee_bps=request.royalty_fee_bps,
             signed_message=request.signed_message,
             wallet_signature=request.wallet_signature,
-            operator_id=current_user_id,
+            operator_id=parse_current_user_id(current_user_id),
         )
         await db.commit()
         return result
@@ -162,7 +162,7 @@ async def batch_mint_nft(
         result = await nft_service.batch_mint_assets(
             asset_ids=request.asset_ids,
             minter_address=request.minter_address,
-            operator_id=current_user_id,
+            operator_id=parse_current_user_id(current_user_id),
         )
         await db.commit()
         return result
@@ -309,7 +309,7 @@ async def retry_mint_nft(
         result = await nft_service.retry_mint(
             asset_id=asset_id,
             minter_address=request.minter_address,
-            operator_id=current_user_id,
+            operator_id=parse_current_user_id(current_user_id),
         )
         await db.commit()
         return result
@@ -422,7 +422,7 @@ async def get_nft_history(
     token_id: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: UUID = Depends(get_current_user_id),
 ) -> dict:
     """获取NFT权属变更历史。"""
@@ -463,7 +463,7 @@ async def get_nft_mint_history(
     record_status: Optional[str] = Query(None, description="按记录状态筛选：PENDING/SUCCESS/FAILED"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: UUID = Depends(get_current_user_id),
 ) -> dict:
     user_id = parse_current_user_id(current_user_id)
@@ -498,7 +498,7 @@ async def get_nft_history_alias(
     token_id: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: UUID = Depends(get_current_user_id),
 ) -> dict:
     return await get_nft_history(
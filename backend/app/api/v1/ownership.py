@@ -3,13 +3,14 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_id
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.exceptions import BadRequestException, BlockchainException, ForbiddenException, NotFoundException
+from app.core.http_cache import etag_matches, make_etag, not_modified, set_cache_headers
 from app.schemas.response import ApiResponse, PageResult
 from app.services.ownership_service import OwnershipService
 
@@ -114,7 +115,7 @@ async def get_enterprise_ownership_assets(
     search: Optional[str] = Query(None, description="Asset name search"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id),
 ):
     service = OwnershipService(db)
@@ -134,7 +135,7 @@ async def get_enterprise_ownership_assets(
 
     return ApiResponse(
         data=PageResult(
-            items=[OwnershipAssetResponse(**item) for item in items],
+            items=items,
             total=total,
             page=page,
             page_size=page_size,
@@ -150,7 +151,7 @@ async def get_enterprise_ownership_assets(
 )
 async def get_enterprise_ownership_stats(
     enterprise_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id),
 ):
     service = OwnershipService(db)
@@ -170,11 +171,18 @@ async def get_enterprise_ownership_stats(
 )
 async def get_ownership_asset_detail(
     token_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user_id: str = Depends(get_current_user_id),
 ):
     service = OwnershipService(db)
     asset = await ensure_token_member_access(service, token_id, current_user_id)
+    # 详情本身只是两次按列查询，ETag 直接取响应内容的摘要，命中时省去序列化与传输
+    etag = make_etag(*asset.values())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
     return ApiResponse(data=OwnershipAssetResponse(**asset))
 
 
@@ -185,19 +193,29 @@ async def get_ownership_asset_detail(
 )
 async def get_nft_transfer_history(
     token_id: int,
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id),
 ):
     service = OwnershipService(db)
     asset = await ensure_token_member_access(service, token_id, current_user_id)
+    contract_address = asset.get("contract_address") or None
+    # 新记录会插到第一页之前，分页结果不是不可变的，因此按版本信息校验而不设长期缓存
+    version = await service.get_transfer_history_version(token_id, contract_address)
+    etag = make_etag(token_id, contract_address, page, page_size, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     records, total = await service.get_transfer_history(
         token_id=token_id,
-        contract_address=asset.get("contract_address") or None,
+        contract_address=contract_address,
         page=page,
         page_size=page_size,
     )
+    set_cache_headers(response, etag)
     return ApiResponse(
         data=PageResult(
             items=[TransferRecordResponse(**record) for record in records],
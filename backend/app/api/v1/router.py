@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, users, enterprises, assets, nft, dashboard, approvals, ipfs, contracts, ownership
+from app.api.v1 import auth, users, enterprises, assets, nft, dashboard, approvals, ipfs, contracts, ownership, events, exports, asset_imports
 from app.api.v1.asset_with_attachments import router as asset_with_attachments_router
 
 api_router = APIRouter(prefix="/api/v1")
@@ -15,6 +15,9 @@ api_router.include_router(approvals.router)
 api_router.include_router(ipfs.router)
 api_router.include_router(contracts.router)
 api_router.include_router(ownership.router)
+api_router.include_router(events.router)
+api_router.include_router(exports.router)
+api_router.include_router(asset_imports.router)
 
 # Include new IPFS auto-upload router
 api_router.include_router(asset_with_attachments_router)
@@ -0,0 +1,91 @@
+"""认证相关的进程内缓存。
+
+- ``VerifiedTokenCache``：已验签访问令牌的有界 LRU，以令牌摘要为键，遵守 ``exp``；
+- ``PrincipalCache``：用户主体的短 TTL 缓存，登出、撤销、改密等操作时主动失效。
+
+缓存只在单个进程内生效，多进程部署下各进程独立维护。
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+
+def token_digest(token: str) -> bytes:
+    """计算令牌摘要，缓存中不保存原始令牌。"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    """已验签令牌的有界 LRU 缓存。"""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        获取缓存的令牌载荷。
+
+        Args:
+            token: 原始令牌
+            now: 当前时间戳（便于测试）
+
+        Returns:
+            Optional[Dict[str, Any]]: 载荷副本；未命中或已过期时返回 None
+        """
+        if self.maxsize <= 0:
+            return None
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= (now if now is not None else time.time()):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return dict(payload)
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """缓存已验签的载荷；没有 exp 的令牌不缓存。"""
+        if self.maxsize <= 0:
+            return
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (dict(payload), float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PrincipalCache(TTLCache):
+    """
+    按键缓存用户主体快照的短 TTL 缓存。
+
+    登出、撤销、改密、资料变更后调用 ``invalidate`` 使对应主体失效。
+    """
+
+
+# 全局缓存实例
+verified_token_cache = VerifiedTokenCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+principal_cache = PrincipalCache(
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+)
@@ -1,13 +1,22 @@
-"""用于 Web3 交互的区块链客户端。"""
+"""用于 Web3 交互的区块链客户端。
+
+web3 / eth_account 在首次创建客户端时才导入（导入耗时约 1 秒），应用启动时不承担这部分开销；
+合约 ABI 与字节码只解析一次并在进程内缓存。
+"""
+from __future__ import annotations
+
 import logging
 import json
-from typing import Optional, Dict, Any
-from eth_account import Account
-from eth_account.messages import encode_defunct
-from web3 import Web3
-from web3.contract import Contract
-from web3.exceptions import InvalidAddress, Web3ValidationError
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
 from app.core.config import settings
+from app.core.instrumentation import RPC, instrumented
+
+if TYPE_CHECKING:
+    from eth_account import Account
+    from web3 import Web3
+    from web3.contract import Contract
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +26,40 @@ class BlockchainConnectionError(Exception):
     pass
 
 
+# 合约构建产物：项目根目录/contracts/artifacts/contracts/IPNFT.sol/IPNFT.json
+CONTRACT_ARTIFACT_PATH = os.path.abspath(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..", "..", "..",
+        "contracts", "artifacts", "contracts", "IPNFT.sol", "IPNFT.json",
+    )
+)
+
+
+@lru_cache(maxsize=None)
+def load_contract_artifact(path: str = CONTRACT_ARTIFACT_PATH) -> Tuple[Optional[list], Optional[str]]:
+    """
+    读取并解析合约构建产物（进程内只解析一次）。
+
+    参数：
+        path: 构建产物 JSON 路径
+
+    返回：
+        tuple: (ABI, 字节码)，文件不存在或解析失败时为 (None, None)
+    """
+    try:
+        if not os.path.exists(path):
+            logger.warning(f"Contract artifact not found at {path}")
+            return None, None
+        with open(path, 'r') as f:
+            artifact = json.load(f)
+        logger.info(f"Contract ABI and bytecode loaded from {path}")
+        return artifact.get('abi'), artifact.get('bytecode')
+    except Exception as e:
+        logger.warning(f"Failed to load contract info: {e}")
+        return None, None
+
+
 class BlockchainClient:
     """带有错误处理和重试逻辑的区块链交互客户端。"""
     
@@ -42,33 +85,12 @@ class BlockchainClient:
     
     def _load_contract_info(self) -> None:
         """加载合约ABI和字节码"""
-        try:
-            import os
-            
-            # Get project root (parent of backend directory)
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # From app/core go up to backend, then to project root
-            project_root = os.path.abspath(os.path.join(current_dir, "..", "..", ".."))
-            
-            # Path: project_root/contracts/artifacts/contracts/IPNFT.sol/IPNFT.json
-            artifacts_path = os.path.join(
-                project_root, "contracts", "artifacts", 
-                "contracts", "IPNFT.sol", "IPNFT.json"
-            )
-            
-            if os.path.exists(artifacts_path):
-                with open(artifacts_path, 'r') as f:
-                    artifact = json.load(f)
-                    self._contract_abi = artifact.get('abi')
-                    self._contract_bytecode = artifact.get('bytecode')
-                    logger.info(f"Contract ABI and bytecode loaded from {artifacts_path}")
-            else:
-                logger.warning(f"Contract artifact not found at {artifacts_path}")
-        except Exception as e:
-            logger.warning(f"Failed to load contract info: {e}")
+        self._contract_abi, self._contract_bytecode = load_contract_artifact()
     
     def _connect(self) -> None:
         """建立与区块链节点的连接。"""
+        from web3 import Web3
+
         try:
             self.w3 = Web3(
                 Web3.HTTPProvider(
@@ -99,6 +121,7 @@ class BlockchainClient:
             logger.error(f"检查区块链连接时出错：{e}")
             return False
     
+    @instrumented(RPC)
     def get_balance(self, address: str) -> int:
         """
         获取地址的余额（以 wei 为单位）。
@@ -113,6 +136,8 @@ class BlockchainClient:
             InvalidAddress: 如果地址无效
             BlockchainConnectionError: 如果连接失败
         """
+        from web3.exceptions import InvalidAddress
+
         if not self.is_valid_address(address):
             raise InvalidAddress(f"无效地址：{address}")
         
@@ -147,6 +172,9 @@ class BlockchainClient:
         返回：
             bool: 如果签名有效则为 True
         """
+        from eth_account.messages import encode_defunct
+        from web3.exceptions import Web3ValidationError
+
         if not self.is_valid_address(expected_address):
             logger.warning(f"预期地址无效：{expected_address}")
             return False
@@ -194,6 +222,8 @@ class BlockchainClient:
         if not address or not isinstance(address, str):
             return False
         
+        from web3 import Web3
+
         try:
             # 检查基本格式
             if not Web3.is_address(address):
@@ -221,11 +251,14 @@ class BlockchainClient:
         抛出：
             InvalidAddress: 如果地址无效
         """
+        from web3.exceptions import InvalidAddress
+
         if not self.is_valid_address(address):
             raise InvalidAddress(f"无效地址：{address}")
         
         return self.w3.to_checksum_address(address)
     
+    @instrumented(RPC)
     def get_block_number(self) -> int:
         """
         获取当前区块号。
@@ -245,6 +278,7 @@ class BlockchainClient:
                 f"获取区块号失败：{str(e)}"
             ) from e
     
+    @instrumented(RPC)
     async def mint_nft(
         self,
         to_address: str,
@@ -327,6 +361,7 @@ class BlockchainClient:
 
         return None
 
+    @instrumented(RPC)
     async def estimate_mint_gas(
         self,
         to_address: str,
@@ -337,6 +372,8 @@ class BlockchainClient:
         if not self.contract_address:
             raise BlockchainConnectionError("NFT 合约未部署。请先部署合约并设置 CONTRACT_ADDRESS")
 
+        from web3 import Web3
+
         try:
             checksum_to = self.w3.to_checksum_address(to_address)
             contract = self._get_contract()
@@ -380,6 +417,8 @@ class BlockchainClient:
                 "DEPLOYER_PRIVATE_KEY 未配置。请设置私钥后再进行部署。"
             )
         
+        from eth_account import Account
+
         try:
             self._deployer_account = Account.from_key(settings.DEPLOYER_PRIVATE_KEY)
             return self._deployer_account
@@ -408,6 +447,7 @@ class BlockchainClient:
             abi=self._contract_abi
         )
     
+    @instrumented(RPC)
     async def transfer_nft(
         self,
         from_address: str,
@@ -457,6 +497,7 @@ class BlockchainClient:
             logger.error(f"NFT 转移失败: {e}")
             raise BlockchainConnectionError(f"NFT 转移失败: {str(e)}")
 
+    @instrumented(RPC)
     def deploy_contract(self) -> Dict[str, Any]:
         """
         部署 NFT 智能合约。
@@ -564,6 +605,23 @@ def get_blockchain_client() -> BlockchainClient:
     return _blockchain_client
 
 
+def warm_up_blockchain_client() -> Optional[BlockchainClient]:
+    """
+    预热区块链客户端：导入 web3、解析合约产物并建立节点连接（在线程中调用）。
+
+    节点不可用时只记录日志，首个请求会再次尝试连接。
+
+    返回：
+        Optional[BlockchainClient]: 连接成功时返回客户端实例
+    """
+    load_contract_artifact()
+    try:
+        return get_blockchain_client()
+    except BlockchainConnectionError as e:
+        logger.warning(f"区块链客户端预热失败：{e}")
+        return None
+
+
 def close_blockchain_client() -> None:
     """关闭全局区块链客户端。"""
     global _blockchain_client
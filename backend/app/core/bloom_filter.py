@@ -0,0 +1,67 @@
+"""紧凑的 Bloom 过滤器实现。"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    基于 bytearray 的 Bloom 过滤器。
+
+    只会产生假阳性，不会产生假阴性：``x in bf`` 为 False 时 x 一定没有加入过。
+    位数组大小和哈希函数个数按期望容量与误判率计算，
+    哈希使用一次 blake2b 摘要的两半做双重哈希。
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity <= 0:
+            raise ValueError("capacity 必须大于 0")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate 必须在 (0, 1) 之间")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> bool:
+        """
+        加入元素。
+
+        Returns:
+            bool: 是否改变了位数组（已存在或假阳性的元素返回 False，不计入元素个数）。
+        """
+        changed = False
+        bits = self._bits
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                changed = True
+        if changed:
+            self._count += 1
+        return changed
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self) -> int:
+        """已加入的不同元素个数（近似值）。"""
+        return self._count
+
+    @property
+    def is_saturated(self) -> bool:
+        """加入的元素超过设计容量后误判率会快速上升，需要重建。"""
+        return self._count >= self.capacity
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
@@ -0,0 +1,521 @@
+"""热点读模型的应用缓存。
+
+两级缓存，读取顺序为本进程 → 共享层 → 加载函数：
+
+- ``LocalCacheTier``：进程内有界 LRU/TTL 缓存，维护标签到键的索引，按标签失效；
+- ``RedisCacheTier``：可选的 Redis 共享层（``CACHE_BACKEND=redis``），多进程 / 多实例共用一次加载结果。
+  每个标签在 Redis 中有一个版本号，条目写入时记下各标签的版本，读取时版本不一致即视为未命中；
+  失效只需对标签版本号 ``INCR``，不必枚举、删除条目。标签取决于加载结果（``tags`` 为函数）的条目
+  只进本地层：加载前无从读取其标签版本，加载期间其他进程的失效无法识别。
+
+同一进程内对同一个键的并发未命中只执行一次加载（single-flight），其余请求等待同一个结果。
+条目按标签（``enterprise:{id}``、``asset:{id}``、``user:{id}``）失效：写路径调用
+``invalidate_after_commit`` 登记标签，事务提交后失效，回滚时丢弃。本进程立即失效；
+其他进程的本地层最多滞后 ``CACHE_LOCAL_TTL`` 秒。
+
+缓存的值须为 JSON 原生类型（dict / list / str / int / float / bool），共享层按 JSON 存储；
+返回值与其他请求共享，调用方不得原地修改。加载结果为 None 时不缓存。
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# 未命中的哨兵值（缓存值本身可能是 0、空列表等假值）
+MISSING: Any = object()
+
+_PENDING_TAGS_KEY = "pending_cache_tags"
+
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+
+def enterprise_tag(enterprise_id: Any) -> str:
+    """企业标签：企业信息、成员或名下资产变化时失效。"""
+    return f"enterprise:{enterprise_id}"
+
+
+def asset_tag(asset_id: Any) -> str:
+    """资产标签：资产状态或权属变化时失效。"""
+    return f"asset:{asset_id}"
+
+
+def user_tag(user_id: Any) -> str:
+    """用户标签：用户资料或其通知变化时失效。"""
+    return f"user:{user_id}"
+
+
+class LocalCacheTier:
+    """进程内有界 LRU/TTL 缓存，支持按标签失效。"""
+
+    def __init__(self, ttl: float = 10.0, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Any, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """
+        读取条目。
+
+        Returns:
+            Any: 缓存值；不存在或已过期时返回 ``MISSING``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any, tags: Iterable[str] = (), ttl: Optional[float] = None) -> None:
+        """
+        写入条目，超出容量时淘汰最久未使用的条目。
+
+        Args:
+            key: 键
+            value: 值
+            tags: 标签
+            ttl: 有效期（秒），默认使用本层的 TTL；不大于 0 时不写入
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if not self.enabled or ttl <= 0:
+            return
+        tags = tuple(dict.fromkeys(tags))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tags)
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        删除带有任一标签的条目。
+
+        Returns:
+            int: 删除的条目数
+        """
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tag_index.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def _remove(self, key: str) -> None:
+        # 调用方持有锁
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+# 读取条目并校验其记录的标签版本，一次往返完成；版本不一致视为未命中
+_GET_LUA = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return false
+end
+local entry = cjson.decode(raw)
+for tag, version in pairs(entry['t']) do
+    local current = redis.call('GET', ARGV[1] .. tag) or '0'
+    if tostring(current) ~= tostring(version) then
+        return false
+    end
+end
+return raw
+"""
+
+
+class RedisCacheTier:
+    """
+    基于 Redis 的共享缓存层。
+
+    条目存为 ``{"v": 值, "t": {标签: 版本}}``；失效时递增标签版本号，旧条目在下次读取时被识别为过期，
+    并随自身 TTL 自然淘汰。标签版本号的有效期远长于条目 TTL，版本号过期重置不会让旧条目复活。
+    """
+
+    def __init__(
+        self,
+        client=None,
+        url: Optional[str] = None,
+        ttl: float = 300.0,
+        prefix: str = "cache:",
+        tag_version_ttl: int = 86400,
+    ):
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:  # pragma: no cover
+                raise RuntimeError("使用 Redis 缓存共享层需要安装 redis 包") from e
+            client = redis_asyncio.Redis.from_url(url or settings.CACHE_REDIS_URL)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.tag_prefix = prefix + "tag:"
+        self.tag_version_ttl = tag_version_ttl
+        self._get_script = client.register_script(_GET_LUA)
+
+    async def get(self, key: str) -> Any:
+        """
+        读取条目。
+
+        Returns:
+            Any: (值, 标签) 二元组；不存在、已过期或标签版本已变化时返回 ``MISSING``
+        """
+        raw = await self._get_script(keys=[self.prefix + key], args=[self.tag_prefix])
+        if not raw:
+            return MISSING
+        entry = json.loads(raw)
+        return entry["v"], tuple(entry["t"])
+
+    async def versions(self, tags: Iterable[str]) -> Dict[str, str]:
+        """
+        读取一组标签的当前版本号（不存在的标签为 ``"0"``）。
+
+        Args:
+            tags: 标签
+
+        Returns:
+            Dict[str, str]: 标签到版本号的映射
+        """
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return {}
+        values = await self.client.mget([self.tag_prefix + tag for tag in tags])
+        return {
+            tag: (value.decode() if isinstance(value, bytes) else str(value)) if value is not None else "0"
+            for tag, value in zip(tags, values)
+        }
+
+    async def put(self, key: str, value: Any, versions: Dict[str, str], ttl: Optional[float] = None) -> None:
+        """
+        写入条目。
+
+        Args:
+            key: 键
+            value: JSON 原生类型的值
+            versions: 加载开始前读取的标签版本号
+            ttl: 有效期（秒），默认使用本层的 TTL
+        """
+        payload = json.dumps({"v": value, "t": versions}, ensure_ascii=False, separators=(",", ":"))
+        await self.client.set(self.prefix + key, payload, px=int((ttl or self.ttl) * 1000))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag in dict.fromkeys(tags):
+                pipe.incr(self.tag_prefix + tag)
+                pipe.expire(self.tag_prefix + tag, self.tag_version_ttl)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close is not None:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+class _NamespaceStats:
+    __slots__ = ("hits", "shared_hits", "misses", "coalesced")
+
+    def __init__(self) -> None:
+        self.hits = self.shared_hits = self.misses = self.coalesced = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.shared_hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((total - self.misses) / total, 4) if total else None,
+        }
+
+
+class CacheService:
+    """两级应用缓存：本地层 + 可选共享层，带 single-flight 与按标签失效。"""
+
+    def __init__(
+        self,
+        local: Optional[LocalCacheTier] = None,
+        shared: Optional[RedisCacheTier] = None,
+        enabled: bool = True,
+    ):
+        self.local = local or LocalCacheTier()
+        self.shared = shared
+        self.enabled = enabled
+        self._inflight: Dict[str, Tuple["asyncio.Future[Any]", int]] = {}
+        # 每次失效递增；加载期间发生过失效时不写入结果，避免把失效前读到的旧值放回缓存
+        self._epoch = 0
+        self._stats: Dict[str, _NamespaceStats] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: Any,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Tags = (),
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        读取缓存，未命中时调用加载函数并写入缓存。
+
+        Args:
+            namespace: 命名空间（统计按命名空间区分，如 ``enterprise_detail``）
+            key: 命名空间内的键
+            loader: 无参异步加载函数，返回 JSON 原生类型的值
+            tags: 条目的标签；也可以是以加载结果为参数、返回标签的函数（标签取决于加载结果时使用，
+                这类条目只缓存在本地层）
+            ttl: 本地层有效期（秒），默认 ``CACHE_LOCAL_TTL``；不大于 0 时不缓存
+
+        Returns:
+            Any: 缓存值或加载结果
+        """
+        if not self.enabled or (ttl is not None and ttl <= 0):
+            return await loader()
+
+        full_key = f"{namespace}:{key}"
+        value = self.local.get(full_key)
+        if value is not MISSING:
+            self._record(namespace, "local")
+            return value
+
+        inflight, inflight_epoch = self._inflight.get(full_key, (None, None))
+        # 领头的加载开始后发生过失效时，其结果可能已过期，不再合并
+        if inflight is not None and inflight_epoch == self._epoch:
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 领头的加载被取消时自行加载；自身被取消则照常抛出
+                if not inflight.cancelled():
+                    raise
+            else:
+                self._record(namespace, "coalesced")
+                return value
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        entry = self._inflight[full_key] = (future, self._epoch)
+        try:
+            value = await self._load(namespace, full_key, loader, tags, ttl)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                # 等待者会各自取走异常；无人等待时避免 "exception was never retrieved"
+                future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(full_key) is entry:
+                del self._inflight[full_key]
+
+    async def _load(
+        self,
+        namespace: str,
+        full_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Tags,
+        ttl: Optional[float],
+    ) -> Any:
+        epoch = self._epoch
+        # 标签取决于加载结果时无法在加载前记下版本，加载期间其他进程提交的失效会被漏掉，
+        # 旧值将在共享层存活整个 TTL，因此这类条目不经过共享层
+        shared = None if callable(tags) else self.shared
+        static_tags = () if callable(tags) else tuple(tags)
+        versions: Dict[str, str] = {}
+        if shared is not None:
+            try:
+                entry = await shared.get(full_key)
+                if entry is not MISSING:
+                    self._record(namespace, "shared")
+                    value, entry_tags = entry
+                    if epoch == self._epoch:
+                        self.local.put(full_key, value, entry_tags, ttl)
+                    return value
+                versions = await shared.versions(static_tags)
+            except Exception as exc:
+                logger.warning("读取共享缓存失败，直接加载：%s", exc)
+                versions = {}
+
+        self._record(namespace, "miss")
+        value = await loader()
+        if value is None or epoch != self._epoch:
+            return value
+
+        entry_tags = tuple(tags(value)) if callable(tags) else static_tags
+        self.local.put(full_key, value, entry_tags, ttl)
+        if shared is not None:
+            try:
+                await shared.put(full_key, value, versions)
+            except Exception as exc:
+                logger.warning("写入共享缓存失败：%s", exc)
+        return value
+
+    def invalidate_local(self, tags: Iterable[str]) -> None:
+        """立即失效本进程中带有任一标签的条目。"""
+        tags = list(tags)
+        if not tags:
+            return
+        self._epoch += 1
+        self.local.invalidate_tags(tags)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """
+        失效带有任一标签的条目（本进程与共享层）。
+
+        Args:
+            tags: 标签
+        """
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return
+        self.invalidate_local(tags)
+        if self.shared is not None:
+            try:
+                await self.shared.invalidate_tags(tags)
+            except Exception as exc:
+                logger.warning("失效共享缓存标签失败：%s", exc)
+
+    def schedule_shared_invalidation(self, tags: Iterable[str]) -> None:
+        """在后台失效共享层的标签（用于同步上下文，如事务提交回调）。"""
+        if self.shared is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("当前线程没有运行中的事件循环，跳过共享缓存失效")
+            return
+        task = loop.create_task(self._invalidate_shared(list(tags)))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _invalidate_shared(self, tags: list) -> None:
+        try:
+            await self.shared.invalidate_tags(tags)
+        except Exception as exc:
+            logger.warning("失效共享缓存标签失败：%s", exc)
+
+    def clear(self) -> None:
+        """清空本地层与统计（共享层不受影响）。"""
+        self._epoch += 1
+        self.local.clear()
+        self._stats.clear()
+
+    async def close(self) -> None:
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        if self.shared is not None:
+            await self.shared.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "backend": "redis" if self.shared is not None else "memory",
+            "local_entries": len(self.local),
+            "inflight": len(self._inflight),
+            "namespaces": {name: stats.as_dict() for name, stats in sorted(self._stats.items())},
+        }
+
+    def _record(self, namespace: str, result: str) -> None:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = _NamespaceStats()
+        if result == "local":
+            stats.hits += 1
+        elif result == "shared":
+            stats.shared_hits += 1
+        elif result == "coalesced":
+            stats.coalesced += 1
+        else:
+            stats.misses += 1
+        CACHE_REQUESTS.labels(namespace, result).inc()
+
+
+def invalidate_after_commit(session: Any, *tags: str) -> None:
+    """
+    登记在会话事务提交后失效的缓存标签（回滚时丢弃）。
+
+    Args:
+        session: ``AsyncSession`` 或同步 ``Session``
+        *tags: 标签
+    """
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(_PENDING_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_pending_tags(session: Session) -> None:
+    tags = session.info.pop(_PENDING_TAGS_KEY, None)
+    if tags:
+        cache_service.invalidate_local(tags)
+        cache_service.schedule_shared_invalidation(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_tags(session: Session) -> None:
+    session.info.pop(_PENDING_TAGS_KEY, None)
+
+
+def create_cache_service(backend: Optional[str] = None) -> CacheService:
+    """
+    根据配置创建缓存服务。
+
+    Args:
+        backend: memory / redis，默认读取 CACHE_BACKEND
+
+    Returns:
+        CacheService: 缓存服务
+    """
+    backend = (backend or settings.CACHE_BACKEND).lower()
+    local = LocalCacheTier(ttl=settings.CACHE_LOCAL_TTL, maxsize=settings.CACHE_LOCAL_MAXSIZE)
+    if backend == "memory":
+        shared = None
+    elif backend == "redis":
+        shared = RedisCacheTier(url=settings.CACHE_REDIS_URL, ttl=settings.CACHE_SHARED_TTL)
+    else:
+        raise ValueError(f"不支持的缓存后端：{backend}")
+    return CacheService(local=local, shared=shared, enabled=settings.CACHE_ENABLED)
+
+
+# 全局缓存服务
+cache_service = create_cache_service()
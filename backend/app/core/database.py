@@ -1,24 +1,89 @@
+import asyncio
 import importlib
 import logging
 import sys
 from datetime import datetime
-from typing import AsyncGenerator, Any
-from sqlalchemy import DateTime, func
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from pathlib import Path
+from typing import AsyncGenerator, Any, Dict, Optional, Set
+from sqlalchemy import DateTime, Delete, Engine, Select, delete, func, inspect, select, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
+from app.core.instrumentation import install_query_instrumentation
+from app.core.metrics import InstrumentedAsyncQueuePool, install_pool_metrics
 
 # 配置日志记录器
 logger = logging.getLogger(__name__)
 
+# SQL 语句计数与慢查询日志（对所有引擎生效）
+install_query_instrumentation()
+# 连接池借出次数与等待时间指标
+install_pool_metrics()
+
 ERROR_DIVIDER = "=" * 80
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    # echo=settings.DEBUG,
-    echo=False,
-    pool_pre_ping=True,  # 验证连接有效性，防止使用已断开连接
-)
+def engine_options(url: str, read_only: bool = False) -> Dict[str, Any]:
+    """
+    根据配置生成 ``create_async_engine`` 的参数。
+
+    连接池参数仅对 PostgreSQL 等使用 QueuePool 的数据库生效；asyncpg 额外设置预编译语句缓存、
+    会话级语句超时与事务空闲超时。只读库连接默认开启 ``default_transaction_read_only``，
+    误写会直接报错而不是悄悄写入副本。
+
+    Args:
+        url: 数据库连接 URL
+        read_only: 是否为只读库引擎
+
+    Returns:
+        Dict[str, Any]: 引擎参数
+    """
+    options: Dict[str, Any] = {
+        # echo=settings.DEBUG,
+        "echo": False,
+        # 验证连接有效性，防止使用已断开连接（每次借出多一次往返，可配合 pool_recycle 关闭）
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.startswith("sqlite"):
+        return options
+
+    options.update(
+        pool_size=settings.DB_READ_POOL_SIZE if read_only else settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_READ_MAX_OVERFLOW if read_only else settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        # 后进先出：低峰期多余连接保持空闲，可被 pool_recycle / 服务端超时回收
+        pool_use_lifo=True,
+        poolclass=InstrumentedAsyncQueuePool,
+    )
+    if "+asyncpg" in url:
+        server_settings = {
+            "application_name": settings.DB_APPLICATION_NAME,
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+            "idle_in_transaction_session_timeout": str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS),
+        }
+        if read_only:
+            server_settings["default_transaction_read_only"] = "on"
+        connect_args: Dict[str, Any] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        }
+        if settings.DB_STATEMENT_CACHE_SIZE == 0:
+            # 经 PgBouncer 事务模式连接时需同时关闭 asyncpg 自身的语句缓存
+            connect_args["statement_cache_size"] = 0
+        options["connect_args"] = connect_args
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+# 只读副本；未配置时与主库共用同一个引擎
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(
+        settings.DATABASE_READ_URL,
+        **engine_options(settings.DATABASE_READ_URL, read_only=True),
+    )
+else:
+    read_engine = engine
 
 SessionLocal = async_sessionmaker(
     engine,
@@ -28,6 +93,44 @@ SessionLocal = async_sessionmaker(
 )
 
 
+def _is_read_statement(clause: Any) -> bool:
+    """普通 SELECT（不含 FOR UPDATE）视为只读语句。"""
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+class RoutingSession(Session):
+    """
+    按事务意图路由的会话。
+
+    只读查询发往只读库；一旦出现写操作（flush、INSERT/UPDATE/DELETE、SELECT FOR UPDATE
+    或无法判断的文本语句），本会话后续所有语句都固定到主库，保证读到自己的写入。
+    """
+
+    def __init__(self, *args: Any, primary: Engine, replica: Engine, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replica = replica
+        self.pinned_to_primary = primary is replica
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        if self.pinned_to_primary:
+            return self.primary
+        if self._flushing or not _is_read_statement(clause):
+            self.pinned_to_primary = True
+            return self.primary
+        return self.replica
+
+
+ReadSessionLocal = async_sessionmaker(
+    autoflush=False,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    primary=engine.sync_engine,
+    replica=read_engine.sync_engine,
+)
+
+
 class Base(DeclarativeBase):
     """所有数据库模型的基类，包含时间戳字段。"""
     
@@ -44,6 +147,28 @@ class Base(DeclarativeBase):
     )
 
 
+def limited_delete(model: Any, *criteria: Any, limit: Optional[int] = None) -> Delete:
+    """
+    构造最多删除 ``limit`` 行的 DELETE 语句。
+
+    通过 ``WHERE pk IN (SELECT pk ... LIMIT n)`` 实现，PostgreSQL 与 SQLite 均可执行，
+    分批调用可以避免一次大删除长时间持有锁。
+
+    Args:
+        model: ORM 模型类（要求单列主键）
+        *criteria: 过滤条件
+        limit: 单批最多删除的行数，None 表示不限制
+
+    Returns:
+        Delete: 删除语句
+    """
+    if limit is None:
+        return delete(model).where(*criteria)
+    pk = model.__mapper__.primary_key[0]
+    batch = select(pk).where(*criteria).limit(limit)
+    return delete(model).where(pk.in_(batch.scalar_subquery()))
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """获取数据库会话的依赖函数。"""
     async with SessionLocal() as db:
@@ -56,6 +181,28 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await db.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """获取读多写少接口使用的数据库会话（查询走只读库，出现写操作后切回主库）。"""
+    async with ReadSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+
+
+def get_read_session_factory() -> async_sessionmaker:
+    """
+    获取只读会话工厂的依赖函数。
+
+    流式响应在路由返回之后才读取数据，不能依赖请求作用域会话的关闭时机，
+    应从工厂自行打开并关闭会话。
+    """
+    return ReadSessionLocal
+
+
 def _print_db_unicode_error() -> None:
     """当 Windows 上数据库连接解码失败时打印帮助信息。"""
     logger.error("\n" + ERROR_DIVIDER)
@@ -82,7 +229,114 @@ async def init_db() -> None:
         raise
 
 
+# Alembic 配置（backend/alembic.ini 与 backend/alembic 目录）
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+class SchemaVersionError(RuntimeError):
+    """数据库结构版本与代码中的 Alembic 迁移头不一致时抛出。"""
+
+
+def get_migration_heads() -> Set[str]:
+    """
+    读取代码中 Alembic 迁移脚本的头版本。
+
+    Returns:
+        Set[str]: 头版本号集合
+    """
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def get_database_revisions(bind: Optional[AsyncEngine] = None) -> Set[str]:
+    """
+    读取数据库当前的 Alembic 版本（``alembic_version`` 表不存在时返回空集合）。
+
+    Args:
+        bind: 数据库引擎，默认为主库引擎
+
+    Returns:
+        Set[str]: 数据库版本号集合
+    """
+    async with (bind or engine).connect() as conn:
+        has_table = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("alembic_version"))
+        if not has_table:
+            return set()
+        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        return {row[0] for row in result}
+
+
+async def verify_schema_revision(bind: Optional[AsyncEngine] = None) -> None:
+    """
+    校验数据库结构已迁移到最新版本（替代每次启动执行 ``create_all``）。
+
+    Args:
+        bind: 数据库引擎，默认为主库引擎
+
+    Raises:
+        SchemaVersionError: 数据库版本与迁移头不一致
+    """
+    heads = get_migration_heads()
+    current = await get_database_revisions(bind)
+    if current != heads:
+        raise SchemaVersionError(
+            f"数据库结构版本 {sorted(current) or '（未迁移）'} 与迁移头 {sorted(heads)} 不一致，"
+            f"请先执行 alembic upgrade head"
+        )
+    logger.info(f"数据库结构版本校验通过：{', '.join(sorted(heads))}")
+
+
+async def prepare_database(mode: Optional[str] = None) -> None:
+    """
+    按启动模式准备数据库结构。
+
+    Args:
+        mode: ``create_all``（开发环境，自动建表）、``check``（校验 Alembic 版本）或 ``skip``，
+            默认取 ``DB_SCHEMA_STARTUP_MODE``
+    """
+    mode = (mode or settings.DB_SCHEMA_STARTUP_MODE).lower()
+    if mode == "create_all":
+        await init_db()
+    elif mode == "check":
+        await verify_schema_revision()
+    elif mode != "skip":
+        raise ValueError(f"未知的 DB_SCHEMA_STARTUP_MODE：{mode}")
+
+
+async def warm_up_pool(connections: int, bind: Optional[AsyncEngine] = None) -> int:
+    """
+    预先建立连接池中的连接，首批请求无需等待建连与认证。
+
+    Args:
+        connections: 预建立的连接数
+        bind: 数据库引擎，默认为主库引擎
+
+    Returns:
+        int: 成功建立的连接数
+    """
+    bind = bind or engine
+
+    async def _open() -> bool:
+        async with bind.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+
+    # 并发借出，确保建立的是不同的连接
+    results = await asyncio.gather(*(_open() for _ in range(max(0, connections))), return_exceptions=True)
+    opened = sum(1 for result in results if result is True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"数据库连接预热失败：{result}")
+    return opened
+
+
 async def close_db() -> None:
     """关闭数据库引擎连接。"""
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
     logger.info("数据库连接已关闭")
@@ -0,0 +1,307 @@
+"""服务端推送的进程内发布/订阅总线。
+
+- ``EventBus``：按主题（``user:{id}``、``approvals``）把事件分发给本进程的 SSE / WebSocket 连接，
+  每个连接一个有界队列，慢连接只丢弃自己最旧的事件，不会拖慢发布方；
+- ``publish_after_commit``：业务写入随事务提交后再发布，回滚时丢弃，客户端收到事件后查询一定能看到新状态；
+- ``PostgresEventBridge``：``EVENTS_BACKEND=postgres`` 时用 LISTEN/NOTIFY 把事件扇出到所有工作进程。
+
+事件只用于提示客户端刷新，不保证送达（连接断开期间的事件不会重放），客户端重连后应重新拉取一次。
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APPROVALS_TOPIC = "approvals"
+_PENDING_EVENTS_KEY = "pending_events"
+# PostgreSQL NOTIFY 的负载上限为 8000 字节
+_NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+def user_topic(user_id: Any) -> str:
+    """用户私有主题。"""
+    return f"user:{user_id}"
+
+
+@dataclass
+class Event:
+    """推送给客户端的事件。"""
+
+    topic: str
+    type: str
+    data: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "Event":
+        return cls(
+            topic=payload["topic"],
+            type=payload["type"],
+            data=payload.get("data") or {},
+            id=payload.get("id") or uuid.uuid4().hex,
+            created_at=payload.get("created_at") or time.time(),
+        )
+
+
+class Subscription:
+    """一个连接的订阅，持有该连接的事件队列。"""
+
+    def __init__(self, bus: "EventBus", topics: Iterable[str], queue_size: int):
+        self.bus = bus
+        self.topics: Set[str] = set(topics)
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def deliver(self, evt: Event) -> None:
+        """投递事件；队列已满时丢弃最旧的一条。"""
+        while True:
+            try:
+                self.queue.put_nowait(evt)
+                return
+            except asyncio.QueueFull:
+                self.queue.get_nowait()
+                self.dropped += 1
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """
+        等待下一个事件。
+
+        Args:
+            timeout: 超时时间（秒），None 表示一直等待
+
+        Returns:
+            Optional[Event]: 事件；超时返回 None
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class EventBus:
+    """进程内事件总线。"""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        # 区分本进程发出的 NOTIFY，避免重复投递
+        self.origin = uuid.uuid4().hex
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._connections = 0
+        self._bridge: Optional["PostgresEventBridge"] = None
+        self.published = 0
+        self.delivered = 0
+
+    @property
+    def connections(self) -> int:
+        """当前订阅（连接）数。"""
+        return self._connections
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        """
+        订阅一组主题。
+
+        Args:
+            topics: 主题列表
+
+        Returns:
+            Subscription: 订阅对象，用完后调用 ``close``（或用作上下文管理器）
+        """
+        subscription = Subscription(self, topics, self.queue_size)
+        for topic in subscription.topics:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        self._connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        removed = False
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers and subscription in subscribers:
+                subscribers.discard(subscription)
+                removed = True
+                if not subscribers:
+                    del self._subscribers[topic]
+        if removed:
+            self._connections -= 1
+
+    def dispatch(self, evt: Event) -> int:
+        """
+        把事件投递给本进程内订阅了该主题的连接。
+
+        Returns:
+            int: 投递的连接数
+        """
+        subscribers = self._subscribers.get(evt.topic)
+        if not subscribers:
+            return 0
+        for subscription in list(subscribers):
+            subscription.deliver(evt)
+        self.delivered += len(subscribers)
+        return len(subscribers)
+
+    def publish(self, topic: str, type: str, data: Dict[str, Any]) -> Event:
+        """
+        发布事件：立即投递给本进程，启用 PostgreSQL 桥接时同时扇出到其他进程。
+
+        Args:
+            topic: 主题
+            type: 事件类型（如 ``notification.created``）
+            data: 事件数据（应可 JSON 序列化，尽量只包含 ID 与状态）
+
+        Returns:
+            Event: 发布的事件
+        """
+        evt = Event(topic=topic, type=type, data=data)
+        self.published += 1
+        if settings.EVENTS_ENABLED:
+            self.dispatch(evt)
+            if self._bridge is not None:
+                self._bridge.send(evt)
+        return evt
+
+    def start(self) -> None:
+        """按配置启动跨进程桥接（内存后端无需启动）。"""
+        if settings.EVENTS_BACKEND == "postgres" and self._bridge is None:
+            self._bridge = PostgresEventBridge(self, settings.DATABASE_URL, settings.EVENTS_PG_CHANNEL)
+            self._bridge.start()
+
+    async def stop(self) -> None:
+        if self._bridge is not None:
+            await self._bridge.stop()
+            self._bridge = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": settings.EVENTS_BACKEND,
+            "connections": self._connections,
+            "topics": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+        }
+
+
+class PostgresEventBridge:
+    """
+    用 PostgreSQL LISTEN/NOTIFY 在工作进程间扇出事件。
+
+    每个进程持有一条专用 asyncpg 连接：监听通道，并由后台任务串行发送 ``pg_notify``，
+    发布方只把事件放入发送队列，不等待网络往返。连接断开后按退避重连，期间的事件丢弃。
+    """
+
+    def __init__(self, bus: EventBus, database_url: str, channel: str, outbox_size: int = 10000):
+        self.bus = bus
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._outbox: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=outbox_size)
+        self._task: Optional[asyncio.Task] = None
+
+    def send(self, evt: Event) -> None:
+        try:
+            self._outbox.put_nowait(evt)
+        except asyncio.QueueFull:
+            logger.warning("事件发送队列已满，丢弃事件 %s", evt.type)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="event-bridge")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("忽略无法解析的事件通知")
+            return
+        if message.get("origin") == self.bus.origin:
+            return
+        self.bus.dispatch(Event.from_dict(message))
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(self.channel, self._on_notify)
+                delay = 1.0
+                while True:
+                    evt = await self._outbox.get()
+                    payload = json.dumps(
+                        {"origin": self.bus.origin, **asdict(evt)}, ensure_ascii=False, default=str
+                    )
+                    if len(payload.encode()) > _NOTIFY_PAYLOAD_LIMIT:
+                        logger.warning("事件 %s 超过 NOTIFY 负载上限，只在本进程投递", evt.type)
+                        continue
+                    await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("事件桥接连接异常，%.0f 秒后重连：%s", delay, exc)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+def publish_after_commit(session: Any, topic: str, type: str, data: Dict[str, Any]) -> None:
+    """
+    登记一个在会话事务提交后发布的事件（回滚时丢弃）。
+
+    Args:
+        session: ``AsyncSession`` 或同步 ``Session``
+        topic: 主题
+        type: 事件类型
+        data: 事件数据
+    """
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(_PENDING_EVENTS_KEY, []).append((topic, type, data))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session: Session) -> None:
+    pending: List = session.info.pop(_PENDING_EVENTS_KEY, None) or []
+    for topic, type, data in pending:
+        event_bus.publish(topic, type, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session: Session) -> None:
+    session.info.pop(_PENDING_EVENTS_KEY, None)
+
+
+# 全局事件总线
+event_bus = EventBus(queue_size=settings.EVENTS_QUEUE_SIZE)
@@ -61,6 +61,13 @@ class ValidationException(AppException):
         super().__init__(message, code, 422, details)
 
 
+class ServiceUnavailableException(AppException):
+    """503 - 服务暂时不可用（过载或依赖不可用）。"""
+    
+    def __init__(self, message: str = "服务繁忙，请稍后重试", code: str = "SERVICE_UNAVAILABLE", details: Optional[Any] = None):
+        super().__init__(message, code, 503, details)
+
+
 class BlockchainException(AppException):
     """500 - 区块链交互错误。"""
     
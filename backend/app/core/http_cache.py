@@ -0,0 +1,82 @@
+"""HTTP 条件请求（ETag / If-None-Match）与 Cache-Control 辅助函数。
+
+读接口先用只查版本列的廉价查询生成强 ETag：请求携带的 ``If-None-Match`` 命中时直接返回 304，
+不再加载完整的实体图和序列化响应体；未命中时照常返回，并附上 ETag 供客户端下次校验。
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# 需要鉴权的可变数据：允许客户端缓存，但每次使用前都要携带 ETag 重新校验
+CACHE_REVALIDATE = "private, no-cache"
+# 内容寻址（IPFS CID）的数据：同一 CID 对应的内容不会变化，有效期内无需校验
+CACHE_IMMUTABLE = "public, max-age=86400, immutable"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    由版本信息生成强 ETag。
+
+    Args:
+        *parts: 决定响应内容的版本信息（主键、更新时间、子记录摘要等），按 ``repr`` 参与摘要
+
+    Returns:
+        str: 带双引号的强 ETag
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    判断请求的 ``If-None-Match`` 是否命中当前 ETag（按 RFC 9110 使用弱比较）。
+
+    Args:
+        request: 当前请求
+        etag: 当前资源的 ETag
+
+    Returns:
+        bool: 命中时为 True，应返回 304
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_opaque(candidate) == _opaque(etag) for candidate in header.split(","))
+
+
+def _opaque(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def set_cache_headers(response: Response, etag: Optional[str] = None, cache_control: str = CACHE_REVALIDATE) -> None:
+    """
+    为响应设置 ``ETag`` 与 ``Cache-Control``。
+
+    Args:
+        response: 响应对象（路由中注入的 ``Response``）
+        etag: ETag，为空时不设置
+        cache_control: Cache-Control 指令
+    """
+    if etag:
+        response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str = CACHE_REVALIDATE) -> Response:
+    """
+    构造 304 响应（不含响应体，保留 ETag 与 Cache-Control）。
+
+    Args:
+        etag: 当前资源的 ETag
+        cache_control: Cache-Control 指令
+
+    Returns:
+        Response: 304 响应
+    """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
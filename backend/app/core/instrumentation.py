@@ -0,0 +1,239 @@
+"""请求级性能埋点：SQL 语句计数与耗时、外部调用耗时、慢查询日志。
+
+- 每个请求在 ``TimingMiddleware`` 中创建一个 ``RequestMetrics``，保存在 contextvar 中；
+- SQLAlchemy ``before/after_cursor_execute`` 事件累计语句数与数据库耗时，超过阈值的语句
+  连同参数写入慢查询日志；
+- ``instrumented(kind)`` 装饰器包装区块链 RPC、Pinata 上传与邮件发送，按类别累计耗时；
+- ``query_budget`` 供测试断言一段代码执行的 SQL 语句数不超过预算，用于发现 N+1 查询。
+"""
+import asyncio
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import observe_external_call
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# 外部调用类别
+RPC = "rpc"
+UPLOAD = "upload"
+EMAIL = "email"
+
+_QUERY_START_KEY = "instrumentation_query_start"
+
+
+@dataclass
+class RequestMetrics:
+    """单个请求（或一段代码）的性能计数。"""
+
+    db_queries: int = 0
+    db_time_ms: float = 0.0
+    external_calls: Dict[str, int] = field(default_factory=dict)
+    external_time_ms: Dict[str, float] = field(default_factory=dict)
+    statements: Optional[List[str]] = None
+
+    def record_query(self, statement: str, duration_ms: float) -> None:
+        self.db_queries += 1
+        self.db_time_ms += duration_ms
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def record_external(self, kind: str, duration_ms: float) -> None:
+        self.external_calls[kind] = self.external_calls.get(kind, 0) + 1
+        self.external_time_ms[kind] = self.external_time_ms.get(kind, 0.0) + duration_ms
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        """
+        生成 ``Server-Timing`` 响应头的值。
+
+        Args:
+            total_ms: 请求总耗时（毫秒）
+
+        Returns:
+            str: 形如 ``db;dur=3.2;desc="4 queries", rpc;dur=120.5;desc="1 calls"`` 的字符串
+        """
+        parts = [f'db;dur={self.db_time_ms:.2f};desc="{self.db_queries} queries"']
+        for kind in sorted(self.external_calls):
+            parts.append(
+                f'{kind};dur={self.external_time_ms[kind]:.2f};desc="{self.external_calls[kind]} calls"'
+            )
+        if total_ms is not None:
+            parts.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(parts)
+
+    def as_log_fields(self) -> Dict[str, Any]:
+        """结构化日志字段。"""
+        fields: Dict[str, Any] = {
+            "db_queries": self.db_queries,
+            "db_time_ms": round(self.db_time_ms, 2),
+        }
+        for kind in self.external_calls:
+            fields[f"{kind}_calls"] = self.external_calls[kind]
+            fields[f"{kind}_time_ms"] = round(self.external_time_ms[kind], 2)
+        return fields
+
+
+request_metrics_ctx: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def get_request_metrics() -> Optional[RequestMetrics]:
+    """获取当前请求的性能计数（不在请求上下文中时返回 None）。"""
+    return request_metrics_ctx.get()
+
+
+@contextmanager
+def track_metrics(record_statements: bool = False) -> Iterator[RequestMetrics]:
+    """
+    在当前上下文中收集性能计数。
+
+    Args:
+        record_statements: 是否记录执行过的 SQL 语句
+
+    Yields:
+        RequestMetrics: 性能计数
+    """
+    metrics = RequestMetrics(statements=[] if record_statements else None)
+    token = request_metrics_ctx.set(metrics)
+    try:
+        yield metrics
+    finally:
+        request_metrics_ctx.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """执行的 SQL 语句数超过预算时抛出。"""
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[RequestMetrics]:
+    """
+    断言代码块执行的 SQL 语句数不超过 ``max_queries``（用于测试）。
+
+    Args:
+        max_queries: 允许的最大语句数
+
+    Raises:
+        QueryBudgetExceeded: 超出预算时抛出，消息中列出执行过的语句
+    """
+    with track_metrics(record_statements=True) as metrics:
+        yield metrics
+    if metrics.db_queries > max_queries:
+        statements = "\n".join(f"  {i + 1}. {sql}" for i, sql in enumerate(metrics.statements or []))
+        raise QueryBudgetExceeded(
+            f"执行了 {metrics.db_queries} 条 SQL 语句，超过预算 {max_queries} 条：\n{statements}"
+        )
+
+
+def _format_parameters(parameters: Any) -> str:
+    text = repr(parameters)
+    limit = settings.SLOW_QUERY_MAX_PARAMETER_LENGTH
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_QUERY_START_KEY)
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+
+    metrics = request_metrics_ctx.get()
+    if metrics is not None:
+        metrics.record_query(statement, duration_ms)
+
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold > 0 and duration_ms >= threshold:
+        from app.core.middleware import get_request_id
+
+        slow_query_logger.warning(
+            "slow_query",
+            extra={
+                "duration_ms": round(duration_ms, 2),
+                "statement": statement,
+                "parameters": _format_parameters(parameters) if settings.SLOW_QUERY_LOG_PARAMETERS else None,
+                "executemany": executemany,
+                "request_id": get_request_id(),
+            },
+        )
+
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None:
+        starts = conn.info.get(_QUERY_START_KEY)
+        if starts:
+            starts.pop()
+
+
+_installed = False
+
+
+def install_query_instrumentation() -> None:
+    """为所有 SQLAlchemy 引擎注册语句计数与慢查询事件（幂等）。"""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _installed = True
+
+
+@contextmanager
+def external_span(kind: str, operation: str = "") -> Iterator[None]:
+    """
+    将代码块耗时计入当前请求的外部调用类别 ``kind``，并写入外部调用延迟直方图。
+
+    Args:
+        kind: 调用类别
+        operation: 具体方法名（直方图标签）
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics = request_metrics_ctx.get()
+        if metrics is not None:
+            metrics.record_external(kind, elapsed * 1000)
+        if settings.METRICS_ENABLED:
+            observe_external_call(kind, operation, elapsed)
+
+
+def instrumented(kind: str) -> Callable[[Callable], Callable]:
+    """
+    方法装饰器：将调用耗时计入当前请求的外部调用类别（支持同步与异步函数），
+    直方图以函数名作为 ``operation`` 标签。
+
+    Args:
+        kind: 调用类别，如 ``rpc`` / ``upload`` / ``email``
+    """
+    def decorator(func: Callable) -> Callable:
+        operation = func.__name__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with external_span(kind, operation):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with external_span(kind, operation):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
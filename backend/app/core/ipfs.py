@@ -3,13 +3,13 @@ import json
 import threading
 import time
 from functools import wraps
-from typing import Optional, Callable, Any
-
-import ipfshttpclient
-from ipfshttpclient.exceptions import Error as IPFSError
+from typing import TYPE_CHECKING, Optional, Callable, Any, Union
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    import ipfshttpclient
+
 
 # 配置日志
 import logging
@@ -43,20 +43,39 @@ class IPFSFileTooLargeError(Exception):
     pass
 
 
+def _retryable_errors() -> tuple:
+    """需要重试的异常类型（首次调用时才导入 ipfshttpclient）。"""
+    from ipfshttpclient.exceptions import Error as IPFSError
+
+    return (IPFSConnectionError, IPFSError, ConnectionError)
+
+
+def _non_connection_errors() -> tuple:
+    """不含底层连接错误的重试异常类型。"""
+    from ipfshttpclient.exceptions import Error as IPFSError
+
+    return (IPFSConnectionError, IPFSError)
+
+
 def retry_on_error(
     max_retries: int = MAX_RETRIES,
     delay: float = RETRY_DELAY,
-    exceptions: tuple = (Exception,)
+    exceptions: Union[tuple, Callable[[], tuple]] = (Exception,)
 ) -> Callable:
-    """在指定异常时重试函数的装饰器。"""
+    """
+    在指定异常时重试函数的装饰器。
+
+    ``exceptions`` 也可以是返回异常元组的函数，在首次调用时解析，便于延迟导入第三方库。
+    """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
+            retry_on = exceptions if isinstance(exceptions, (tuple, type)) else exceptions()
             last_exception = None
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
-                except exceptions as e:
+                except retry_on as e:
                     last_exception = e
                     if attempt < max_retries - 1:
                         wait_time = delay * (2 ** attempt)  # 指数退避
@@ -94,12 +113,12 @@ class IPFSClient:
         self.ipfs_url = ipfs_url or settings.IPFS_API_URL
         self.max_file_size = max_file_size
         self.timeout = timeout
-        self._client: Optional[ipfshttpclient.Client] = None
+        self._client: Optional["ipfshttpclient.Client"] = None
         self._lock = threading.Lock()
         self._connection_attempts = 0
         self._max_connection_attempts = 3
     
-    def _get_client(self) -> ipfshttpclient.Client:
+    def _get_client(self) -> "ipfshttpclient.Client":
         """
         获取或创建线程安全的 IPFS 客户端实例。
         
@@ -109,6 +128,8 @@ class IPFSClient:
         抛出：
             IPFSConnectionError: 如果连接在重试后失败
         """
+        import ipfshttpclient
+
         with self._lock:
             if self._client is None:
                 try:
@@ -153,7 +174,7 @@ class IPFSClient:
     
     @retry_on_error(
         max_retries=MAX_RETRIES,
-        exceptions=(IPFSConnectionError, IPFSError, ConnectionError)
+        exceptions=_retryable_errors
     )
     def upload_file(self, file_content: bytes, file_name: str) -> str:
         """
@@ -192,7 +213,7 @@ class IPFSClient:
     
     @retry_on_error(
         max_retries=MAX_RETRIES,
-        exceptions=(IPFSConnectionError, IPFSError, ConnectionError)
+        exceptions=_retryable_errors
     )
     def upload_json(self, json_data: dict) -> str:
         """
@@ -218,7 +239,7 @@ class IPFSClient:
     
     @retry_on_error(
         max_retries=MAX_RETRIES,
-        exceptions=(IPFSConnectionError, IPFSError, ConnectionError)
+        exceptions=_retryable_errors
     )
     def get_file(self, cid: str) -> bytes:
         """
@@ -281,7 +302,7 @@ class IPFSClient:
     
     @retry_on_error(
         max_retries=MAX_RETRIES,
-        exceptions=(IPFSConnectionError, IPFSError)
+        exceptions=_non_connection_errors
     )
     def pin_file(self, cid: str) -> bool:
         """
@@ -308,7 +329,7 @@ class IPFSClient:
     
     @retry_on_error(
         max_retries=MAX_RETRIES,
-        exceptions=(IPFSConnectionError, IPFSError)
+        exceptions=_non_connection_errors
     )
     def unpin_file(self, cid: str) -> bool:
         """
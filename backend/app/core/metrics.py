@@ -0,0 +1,172 @@
+"""Prometheus 指标：热点路径的延迟直方图与计数器，在 ``/metrics`` 暴露。
+
+单进程下指标保存在进程内存中，每次更新只是一次加锁的浮点数累加；
+多 worker 部署时在启动前设置环境变量 ``PROMETHEUS_MULTIPROC_DIR``，
+prometheus_client 会把每个 worker 的值写入该目录下的 mmap 文件（共享内存），
+``/metrics`` 抓取时再汇总所有 worker，各 worker 之间无需任何同步。
+
+    PROMETHEUS_MULTIPROC_DIR=/tmp/metrics gunicorn -w 4 -k uvicorn.workers.UvicornWorker app.main:app
+
+目录需在每次部署前清空。
+"""
+import os
+import time
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from starlette.types import Scope
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# 未匹配到路由的请求统一归入该标签，避免按原始路径产生无界的标签基数
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 请求处理耗时（按路由模板）",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds",
+    "外部调用耗时：区块链 RPC、Pinata 上传、邮件发送（按方法）",
+    ["kind", "operation"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+PINATA_UPLOAD_BYTES = Counter(
+    "pinata_upload_bytes",
+    "成功上传到 Pinata 的字节数",
+)
+
+MINT_STAGE_DURATION = Histogram(
+    "mint_stage_duration_seconds",
+    "NFT 铸造各阶段耗时（与 MintRecord 的阶段对应）",
+    ["stage", "status"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections",
+    "被限流拒绝的请求数（按限流策略）",
+    ["policy"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "应用缓存读取次数（按命名空间与结果：local / shared / miss / coalesced）",
+    ["namespace", "result"],
+)
+
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts",
+    "数据库连接池借出连接次数",
+)
+
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "从连接池获取连接的等待时间",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+def is_multiprocess() -> bool:
+    """是否运行在多进程（共享内存汇总）模式。"""
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def route_label(scope: Scope) -> str:
+    """
+    取请求匹配到的路由模板（如 ``/api/v1/assets/{asset_id}``）作为指标标签。
+
+    Starlette 路由匹配后会把 ``route`` 写回同一个 scope，外层中间件在响应时即可读取。
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else UNMATCHED_ROUTE
+
+
+def observe_request(method: str, route: str, status_code: int, duration_seconds: float) -> None:
+    """记录一次 HTTP 请求的耗时。"""
+    HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(duration_seconds)
+
+
+def observe_external_call(kind: str, operation: str, duration_seconds: float) -> None:
+    """记录一次外部调用的耗时。"""
+    EXTERNAL_CALL_DURATION.labels(kind, operation).observe(duration_seconds)
+
+
+def observe_mint_stage(stage: str, status: str, started: float) -> float:
+    """
+    记录铸造阶段耗时。
+
+    Args:
+        stage: 阶段名
+        status: 阶段结果（success / failed）
+        started: 阶段开始时的 ``time.perf_counter()``
+
+    Returns:
+        float: 当前 ``time.perf_counter()``，可作为下一阶段的开始时间
+    """
+    now = time.perf_counter()
+    MINT_STAGE_DURATION.labels(stage, status).observe(now - started)
+    return now
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    生成 Prometheus 文本格式的指标。
+
+    Returns:
+        Tuple[bytes, str]: (响应体, Content-Type)
+    """
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """worker 退出时清理其在共享目录中的存活数据（仅多进程模式）。"""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """记录获取连接等待时间的连接池（连接池耗尽时等待时间会明显上升）。"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    DB_POOL_CHECKOUTS.inc()
+
+
+_pool_events_installed = False
+
+
+def install_pool_metrics() -> None:
+    """为所有连接池注册借出计数事件（幂等）。"""
+    global _pool_events_installed
+    if _pool_events_installed:
+        return
+    event.listen(Pool, "checkout", _on_checkout)
+    _pool_events_installed = True
@@ -0,0 +1,120 @@
+"""纯 ASGI 中间件：请求 ID、请求耗时与性能埋点。
+
+这些中间件只在 ``http.response.start`` 消息上追加响应头，不包装请求体和响应体，
+因此不会像 ``BaseHTTPMiddleware`` 那样为每个请求创建额外任务，也不会破坏流式响应与背压。
+"""
+import logging
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.instrumentation import track_metrics
+from app.core.metrics import observe_request, route_label
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+RESPONSE_TIME_HEADER = "X-Response-Time"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# 只接受长度合理、字符安全的外部请求 ID，避免日志注入
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._\-]{1,128}$")
+
+request_id_ctx: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """获取当前请求的 ID（不在请求上下文中时返回 None）。"""
+    return request_id_ctx.get()
+
+
+class RequestIdMiddleware:
+    """为每个请求分配请求 ID，写入 ``request.state.request_id`` 并回显到响应头。"""
+
+    def __init__(self, app: ASGIApp, header_name: str = REQUEST_ID_HEADER):
+        self.app = app
+        self.header_name = header_name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = Headers(scope=scope).get(self.header_name)
+        if incoming and _REQUEST_ID_PATTERN.match(incoming):
+            request_id = incoming
+        else:
+            request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message).append(self.header_name, request_id)
+            await send(message)
+
+        token = request_id_ctx.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_ctx.reset(token)
+
+
+class TimingMiddleware:
+    """
+    记录请求耗时与性能计数。
+
+    响应头给出首字节前的处理时间与 ``Server-Timing``（SQL 语句数与耗时、外部调用耗时），
+    响应结束时记录包含完整计数的结构化日志，并按路由模板写入请求延迟直方图。
+    """
+
+    def __init__(self, app: ASGIApp, header_name: str = RESPONSE_TIME_HEADER):
+        self.app = app
+        self.header_name = header_name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        with track_metrics() as metrics:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    message.setdefault("headers", [])
+                    headers = MutableHeaders(scope=message)
+                    headers.append(self.header_name, f"{elapsed_ms:.2f}ms")
+                    if settings.SERVER_TIMING_ENABLED:
+                        headers.append(SERVER_TIMING_HEADER, metrics.server_timing(elapsed_ms))
+                elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                    elapsed = time.perf_counter() - start
+                    if settings.METRICS_ENABLED:
+                        observe_request(scope["method"], route_label(scope), status_code, elapsed)
+                    fields = {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status_code": status_code,
+                        "duration_ms": round(elapsed * 1000, 2),
+                        "request_id": get_request_id(),
+                        **metrics.as_log_fields(),
+                    }
+                    threshold = settings.REQUEST_QUERY_WARN_THRESHOLD
+                    if threshold > 0 and metrics.db_queries > threshold:
+                        logger.warning("request_query_count_exceeded", extra=fields)
+                    else:
+                        logger.debug("request_completed", extra=fields)
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
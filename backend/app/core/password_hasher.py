@@ -0,0 +1,116 @@
+"""密码哈希执行器。
+
+pbkdf2 / bcrypt 是刻意设计的 CPU 密集型计算，直接在事件循环中执行会让一次登录
+阻塞所有其他请求。这里把哈希与校验放到独立的进程池中执行，并限制排队深度：
+超过上限时立即返回 503，而不是让请求无限堆积。
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.security import get_password_hash, verify_and_update_password, verify_password
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(ServiceUnavailableException):
+    """当哈希队列已满时抛出。"""
+
+    def __init__(self):
+        super().__init__("登录请求过多，请稍后重试", "PASSWORD_HASHER_BUSY")
+
+
+class PasswordHasher:
+    """
+    带背压的异步密码哈希器。
+
+    mode 为 process 时使用进程池（默认，大小为 CPU 核数），thread 时使用线程池，
+    inline 时直接在当前线程执行（仅用于测试）。在途任务（执行中 + 排队中）
+    超过 max_pending 时拒绝新任务。
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self.mode = (mode or settings.PASSWORD_HASH_EXECUTOR).lower()
+        if self.mode not in ("process", "thread", "inline"):
+            raise ValueError(f"不支持的密码哈希执行方式：{self.mode}")
+        self.max_workers = max_workers or settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+        self.max_pending = max_pending or settings.PASSWORD_HASH_MAX_PENDING or self.max_workers * 8
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """当前在途的哈希任务数。"""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        # 延迟创建，首次登录 / 注册时才启动工作进程
+        if self._executor is None:
+            if self.mode == "process":
+                # 使用 spawn，避免在已有线程的进程中 fork
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_pending:
+            logger.warning(f"密码哈希队列已满（{self._pending}/{self.max_pending}），拒绝请求")
+            raise PasswordHasherBusyError()
+
+        self._pending += 1
+        try:
+            if self.mode == "inline":
+                return fn(*args)
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+            except BrokenProcessPool:
+                # 工作进程异常退出时重建进程池并重试一次
+                logger.error("密码哈希进程池已损坏，正在重建")
+                self.shutdown(wait=False)
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """异步计算密码哈希。"""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """异步校验密码。"""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """异步校验密码，并在哈希过时（如旧版 bcrypt）时返回新哈希。"""
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭执行器。"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# 全局密码哈希器实例
+password_hasher = PasswordHasher()
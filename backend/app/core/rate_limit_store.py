@@ -0,0 +1,441 @@
+"""限流状态存储后端。
+
+限流器本身只负责策略（每分钟 / 每小时额度），状态保存在可插拔的存储中：
+
+- ``MemoryRateLimitStore``：进程内分片字典，默认后端；
+- ``SharedMemoryRateLimitStore``：基于 mmap 文件与 fcntl 区间锁，单机多进程共享；
+- ``RedisRateLimitStore``：通过 Lua 脚本原子执行 GCRA，多实例 / 多 Pod 共享。
+
+所有后端都实现同一套 GCRA 算法：每个键保存分钟、小时两个窗口的理论到达时间（TAT）。
+"""
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:  # pragma: no cover - Windows 无 fcntl
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MINUTE_WINDOW = 60
+HOUR_WINDOW = 3600
+
+STATUS_OK = 0
+STATUS_MINUTE_EXCEEDED = 1
+STATUS_HOUR_EXCEEDED = 2
+
+# 抵消浮点误差，例如 (60 - 30) / 0.6 = 49.999...
+_EPSILON = 1e-9
+
+
+class GcraResult(NamedTuple):
+    """存储后端返回的一次 GCRA 计算结果。"""
+
+    status: int
+    retry_after: float
+    minute_remaining: int
+    hour_remaining: int
+
+
+def _remaining(tat: float, window: int, interval: float, now: float) -> int:
+    return max(0, int((window - (tat - now)) / interval + _EPSILON))
+
+
+def gcra_apply(
+    minute_tat: float,
+    hour_tat: float,
+    now: float,
+    minute_interval: float,
+    hour_interval: float,
+) -> Tuple[Optional[Tuple[float, float]], GcraResult]:
+    """
+    对一个键执行 GCRA 检查。
+
+    Args:
+        minute_tat: 分钟窗口当前 TAT
+        hour_tat: 小时窗口当前 TAT
+        now: 当前时间戳
+        minute_interval: 分钟窗口发射间隔（60 / 每分钟额度）
+        hour_interval: 小时窗口发射间隔（3600 / 每小时额度）
+
+    Returns:
+        Tuple: (需要写回的新 TAT，被拒绝时为 None；检查结果)
+    """
+    minute_tat = max(minute_tat, now)
+    hour_tat = max(hour_tat, now)
+
+    new_minute_tat = minute_tat + minute_interval
+    if new_minute_tat - now > MINUTE_WINDOW + _EPSILON:
+        return None, GcraResult(
+            STATUS_MINUTE_EXCEEDED,
+            new_minute_tat - MINUTE_WINDOW - now,
+            0,
+            _remaining(hour_tat, HOUR_WINDOW, hour_interval, now),
+        )
+
+    new_hour_tat = hour_tat + hour_interval
+    if new_hour_tat - now > HOUR_WINDOW + _EPSILON:
+        return None, GcraResult(
+            STATUS_HOUR_EXCEEDED,
+            new_hour_tat - HOUR_WINDOW - now,
+            _remaining(minute_tat, MINUTE_WINDOW, minute_interval, now),
+            0,
+        )
+
+    return (new_minute_tat, new_hour_tat), GcraResult(
+        STATUS_OK,
+        0.0,
+        _remaining(new_minute_tat, MINUTE_WINDOW, minute_interval, now),
+        _remaining(new_hour_tat, HOUR_WINDOW, hour_interval, now),
+    )
+
+
+def gcra_peek(
+    minute_tat: float,
+    hour_tat: float,
+    now: float,
+    minute_interval: float,
+    hour_interval: float,
+) -> Tuple[int, int]:
+    """只读计算剩余额度，不消耗额度。"""
+    return (
+        _remaining(max(minute_tat, now), MINUTE_WINDOW, minute_interval, now),
+        _remaining(max(hour_tat, now), HOUR_WINDOW, hour_interval, now),
+    )
+
+
+class RateLimitStore(ABC):
+    """限流状态存储接口。"""
+
+    #: 是否为进程内 / 本机存储（可在同步代码中直接调用 ``hit_sync``）
+    is_local: bool = False
+
+    @abstractmethod
+    async def hit(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> GcraResult:
+        """原子地检查并记录一次请求。"""
+
+    @abstractmethod
+    async def peek(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> Tuple[int, int]:
+        """返回 (分钟剩余, 小时剩余)，不消耗额度。"""
+
+    def hit_sync(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> GcraResult:
+        raise NotImplementedError(f"{type(self).__name__} 不支持同步调用")
+
+    async def close(self) -> None:
+        """释放底层资源。"""
+
+    def __len__(self) -> int:
+        return 0
+
+
+class _Shard:
+    """内存存储分片：独立的锁与键表，减少锁竞争。"""
+
+    __slots__ = ("lock", "entries", "last_cleanup")
+
+    def __init__(self, now: float):
+        self.lock = threading.Lock()
+        # 存储：{key: (分钟窗口 TAT, 小时窗口 TAT)}
+        self.entries: Dict[str, Tuple[float, float]] = {}
+        self.last_cleanup = now
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    进程内分片存储。
+
+    键按哈希分布到多个分片，每个分片持有独立的锁，过期条目在分片内按需增量清理。
+    """
+
+    is_local = True
+
+    def __init__(self, shards: int = 64, cleanup_interval: float = 300):
+        self.cleanup_interval = cleanup_interval
+        now = time.time()
+        self._shards: List[_Shard] = [_Shard(now) for _ in range(max(1, shards))]
+
+    def _shard_for(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _cleanup_shard(self, shard: _Shard, now: float) -> None:
+        """移除 TAT 已过期的条目；过期条目与不存在等价，可安全删除。"""
+        expired = [
+            key for key, (minute_tat, hour_tat) in shard.entries.items()
+            if minute_tat <= now and hour_tat <= now
+        ]
+        for key in expired:
+            del shard.entries[key]
+        shard.last_cleanup = now
+        if expired:
+            logger.debug(f"已从限流器分片中清理 {len(expired)} 个陈旧的条目")
+
+    def hit_sync(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> GcraResult:
+        shard = self._shard_for(key)
+        with shard.lock:
+            if now - shard.last_cleanup > self.cleanup_interval:
+                self._cleanup_shard(shard, now)
+            minute_tat, hour_tat = shard.entries.get(key, (now, now))
+            new_tats, result = gcra_apply(minute_tat, hour_tat, now, minute_interval, hour_interval)
+            if new_tats is not None:
+                shard.entries[key] = new_tats
+            return result
+
+    async def hit(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> GcraResult:
+        return self.hit_sync(key, minute_interval, hour_interval, now)
+
+    async def peek(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> Tuple[int, int]:
+        shard = self._shard_for(key)
+        with shard.lock:
+            minute_tat, hour_tat = shard.entries.get(key, (now, now))
+        return gcra_peek(minute_tat, hour_tat, now, minute_interval, hour_interval)
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+
+class SharedMemoryRateLimitStore(RateLimitStore):
+    """
+    单机多进程共享的存储。
+
+    状态保存在 mmap 映射的文件中（建议放在 /dev/shm），按分片划分为若干开放寻址表，
+    每个槽位为 (键哈希, 分钟 TAT, 小时 TAT)。跨进程互斥使用 fcntl 字节区间锁，
+    进程内线程互斥使用分片 ``threading.Lock``。表满时淘汰最早过期的槽位。
+    """
+
+    is_local = True
+
+    _SLOT = struct.Struct("<Qdd")
+
+    def __init__(self, path: Optional[str] = None, slots: int = 65536, shards: int = 64):
+        if fcntl is None:
+            raise RuntimeError("共享内存限流存储需要 POSIX fcntl 支持")
+        self.path = path or os.path.join(tempfile.gettempdir(), "ipnft_rate_limit.shm")
+        self.shards = max(1, shards)
+        self.slots_per_shard = max(1, slots // self.shards)
+        self.size = self.slots_per_shard * self.shards * self._SLOT.size
+        self._thread_locks = [threading.Lock() for _ in range(self.shards)]
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._open_lock = threading.Lock()
+
+    def _ensure_open(self) -> mmap.mmap:
+        # 延迟打开，避免导入时产生文件副作用
+        if self._map is None:
+            with self._open_lock:
+                if self._map is None:
+                    fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                    if os.fstat(fd).st_size < self.size:
+                        os.ftruncate(fd, self.size)
+                    self._map = mmap.mmap(fd, self.size)
+                    self._fd = fd
+        return self._map
+
+    @staticmethod
+    def _hash_key(key: str) -> int:
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        return digest or 1  # 0 表示空槽位
+
+    def _locate(self, buf: mmap.mmap, key_hash: int, base: int, start: int, now: float) -> Tuple[int, bool]:
+        """返回 (槽位偏移, 是否已存在该键)。"""
+        reusable = -1
+        oldest_offset, oldest_tat = -1, float("inf")
+        for step in range(self.slots_per_shard):
+            offset = base + ((start + step) % self.slots_per_shard) * self._SLOT.size
+            slot_hash, minute_tat, hour_tat = self._SLOT.unpack_from(buf, offset)
+            if slot_hash == key_hash:
+                return offset, True
+            if slot_hash == 0:
+                return (reusable if reusable >= 0 else offset), False
+            expires_at = max(minute_tat, hour_tat)
+            if reusable < 0 and expires_at <= now:
+                reusable = offset
+            if expires_at < oldest_tat:
+                oldest_offset, oldest_tat = offset, expires_at
+        return (reusable if reusable >= 0 else oldest_offset), False
+
+    def _with_shard(self, key: str, fn):
+        buf = self._ensure_open()
+        key_hash = self._hash_key(key)
+        shard = key_hash % self.shards
+        base = shard * self.slots_per_shard * self._SLOT.size
+        start = (key_hash >> 16) % self.slots_per_shard
+        with self._thread_locks[shard]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, shard)
+            try:
+                return fn(buf, key_hash, base, start)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, shard)
+
+    def hit_sync(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> GcraResult:
+        def _hit(buf, key_hash, base, start):
+            offset, found = self._locate(buf, key_hash, base, start, now)
+            if found:
+                _, minute_tat, hour_tat = self._SLOT.unpack_from(buf, offset)
+            else:
+                minute_tat = hour_tat = now
+            new_tats, result = gcra_apply(minute_tat, hour_tat, now, minute_interval, hour_interval)
+            if new_tats is not None:
+                self._SLOT.pack_into(buf, offset, key_hash, *new_tats)
+            return result
+
+        return self._with_shard(key, _hit)
+
+    async def hit(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> GcraResult:
+        return self.hit_sync(key, minute_interval, hour_interval, now)
+
+    async def peek(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> Tuple[int, int]:
+        def _peek(buf, key_hash, base, start):
+            offset, found = self._locate(buf, key_hash, base, start, now)
+            if not found:
+                return now, now
+            _, minute_tat, hour_tat = self._SLOT.unpack_from(buf, offset)
+            return minute_tat, hour_tat
+
+        minute_tat, hour_tat = self._with_shard(key, _peek)
+        return gcra_peek(minute_tat, hour_tat, now, minute_interval, hour_interval)
+
+    async def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            os.close(self._fd)
+            self._map = None
+            self._fd = None
+
+    def __len__(self) -> int:
+        buf = self._ensure_open()
+        now = time.time()
+        count = 0
+        for offset in range(0, self.size, self._SLOT.size):
+            slot_hash, minute_tat, hour_tat = self._SLOT.unpack_from(buf, offset)
+            if slot_hash and max(minute_tat, hour_tat) > now:
+                count += 1
+        return count
+
+
+# KEYS[1]: 限流键；ARGV: 当前时间, 分钟发射间隔, 小时发射间隔
+_GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local mi = tonumber(ARGV[2])
+local hi = tonumber(ARGV[3])
+local eps = 1e-9
+local state = redis.call('HMGET', KEYS[1], 'm', 'h')
+local mt = tonumber(state[1]) or now
+local ht = tonumber(state[2]) or now
+if mt < now then mt = now end
+if ht < now then ht = now end
+local new_mt = mt + mi
+if new_mt - now > 60 + eps then
+  return {1, string.format('%.6f', new_mt - 60 - now), 0,
+          math.max(0, math.floor((3600 - (ht - now)) / hi + eps))}
+end
+local new_ht = ht + hi
+if new_ht - now > 3600 + eps then
+  return {2, string.format('%.6f', new_ht - 3600 - now),
+          math.max(0, math.floor((60 - (mt - now)) / mi + eps)), 0}
+end
+redis.call('HSET', KEYS[1], 'm', string.format('%.6f', new_mt), 'h', string.format('%.6f', new_ht))
+redis.call('PEXPIRE', KEYS[1], math.ceil((math.max(new_mt, new_ht) - now) * 1000))
+return {0, '0', math.max(0, math.floor((60 - (new_mt - now)) / mi + eps)),
+        math.max(0, math.floor((3600 - (new_ht - now)) / hi + eps))}
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    基于 Redis 的共享存储。
+
+    GCRA 在 Lua 脚本中原子执行，一次往返完成检查与写回；键在两个窗口都过期后自动删除。
+    时间戳由调用方传入，各实例需保持时钟同步。
+    """
+
+    def __init__(self, client=None, url: Optional[str] = None, prefix: str = "ratelimit:"):
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:  # pragma: no cover
+                raise RuntimeError("使用 Redis 限流存储需要安装 redis 包") from e
+            client = redis_asyncio.Redis.from_url(url or settings.RATE_LIMIT_REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_GCRA_LUA)
+
+    async def hit(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> GcraResult:
+        status, retry_after, minute_remaining, hour_remaining = await self._script(
+            keys=[self.prefix + key],
+            args=[repr(now), repr(minute_interval), repr(hour_interval)],
+        )
+        return GcraResult(int(status), float(retry_after), int(minute_remaining), int(hour_remaining))
+
+    async def peek(
+        self, key: str, minute_interval: float, hour_interval: float, now: float
+    ) -> Tuple[int, int]:
+        minute_tat, hour_tat = await self.client.hmget(self.prefix + key, "m", "h")
+        return gcra_peek(
+            float(minute_tat) if minute_tat is not None else now,
+            float(hour_tat) if hour_tat is not None else now,
+            now,
+            minute_interval,
+            hour_interval,
+        )
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close is not None:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+def create_rate_limit_store(backend: Optional[str] = None) -> RateLimitStore:
+    """
+    根据配置创建限流存储。
+
+    Args:
+        backend: memory / shared_memory / redis，默认读取 RATE_LIMIT_BACKEND
+
+    Returns:
+        RateLimitStore: 存储实例
+    """
+    backend = (backend or settings.RATE_LIMIT_BACKEND).lower()
+    if backend == "memory":
+        return MemoryRateLimitStore()
+    if backend == "shared_memory":
+        return SharedMemoryRateLimitStore(
+            path=settings.RATE_LIMIT_SHM_PATH or None,
+            slots=settings.RATE_LIMIT_SHM_SLOTS,
+        )
+    if backend == "redis":
+        return RedisRateLimitStore(url=settings.RATE_LIMIT_REDIS_URL)
+    raise ValueError(f"不支持的限流存储后端：{backend}")
@@ -1,180 +1,284 @@
 """用于 API 保护的限流中间件。"""
-import asyncio
+import math
 import time
 import logging
-from collections import defaultdict
-from typing import Dict, Tuple, Optional
-from fastapi import Request, HTTPException, status
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_REJECTIONS
+from app.core.rate_limit_store import (
+    HOUR_WINDOW,
+    MINUTE_WINDOW,
+    STATUS_HOUR_EXCEEDED,
+    STATUS_MINUTE_EXCEEDED,
+    STATUS_OK,
+    GcraResult,
+    MemoryRateLimitStore,
+    RateLimitStore,
+    create_rate_limit_store,
+)
 
 logger = logging.getLogger(__name__)
 
+_STATUS_MESSAGES = {
+    STATUS_MINUTE_EXCEEDED: "每分钟请求过多",
+    STATUS_HOUR_EXCEEDED: "每小时请求过多",
+}
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """一次限流检查的结果，附带本次检查后的剩余额度。"""
+
+    allowed: bool
+    message: str
+    retry_after: Optional[int]
+    minute_remaining: int
+    hour_remaining: int
+
 
 class RateLimiter:
-    """使用滑动窗口和内存清理的线程安全内存限流器。"""
+    """
+    基于 GCRA（通用信元速率算法）的限流器。
+
+    每个键只保存两个浮点数（分钟、小时窗口的理论到达时间 TAT），
+    单次检查为 O(1)，内存与请求量无关。状态保存在可插拔的 ``RateLimitStore`` 中，
+    默认使用进程内分片存储；共享存储通过 ``name`` 区分不同策略的键空间。
+    """
     
     def __init__(
         self,
         requests_per_minute: int = 120,
         requests_per_hour: int = 1000,
         cleanup_interval: int = 300,  # 每 5 分钟清理一次旧条目
+        shards: int = 64,
+        store: Optional[RateLimitStore] = None,
+        name: str = "default",
     ):
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
         self.cleanup_interval = cleanup_interval
-        # 存储：{ip: [(timestamp, count), ...]}
-        self._minute_requests: Dict[str, list] = defaultdict(list)
-        self._hour_requests: Dict[str, list] = defaultdict(list)
-        self._last_cleanup = time.time()
-        # 用于线程安全的异步锁
-        self._lock = asyncio.Lock()
-    
-    def _clean_old_requests(
-        self,
-        requests: list,
-        window_seconds: int,
-        current_time: float,
-    ) -> list:
-        """移除时间窗口外的请求。"""
-        cutoff = current_time - window_seconds
-        return [r for r in requests if r > cutoff]
-    
-    def _cleanup_old_ips(self, current_time: float) -> None:
-        """移除没有近期请求的 IP 条目以防止内存泄漏。"""
-        # 清理分钟请求
-        empty_ips = [
-            ip for ip, requests in self._minute_requests.items()
-            if not requests or all(r < current_time - 60 for r in requests)
-        ]
-        for ip in empty_ips:
-            del self._minute_requests[ip]
-        
-        # 清理小时请求
-        empty_ips = [
-            ip for ip, requests in self._hour_requests.items()
-            if not requests or all(r < current_time - 3600 for r in requests)
-        ]
-        for ip in empty_ips:
-            del self._hour_requests[ip]
-        
-        if empty_ips:
-            logger.debug(f"已从限流器中清理 {len(empty_ips)} 个陈旧的 IP 条目")
-    
+        self.name = name
+        if store is None:
+            store = MemoryRateLimitStore(shards=shards, cleanup_interval=cleanup_interval)
+        self.store = store
+        # 每个请求在各窗口中占用的时间（发射间隔）
+        self._minute_interval = MINUTE_WINDOW / requests_per_minute
+        self._hour_interval = HOUR_WINDOW / requests_per_hour
+        self._key_prefix = f"{name}:"
+
+    def _to_decision(self, result: GcraResult) -> RateLimitDecision:
+        if result.status == STATUS_OK:
+            return RateLimitDecision(True, "", None, result.minute_remaining, result.hour_remaining)
+        return RateLimitDecision(
+            False,
+            _STATUS_MESSAGES[result.status],
+            max(1, math.ceil(result.retry_after)),
+            result.minute_remaining,
+            result.hour_remaining,
+        )
+
+    def check(self, client_ip: str, current_time: Optional[float] = None) -> RateLimitDecision:
+        """
+        同步检查并记录一次请求，同时返回剩余额度（仅限本机存储）。
+
+        Args:
+            client_ip: 客户端标识
+            current_time: 当前时间戳（便于测试，默认取系统时间）
+
+        Returns:
+            RateLimitDecision: 限流检查结果
+        """
+        if current_time is None:
+            current_time = time.time()
+        result = self.store.hit_sync(
+            self._key_prefix + client_ip, self._minute_interval, self._hour_interval, current_time
+        )
+        return self._to_decision(result)
+
+    async def acquire(self, client_ip: str, current_time: Optional[float] = None) -> RateLimitDecision:
+        """
+        检查并记录一次请求，同时返回剩余额度（适用于所有存储后端）。
+
+        Args:
+            client_ip: 客户端标识
+            current_time: 当前时间戳（便于测试，默认取系统时间）
+
+        Returns:
+            RateLimitDecision: 限流检查结果
+        """
+        if current_time is None:
+            current_time = time.time()
+        result = await self.store.hit(
+            self._key_prefix + client_ip, self._minute_interval, self._hour_interval, current_time
+        )
+        return self._to_decision(result)
+
     async def is_allowed(self, client_ip: str) -> Tuple[bool, str, Optional[int]]:
         """
         检查给定 IP 的请求是否被允许。
         返回：(是否允许, 消息, 重试等待秒数)
         """
-        async with self._lock:
-            current_time = time.time()
-            
-            # 定期清理旧的 IP 条目以防止内存泄漏
-            if current_time - self._last_cleanup > self.cleanup_interval:
-                self._cleanup_old_ips(current_time)
-                self._last_cleanup = current_time
-            
-            # 清理并检查分钟窗口
-            self._minute_requests[client_ip] = self._clean_old_requests(
-                self._minute_requests[client_ip], 60, current_time
-            )
-            if len(self._minute_requests[client_ip]) >= self.requests_per_minute:
-                # 计算重试等待时间
-                oldest_request = min(self._minute_requests[client_ip])
-                retry_after = int(oldest_request + 60 - current_time) + 1
-                return False, "每分钟请求过多", max(1, retry_after)
-            
-            # 清理并检查小时窗口
-            self._hour_requests[client_ip] = self._clean_old_requests(
-                self._hour_requests[client_ip], 3600, current_time
-            )
-            if len(self._hour_requests[client_ip]) >= self.requests_per_hour:
-                oldest_request = min(self._hour_requests[client_ip])
-                retry_after = int(oldest_request + 3600 - current_time) + 1
-                return False, "每小时请求过多", max(1, retry_after)
-            
-            # 记录请求
-            self._minute_requests[client_ip].append(current_time)
-            self._hour_requests[client_ip].append(current_time)
-            
-            return True, "", None
+        decision = await self.acquire(client_ip)
+        return decision.allowed, decision.message, decision.retry_after
     
     async def get_remaining(self, client_ip: str) -> Dict[str, int]:
-        """获取客户端的剩余请求数。"""
-        async with self._lock:
-            current_time = time.time()
-            
-            minute_requests = self._clean_old_requests(
-                self._minute_requests.get(client_ip, []), 60, current_time
-            )
-            hour_requests = self._clean_old_requests(
-                self._hour_requests.get(client_ip, []), 3600, current_time
+        """获取客户端的剩余请求数（不消耗额度）。"""
+        minute_remaining, hour_remaining = await self.store.peek(
+            self._key_prefix + client_ip, self._minute_interval, self._hour_interval, time.time()
+        )
+        return {"minute_remaining": minute_remaining, "hour_remaining": hour_remaining}
+
+    def __len__(self) -> int:
+        """当前跟踪的键数量。"""
+        return len(self.store)
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """按路径前缀匹配的限流策略。"""
+
+    name: str
+    path_prefix: str
+    requests_per_minute: int
+    requests_per_hour: int
+
+
+def load_route_policies() -> List[RateLimitPolicy]:
+    """从配置 RATE_LIMIT_ROUTE_POLICIES 读取路由限流策略。"""
+    policies = []
+    for prefix, (per_minute, per_hour) in settings.RATE_LIMIT_ROUTE_POLICIES.items():
+        name = prefix.strip("/").replace("/", "_") or "root"
+        policies.append(RateLimitPolicy(name, prefix, int(per_minute), int(per_hour)))
+    return policies
+
+
+class RateLimitPolicyRegistry:
+    """按最长路径前缀为请求选择限流器。"""
+
+    def __init__(self, default: RateLimiter, routes: Optional[List[Tuple[str, RateLimiter]]] = None):
+        self.default = default
+        self.routes = sorted(routes or [], key=lambda item: len(item[0]), reverse=True)
+
+    @classmethod
+    def from_policies(
+        cls,
+        default: RateLimiter,
+        policies: List[RateLimitPolicy],
+        store: Optional[RateLimitStore] = None,
+    ) -> "RateLimitPolicyRegistry":
+        routes = [
+            (
+                policy.path_prefix,
+                RateLimiter(
+                    requests_per_minute=policy.requests_per_minute,
+                    requests_per_hour=policy.requests_per_hour,
+                    store=store,
+                    name=policy.name,
+                ),
             )
-            
-            return {
-                "minute_remaining": max(0, self.requests_per_minute - len(minute_requests)),
-                "hour_remaining": max(0, self.requests_per_hour - len(hour_requests)),
-            }
+            for policy in policies
+        ]
+        return cls(default, routes)
 
+    def resolve(self, path: str) -> RateLimiter:
+        for prefix, limiter in self.routes:
+            if path.startswith(prefix):
+                return limiter
+        return self.default
+
+
+# 所有策略共享同一个存储，键按策略名隔离
+rate_limit_store = create_rate_limit_store()
 
 # 全局限流器实例
-rate_limiter = RateLimiter()
+rate_limiter = RateLimiter(
+    requests_per_minute=settings.RATE_LIMIT_PER_MINUTE,
+    requests_per_hour=settings.RATE_LIMIT_PER_HOUR,
+    store=rate_limit_store,
+)
+
+policy_registry = RateLimitPolicyRegistry.from_policies(
+    rate_limiter, load_route_policies(), store=rate_limit_store
+)
 
 # 针对认证端点的更严格限流器
-auth_rate_limiter = RateLimiter(requests_per_minute=120, requests_per_hour=1200)
+auth_rate_limiter = policy_registry.resolve("/api/v1/auth")
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """应用限流并正确处理错误的中间件。"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # 更好地获取客户端 IP
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            # 获取链中的第一个 IP（原始客户端）
-            client_ip = forwarded.split(",")[0].strip()
-        elif request.client:
-            client_ip = request.client.host
-        else:
-            # 为未知客户端生成临时标识符
-            # 这可以防止所有未知客户端共享相同的限制
-            client_ip = f"unknown_{id(request)}"
-        
-        # 对认证端点使用更严格的限制
-        path = request.url.path
-        if path.startswith("/api/v1/auth"):
-            limiter = auth_rate_limiter
-        else:
-            limiter = rate_limiter
-        
-        # 检查限流
+def get_client_ip(scope: Scope) -> str:
+    """从 ASGI scope 中解析客户端 IP。"""
+    forwarded = Headers(scope=scope).get("X-Forwarded-For")
+    if forwarded:
+        # 获取链中的第一个 IP（原始客户端）
+        return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    if client:
+        return client[0]
+    # 为未知客户端生成临时标识符
+    # 这可以防止所有未知客户端共享相同的限制
+    return f"unknown_{id(scope)}"
+
+
+class RateLimitMiddleware:
+    """
+    应用限流的纯 ASGI 中间件。
+
+    只在 ``http.response.start`` 上追加限流响应头，不包装请求体和响应体，
+    流式响应与背压不受影响。
+    """
+
+    def __init__(self, app: ASGIApp, registry: Optional[RateLimitPolicyRegistry] = None):
+        self.app = app
+        self.registry = registry or policy_registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client_ip = get_client_ip(scope)
+        # 按路由策略选择限流器
+        limiter = self.registry.resolve(scope["path"])
+
+        # 检查限流（一次调用同时得到剩余额度）
         try:
-            allowed, message, retry_after = await limiter.is_allowed(client_ip)
+            decision = await limiter.acquire(client_ip)
         except Exception as e:
             logger.error(f"限流器错误：{e}")
             # 失败开放 - 如果限流器失败则允许请求
-            allowed = True
-            message = ""
-            retry_after = None
-        
-        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        if not decision.allowed:
+            if settings.METRICS_ENABLED:
+                RATE_LIMIT_REJECTIONS.labels(limiter.name).inc()
             headers = {}
-            if retry_after:
-                headers["Retry-After"] = str(retry_after)
-            
-            return JSONResponse(
+            if decision.retry_after:
+                headers["Retry-After"] = str(decision.retry_after)
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                content={"detail": {"message": message, "code": "RATE_LIMIT_EXCEEDED"}},
+                content={"detail": {"message": decision.message, "code": "RATE_LIMIT_EXCEEDED"}},
                 headers=headers,
             )
-        
-        # 添加限流响应头
-        try:
-            response = await call_next(request)
-            remaining = await limiter.get_remaining(client_ip)
-            response.headers["X-RateLimit-Remaining-Minute"] = str(remaining["minute_remaining"])
-            response.headers["X-RateLimit-Remaining-Hour"] = str(remaining["hour_remaining"])
-            return response
-        except Exception as e:
-            # 如果异常已经被处理（如验证错误），直接抛出
-            raise
+            await response(scope, receive, send)
+            return
+
+        minute_remaining = str(decision.minute_remaining)
+        hour_remaining = str(decision.hour_remaining)
+
+        async def send_with_headers(message: Message) -> None:
+            # 添加限流响应头
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                headers = MutableHeaders(scope=message)
+                headers.append("X-RateLimit-Remaining-Minute", minute_remaining)
+                headers.append("X-RateLimit-Remaining-Hour", hour_remaining)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,162 @@
+"""启动就绪状态与后台预热。
+
+应用启动只做必要的工作（结构版本校验、启动后台任务），随即开始接受请求；
+连接池与外部客户端在后台预热，预热完成前 ``/health/ready`` 返回 503，
+负载均衡据此推迟向新实例分发流量。
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+OK = "ok"
+DEGRADED = "degraded"
+FAILED = "failed"
+
+
+class ReadinessState:
+    """记录各组件的预热状态。"""
+
+    def __init__(self):
+        self.components: Dict[str, str] = {}
+        self.durations_ms: Dict[str, float] = {}
+        self.required: set = set()
+        self.started_at = time.monotonic()
+        self.ready_after_ms: Optional[float] = None
+
+    def reset(self) -> None:
+        """重置状态（每次应用启动时调用）。"""
+        self.__init__()
+
+    def register(self, name: str, required: bool = False) -> None:
+        """
+        登记一个待预热的组件。
+
+        Args:
+            name: 组件名
+            required: 是否为就绪的必要条件（可选组件失败时只标记为 degraded）
+        """
+        self.components[name] = PENDING
+        if required:
+            self.required.add(name)
+
+    def mark(self, name: str, status: str, duration_ms: Optional[float] = None) -> None:
+        """更新组件状态。"""
+        self.components[name] = status
+        if duration_ms is not None:
+            self.durations_ms[name] = round(duration_ms, 1)
+        if self.ready_after_ms is None and self.is_ready:
+            self.ready_after_ms = round((time.monotonic() - self.started_at) * 1000, 1)
+
+    @property
+    def is_ready(self) -> bool:
+        """所有组件都已完成预热，且必要组件没有失败。"""
+        if any(status == PENDING for status in self.components.values()):
+            return False
+        return all(self.components.get(name) == OK for name in self.required)
+
+    def snapshot(self) -> dict:
+        """返回可直接序列化的状态快照。"""
+        return {
+            "ready": self.is_ready,
+            "components": dict(self.components),
+            "durations_ms": dict(self.durations_ms),
+            "ready_after_ms": self.ready_after_ms,
+        }
+
+
+async def _run_step(state: ReadinessState, name: str, step: Callable[[], Awaitable[bool]]) -> None:
+    started = time.perf_counter()
+    try:
+        ok = await step()
+        status = OK if ok else (FAILED if name in state.required else DEGRADED)
+    except Exception as exc:
+        logger.warning(f"组件 {name} 预热失败：{exc}")
+        status = FAILED if name in state.required else DEGRADED
+    state.mark(name, status, (time.perf_counter() - started) * 1000)
+
+
+async def _warm_up_database() -> bool:
+    from app.core.database import engine, read_engine, warm_up_pool
+
+    count = settings.DB_POOL_WARMUP_CONNECTIONS
+    opened = await warm_up_pool(count)
+    if read_engine is not engine:
+        opened += await warm_up_pool(count, bind=read_engine)
+        count *= 2
+    return opened == count
+
+
+async def _warm_up_wallet() -> bool:
+    from app.core import wallet
+
+    await asyncio.to_thread(wallet.warm_up)
+    return True
+
+
+async def _warm_up_blockchain() -> bool:
+    from app.core.blockchain import warm_up_blockchain_client
+
+    return await asyncio.to_thread(warm_up_blockchain_client) is not None
+
+
+async def _warm_up_pinata() -> bool:
+    from app.services.pinata_service import get_pinata_service
+
+    await asyncio.to_thread(get_pinata_service)
+    return True
+
+
+def default_steps() -> Dict[str, Callable[[], Awaitable[bool]]]:
+    """默认的预热步骤：组件名 -> 预热函数。"""
+    steps = {
+        "database": _warm_up_database,
+        "wallet": _warm_up_wallet,
+        "pinata": _warm_up_pinata,
+    }
+    if settings.STARTUP_WARMUP_BLOCKCHAIN:
+        steps["blockchain"] = _warm_up_blockchain
+    return steps
+
+
+async def warm_up(
+    state: ReadinessState,
+    steps: Optional[Dict[str, Callable[[], Awaitable[bool]]]] = None,
+) -> None:
+    """
+    并发执行各预热步骤并更新就绪状态。
+
+    Args:
+        state: 就绪状态
+        steps: 预热步骤，默认为 ``default_steps()``
+    """
+    steps = steps if steps is not None else default_steps()
+    for name in steps:
+        state.register(name, required=(name == "database"))
+    await asyncio.gather(*(_run_step(state, name, step) for name, step in steps.items()))
+    logger.info(f"启动预热完成：{state.snapshot()}")
+
+
+def start_warm_up(
+    state: ReadinessState,
+    steps: Optional[Dict[str, Callable[[], Awaitable[bool]]]] = None,
+) -> asyncio.Task:
+    """
+    在后台启动预热任务；组件在返回前即登记为 pending，保证任务运行前实例不会被判定为就绪。
+
+    Returns:
+        asyncio.Task: 预热任务
+    """
+    steps = steps if steps is not None else default_steps()
+    for name in steps:
+        state.register(name, required=(name == "database"))
+    return asyncio.create_task(warm_up(state, steps), name="startup-warm-up")
+
+
+# 全局就绪状态
+readiness = ReadinessState()
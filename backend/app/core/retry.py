@@ -0,0 +1,156 @@
+"""后台任务使用的重试退避与熔断器工具。"""
+import random
+import time
+import threading
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def compute_backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    rng: Optional[random.Random] = None,
+) -> float:
+    """
+    计算带完全抖动（full jitter）的指数退避时间。
+
+    第 n 次失败后的等待时间在 [0, min(max_delay, base_delay * 2^(n-1))] 内均匀分布，
+    避免大量任务在同一时刻集中重试。
+
+    Args:
+        attempt: 已失败次数（从 1 开始）
+        base_delay: 基础等待秒数
+        max_delay: 等待时间上限
+        rng: 可选的随机数生成器（便于测试）
+
+    Returns:
+        float: 等待秒数
+    """
+    exponent = max(0, attempt - 1)
+    # 限制指数，防止大次数时浮点溢出
+    ceiling = min(max_delay, base_delay * (2 ** min(exponent, 32)))
+    return (rng or random).uniform(0, ceiling)
+
+
+class CircuitOpenError(Exception):
+    """当熔断器处于打开状态时抛出。"""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"熔断器 {name} 已打开，{retry_after:.1f} 秒后重试")
+
+
+class CircuitBreaker:
+    """
+    简单的三态熔断器（关闭 / 打开 / 半开）。
+
+    连续失败达到阈值后打开，在 reset_timeout 内拒绝调用；
+    超时后进入半开状态，只放行一个探测调用，成功则关闭，失败则重新打开；
+    每次 ``allow()`` 放行的调用都须以 ``record_success``、``record_failure`` 或 ``release`` 结束。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """当前状态（会根据时间推进打开 → 半开）。"""
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def _advance(self, now: float) -> None:
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        """距离允许下一次尝试的剩余秒数。"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """判断当前是否允许发起调用。"""
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """记录一次成功调用。"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"熔断器 {self.name} 已恢复")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """
+        结束一次未记录结果的调用。
+
+        调用方在 ``allow()`` 之后因与服务商无关的原因（如本地文件丢失、请求被确定性拒绝）放弃时调用，
+        释放半开状态下的探测名额；已记录成功或失败时调用无副作用。
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """记录一次失败调用。"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"熔断器 {self.name} 已打开，连续失败 {self._failures} 次")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    name: str,
+    failure_threshold: int = 5,
+    reset_timeout: float = 60.0,
+) -> CircuitBreaker:
+    """
+    获取（或创建）按名称共享的熔断器实例。
+
+    Args:
+        name: 熔断器名称（通常是服务商名）
+        failure_threshold: 打开熔断器的连续失败次数
+        reset_timeout: 打开状态持续秒数
+
+    Returns:
+        CircuitBreaker: 熔断器实例
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+            _breakers[name] = breaker
+        return breaker
@@ -1,10 +1,13 @@
 import uuid
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Iterable, Optional, Dict
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Dict, Tuple
 import bcrypt
-from jose import jwt, JWTError
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
 from passlib.context import CryptContext
+from app.core.auth_cache import verified_token_cache
 from app.core.config import settings
 
 # 密码哈希上下文
@@ -14,6 +17,16 @@ pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 ALLOWED_ALGORITHMS = ["HS256", "HS384", "HS512"]
 
 
+@lru_cache(maxsize=8)
+def _build_signing_key(secret: str, algorithm: str) -> Key:
+    return jwk.construct(secret, algorithm)
+
+
+def get_signing_key() -> Key:
+    """获取预先构造的 JWT 签名密钥对象（按当前密钥与算法缓存）。"""
+    return _build_signing_key(settings.SECRET_KEY, settings.ALGORITHM)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证明文密码与哈希密码是否匹配。"""
     try:
@@ -45,6 +58,30 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """判断哈希是否为旧版 bcrypt 或参数已过时，需要重新哈希。"""
+    if hashed_password.startswith("$2"):
+        return True
+    try:
+        return pwd_context.needs_update(hashed_password)
+    except ValueError:
+        return False
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    验证密码，并在哈希方案过时时顺便生成新哈希。
+
+    Returns:
+        Tuple[bool, Optional[str]]: (是否匹配, 需要回写的新哈希；无需更新时为 None)
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if password_needs_rehash(hashed_password):
+        return True, get_password_hash(plain_password)
+    return True, None
+
+
 def create_access_token(
     data: Dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -61,14 +98,14 @@ def create_access_token(
     # 添加安全声明
     to_encode.update({
         "exp": expire,
-        "iat": now,  # 签发时间
+        "iat": now.timestamp(),  # 签发时间（保留小数，与撤销水位线精确比较）
         "jti": str(uuid.uuid4()),  # JWT ID，用于令牌撤销
         "type": "access"
     })
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
+        get_signing_key(),
         algorithm=settings.ALGORITHM
     )
     return encoded_jwt
@@ -90,7 +127,7 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
+        get_signing_key(),
         algorithm=settings.ALGORITHM
     )
     return encoded_jwt
@@ -109,7 +146,7 @@ def decode_token(
             
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
+            get_signing_key(),
             algorithms=[settings.ALGORITHM],
             options={"require": list(require_claims)},
         )
@@ -123,3 +160,24 @@ def decode_token(
         return None
         
     return payload
+
+
+def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    验证访问令牌，命中已验签缓存时跳过解析与 HMAC 校验。
+
+    缓存以令牌摘要为键，条目在令牌 exp 到期后失效。
+
+    Args:
+        token: 原始访问令牌
+
+    Returns:
+        Optional[Dict[str, Any]]: 令牌载荷；无效时返回 None
+    """
+    payload = verified_token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = decode_token(token, expected_type="access")
+    if payload is not None:
+        verified_token_cache.put(token, payload)
+    return payload
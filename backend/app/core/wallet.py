@@ -0,0 +1,50 @@
+"""钱包签名校验工具。
+
+eth_account / web3 导入耗时约 1 秒，这里在首次使用时才导入，避免拖慢应用启动；
+应用启动后的预热阶段会调用 ``warm_up`` 提前完成导入，首个钱包登录请求不再承担这部分开销。
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def recover_message_signer(message: str, signature: str) -> str:
+    """
+    按 EIP-191 personal_sign 格式从签名恢复签名者地址。
+
+    Args:
+        message: 签名的原始消息
+        signature: 签名（十六进制字符串）
+
+    Returns:
+        str: 签名者地址（校验和格式）
+    """
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+
+    return Account.recover_message(encode_defunct(text=message), signature=signature)
+
+
+def verify_wallet_signature(wallet_address: str, signature: str, message: str) -> bool:
+    """
+    校验消息是否由指定钱包地址签名。
+
+    Args:
+        wallet_address: 钱包地址
+        signature: 钱包签名
+        message: 签名的原始消息
+
+    Returns:
+        bool: 签名是否有效
+    """
+    try:
+        return recover_message_signer(message, signature).lower() == wallet_address.lower()
+    except Exception:
+        return False
+
+
+def warm_up() -> None:
+    """提前导入签名校验依赖（在线程中调用）。"""
+    import eth_account.messages  # noqa: F401
+
+    logger.debug("钱包签名依赖已加载")
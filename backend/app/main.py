@@ -1,21 +1,62 @@
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.cache import cache_service
 from app.core.config import settings
-from app.core.database import init_db
-from app.core.rate_limiter import RateLimitMiddleware
+from app.core.database import prepare_database
+from app.core.events import event_bus
+from app.core.metrics import mark_process_dead, render_metrics
+from app.core.middleware import RequestIdMiddleware, TimingMiddleware
+from app.core.password_hasher import password_hasher
+from app.core.rate_limiter import RateLimitMiddleware, rate_limit_store
+from app.core.readiness import readiness, start_warm_up
 from app.core.handlers import register_exception_handlers
+from app.api.deps import get_current_superuser
 from app.api.v1.router import api_router
+from app.services.asset_import_service import asset_import_worker
+from app.services.email_outbox_service import email_worker
+from app.services.email_service import email_service
+from app.services.maintenance_service import maintenance_scheduler
+from app.services.upload_queue_service import upload_worker
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
-    await init_db()
+    readiness.reset()
+    await prepare_database()
+    if settings.UPLOAD_WORKER_ENABLED:
+        upload_worker.start()
+    if settings.MAINTENANCE_ENABLED:
+        maintenance_scheduler.start()
+    if settings.EMAIL_WORKER_ENABLED:
+        email_worker.start()
+    if settings.IMPORT_WORKER_ENABLED:
+        asset_import_worker.start()
+    if settings.EVENTS_ENABLED:
+        event_bus.start()
+    warm_up_task = None
+    if settings.STARTUP_WARMUP_ENABLED:
+        warm_up_task = start_warm_up(readiness)
     yield
     # Shutdown
-    pass
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warm_up_task
+    await event_bus.stop()
+    await asset_import_worker.stop()
+    await email_worker.stop()
+    await email_service.close()
+    await maintenance_scheduler.stop()
+    await upload_worker.stop()
+    await rate_limit_store.close()
+    await cache_service.close()
+    password_hasher.shutdown()
+    mark_process_dead()
 
 
 def create_app() -> FastAPI:
@@ -43,6 +84,10 @@ def create_app() -> FastAPI:
     # Add rate limiting middleware
     app.add_middleware(RateLimitMiddleware)
     
+    # Add timing and request id middleware (outermost, so 429 responses carry them too)
+    app.add_middleware(TimingMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+    
     # Register exception handlers
     register_exception_handlers(app)
     
@@ -53,6 +98,34 @@ def create_app() -> FastAPI:
     async def health_check():
         """Health check endpoint."""
         return {"status": "healthy", "version": settings.APP_VERSION}
+
+    @app.get("/health/ready")
+    async def readiness_check():
+        """Readiness probe: 503 until connection pools and clients are warmed up."""
+        snapshot = readiness.snapshot()
+        return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+    @app.get("/health/maintenance", dependencies=[Depends(get_current_superuser)])
+    async def maintenance_stats():
+        """Per-job run statistics of the background maintenance scheduler."""
+        return {"owner": maintenance_scheduler.owner, "jobs": maintenance_scheduler.get_stats()}
+
+    @app.get("/health/events", dependencies=[Depends(get_current_superuser)])
+    async def event_stats():
+        """Push connections and event counters of this worker."""
+        return event_bus.get_stats()
+
+    @app.get("/health/cache", dependencies=[Depends(get_current_superuser)])
+    async def cache_stats():
+        """Application cache hit rates of this worker, per namespace."""
+        return cache_service.get_stats()
+
+    if settings.METRICS_ENABLED:
+        @app.get(settings.METRICS_PATH, include_in_schema=False)
+        async def metrics():
+            """Prometheus metrics (aggregated across workers in multiprocess mode)."""
+            body, content_type = render_metrics()
+            return Response(body, media_type=content_type)
     
     return app
 
@@ -4,16 +4,23 @@ from app.models.refresh_token import RefreshToken
 from app.models.password_reset_token import PasswordResetToken
 from app.models.email_verification_token import EmailVerificationToken
 from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
-from app.models.asset import Asset, Attachment, AssetType, LegalStatus, AssetStatus
+from app.models.asset import Asset, Attachment, AssetType, LegalStatus, AssetStatus, AttachmentUploadStatus
 from app.models.approval import (
     Approval, 
     ApprovalProcess, 
     ApprovalNotification,
+    ApprovalCounter,
     ApprovalType,
     ApprovalStatus,
     ApprovalAction,
 )
 from app.models.ownership import NFTTransferRecord, OwnershipStatus, TransferType, TransferStatus
+from app.models.upload_task import UploadTask, UploadTaskStatus
+from app.models.token_revocation import RevokedAccessToken, UserTokenWatermark
+from app.models.job_lock import JobLock
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.models.dashboard import AssetCountRollup, TransferDailyRollup, ApprovalBacklogRollup
+from app.models.asset_import import AssetImportJob, AssetImportError, AssetImportStatus
 
 __all__ = [
     "User",
@@ -28,9 +35,11 @@ __all__ = [
     "AssetType",
     "LegalStatus",
     "AssetStatus",
+    "AttachmentUploadStatus",
     "Approval",
     "ApprovalProcess",
     "ApprovalNotification",
+    "ApprovalCounter",
     "ApprovalType",
     "ApprovalStatus",
     "ApprovalAction",
@@ -38,4 +47,17 @@ __all__ = [
     "OwnershipStatus",
     "TransferType",
     "TransferStatus",
+    "UploadTask",
+    "UploadTaskStatus",
+    "RevokedAccessToken",
+    "UserTokenWatermark",
+    "JobLock",
+    "EmailOutbox",
+    "EmailOutboxStatus",
+    "AssetCountRollup",
+    "TransferDailyRollup",
+    "ApprovalBacklogRollup",
+    "AssetImportJob",
+    "AssetImportError",
+    "AssetImportStatus",
 ]
@@ -418,6 +418,7 @@ class ApprovalNotification(Base):
         Index("ix_approval_notifications_is_read", "is_read"),
         Index("ix_approval_notifications_created_at", "created_at"),
         Index("ix_approval_notifications_recipient_read", "recipient_id", "is_read"),
+        Index("ix_approval_notifications_read_at", "read_at"),
     )
     
     def __repr__(self) -> str:
@@ -428,3 +429,48 @@ class ApprovalNotification(Base):
             str: 包含通知 ID、接收人 ID 和类型的格式化字符串。
         """
         return f"<ApprovalNotification(id={self.id}, recipient_id={self.recipient_id}, type={self.type})>"
+
+
+class ApprovalCounter(Base):
+    """
+    审批计数模型。
+    
+    按 (状态, 类型) 维护审批数量，与审批的创建和状态流转在同一事务内增量更新，
+    统计接口只读取这张最多 状态数 × 类型数 行的小表，耗时与审批总量无关。
+    级联删除等绕过服务层的变更由维护任务定期按 GROUP BY 重算纠正。
+    """
+    
+    __tablename__ = "approval_counters"
+    
+    status: Mapped[ApprovalStatus] = mapped_column(
+        SQLEnum(ApprovalStatus),
+        primary_key=True,
+        comment="审批状态",
+    )
+    type: Mapped[ApprovalType] = mapped_column(
+        SQLEnum(ApprovalType),
+        primary_key=True,
+        comment="审批类型",
+    )
+    count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="审批数量",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="更新时间",
+    )
+    
+    def __repr__(self) -> str:
+        """
+        返回计数对象的字符串表示形式。
+        
+        Returns:
+            str: 包含状态、类型和数量的格式化字符串。
+        """
+        return f"<ApprovalCounter(status={self.status}, type={self.type}, count={self.count})>"
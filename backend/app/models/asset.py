@@ -3,7 +3,7 @@ from datetime import datetime, date, timezone
 from enum import Enum
 from typing import Optional, List, TYPE_CHECKING
 from sqlalchemy import String, DateTime, ForeignKey, Enum as SQLEnum, Index, Text, Date, BigInteger, JSON, Boolean
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -14,6 +14,26 @@ if TYPE_CHECKING:
     from app.models.enterprise import Enterprise
     from app.models.asset import MintRecord
 
+# token_id 列为 BIGINT（有符号 64 位）
+MAX_TOKEN_ID = 2**63 - 1
+
+
+def parse_token_id(raw: Optional[str]) -> Optional[int]:
+    """
+    把链上返回的 Token ID 字符串解析为整数。
+    
+    Args:
+        raw: Token ID 字符串
+        
+    Returns:
+        Optional[int]: 正整数 Token ID；为空、非十进制整数或超出 BIGINT 范围时返回 None
+    """
+    raw = (raw or "").strip()
+    if not raw.isdigit() or not raw.isascii():
+        return None
+    token_id = int(raw)
+    return token_id if 0 < token_id <= MAX_TOKEN_ID else None
+
 
 class AssetType(str, Enum):
     """
@@ -76,6 +96,20 @@ class AssetStatus(str, Enum):
     MINT_FAILED = "MINT_FAILED"
 
 
+class AttachmentUploadStatus(str, Enum):
+    """
+    附件上传状态枚举。
+    
+    定义附件文件在 IPFS 上的上传状态：
+    - PENDING_UPLOAD: 已暂存到本地，等待后台上传
+    - UPLOADED: 已上传到 IPFS
+    - FAILED: 重试耗尽，上传失败
+    """
+    PENDING_UPLOAD = "PENDING_UPLOAD"
+    UPLOADED = "UPLOADED"
+    FAILED = "FAILED"
+
+
 class Asset(Base):
     """
     IP 资产模型。
@@ -187,9 +221,13 @@ class Asset(Base):
     nft_token_id: Mapped[Optional[str]] = mapped_column(
         String(100),
         nullable=True,
-        index=True,
         comment="NFT Token ID",
     )
+    token_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="NFT Token ID（整数，随 nft_token_id 写入；按 Token 查询走此列）",
+    )
     nft_contract_address: Mapped[Optional[str]] = mapped_column(
         String(42),
         nullable=True,
@@ -386,8 +424,18 @@ class Asset(Base):
         Index("ix_assets_enterprise_status", "enterprise_id", "status"),
         Index("ix_assets_type_status", "type", "status"),
         Index("ix_assets_created_at", "created_at"),
+        # 企业资产列表与导出按创建时间倒序，反向扫描即可按序输出，无需排序
+        Index("ix_assets_enterprise_created", "enterprise_id", "created_at", "id"),
+        # 同一合约内 Token 唯一；token_id 在前，只按 Token ID 查询（不带合约地址）也能走索引
+        Index("ux_assets_token_contract", "token_id", "nft_contract_address", unique=True),
     )
     
+    @validates("nft_token_id")
+    def _sync_token_id(self, key: str, value: Optional[str]) -> Optional[str]:
+        """写入 nft_token_id 时同步整数列 token_id。"""
+        self.token_id = parse_token_id(value)
+        return value
+    
     def __repr__(self) -> str:
         """
         返回资产对象的字符串表示形式。
@@ -443,12 +491,18 @@ class Attachment(Base):
     )
     
     # IPFS 信息
-    ipfs_cid: Mapped[str] = mapped_column(
+    ipfs_cid: Mapped[Optional[str]] = mapped_column(
         String(100),
-        nullable=False,
-        unique=True,
+        nullable=True,
         index=True,
-        comment="IPFS 内容标识符（CID）",
+        comment="IPFS 内容标识符（CID），后台上传完成前为空；内容相同的附件共用同一 CID",
+    )
+    upload_status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=AttachmentUploadStatus.UPLOADED,
+        server_default=AttachmentUploadStatus.UPLOADED.value,
+        comment="上传状态: PENDING_UPLOAD/UPLOADED/FAILED",
     )
     is_primary: Mapped[bool] = mapped_column(
         Boolean,
@@ -0,0 +1,179 @@
+"""资产批量导入数据库模型。"""
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from sqlalchemy import String, DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+
+class AssetImportStatus(str, Enum):
+    """
+    导入任务状态枚举。
+
+    - PENDING: 等待后台工作进程处理
+    - RUNNING: 已被某个工作进程领取（租约过期后可被其他进程接管并续跑）
+    - COMPLETED: 全部行处理完毕（单行失败记录在错误表中，不影响其他行）
+    - FAILED: 清单或压缩包无法读取，整个任务失败
+    """
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class AssetImportJob(Base):
+    """
+    资产批量导入任务模型。
+
+    上传的清单（CSV / JSON）与附件压缩包（zip / tar）先暂存到本地，由后台工作进程
+    分批校验并批量写入资产、附件与上传任务。每批与进度在同一事务中提交，
+    进程重启后从 ``processed_rows`` 处续跑。
+    """
+
+    __tablename__ = "asset_import_jobs"
+
+    # 主键
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        comment="导入任务唯一标识符",
+    )
+
+    # 归属
+    enterprise_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("enterprises.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="导入到的企业 ID",
+    )
+    created_by: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="发起导入的用户 ID（导入资产的创建者）",
+    )
+
+    # 暂存文件
+    manifest_format: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+        comment="清单格式: csv/json",
+    )
+    manifest_path: Mapped[str] = mapped_column(
+        String(500),
+        nullable=False,
+        comment="清单暂存路径",
+    )
+    archive_path: Mapped[Optional[str]] = mapped_column(
+        String(500),
+        nullable=True,
+        comment="附件压缩包暂存路径",
+    )
+
+    # 状态与进度
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=AssetImportStatus.PENDING,
+        comment="任务状态: PENDING/RUNNING/COMPLETED/FAILED",
+    )
+    total_rows: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="清单总行数（开始处理后填写）",
+    )
+    processed_rows: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="已处理行数（续跑起点）",
+    )
+    imported_rows: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="成功导入的资产数",
+    )
+    failed_rows: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="失败行数",
+    )
+    attachments_enqueued: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="加入上传队列的附件数",
+    )
+    error: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="任务级错误信息",
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="被工作进程领取（或最近一次提交进度）的时间",
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="开始处理时间",
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="处理完成时间",
+    )
+
+    __table_args__ = (
+        Index("ix_asset_import_jobs_status_created", "status", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AssetImportJob(id={self.id}, status={self.status}, processed={self.processed_rows})>"
+
+
+class AssetImportError(Base):
+    """导入任务的单行错误。"""
+
+    __tablename__ = "asset_import_errors"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        comment="错误记录唯一标识符",
+    )
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("asset_import_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="导入任务 ID",
+    )
+    row_number: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="清单中的行号（从 1 开始，不含 CSV 表头）",
+    )
+    field: Mapped[Optional[str]] = mapped_column(
+        String(100),
+        nullable=True,
+        comment="出错的字段",
+    )
+    message: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        comment="错误信息",
+    )
+
+    __table_args__ = (
+        Index("ix_asset_import_errors_job_row", "job_id", "row_number"),
+    )
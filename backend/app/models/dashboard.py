@@ -0,0 +1,171 @@
+"""仪表盘汇总（rollup）数据库模型。
+
+汇总表由维护任务定期按源表重算并只写入变化的行，仪表盘接口只读取这些小表，
+耗时与资产、转移记录和审批的总量无关。
+"""
+from datetime import date, datetime, timezone
+from typing import Optional
+import uuid
+
+from sqlalchemy import String, DateTime, Date, ForeignKey, Enum as SQLEnum, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+from app.models.approval import ApprovalType
+from app.models.asset import AssetStatus, AssetType, LegalStatus
+
+
+class AssetCountRollup(Base):
+    """
+    资产数量汇总。
+
+    按 (企业, 资产类型, 资产状态, 法律状态) 统计资产数量，
+    同时用于按类型/状态/法律状态的分布与铸造漏斗。
+    """
+
+    __tablename__ = "dashboard_asset_counts"
+
+    enterprise_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("enterprises.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="企业 ID",
+    )
+    type: Mapped[AssetType] = mapped_column(
+        SQLEnum(AssetType),
+        primary_key=True,
+        comment="资产类型",
+    )
+    status: Mapped[AssetStatus] = mapped_column(
+        SQLEnum(AssetStatus),
+        primary_key=True,
+        comment="资产状态",
+    )
+    legal_status: Mapped[LegalStatus] = mapped_column(
+        SQLEnum(LegalStatus),
+        primary_key=True,
+        comment="法律状态",
+    )
+    count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="资产数量",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="更新时间",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<AssetCountRollup(enterprise_id={self.enterprise_id}, type={self.type}, "
+            f"status={self.status}, legal_status={self.legal_status}, count={self.count})>"
+        )
+
+
+class TransferDailyRollup(Base):
+    """
+    每日转移量汇总。
+
+    按 (日期, 企业, 方向, 变更类型) 统计已确认的权属变更记录，
+    方向 ``out`` 表示企业为转出方，``in`` 表示企业为转入方。
+    """
+
+    __tablename__ = "dashboard_transfer_daily"
+
+    day: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        comment="日期（UTC，按记录创建时间）",
+    )
+    enterprise_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("enterprises.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="企业 ID",
+    )
+    direction: Mapped[str] = mapped_column(
+        String(8),
+        primary_key=True,
+        comment="方向: in, out",
+    )
+    transfer_type: Mapped[str] = mapped_column(
+        String(20),
+        primary_key=True,
+        comment="权属变更类型",
+    )
+    count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="记录数量",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="更新时间",
+    )
+
+    __table_args__ = (
+        Index("ix_dashboard_transfer_daily_enterprise_day", "enterprise_id", "day"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<TransferDailyRollup(day={self.day}, enterprise_id={self.enterprise_id}, "
+            f"direction={self.direction}, transfer_type={self.transfer_type}, count={self.count})>"
+        )
+
+
+class ApprovalBacklogRollup(Base):
+    """
+    待审批积压汇总。
+
+    按 (企业, 审批类型) 统计待审批数量与最早的提交时间；
+    企业由审批目标解析：企业审批取目标 ID，资产审批取资产所属企业，成员审批取成员所属企业。
+    """
+
+    __tablename__ = "dashboard_approval_backlog"
+
+    enterprise_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("enterprises.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="企业 ID",
+    )
+    type: Mapped[ApprovalType] = mapped_column(
+        SQLEnum(ApprovalType),
+        primary_key=True,
+        comment="审批类型",
+    )
+    count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="待审批数量",
+    )
+    oldest_created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="最早的待审批提交时间",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="更新时间",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ApprovalBacklogRollup(enterprise_id={self.enterprise_id}, type={self.type}, "
+            f"count={self.count})>"
+        )
@@ -0,0 +1,142 @@
+"""邮件发件箱数据库模型。"""
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+from sqlalchemy import String, DateTime, Index, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+
+class EmailOutboxStatus(str, Enum):
+    """
+    发件箱邮件状态枚举。
+
+    - PENDING: 等待发送（包括等待重试）
+    - SENDING: 已被某个工作进程领取
+    - SENT: 发送成功
+    - DEAD: 重试耗尽或收件人被拒绝
+    """
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    DEAD = "DEAD"
+
+
+class EmailOutbox(Base):
+    """
+    邮件发件箱模型。
+
+    请求只负责渲染邮件并写入发件箱（与业务数据同一事务提交），
+    由后台工作进程复用 SMTP 连接批量发送，失败时按退避重试。
+    """
+
+    __tablename__ = "email_outbox"
+
+    # 主键
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        comment="邮件唯一标识符",
+    )
+
+    # 邮件内容
+    to_email: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="收件人邮箱",
+    )
+    subject: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="邮件主题",
+    )
+    html_body: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        comment="邮件 HTML 内容",
+    )
+    template: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="渲染所用模板名称（便于统计与排查）",
+    )
+    provider: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        default="smtp",
+        comment="发送服务商（按服务商限速）",
+    )
+
+    # 状态与重试
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=EmailOutboxStatus.PENDING,
+        comment="邮件状态: PENDING/SENDING/SENT/DEAD",
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="已尝试次数",
+    )
+    max_attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=8,
+        comment="最大尝试次数",
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="下次可尝试时间",
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="被工作进程领取的时间",
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="上次失败的错误信息",
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="发送成功时间",
+    )
+
+    # 时间戳
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="创建时间",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="更新时间",
+    )
+
+    # 索引
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self) -> str:
+        """
+        返回发件箱邮件对象的字符串表示形式。
+
+        Returns:
+            str: 包含邮件 ID、收件人和状态的格式化字符串。
+        """
+        return f"<EmailOutbox(id={self.id}, to_email={self.to_email}, status={self.status})>"
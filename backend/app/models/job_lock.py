@@ -0,0 +1,63 @@
+"""后台任务锁数据库模型。"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, DateTime, Integer, Float, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class JobLock(Base):
+    """
+    后台定时任务的租约锁，同时记录最近一次运行结果。
+
+    多个工作进程同时运行调度器时，只有持有未过期租约的进程执行对应任务。
+    """
+
+    __tablename__ = "job_locks"
+
+    name: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="任务名称",
+    )
+    owner: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="当前持有者标识（主机名:进程号）",
+    )
+    locked_until: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="租约到期时间，为空表示未加锁",
+    )
+
+    # 最近一次运行结果
+    last_started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="最近一次开始时间",
+    )
+    last_finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="最近一次结束时间",
+    )
+    last_duration_ms: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="最近一次运行耗时（毫秒）",
+    )
+    last_rows: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="最近一次删除的行数",
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="最近一次失败的错误信息",
+    )
+
+    def __repr__(self) -> str:
+        return f"<JobLock(name={self.name}, owner={self.owner}, locked_until={self.locked_until})>"
@@ -0,0 +1,84 @@
+"""访问令牌撤销数据库模型。"""
+from datetime import datetime, timezone
+from sqlalchemy import String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+
+class RevokedAccessToken(Base):
+    """
+    被单独撤销的访问令牌（按 jti 记录）。
+
+    记录只需保留到令牌自身过期，过期后由维护任务清理。
+    """
+
+    __tablename__ = "revoked_access_tokens"
+
+    jti: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        comment="被撤销令牌的 JWT ID",
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="令牌所属用户 ID",
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+        comment="令牌原过期时间",
+    )
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+        comment="撤销时间",
+    )
+
+    def __repr__(self) -> str:
+        return f"<RevokedAccessToken(jti={self.jti}, user_id={self.user_id})>"
+
+
+class UserTokenWatermark(Base):
+    """
+    用户令牌水位线。
+
+    签发时间早于 ``revoked_before`` 的访问令牌全部视为已撤销，
+    用于“登出所有设备”、重置密码等需要一次性作废全部令牌的场景。
+    """
+
+    __tablename__ = "user_token_watermarks"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="用户 ID",
+    )
+    revoked_before: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="早于该时间签发的令牌均无效",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="更新时间（增量同步游标）",
+    )
+
+    __table_args__ = (
+        Index("ix_user_token_watermarks_updated_at", "updated_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserTokenWatermark(user_id={self.user_id}, revoked_before={self.revoked_before})>"
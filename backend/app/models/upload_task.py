@@ -0,0 +1,171 @@
+"""附件上传队列数据库模型。"""
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional, TYPE_CHECKING
+from sqlalchemy import String, DateTime, ForeignKey, Index, Integer, Text, BigInteger, JSON
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+if TYPE_CHECKING:
+    from app.models.asset import Attachment
+
+
+class UploadTaskStatus(str, Enum):
+    """
+    上传任务状态枚举。
+
+    - PENDING: 等待上传（包括等待重试）
+    - IN_PROGRESS: 已被某个工作进程领取
+    - SUCCEEDED: 上传成功
+    - DEAD: 重试耗尽或不可重试的错误
+    """
+    PENDING = "PENDING"
+    IN_PROGRESS = "IN_PROGRESS"
+    SUCCEEDED = "SUCCEEDED"
+    DEAD = "DEAD"
+
+
+class UploadTask(Base):
+    """
+    附件上传任务模型（持久化上传发件箱）。
+
+    文件先暂存到本地磁盘，由后台工作进程上传到 IPFS 服务商，
+    上传完成后回填附件的 CID。任务带有重试计数和下次尝试时间，
+    进程重启后可以继续处理。
+    """
+
+    __tablename__ = "upload_tasks"
+
+    # 主键
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        comment="上传任务唯一标识符",
+    )
+
+    # 关联附件
+    attachment_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("attachments.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="关联附件 ID",
+    )
+    asset_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+        index=True,
+        comment="关联资产 ID（冗余，便于日志与查询）",
+    )
+
+    # 上传目标
+    provider: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        default="pinata",
+        comment="存储服务商",
+    )
+
+    # 暂存文件信息
+    spool_path: Mapped[str] = mapped_column(
+        String(500),
+        nullable=False,
+        comment="本地暂存文件路径",
+    )
+    file_name: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="原始文件名",
+    )
+    content_type: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        comment="文件类型（MIME type）",
+    )
+    file_size: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="文件大小（字节）",
+    )
+    upload_metadata: Mapped[Optional[dict]] = mapped_column(
+        JSON,
+        nullable=True,
+        comment="上传时附带的元数据",
+    )
+
+    # 状态与重试
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=UploadTaskStatus.PENDING,
+        comment="任务状态: PENDING/IN_PROGRESS/SUCCEEDED/DEAD",
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="已尝试次数",
+    )
+    max_attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=8,
+        comment="最大尝试次数",
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="下次可尝试时间",
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="被工作进程领取的时间",
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="上次失败的错误信息",
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="完成时间",
+    )
+
+    # 时间戳
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="创建时间",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="更新时间",
+    )
+
+    # 关系
+    attachment: Mapped["Attachment"] = relationship("Attachment")
+
+    # 索引
+    __table_args__ = (
+        Index("ix_upload_tasks_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self) -> str:
+        """
+        返回上传任务对象的字符串表示形式。
+
+        Returns:
+            str: 包含任务 ID、附件 ID 和状态的格式化字符串。
+        """
+        return f"<UploadTask(id={self.id}, attachment_id={self.attachment_id}, status={self.status})>"
@@ -8,6 +8,7 @@ from app.repositories.enterprise_repository import (
     EnterpriseMemberRepository,
 )
 from app.repositories.asset_repository import AssetRepository
+from app.repositories.token_revocation_repository import TokenRevocationRepository
 
 __all__ = [
     "UserRepository",
@@ -17,4 +18,5 @@ __all__ = [
     "EnterpriseRepository",
     "EnterpriseMemberRepository",
     "AssetRepository",
+    "TokenRevocationRepository",
 ]
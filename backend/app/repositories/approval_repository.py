@@ -1,17 +1,71 @@
 """审批数据访问层。"""
-from typing import Optional, List, Tuple
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, List, Sequence, Tuple
 from uuid import UUID
-from sqlalchemy import select, and_, desc
+from sqlalchemy import Row, select, and_, desc, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate_after_commit, user_tag
+from app.core.database import limited_delete
+from app.core.events import APPROVALS_TOPIC, publish_after_commit, user_topic
+
 from app.models.approval import (
     Approval, 
     ApprovalProcess, 
     ApprovalNotification,
+    ApprovalCounter,
     ApprovalType,
     ApprovalStatus,
 )
 
+# 审批统计缓存条目的标签（计数表变更提交后失效）
+APPROVAL_STATS_TAG = "approvals:statistics"
+
+CounterKey = Tuple[ApprovalStatus, ApprovalType]
+
+# 审批列表接口的投影列（对应 ApprovalResponse 的字段）。按列查询不构造 ORM 实体，
+# 也不会触发申请人、流程记录、通知的 selectin 级联加载。
+APPROVAL_LIST_COLUMNS = (
+    Approval.id,
+    Approval.type,
+    Approval.target_id,
+    Approval.target_type,
+    Approval.applicant_id,
+    Approval.status,
+    Approval.current_step,
+    Approval.total_steps,
+    Approval.remarks,
+    Approval.attachments,
+    Approval.changes,
+    Approval.created_at,
+    Approval.updated_at,
+    Approval.completed_at,
+)
+
+
+def _publish_notification(
+    session: AsyncSession,
+    notification_id: UUID,
+    recipient_id: UUID,
+    notification_type: str,
+    approval_id: Optional[UUID],
+    title: str,
+) -> None:
+    """通知随事务提交后推送给接收人，并失效接收人的未读数缓存。"""
+    invalidate_after_commit(session, user_tag(recipient_id))
+    publish_after_commit(
+        session,
+        user_topic(recipient_id),
+        "notification.created",
+        {
+            "notification_id": str(notification_id),
+            "type": notification_type,
+            "approval_id": str(approval_id) if approval_id else None,
+            "title": title,
+        },
+    )
+
 
 class ApprovalRepository:
     """审批记录数据访问类。"""
@@ -37,6 +91,13 @@ class ApprovalRepository:
         """
         self.session.add(approval)
         await self.session.flush()
+        await ApprovalCounterRepository(self.session).adjust({(approval.status, approval.type): 1})
+        publish_after_commit(
+            self.session,
+            APPROVALS_TOPIC,
+            "approval.submitted",
+            {"approval_id": str(approval.id), "type": approval.type.value},
+        )
         return approval
     
     async def get_approval_by_id(self, approval_id: UUID) -> Optional[Approval]:
@@ -66,6 +127,67 @@ class ApprovalRepository:
         """
         await self.session.flush()
         return approval
+
+    async def transition_pending(
+        self,
+        approval_ids: Sequence[UUID],
+        status: ApprovalStatus,
+        completed_at: datetime,
+        exclude_applicant_id: Optional[UUID] = None,
+    ) -> List[Row]:
+        """
+        用一条 UPDATE ... RETURNING 把一批待审批记录流转到目标状态。
+
+        状态条件写在语句里，并发处理同一申请时只有一方能成功；
+        未返回的 ID 要么不存在，要么已被处理，要么由被排除的申请人提交。
+
+        Args:
+            approval_ids: 审批ID列表
+            status: 目标状态
+            completed_at: 完成时间
+            exclude_applicant_id: 跳过该用户提交的申请（审批人不能处理本人的申请）
+
+        Returns:
+            List[Row]: 成功流转的记录（id、type、target_id、target_type、applicant_id、asset_id、changes）
+        """
+        if not approval_ids:
+            return []
+        criteria = [Approval.id.in_(approval_ids), Approval.status == ApprovalStatus.PENDING]
+        if exclude_applicant_id is not None:
+            criteria.append(Approval.applicant_id != exclude_applicant_id)
+        result = await self.session.execute(
+            update(Approval)
+            .where(*criteria)
+            .values(status=status, completed_at=completed_at)
+            .returning(
+                Approval.id,
+                Approval.type,
+                Approval.target_id,
+                Approval.target_type,
+                Approval.applicant_id,
+                Approval.asset_id,
+                Approval.changes,
+            )
+        )
+        return list(result.all())
+
+    async def get_applicant_ids(self, approval_ids: Iterable[UUID]) -> Dict[UUID, UUID]:
+        """
+        返回给定ID中实际存在的审批及其申请人。
+
+        Args:
+            approval_ids: 审批ID列表
+
+        Returns:
+            Dict[UUID, UUID]: 审批ID到申请人ID的映射
+        """
+        approval_ids = list(approval_ids)
+        if not approval_ids:
+            return {}
+        result = await self.session.execute(
+            select(Approval.id, Approval.applicant_id).where(Approval.id.in_(approval_ids))
+        )
+        return dict(result.tuples().all())
     
     async def get_approvals_by_target(
         self,
@@ -98,13 +220,46 @@ class ApprovalRepository:
         
         result = await self.session.execute(query)
         return list(result.scalars().all())
+
+    async def count_by_status_and_type(self) -> Dict[CounterKey, int]:
+        """
+        用一条 GROUP BY status, type 查询统计审批数量。
+
+        Returns:
+            Dict[CounterKey, int]: (状态, 类型) 到数量的映射
+        """
+        result = await self.session.execute(
+            select(Approval.status, Approval.type, func.count())
+            .group_by(Approval.status, Approval.type)
+        )
+        return {(status, approval_type): count for status, approval_type, count in result.all()}
     
+    async def _list_rows(
+        self,
+        criteria: Sequence[Any],
+        order_by: Any,
+        page: int,
+        page_size: int,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """按条件分页查询审批列表的投影行与总数。"""
+        total = await self.session.scalar(
+            select(func.count()).select_from(Approval).where(*criteria)
+        )
+        result = await self.session.execute(
+            select(*APPROVAL_LIST_COLUMNS)
+            .where(*criteria)
+            .order_by(order_by, desc(Approval.id))
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        return [dict(row) for row in result.mappings()], total or 0
+
     async def get_pending_approvals(
         self,
         approval_type: Optional[ApprovalType] = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> Tuple[List[Approval], int]:
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
         获取待审批列表。
         
@@ -114,29 +269,12 @@ class ApprovalRepository:
             page_size: 每页数量
             
         Returns:
-            Tuple[List[Approval], int]: (审批列表, 总数)
+            Tuple[List[Dict[str, Any]], int]: (按 ApprovalResponse 字段投影的审批行列表, 总数)
         """
-        # 构建查询
-        query = select(Approval).where(Approval.status == ApprovalStatus.PENDING)
-        
+        criteria = [Approval.status == ApprovalStatus.PENDING]
         if approval_type:
-            query = query.where(Approval.type == approval_type)
-        
-        # 排序
-        query = query.order_by(desc(Approval.created_at))
-        
-        # 计算总数
-        count_result = await self.session.execute(
-            select(Approval).where(Approval.status == ApprovalStatus.PENDING)
-        )
-        total = len(count_result.scalars().all())
-        
-        # 分页
-        skip = (page - 1) * page_size
-        query = query.offset(skip).limit(page_size)
-        
-        result = await self.session.execute(query)
-        return list(result.scalars().all()), total
+            criteria.append(Approval.type == approval_type)
+        return await self._list_rows(criteria, desc(Approval.created_at), page, page_size)
 
     async def get_approval_history(
         self,
@@ -144,29 +282,19 @@ class ApprovalRepository:
         page_size: int = 20,
         status: Optional[ApprovalStatus] = None,
         approval_type: Optional[ApprovalType] = None,
-    ) -> Tuple[List[Approval], int]:
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """Get processed approvals history."""
         completed_statuses = [
             ApprovalStatus.APPROVED,
             ApprovalStatus.REJECTED,
             ApprovalStatus.RETURNED,
         ]
-        query = select(Approval).where(Approval.status.in_(completed_statuses))
-
+        criteria = [Approval.status.in_(completed_statuses)]
         if status:
-            query = query.where(Approval.status == status)
+            criteria.append(Approval.status == status)
         if approval_type:
-            query = query.where(Approval.type == approval_type)
-
-        query = query.order_by(desc(Approval.updated_at))
-
-        count_result = await self.session.execute(query)
-        total = len(count_result.scalars().all())
-
-        skip = (page - 1) * page_size
-        paged_query = query.offset(skip).limit(page_size)
-        result = await self.session.execute(paged_query)
-        return list(result.scalars().all()), total
+            criteria.append(Approval.type == approval_type)
+        return await self._list_rows(criteria, desc(Approval.updated_at), page, page_size)
 
     async def get_user_approvals(
         self,
@@ -174,21 +302,12 @@ class ApprovalRepository:
         page: int = 1,
         page_size: int = 20,
         status: Optional[ApprovalStatus] = None,
-    ) -> Tuple[List[Approval], int]:
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """Get approvals submitted by a specific user."""
-        query = select(Approval).where(Approval.applicant_id == user_id)
+        criteria = [Approval.applicant_id == user_id]
         if status:
-            query = query.where(Approval.status == status)
-
-        query = query.order_by(desc(Approval.created_at))
-
-        count_result = await self.session.execute(query)
-        total = len(count_result.scalars().all())
-
-        skip = (page - 1) * page_size
-        paged_query = query.offset(skip).limit(page_size)
-        result = await self.session.execute(paged_query)
-        return list(result.scalars().all()), total
+            criteria.append(Approval.status == status)
+        return await self._list_rows(criteria, desc(Approval.created_at), page, page_size)
 
 
 class ApprovalProcessRepository:
@@ -216,6 +335,36 @@ class ApprovalProcessRepository:
         self.session.add(process)
         await self.session.flush()
         return process
+
+    async def create_processes(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        批量插入流程记录（单条多行 INSERT）。
+
+        Args:
+            rows: 流程记录字段字典列表，各行字段需一致
+        """
+        if rows:
+            await self.session.execute(insert(ApprovalProcess), rows)
+
+    async def get_next_steps(self, approval_ids: Sequence[UUID]) -> Dict[UUID, int]:
+        """
+        用 MAX(step) 聚合计算每个审批的下一步序号，无需加载历史流程记录。
+
+        Args:
+            approval_ids: 审批ID列表
+
+        Returns:
+            Dict[UUID, int]: 审批ID到下一步序号的映射（无流程记录时为 1）
+        """
+        if not approval_ids:
+            return {}
+        result = await self.session.execute(
+            select(ApprovalProcess.approval_id, func.max(ApprovalProcess.step))
+            .where(ApprovalProcess.approval_id.in_(approval_ids))
+            .group_by(ApprovalProcess.approval_id)
+        )
+        max_steps = dict(result.all())
+        return {approval_id: (max_steps.get(approval_id) or 0) + 1 for approval_id in approval_ids}
     
     async def get_processes_by_approval(
         self, 
@@ -265,7 +414,34 @@ class ApprovalNotificationRepository:
         """
         self.session.add(notification)
         await self.session.flush()
+        _publish_notification(
+            self.session,
+            notification_id=notification.id,
+            recipient_id=notification.recipient_id,
+            notification_type=notification.type,
+            approval_id=notification.approval_id,
+            title=notification.title,
+        )
         return notification
+
+    async def create_notifications(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        批量插入通知（单条多行 INSERT），提交后逐条推送给接收人。
+
+        Args:
+            rows: 通知字段字典列表，各行字段需一致且包含 ``id``
+        """
+        if rows:
+            await self.session.execute(insert(ApprovalNotification), rows)
+            for row in rows:
+                _publish_notification(
+                    self.session,
+                    notification_id=row["id"],
+                    recipient_id=row["recipient_id"],
+                    notification_type=row["type"],
+                    approval_id=row.get("approval_id"),
+                    title=row["title"],
+                )
     
     async def get_notifications_by_recipient(
         self,
@@ -322,6 +498,7 @@ class ApprovalNotificationRepository:
         if notification:
             notification.is_read = True
             notification.read_at = datetime.now(timezone.utc)
+            invalidate_after_commit(self.session, user_tag(notification.recipient_id))
             await self.session.flush()
             await self.session.refresh(notification)
         return notification
@@ -337,11 +514,151 @@ class ApprovalNotificationRepository:
             int: 未读通知数量
         """
         result = await self.session.execute(
-            select(ApprovalNotification).where(
+            select(func.count(ApprovalNotification.id)).where(
                 and_(
                     ApprovalNotification.recipient_id == recipient_id,
                     ApprovalNotification.is_read == False,
                 )
             )
         )
-        return len(result.scalars().all())
+        return result.scalar_one()
+    
+    async def delete_read_before(self, cutoff: datetime, limit: Optional[int] = None) -> int:
+        """
+        删除在指定时间之前已读的通知（清理任务）。
+        
+        Args:
+            cutoff: 阅读时间早于该时间的通知将被删除
+            limit: 单批最多删除的数量，None 表示全部删除
+            
+        Returns:
+            int: 删除的通知数量
+        """
+        result = await self.session.execute(
+            limited_delete(
+                ApprovalNotification,
+                ApprovalNotification.is_read == True,
+                ApprovalNotification.read_at < cutoff,
+                limit=limit,
+            )
+        )
+        return result.rowcount
+
+
+class ApprovalCounterRepository:
+    """审批计数表数据访问类（不提交事务，随调用方的业务写入一起提交）。"""
+
+    def __init__(self, session: AsyncSession):
+        """
+        初始化审批计数仓库。
+
+        Args:
+            session: 数据库会话
+        """
+        self.session = session
+
+    def _upsert_statement(self, rows: List[Dict[str, Any]], replace: bool):
+        """PostgreSQL 与 SQLite 上用 ON CONFLICT 合并为一条语句，其他方言返回 None。"""
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(ApprovalCounter).values(rows)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(ApprovalCounter).values(rows)
+        else:
+            return None
+        count = stmt.excluded.count if replace else ApprovalCounter.count + stmt.excluded.count
+        return stmt.on_conflict_do_update(
+            index_elements=[ApprovalCounter.status, ApprovalCounter.type],
+            set_={"count": count, "updated_at": stmt.excluded.updated_at},
+        )
+
+    async def _write(self, values: Dict[CounterKey, int], replace: bool) -> None:
+        now = datetime.now(timezone.utc)
+        rows = [
+            {"status": status, "type": approval_type, "count": value, "updated_at": now}
+            for (status, approval_type), value in sorted(values.items())
+        ]
+        stmt = self._upsert_statement(rows, replace)
+        if stmt is not None:
+            await self.session.execute(stmt)
+        else:
+            for row in rows:
+                count = row["count"] if replace else ApprovalCounter.count + row["count"]
+                result = await self.session.execute(
+                    update(ApprovalCounter)
+                    .where(ApprovalCounter.status == row["status"], ApprovalCounter.type == row["type"])
+                    .values(count=count, updated_at=now)
+                )
+                if result.rowcount == 0:
+                    await self.session.execute(insert(ApprovalCounter).values(**row))
+        invalidate_after_commit(self.session, APPROVAL_STATS_TAG)
+
+    async def adjust(self, deltas: Dict[CounterKey, int]) -> None:
+        """
+        按增量更新计数（行不存在时插入）。
+
+        行按主键排序写入，并发事务以相同顺序加锁，避免死锁。
+
+        Args:
+            deltas: (状态, 类型) 到增量的映射
+        """
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if deltas:
+            await self._write(deltas, replace=False)
+
+    async def record_transition(
+        self,
+        type_counts: Dict[ApprovalType, int],
+        from_status: ApprovalStatus,
+        to_status: ApprovalStatus,
+    ) -> None:
+        """
+        记录一批审批从一个状态流转到另一个状态。
+
+        Args:
+            type_counts: 各审批类型流转的数量
+            from_status: 原状态
+            to_status: 新状态
+        """
+        deltas: Dict[CounterKey, int] = {}
+        for approval_type, count in type_counts.items():
+            deltas[(from_status, approval_type)] = deltas.get((from_status, approval_type), 0) - count
+            deltas[(to_status, approval_type)] = deltas.get((to_status, approval_type), 0) + count
+        await self.adjust(deltas)
+
+    async def get_counts(self, for_update: bool = False) -> Dict[CounterKey, int]:
+        """
+        读取全部计数。
+
+        Args:
+            for_update: 是否锁定计数行直到事务结束（按主键顺序加锁，与 ``adjust`` 一致）
+
+        Returns:
+            Dict[CounterKey, int]: (状态, 类型) 到数量的映射
+        """
+        stmt = select(ApprovalCounter.status, ApprovalCounter.type, ApprovalCounter.count)
+        if for_update:
+            stmt = stmt.order_by(ApprovalCounter.status, ApprovalCounter.type).with_for_update()
+        result = await self.session.execute(stmt)
+        return {(status, approval_type): count for status, approval_type, count in result.all()}
+
+    async def reconcile(self) -> int:
+        """
+        按审批表的实际数量（GROUP BY）校正计数表。
+
+        先锁定计数行再统计审批表：并发的 ``adjust`` 要么已提交、其审批已计入统计，
+        要么等待本事务提交后在校正值上累加，不会被覆盖。
+
+        Returns:
+            int: 被校正的计数行数
+        """
+        stored = await self.get_counts(for_update=True)
+        actual = await ApprovalRepository(self.session).count_by_status_and_type()
+        corrections = {
+            key: actual.get(key, 0)
+            for key in set(actual) | set(stored)
+            if actual.get(key, 0) != stored.get(key, 0)
+        }
+        if corrections:
+            await self._write(corrections, replace=True)
+        return len(corrections)
@@ -1,12 +1,52 @@
 """资产数据访问层。"""
-from typing import Optional, List, Tuple
+from collections import defaultdict
+from typing import Any, Dict, Optional, List, Tuple
 from uuid import UUID
 from datetime import date
-from sqlalchemy import select, func, or_
+from sqlalchemy import Select, select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.asset import Asset, Attachment, AssetType, AssetStatus, LegalStatus
 
+# 资产列表接口的投影列（对应 AssetResponse 的字段）。按列查询返回普通行，
+# 不构造 ORM 实体、不进身份映射，也不会触发 Asset 各关系的 selectin 级联加载。
+ASSET_LIST_COLUMNS = (
+    Asset.id,
+    Asset.enterprise_id,
+    Asset.creator_user_id,
+    Asset.name,
+    Asset.type,
+    Asset.description,
+    Asset.creator_name,
+    Asset.inventors,
+    Asset.creation_date,
+    Asset.legal_status,
+    Asset.application_number,
+    Asset.rights_declaration,
+    Asset.asset_metadata,
+    Asset.status,
+    Asset.nft_token_id,
+    Asset.nft_contract_address,
+    Asset.nft_chain,
+    Asset.metadata_uri,
+    Asset.mint_tx_hash,
+    Asset.created_at,
+    Asset.updated_at,
+)
+
+# 对应 AttachmentResponse 的字段
+ATTACHMENT_LIST_COLUMNS = (
+    Attachment.id,
+    Attachment.asset_id,
+    Attachment.file_name,
+    Attachment.file_type,
+    Attachment.file_size,
+    Attachment.ipfs_cid,
+    Attachment.upload_status,
+    Attachment.is_primary,
+    Attachment.uploaded_at,
+)
+
 
 class AssetRepository:
     """资产数据访问类。"""
@@ -49,7 +89,40 @@ class AssetRepository:
             select(Asset).where(Asset.id == asset_id)
         )
         return result.scalar_one_or_none()
-    
+
+    async def get_asset_version(self, asset_id: UUID) -> Optional[Tuple[UUID, tuple]]:
+        """
+        获取资产详情的版本信息（用于生成 ETag），只查询版本列，不加载实体。
+
+        资产列的任何修改都会刷新 updated_at；附件由后台上传任务回填 CID 与上传状态，
+        因此附件部分取其主键与可变列。
+
+        Args:
+            asset_id: 资产 ID
+
+        Returns:
+            Optional[Tuple[UUID, tuple]]: (所属企业 ID, 版本信息)，资产不存在则返回 None
+        """
+        result = await self.db.execute(
+            select(
+                Asset.enterprise_id,
+                Asset.updated_at,
+                Attachment.id,
+                Attachment.ipfs_cid,
+                Attachment.upload_status,
+                Attachment.is_primary,
+            )
+            .outerjoin(Attachment, Attachment.asset_id == Asset.id)
+            .where(Asset.id == asset_id)
+            .order_by(Attachment.id)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        enterprise_id, updated_at = rows[0][0], rows[0][1]
+        attachments = tuple(tuple(row[2:]) for row in rows if row[2] is not None)
+        return enterprise_id, (asset_id, updated_at, attachments)
+
     async def get_assets_by_enterprise(
         self,
         enterprise_id: UUID,
@@ -79,10 +152,124 @@ class AssetRepository:
         Returns:
             Tuple[List[Asset], int]: (资产列表, 总数)
         """
-        # 构建查询
-        query = select(Asset).where(Asset.enterprise_id == enterprise_id)
+        query = self.filter_enterprise_assets(
+            select(Asset),
+            enterprise_id,
+            asset_type=asset_type,
+            status=status,
+            legal_status=legal_status,
+            start_date=start_date,
+            end_date=end_date,
+            search=search,
+        )
+        
+        # 获取总数
+        count_query = select(func.count()).select_from(query.subquery())
+        total_result = await self.db.execute(count_query)
+        total = total_result.scalar_one()
+        
+        # 应用分页和排序
+        query = query.order_by(Asset.created_at.desc()).offset(skip).limit(limit)
+        
+        # 执行查询
+        result = await self.db.execute(query)
+        assets = list(result.scalars().all())
+        
+        return assets, total
+    
+    async def list_enterprise_asset_rows(
+        self,
+        enterprise_id: UUID,
+        asset_type: Optional[AssetType] = None,
+        status: Optional[AssetStatus] = None,
+        legal_status: Optional[LegalStatus] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        按列投影获取企业资产列表的一页（含附件），供列表接口直接校验为响应模型。
+        
+        资产与附件各一次按列查询，附件按资产 ID 分组挂到 ``attachments`` 键下。
+        
+        Args:
+            enterprise_id: 企业 ID
+            asset_type: 资产类型筛选
+            status: 资产状态筛选
+            legal_status: 法律状态筛选
+            start_date: 创作日期起始
+            end_date: 创作日期结束
+            search: 搜索关键词
+            skip: 跳过记录数
+            limit: 返回记录数
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: (资产行列表, 总数)
+        """
+        filters = dict(
+            asset_type=asset_type,
+            status=status,
+            legal_status=legal_status,
+            start_date=start_date,
+            end_date=end_date,
+            search=search,
+        )
+        total = await self.db.scalar(
+            self.filter_enterprise_assets(select(func.count()).select_from(Asset), enterprise_id, **filters)
+        )
+        query = (
+            self.filter_enterprise_assets(select(*ASSET_LIST_COLUMNS), enterprise_id, **filters)
+            .order_by(Asset.created_at.desc(), Asset.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = [dict(row) for row in (await self.db.execute(query)).mappings()]
+        if not rows:
+            return rows, total or 0
+        
+        attachments: Dict[UUID, List[Dict[str, Any]]] = defaultdict(list)
+        result = await self.db.execute(
+            select(*ATTACHMENT_LIST_COLUMNS)
+            .where(Attachment.asset_id.in_([row["id"] for row in rows]))
+            .order_by(Attachment.uploaded_at)
+        )
+        for attachment in result.mappings():
+            attachments[attachment["asset_id"]].append(dict(attachment))
+        for row in rows:
+            row["attachments"] = attachments.get(row["id"], [])
+        return rows, total or 0
+    
+    @staticmethod
+    def filter_enterprise_assets(
+        query: Select,
+        enterprise_id: UUID,
+        asset_type: Optional[AssetType] = None,
+        status: Optional[AssetStatus] = None,
+        legal_status: Optional[LegalStatus] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        search: Optional[str] = None,
+    ) -> Select:
+        """
+        为查询加上企业资产列表的筛选条件（列表接口与导出接口共用）。
+        
+        Args:
+            query: 以 Asset 为主表的查询
+            enterprise_id: 企业 ID
+            asset_type: 资产类型筛选
+            status: 资产状态筛选
+            legal_status: 法律状态筛选
+            start_date: 创作日期起始
+            end_date: 创作日期结束
+            search: 搜索关键词
+            
+        Returns:
+            Select: 加上筛选条件的查询
+        """
+        query = query.where(Asset.enterprise_id == enterprise_id)
         
-        # 应用筛选条件
         if asset_type is not None:
             query = query.where(Asset.type == asset_type)
         
@@ -108,19 +295,7 @@ class AssetRepository:
                 )
             )
         
-        # 获取总数
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar_one()
-        
-        # 应用分页和排序
-        query = query.order_by(Asset.created_at.desc()).offset(skip).limit(limit)
-        
-        # 执行查询
-        result = await self.db.execute(query)
-        assets = list(result.scalars().all())
-        
-        return assets, total
+        return query
     
     async def update_asset(self, asset: Asset) -> Asset:
         """
@@ -201,9 +376,9 @@ class AssetRepository:
             ipfs_cid: IPFS CID
             
         Returns:
-            Optional[Attachment]: 附件对象，不存在则返回 None
+            Optional[Attachment]: 附件对象（多个附件共用该 CID 时返回其中之一），不存在则返回 None
         """
         result = await self.db.execute(
-            select(Attachment).where(Attachment.ipfs_cid == ipfs_cid)
+            select(Attachment).where(Attachment.ipfs_cid == ipfs_cid).limit(1)
         )
-        return result.scalar_one_or_none()
+        return result.scalars().first()
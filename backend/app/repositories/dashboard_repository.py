@@ -0,0 +1,299 @@
+"""仪表盘汇总表数据访问层。"""
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, and_, case, cast, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.approval import Approval, ApprovalStatus
+from app.models.asset import Asset
+from app.models.dashboard import ApprovalBacklogRollup, AssetCountRollup, TransferDailyRollup
+from app.models.enterprise import Enterprise, EnterpriseMember
+from app.models.job_lock import JobLock
+from app.models.ownership import NFTTransferRecord, TransferStatus
+
+# 单条 INSERT / DELETE 语句包含的最大行数（控制绑定参数数量）
+_WRITE_CHUNK = 500
+
+
+def _as_date(value: Any) -> date:
+    # SQLite 的 date() 返回字符串
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+class DashboardRepository:
+    """仪表盘汇总表的重算与读取（不提交事务）。"""
+
+    def __init__(self, session: AsyncSession):
+        """
+        初始化仪表盘仓库。
+
+        Args:
+            session: 数据库会话
+        """
+        self.session = session
+
+    @property
+    def _dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    # ------------------------------------------------------------------
+    # 按源表计算汇总值
+    # ------------------------------------------------------------------
+
+    async def compute_asset_counts(self) -> Dict[tuple, Dict[str, Any]]:
+        """
+        按资产表计算 (企业, 类型, 状态, 法律状态) 的数量。
+
+        Returns:
+            Dict[tuple, Dict[str, Any]]: 主键到值列的映射
+        """
+        result = await self.session.execute(
+            select(Asset.enterprise_id, Asset.type, Asset.status, Asset.legal_status, func.count())
+            .group_by(Asset.enterprise_id, Asset.type, Asset.status, Asset.legal_status)
+        )
+        return {
+            (enterprise_id, asset_type, asset_status, legal_status): {"count": count}
+            for enterprise_id, asset_type, asset_status, legal_status, count in result.all()
+        }
+
+    async def compute_transfer_daily(self, since: Optional[date] = None) -> Dict[tuple, Dict[str, Any]]:
+        """
+        按转移记录计算每日、每个企业、每个方向的已确认记录数。
+
+        Args:
+            since: 只计算该日期（含）之后的记录，None 表示全部
+
+        Returns:
+            Dict[tuple, Dict[str, Any]]: 主键到值列的映射
+        """
+        if self._dialect == "postgresql":
+            day = cast(func.timezone("UTC", NFTTransferRecord.created_at), Date)
+        else:
+            day = func.date(NFTTransferRecord.created_at)
+
+        values: Dict[tuple, Dict[str, Any]] = {}
+        for direction, column in (
+            ("out", NFTTransferRecord.from_enterprise_id),
+            ("in", NFTTransferRecord.to_enterprise_id),
+        ):
+            conditions = [column.isnot(None), NFTTransferRecord.status == TransferStatus.CONFIRMED]
+            if since is not None:
+                conditions.append(
+                    NFTTransferRecord.created_at >= datetime.combine(since, time.min, tzinfo=timezone.utc)
+                )
+            result = await self.session.execute(
+                select(day, column, NFTTransferRecord.transfer_type, func.count())
+                .where(*conditions)
+                .group_by(day, column, NFTTransferRecord.transfer_type)
+            )
+            for bucket, enterprise_id, transfer_type, count in result.all():
+                values[(_as_date(bucket), enterprise_id, direction, _enum_value(transfer_type))] = {"count": count}
+        return values
+
+    async def compute_approval_backlog(self) -> Dict[tuple, Dict[str, Any]]:
+        """
+        按审批表计算每个企业、每种类型的待审批数量与最早提交时间。
+
+        Returns:
+            Dict[tuple, Dict[str, Any]]: 主键到值列的映射
+        """
+        enterprise_id = func.coalesce(
+            Asset.enterprise_id,
+            EnterpriseMember.enterprise_id,
+            case((Approval.target_type == "enterprise", Approval.target_id)),
+        )
+        result = await self.session.execute(
+            select(enterprise_id, Approval.type, func.count(), func.min(Approval.created_at))
+            .select_from(Approval)
+            .outerjoin(Asset, Asset.id == Approval.asset_id)
+            .outerjoin(
+                EnterpriseMember,
+                and_(Approval.target_type == "member", EnterpriseMember.id == Approval.target_id),
+            )
+            # 只保留仍存在的企业（汇总表对企业有外键）
+            .join(Enterprise, Enterprise.id == enterprise_id)
+            .where(Approval.status == ApprovalStatus.PENDING)
+            .group_by(enterprise_id, Approval.type)
+        )
+        return {
+            (row_enterprise_id, approval_type): {"count": count, "oldest_created_at": oldest}
+            for row_enterprise_id, approval_type, count, oldest in result.all()
+        }
+
+    # ------------------------------------------------------------------
+    # 把计算结果同步到汇总表（只写入变化的行）
+    # ------------------------------------------------------------------
+
+    async def sync_asset_counts(self, values: Dict[tuple, Dict[str, Any]]) -> int:
+        """
+        用计算结果替换资产数量汇总。
+
+        Returns:
+            int: 写入或删除的行数
+        """
+        return await self._sync(AssetCountRollup, ["count"], values, [])
+
+    async def sync_transfer_daily(self, values: Dict[tuple, Dict[str, Any]], since: Optional[date] = None) -> int:
+        """
+        用计算结果替换 ``since`` 之后（含）的每日转移量汇总，更早的日期保持不变。
+
+        Returns:
+            int: 写入或删除的行数
+        """
+        scope = [TransferDailyRollup.day >= since] if since is not None else []
+        return await self._sync(TransferDailyRollup, ["count"], values, scope)
+
+    async def sync_approval_backlog(self, values: Dict[tuple, Dict[str, Any]]) -> int:
+        """
+        用计算结果替换待审批积压汇总。
+
+        Returns:
+            int: 写入或删除的行数
+        """
+        return await self._sync(ApprovalBacklogRollup, ["count", "oldest_created_at"], values, [])
+
+    async def _sync(
+        self,
+        model: Any,
+        value_names: List[str],
+        values: Dict[tuple, Dict[str, Any]],
+        scope: List[Any],
+    ) -> int:
+        key_columns = list(model.__table__.primary_key.columns)
+        key_names = [column.name for column in key_columns]
+
+        result = await self.session.execute(
+            select(*key_columns, *[model.__table__.c[name] for name in value_names]).where(*scope)
+        )
+        stored = {
+            tuple(row[: len(key_names)]): dict(zip(value_names, row[len(key_names):]))
+            for row in result.all()
+        }
+
+        stale = [key for key in stored if key not in values]
+        now = datetime.now(timezone.utc)
+        changed = [
+            {**dict(zip(key_names, key)), **row_values, "updated_at": now}
+            for key, row_values in sorted(values.items(), key=lambda item: tuple(map(str, item[0])))
+            if stored.get(key) != row_values
+        ]
+
+        for start in range(0, len(stale), _WRITE_CHUNK):
+            await self.session.execute(
+                delete(model).where(tuple_(*key_columns).in_(stale[start:start + _WRITE_CHUNK]))
+            )
+        for start in range(0, len(changed), _WRITE_CHUNK):
+            await self._upsert(model, key_names, value_names, changed[start:start + _WRITE_CHUNK])
+        return len(stale) + len(changed)
+
+    async def _upsert(
+        self,
+        model: Any,
+        key_names: Sequence[str],
+        value_names: Sequence[str],
+        rows: List[Dict[str, Any]],
+    ) -> None:
+        """PostgreSQL 与 SQLite 上用 ON CONFLICT 合并为一条语句，其他方言逐行先更新后插入。"""
+        if self._dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if self._dialect == "postgresql" else sqlite.insert
+            stmt = dialect_insert(model).values(rows)
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=list(key_names),
+                    set_={name: stmt.excluded[name] for name in [*value_names, "updated_at"]},
+                )
+            )
+            return
+        for row in rows:
+            result = await self.session.execute(
+                update(model)
+                .where(*[model.__table__.c[name] == row[name] for name in key_names])
+                .values({name: row[name] for name in [*value_names, "updated_at"]})
+            )
+            if result.rowcount == 0:
+                await self.session.execute(insert(model).values(**row))
+
+    # ------------------------------------------------------------------
+    # 读取汇总表
+    # ------------------------------------------------------------------
+
+    async def get_asset_counts(self, enterprise_ids: Iterable[UUID]) -> List[Tuple]:
+        """
+        读取企业的资产数量汇总。
+
+        Returns:
+            List[Tuple]: (类型, 状态, 法律状态, 数量) 列表，已跨企业合并
+        """
+        result = await self.session.execute(
+            select(
+                AssetCountRollup.type,
+                AssetCountRollup.status,
+                AssetCountRollup.legal_status,
+                func.sum(AssetCountRollup.count),
+            )
+            .where(AssetCountRollup.enterprise_id.in_(list(enterprise_ids)))
+            .group_by(AssetCountRollup.type, AssetCountRollup.status, AssetCountRollup.legal_status)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_transfer_daily(self, enterprise_ids: Iterable[UUID], since: date) -> List[Tuple]:
+        """
+        读取企业自 ``since`` 起的每日转移量。
+
+        Returns:
+            List[Tuple]: (日期, 方向, 变更类型, 数量) 列表，已跨企业合并
+        """
+        result = await self.session.execute(
+            select(
+                TransferDailyRollup.day,
+                TransferDailyRollup.direction,
+                TransferDailyRollup.transfer_type,
+                func.sum(TransferDailyRollup.count),
+            )
+            .where(
+                TransferDailyRollup.enterprise_id.in_(list(enterprise_ids)),
+                TransferDailyRollup.day >= since,
+            )
+            .group_by(TransferDailyRollup.day, TransferDailyRollup.direction, TransferDailyRollup.transfer_type)
+        )
+        return [(_as_date(day), direction, transfer_type, count) for day, direction, transfer_type, count in result.all()]
+
+    async def get_approval_backlog(self, enterprise_ids: Iterable[UUID]) -> List[Tuple]:
+        """
+        读取企业的待审批积压汇总。
+
+        Returns:
+            List[Tuple]: (企业 ID, 企业名称, 审批类型, 数量, 最早提交时间) 列表
+        """
+        result = await self.session.execute(
+            select(
+                ApprovalBacklogRollup.enterprise_id,
+                Enterprise.name,
+                ApprovalBacklogRollup.type,
+                ApprovalBacklogRollup.count,
+                ApprovalBacklogRollup.oldest_created_at,
+            )
+            .join(Enterprise, Enterprise.id == ApprovalBacklogRollup.enterprise_id)
+            .where(ApprovalBacklogRollup.enterprise_id.in_(list(enterprise_ids)))
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_job_state(self, job_name: str) -> Optional[Tuple[Optional[datetime], Optional[str]]]:
+        """
+        读取汇总任务最近一次运行的结束时间与错误信息。
+
+        Returns:
+            Optional[Tuple]: (结束时间, 错误信息)；任务从未运行时返回 None
+        """
+        result = await self.session.execute(
+            select(JobLock.last_finished_at, JobLock.last_error).where(JobLock.name == job_name)
+        )
+        row = result.first()
+        return tuple(row) if row is not None else None
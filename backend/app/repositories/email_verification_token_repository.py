@@ -3,9 +3,10 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import limited_delete
 from app.models.email_verification_token import EmailVerificationToken
 
 
@@ -169,29 +170,24 @@ class EmailVerificationTokenRepository:
         )
         return count
     
-    async def delete_expired_tokens(self) -> int:
+    async def delete_expired_tokens(self, limit: Optional[int] = None) -> int:
         """
-        删除所有已过期的邮箱验证令牌。
+        删除已过期的邮箱验证令牌。
         
+        Args:
+            limit: 单批最多删除的数量，None 表示全部删除
+            
         Returns:
             int: 删除的令牌数量
         """
-        now = datetime.now(timezone.utc)
-        # 先查询数量
-        count_result = await self.db.execute(
-            select(EmailVerificationToken).where(
-                EmailVerificationToken.expires_at < now
-            )
-        )
-        count = len(list(count_result.scalars().all()))
-        
-        # 执行删除
-        await self.db.execute(
-            delete(EmailVerificationToken).where(
-                EmailVerificationToken.expires_at < now
+        result = await self.db.execute(
+            limited_delete(
+                EmailVerificationToken,
+                EmailVerificationToken.expires_at < datetime.now(timezone.utc),
+                limit=limit,
             )
         )
-        return count
+        return result.rowcount
     
     async def has_recent_request(
         self,
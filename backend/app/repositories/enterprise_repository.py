@@ -259,6 +259,21 @@ class EnterpriseRepository:
         )
         return result.scalar_one_or_none() is not None
     
+    async def exists(self, enterprise_id: UUID) -> bool:
+        """
+        检查企业是否存在（只查询主键，不加载企业及其成员关系）。
+        
+        Args:
+            enterprise_id (UUID): 企业 ID。
+            
+        Returns:
+            bool: 是否存在。
+        """
+        result = await self.db.execute(
+            select(Enterprise.id).where(Enterprise.id == enterprise_id)
+        )
+        return result.scalar_one_or_none() is not None
+    
     async def get_member_count(self, enterprise_id: UUID) -> int:
         """
         获取企业成员数量。
@@ -352,6 +367,21 @@ class EnterpriseMemberRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_user_enterprise_ids(self, user_id: UUID) -> List[UUID]:
+        """
+        获取用户所属的全部企业 ID。
+        
+        Args:
+            user_id (UUID): 用户 ID。
+            
+        Returns:
+            List[UUID]: 企业 ID 列表。
+        """
+        result = await self.db.execute(
+            select(EnterpriseMember.enterprise_id).where(EnterpriseMember.user_id == user_id)
+        )
+        return list(result.scalars().all())
+    
     async def get_enterprise_members(
         self,
         enterprise_id: UUID,
@@ -0,0 +1,126 @@
+"""后台任务锁仓库。"""
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import select, update, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job_lock import JobLock
+
+
+class JobLockRepository:
+    """基于租约的任务锁（每次操作都会提交事务，锁状态需要立即对其他进程可见）。"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        初始化任务锁仓库。
+
+        Args:
+            db (AsyncSession): 数据库异步会话。
+        """
+        self.db = db
+
+    async def try_acquire(self, name: str, owner: str, ttl: float, min_interval: float = 0) -> bool:
+        """
+        尝试获取任务锁。
+
+        租约已过期或本就由 owner 持有时获取成功；任务首次运行时插入锁记录。
+        指定 ``min_interval`` 时，距任意进程上次完成不足该间隔也视为获取失败，
+        使任务在整个集群内按间隔只运行一次。
+
+        Args:
+            name (str): 任务名称。
+            owner (str): 持有者标识。
+            ttl (float): 租约时长（秒）。
+            min_interval (float): 两次运行的最小间隔（秒）。
+
+        Returns:
+            bool: 是否获取成功。
+        """
+        now = datetime.now(timezone.utc)
+        locked_until = now + timedelta(seconds=ttl)
+        result = await self.db.execute(
+            update(JobLock)
+            .where(
+                JobLock.name == name,
+                or_(
+                    JobLock.locked_until.is_(None),
+                    JobLock.locked_until < now,
+                    JobLock.owner == owner,
+                ),
+                or_(
+                    JobLock.last_finished_at.is_(None),
+                    JobLock.last_finished_at <= now - timedelta(seconds=min_interval),
+                ),
+            )
+            .values(owner=owner, locked_until=locked_until, last_started_at=now)
+        )
+        if result.rowcount == 1:
+            await self.db.commit()
+            return True
+
+        # 记录不存在时插入；已被他人持有时主键冲突
+        try:
+            self.db.add(JobLock(name=name, owner=owner, locked_until=locked_until, last_started_at=now))
+            await self.db.commit()
+            return True
+        except IntegrityError:
+            await self.db.rollback()
+            return False
+
+    async def extend(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        续租（长任务分批执行期间调用）。
+
+        Returns:
+            bool: 锁是否仍由 owner 持有。
+        """
+        result = await self.db.execute(
+            update(JobLock)
+            .where(JobLock.name == name, JobLock.owner == owner)
+            .values(locked_until=datetime.now(timezone.utc) + timedelta(seconds=ttl))
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def release(
+        self,
+        name: str,
+        owner: str,
+        duration_ms: float,
+        rows: int,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        释放任务锁并记录本次运行结果。
+
+        Args:
+            name (str): 任务名称。
+            owner (str): 持有者标识。
+            duration_ms (float): 运行耗时（毫秒）。
+            rows (int): 删除的行数。
+            error (Optional[str]): 错误信息。
+        """
+        await self.db.execute(
+            update(JobLock)
+            .where(JobLock.name == name, JobLock.owner == owner)
+            .values(
+                locked_until=None,
+                last_finished_at=datetime.now(timezone.utc),
+                last_duration_ms=duration_ms,
+                last_rows=rows,
+                last_error=error,
+            )
+        )
+        await self.db.commit()
+
+    async def list_all(self) -> List[JobLock]:
+        """
+        列出所有任务锁及其最近运行结果。
+
+        Returns:
+            List[JobLock]: 任务锁列表。
+        """
+        result = await self.db.execute(select(JobLock).order_by(JobLock.name))
+        return list(result.scalars().all())
@@ -3,9 +3,10 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import limited_delete
 from app.models.password_reset_token import PasswordResetToken
 
 
@@ -143,29 +144,24 @@ class PasswordResetTokenRepository:
         )
         return len(list(count_result.scalars().all()))
     
-    async def delete_expired_tokens(self) -> int:
+    async def delete_expired_tokens(self, limit: Optional[int] = None) -> int:
         """
-        删除所有已过期的密码重置令牌。
+        删除已过期的密码重置令牌。
         
+        Args:
+            limit: 单批最多删除的数量，None 表示全部删除
+            
         Returns:
             int: 删除的令牌数量
         """
-        now = datetime.now(timezone.utc)
-        # 先查询数量
-        count_result = await self.db.execute(
-            select(PasswordResetToken).where(
-                PasswordResetToken.expires_at < now
-            )
-        )
-        count = len(list(count_result.scalars().all()))
-        
-        # 执行删除
-        await self.db.execute(
-            delete(PasswordResetToken).where(
-                PasswordResetToken.expires_at < now
+        result = await self.db.execute(
+            limited_delete(
+                PasswordResetToken,
+                PasswordResetToken.expires_at < datetime.now(timezone.utc),
+                limit=limit,
             )
         )
-        return count
+        return result.rowcount
     
     async def has_recent_request(
         self,
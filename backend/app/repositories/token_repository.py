@@ -1,11 +1,15 @@
 """用于数据访问操作的刷新令牌仓库。"""
+import uuid
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, insert, func, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
+from app.core.database import limited_delete
 from app.models.refresh_token import RefreshToken
+from app.models.user import User
 
 
 class TokenRepository:
@@ -108,18 +112,28 @@ class TokenRepository:
         await self.db.commit()
         return result.rowcount
     
-    async def delete_expired_tokens(self) -> int:
+    async def delete_expired_tokens(
+        self,
+        limit: Optional[int] = None,
+        revoked_before: Optional[datetime] = None,
+    ) -> int:
         """
-        删除所有已过期的令牌（清理任务）。
+        删除已过期的令牌（清理任务）。
         
+        Args:
+            limit (Optional[int]): 单批最多删除的数量，None 表示全部删除。
+            revoked_before (Optional[datetime]): 同时删除在该时间之前被撤销的令牌。
+            
         Returns:
             int: 被删除的令牌数量。
         """
-        result = await self.db.execute(
-            delete(RefreshToken).where(
-                RefreshToken.expires_at < datetime.now(timezone.utc)
+        condition = RefreshToken.expires_at < datetime.now(timezone.utc)
+        if revoked_before is not None:
+            condition = or_(
+                condition,
+                and_(RefreshToken.is_revoked == True, RefreshToken.revoked_at < revoked_before),
             )
-        )
+        result = await self.db.execute(limited_delete(RefreshToken, condition, limit=limit))
         await self.db.commit()
         return result.rowcount
     
@@ -141,3 +155,107 @@ class TokenRepository:
             )
         )
         return result.scalar_one() or 0
+
+    def _supports_writable_cte(self) -> bool:
+        """PostgreSQL 支持在 CTE 中执行 UPDATE / INSERT，可合并为单条语句。"""
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    async def issue_token(
+        self,
+        user_id: UUID,
+        token_hash: str,
+        expires_at: datetime,
+        max_active: int,
+        ip_address: Optional[str] = None,
+        device_info: Optional[str] = None,
+    ) -> None:
+        """
+        签发刷新令牌：会话数达到上限时撤销旧令牌，再写入新令牌（不提交）。
+
+        会话数检查与撤销在同一条 UPDATE 中完成；PostgreSQL 上撤销与插入
+        进一步合并为一条带写 CTE 的语句，只需一次往返。
+
+        Args:
+            user_id (UUID): 用户 ID。
+            token_hash (str): 新令牌哈希。
+            expires_at (datetime): 新令牌过期时间。
+            max_active (int): 允许的最大活跃会话数。
+            ip_address (Optional[str]): 客户端 IP 地址。
+            device_info (Optional[str]): 客户端设备信息。
+        """
+        now = datetime.now(timezone.utc)
+        active_count = (
+            select(func.count(RefreshToken.id))
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.is_revoked == False,
+                RefreshToken.expires_at > now,
+            )
+            .scalar_subquery()
+        )
+        revoke_stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.is_revoked == False,
+                active_count >= max_active,
+            )
+            .values(is_revoked=True, revoked_at=now)
+        )
+        insert_stmt = insert(RefreshToken).values(
+            id=uuid.uuid4(),
+            token_hash=token_hash,
+            user_id=user_id,
+            ip_address=ip_address,
+            device_info=device_info,
+            is_revoked=False,
+            created_at=now,
+            expires_at=expires_at,
+        )
+
+        if self._supports_writable_cte():
+            revoked = revoke_stmt.returning(RefreshToken.id).cte("revoked")
+            await self.db.execute(insert_stmt.add_cte(revoked))
+        else:
+            await self.db.execute(revoke_stmt.execution_options(synchronize_session=False))
+            await self.db.execute(insert_stmt)
+
+    async def rotate_token(self, token_hash: str) -> Optional[User]:
+        """
+        原子地消费一个有效的刷新令牌并返回其所属用户（不提交）。
+
+        撤销语句本身带有有效性条件，并发刷新同一令牌时只有一个请求能成功。
+        PostgreSQL 上撤销与查询用户合并为一条语句。返回的用户不加载关联集合。
+
+        Args:
+            token_hash (str): 令牌哈希。
+
+        Returns:
+            Optional[User]: 令牌所属用户，令牌无效时返回 None。
+        """
+        now = datetime.now(timezone.utc)
+        revoke_stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.is_revoked == False,
+                RefreshToken.expires_at > now,
+            )
+            .values(is_revoked=True, revoked_at=now)
+            .returning(RefreshToken.user_id)
+        )
+
+        if self._supports_writable_cte():
+            rotated = revoke_stmt.cte("rotated")
+            result = await self.db.execute(
+                select(User)
+                .join(rotated, User.id == rotated.c.user_id)
+                .options(raiseload("*"))
+            )
+            return result.scalar_one_or_none()
+
+        result = await self.db.execute(revoke_stmt.execution_options(synchronize_session=False))
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            return None
+        return await self.db.get(User, user_id, options=[raiseload("*")])
@@ -0,0 +1,130 @@
+"""访问令牌撤销仓库。"""
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import limited_delete
+from app.models.token_revocation import RevokedAccessToken, UserTokenWatermark
+
+
+class TokenRevocationRepository:
+    """用于访问令牌撤销记录的仓库类（不提交事务，由调用方提交）。"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        初始化撤销仓库。
+
+        Args:
+            db (AsyncSession): 数据库异步会话。
+        """
+        self.db = db
+
+    async def revoke_jti(self, jti: str, user_id: UUID, expires_at: datetime) -> None:
+        """
+        撤销单个访问令牌（重复撤销无副作用）。
+
+        Args:
+            jti (str): 令牌 JWT ID。
+            user_id (UUID): 令牌所属用户 ID。
+            expires_at (datetime): 令牌原过期时间。
+        """
+        if await self.db.get(RevokedAccessToken, jti) is not None:
+            return
+        self.db.add(RevokedAccessToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        await self.db.flush()
+
+    async def raise_watermark(self, user_id: UUID, revoked_before: datetime) -> datetime:
+        """
+        提升用户水位线，使此前签发的访问令牌全部失效。
+
+        水位线只会前移，不会后退。
+
+        Args:
+            user_id (UUID): 用户 ID。
+            revoked_before (datetime): 新水位线。
+
+        Returns:
+            datetime: 生效后的水位线。
+        """
+        watermark = await self.db.get(UserTokenWatermark, user_id)
+        if watermark is None:
+            watermark = UserTokenWatermark(user_id=user_id, revoked_before=revoked_before)
+            self.db.add(watermark)
+        elif _as_utc(watermark.revoked_before) < revoked_before:
+            watermark.revoked_before = revoked_before
+            watermark.updated_at = datetime.now(timezone.utc)
+        await self.db.flush()
+        return _as_utc(watermark.revoked_before)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        精确检查 jti 是否已被撤销（用于 Bloom 过滤器命中后的确认）。
+
+        Args:
+            jti (str): 令牌 JWT ID。
+
+        Returns:
+            bool: 是否已撤销。
+        """
+        result = await self.db.execute(
+            select(RevokedAccessToken.jti).where(RevokedAccessToken.jti == jti)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def list_active_jtis(self, now: datetime, revoked_since: Optional[datetime] = None) -> List[str]:
+        """
+        列出尚未过期的已撤销 jti。
+
+        Args:
+            now (datetime): 当前时间，已过期的令牌无需再跟踪。
+            revoked_since (datetime): 仅返回该时间之后撤销的记录（增量同步）。
+
+        Returns:
+            List[str]: jti 列表。
+        """
+        query = select(RevokedAccessToken.jti).where(RevokedAccessToken.expires_at > now)
+        if revoked_since is not None:
+            query = query.where(RevokedAccessToken.revoked_at >= revoked_since)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def list_watermarks(self, updated_since: Optional[datetime] = None) -> List[Tuple[UUID, datetime]]:
+        """
+        列出用户水位线。
+
+        Args:
+            updated_since (datetime): 仅返回该时间之后更新的记录（增量同步）。
+
+        Returns:
+            List[Tuple[UUID, datetime]]: (用户 ID, 水位线) 列表。
+        """
+        query = select(UserTokenWatermark.user_id, UserTokenWatermark.revoked_before)
+        if updated_since is not None:
+            query = query.where(UserTokenWatermark.updated_at >= updated_since)
+        result = await self.db.execute(query)
+        return [(user_id, _as_utc(revoked_before)) for user_id, revoked_before in result.all()]
+
+    async def delete_expired(self, now: datetime, limit: Optional[int] = None) -> int:
+        """
+        删除已过期令牌的撤销记录（清理任务）。
+
+        Args:
+            now (datetime): 当前时间。
+            limit (Optional[int]): 单批最多删除的数量，None 表示全部删除。
+
+        Returns:
+            int: 删除的记录数。
+        """
+        result = await self.db.execute(
+            limited_delete(RevokedAccessToken, RevokedAccessToken.expires_at <= now, limit=limit)
+        )
+        return result.rowcount
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite 不保存时区信息，读出的时间按 UTC 处理
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
@@ -4,6 +4,7 @@ from typing import Optional
 from uuid import UUID
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from app.models.user import User
 
@@ -65,6 +66,39 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_principal(self, user_id: UUID) -> Optional[User]:
+        """
+        根据 ID 获取当前请求的用户主体，不加载任何关联集合。
+
+        Args:
+            user_id (UUID): 用户 ID。
+
+        Returns:
+            Optional[User]: 找到的用户，若不存在则返回 None。
+        """
+        result = await self.db.execute(
+            select(User).where(User.id == user_id).options(raiseload("*"))
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_for_login(self, email: str) -> Optional[User]:
+        """
+        根据电子邮箱获取用于认证的用户，不加载任何关联集合。
+
+        User 的关联默认以 selectin 方式加载，登录只需要用户本身的列，
+        这里禁止关联加载以避免额外的查询。
+
+        Args:
+            email (str): 电子邮箱。
+
+        Returns:
+            Optional[User]: 找到的用户，若不存在则返回 None。
+        """
+        result = await self.db.execute(
+            select(User).where(User.email == email.lower()).options(raiseload("*"))
+        )
+        return result.scalar_one_or_none()
+    
     async def get_by_username(self, username: str) -> Optional[User]:
         """
         根据用户名获取用户。
@@ -45,6 +45,34 @@ class ApprovalProcessRequest(BaseModel):
     attachments: Optional[List[AttachmentRequest]] = Field(None, description="附件列表")
 
 
+class ApprovalBatchProcessRequest(BaseModel):
+    """批量审批处理请求模型。"""
+    
+    approval_ids: List[UUID] = Field(..., min_length=1, description="审批ID列表")
+    action: str = Field(..., description="操作类型: approve, reject, return")
+    comment: Optional[str] = Field(None, description="审批意见（应用于每个申请）")
+    attachments: Optional[List[AttachmentRequest]] = Field(None, description="附件列表")
+
+
+class ApprovalBatchItemResult(BaseModel):
+    """批量审批中单个申请的处理结果。"""
+    
+    approval_id: UUID = Field(..., description="审批ID")
+    success: bool = Field(..., description="是否处理成功")
+    status: Optional[str] = Field(None, description="处理后的审批状态")
+    code: str = Field(..., description="结果代码")
+    message: str = Field(..., description="结果说明")
+
+
+class ApprovalBatchProcessResponse(BaseModel):
+    """批量审批处理响应模型。"""
+    
+    total: int = Field(..., description="处理的申请数")
+    succeeded: int = Field(..., description="成功数")
+    failed: int = Field(..., description="失败数")
+    items: List[ApprovalBatchItemResult] = Field(default_factory=list, description="逐项结果")
+
+
 class ApprovalResponse(BaseModel):
     """审批响应模型。"""
     
@@ -18,7 +18,8 @@ class AttachmentResponse(BaseModel):
     file_name: str = Field(..., description="文件名")
     file_type: str = Field(..., description="文件类型（MIME type）")
     file_size: int = Field(..., description="文件大小（字节）")
-    ipfs_cid: str = Field(..., description="IPFS CID")
+    ipfs_cid: Optional[str] = Field(None, description="IPFS CID（后台上传完成前为空）")
+    upload_status: str = Field("UPLOADED", description="上传状态: PENDING_UPLOAD/UPLOADED/FAILED")
     is_primary: bool = Field(..., description="是否主附件")
     uploaded_at: datetime = Field(..., description="上传时间")
     
@@ -0,0 +1,39 @@
+"""资产批量导入相关数据模型。"""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class AssetImportJobResponse(BaseModel):
+    """导入任务状态与进度。"""
+
+    id: UUID = Field(..., description="导入任务 ID")
+    enterprise_id: UUID = Field(..., description="企业 ID")
+    created_by: UUID = Field(..., description="发起导入的用户 ID")
+    manifest_format: str = Field(..., description="清单格式: csv/json")
+    status: str = Field(..., description="任务状态: PENDING/RUNNING/COMPLETED/FAILED")
+    total_rows: Optional[int] = Field(None, description="清单总行数（开始处理后填写）")
+    processed_rows: int = Field(..., description="已处理行数")
+    imported_rows: int = Field(..., description="成功导入的资产数")
+    failed_rows: int = Field(..., description="失败行数")
+    attachments_enqueued: int = Field(..., description="加入上传队列的附件数")
+    error: Optional[str] = Field(None, description="任务级错误信息")
+    created_at: datetime = Field(..., description="创建时间")
+    started_at: Optional[datetime] = Field(None, description="开始处理时间")
+    finished_at: Optional[datetime] = Field(None, description="处理完成时间")
+
+    class Config:
+        from_attributes = True
+
+
+class AssetImportErrorResponse(BaseModel):
+    """导入任务的单行错误。"""
+
+    row_number: int = Field(..., description="清单中的行号（从 1 开始，不含 CSV 表头）")
+    field: Optional[str] = Field(None, description="出错的字段")
+    message: str = Field(..., description="错误信息")
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,62 @@
+"""仪表盘相关数据模型。"""
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class MintFunnel(BaseModel):
+    """铸造漏斗（每个阶段包含已进入后续阶段的资产）。"""
+
+    created: int = Field(..., description="资产总数")
+    submitted: int = Field(..., description="已提交审批")
+    approved: int = Field(..., description="已通过审批")
+    mint_attempted: int = Field(..., description="已发起铸造")
+    minted: int = Field(..., description="已铸造（含已转移、许可、质押）")
+    minting: int = Field(..., description="铸造中")
+    mint_failed: int = Field(..., description="铸造失败")
+    rejected: int = Field(..., description="审批被拒绝")
+    submit_rate: Optional[float] = Field(None, description="提交率 submitted / created")
+    approval_rate: Optional[float] = Field(None, description="通过率 approved / submitted")
+    mint_success_rate: Optional[float] = Field(None, description="铸造成功率 minted / mint_attempted")
+    conversion_rate: Optional[float] = Field(None, description="整体转化率 minted / created")
+
+
+class DashboardAssetSummary(BaseModel):
+    """资产分布与铸造漏斗。"""
+
+    total: int = Field(..., description="资产总数")
+    by_type: Dict[str, int] = Field(..., description="按资产类型")
+    by_status: Dict[str, int] = Field(..., description="按资产状态")
+    by_legal_status: Dict[str, int] = Field(..., description="按法律状态")
+    mint_funnel: MintFunnel = Field(..., description="铸造漏斗")
+
+
+class TransferVolumePoint(BaseModel):
+    """单日转移量。"""
+
+    day: date = Field(..., description="日期（UTC）")
+    incoming: int = Field(..., description="转入记录数")
+    outgoing: int = Field(..., description="转出记录数")
+    by_type: Dict[str, int] = Field(default_factory=dict, description="按权属变更类型（转入与转出合计）")
+
+
+class ApprovalBacklogItem(BaseModel):
+    """单个企业的待审批积压。"""
+
+    enterprise_id: UUID = Field(..., description="企业 ID")
+    enterprise_name: str = Field(..., description="企业名称")
+    pending: int = Field(..., description="待审批数量")
+    by_type: Dict[str, int] = Field(..., description="按审批类型")
+    oldest_pending_at: Optional[datetime] = Field(None, description="最早的待审批提交时间")
+
+
+class DashboardOverviewResponse(BaseModel):
+    """仪表盘响应模型。"""
+
+    enterprise_ids: List[UUID] = Field(default_factory=list, description="统计范围内的企业 ID")
+    assets: DashboardAssetSummary = Field(..., description="资产分布与铸造漏斗")
+    transfer_volume: List[TransferVolumePoint] = Field(default_factory=list, description="每日转移量")
+    approval_backlog: List[ApprovalBacklogItem] = Field(default_factory=list, description="各企业待审批积压")
+    refreshed_at: Optional[datetime] = Field(None, description="汇总表最近一次刷新完成的时间")
@@ -1,11 +1,19 @@
 """审批业务逻辑服务。"""
+import copy
+import uuid
+from collections import Counter
 from datetime import datetime, timezone
-from typing import Optional, List, Tuple
+from typing import Any, Dict, Optional, List, Tuple
 from uuid import UUID
 
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import asset_tag, cache_service, enterprise_tag, invalidate_after_commit, user_tag
+from app.core.config import settings
+from app.core.events import APPROVALS_TOPIC, publish_after_commit, user_topic
 from app.core.exceptions import (
+    AppException,
     NotFoundException,
     ForbiddenException,
     ConflictException,
@@ -21,8 +29,10 @@ from app.models.approval import (
 )
 from app.models.enterprise import Enterprise, EnterpriseMember
 from app.models.user import User
-from app.models.asset import AssetStatus
+from app.models.asset import Asset, AssetStatus
 from app.repositories.approval_repository import (
+    APPROVAL_STATS_TAG,
+    ApprovalCounterRepository,
     ApprovalRepository,
     ApprovalProcessRepository,
     ApprovalNotificationRepository,
@@ -77,6 +87,53 @@ class EnterpriseNotPendingError(ConflictException):
         super().__init__("该企业不处于待审批状态", "ENTERPRISE_NOT_PENDING")
 
 
+# 操作到审批状态、审批结果到资产状态的映射
+_ACTION_STATUS = {
+    ApprovalAction.APPROVE: ApprovalStatus.APPROVED,
+    ApprovalAction.REJECT: ApprovalStatus.REJECTED,
+    ApprovalAction.RETURN: ApprovalStatus.RETURNED,
+}
+
+_ACTION_MESSAGES = {
+    ApprovalAction.APPROVE: "审批通过",
+    ApprovalAction.REJECT: "审批已拒绝",
+    ApprovalAction.RETURN: "审批已退回",
+}
+
+_ASSET_STATUS_BY_RESULT = {
+    ApprovalStatus.APPROVED: AssetStatus.APPROVED,
+    ApprovalStatus.REJECTED: AssetStatus.REJECTED,
+    ApprovalStatus.RETURNED: AssetStatus.DRAFT,
+}
+
+# 企业信息变更审批不能修改的列
+_ENTERPRISE_READONLY_COLUMNS = frozenset({"id", "created_at", "updated_at"})
+
+
+def _enterprise_update_values(changes: Optional[dict]) -> Dict[str, Any]:
+    """
+    从企业信息变更申请中取出要写入企业表的字段。
+
+    只接受企业表中可修改的列；值为 None 表示清空该字段，非空列的 None 值被忽略。
+
+    Args:
+        changes: 审批记录的 ``changes``（包含 ``new_values``）
+
+    Returns:
+        Dict[str, Any]: 列名到新值的映射
+    """
+    columns = Enterprise.__table__.columns
+    values = {}
+    for key, value in ((changes or {}).get("new_values") or {}).items():
+        column = columns.get(key)
+        if column is None or key in _ENTERPRISE_READONLY_COLUMNS:
+            continue
+        if value is None and not column.nullable:
+            continue
+        values[key] = value
+    return values
+
+
 # ============================================================================
 # 审批服务类
 # ============================================================================
@@ -103,6 +160,7 @@ class ApprovalService:
         self.approval_repo = ApprovalRepository(db)
         self.process_repo = ApprovalProcessRepository(db)
         self.notification_repo = ApprovalNotificationRepository(db)
+        self.counter_repo = ApprovalCounterRepository(db)
         self.enterprise_repo = EnterpriseRepository(db)
     
     # ========================================================================
@@ -281,18 +339,16 @@ class ApprovalService:
             raise InvalidApprovalActionError("只支持通过、拒绝、退回操作")
 
         # 4. 更新审批记录
-        if action == ApprovalAction.APPROVE:
-            approval.status = ApprovalStatus.APPROVED
-        elif action == ApprovalAction.REJECT:
-            approval.status = ApprovalStatus.REJECTED
-        elif action == ApprovalAction.RETURN:
-            approval.status = ApprovalStatus.RETURNED
+        approval.status = _ACTION_STATUS[action]
         
         approval.completed_at = datetime.now(timezone.utc)
         await self.approval_repo.update_approval(approval)
+        await self.counter_repo.record_transition(
+            {approval.type: 1}, ApprovalStatus.PENDING, approval.status
+        )
         
         # 6. 创建流程记录
-        next_step = len(await self.process_repo.get_processes_by_approval(approval_id)) + 1
+        next_step = (await self.process_repo.get_next_steps([approval_id]))[approval_id]
         process = ApprovalProcess(
             approval_id=approval_id,
             step=next_step,
@@ -313,10 +369,202 @@ class ApprovalService:
         
         # 8. 执行审批结果回调（如更新企业状态）
         await self._handle_approval_result(approval)
+        self._publish_results([approval], approval.status)
         await self.db.commit()
         
         return approval
     
+    async def process_approvals_batch(
+        self,
+        approval_ids: List[UUID],
+        operator_id: UUID,
+        action: ApprovalAction,
+        comment: str,
+        attachments: Optional[List[dict]] = None,
+        operator_role: str = "admin",
+    ) -> List[Dict[str, Any]]:
+        """
+        在一个事务内批量处理审批（通过/拒绝/退回）。
+        
+        状态流转用一条 UPDATE ... RETURNING 完成，流程记录与通知各一条批量 INSERT，
+        步骤序号用 MAX(step) 聚合计算，资产与企业的联动更新按目标状态分组执行。
+        已处理、不存在或由操作人本人提交的申请不会中断整批，逐项返回结果。
+        
+        Args:
+            approval_ids: 审批记录ID列表
+            operator_id: 操作人用户ID
+            action: 操作类型（通过/拒绝/退回）
+            comment: 审批意见
+            attachments: 附件列表
+            operator_role: 操作人角色
+            
+        Returns:
+            List[Dict[str, Any]]: 每个申请的处理结果，顺序与请求一致（重复ID只保留一次）
+            
+        Raises:
+            InvalidApprovalActionError: 无效的审批操作
+            BadRequestException: 申请列表为空或超过单批上限
+        """
+        if action not in _ACTION_STATUS:
+            raise InvalidApprovalActionError("只支持通过、拒绝、退回操作")
+        
+        approval_ids = list(dict.fromkeys(approval_ids))
+        if not approval_ids:
+            raise BadRequestException("审批申请列表不能为空", "EMPTY_APPROVAL_BATCH")
+        if len(approval_ids) > settings.APPROVAL_BATCH_MAX_ITEMS:
+            raise BadRequestException(
+                f"单次最多批量处理 {settings.APPROVAL_BATCH_MAX_ITEMS} 个审批申请",
+                "APPROVAL_BATCH_TOO_LARGE",
+            )
+        
+        new_status = _ACTION_STATUS[action]
+        now = datetime.now(timezone.utc)
+        
+        # 1. 状态流转（仅待审批记录），返回后续步骤所需字段
+        transitioned = await self.approval_repo.transition_pending(
+            approval_ids, new_status, now, exclude_applicant_id=operator_id
+        )
+        processed = {row.id: row for row in transitioned}
+        
+        # 2. 流程记录与通知批量写入
+        if transitioned:
+            await self.counter_repo.record_transition(
+                Counter(row.type for row in transitioned), ApprovalStatus.PENDING, new_status
+            )
+            processed_ids = list(processed)
+            next_steps = await self.process_repo.get_next_steps(processed_ids)
+            await self.process_repo.create_processes([
+                {
+                    "id": uuid.uuid4(),
+                    "approval_id": row.id,
+                    "step": next_steps[row.id],
+                    "action": action,
+                    "operator_id": operator_id,
+                    "operator_role": operator_role,
+                    "comment": comment,
+                    "attachments": attachments,
+                    "created_at": now,
+                }
+                for row in transitioned
+            ])
+            notifications = []
+            for row in transitioned:
+                title, message = self._build_result_notification(row.type, action)
+                notifications.append({
+                    "id": uuid.uuid4(),
+                    "type": "approval_result",
+                    "recipient_id": row.applicant_id,
+                    "approval_id": row.id,
+                    "title": title,
+                    "content": message,
+                    "is_read": False,
+                    "created_at": now,
+                })
+            await self.notification_repo.create_notifications(notifications)
+            
+            # 3. 审批结果回调（按类型分组）
+            await self._handle_batch_results(transitioned, new_status)
+            self._publish_results(transitioned, new_status)
+        
+        await self.db.commit()
+        
+        # 4. 逐项结果：未流转的申请区分不存在、本人提交与已处理
+        applicants = await self.approval_repo.get_applicant_ids(
+            approval_id for approval_id in approval_ids if approval_id not in processed
+        )
+        results = []
+        for approval_id in approval_ids:
+            if approval_id in processed:
+                results.append({
+                    "approval_id": approval_id,
+                    "success": True,
+                    "status": new_status.value,
+                    "code": "SUCCESS",
+                    "message": _ACTION_MESSAGES[action],
+                })
+                continue
+            error: AppException
+            if approval_id not in applicants:
+                error = ApprovalNotFoundError()
+            elif applicants[approval_id] == operator_id:
+                error = ApprovalPermissionDeniedError("不能审批本人提交的申请")
+            else:
+                error = ApprovalAlreadyProcessedError()
+            results.append({
+                "approval_id": approval_id,
+                "success": False,
+                "status": None,
+                "code": error.code,
+                "message": error.message,
+            })
+        return results
+    
+    def _publish_results(self, approvals: List[Any], status: ApprovalStatus) -> None:
+        """
+        登记审批结果推送（事务提交后发送）：申请人各收到一条结果，审批队列收到一条变化通知。
+        
+        Args:
+            approvals: 已处理的审批（``Approval`` 或 ``transition_pending`` 返回的行）
+            status: 审批结果状态
+        """
+        for approval in approvals:
+            publish_after_commit(
+                self.db,
+                user_topic(approval.applicant_id),
+                "approval.processed",
+                {"approval_id": str(approval.id), "type": approval.type.value, "status": status.value},
+            )
+        publish_after_commit(
+            self.db,
+            APPROVALS_TOPIC,
+            "approval.processed",
+            {"approval_ids": [str(approval.id) for approval in approvals], "status": status.value},
+        )
+    
+    async def _handle_batch_results(self, rows: List[Any], status: ApprovalStatus) -> None:
+        """
+        批量执行审批结果回调，与 ``_handle_approval_result`` 的规则一致。
+        
+        资产状态与企业认证各用一条 UPDATE ... WHERE id IN (...)；
+        企业信息变更的内容因申请而异，逐个企业更新（与单个审批共用 ``_apply_enterprise_changes``）。
+        
+        Args:
+            rows: 已流转的审批记录（``transition_pending`` 的返回值）
+            status: 审批结果状态
+        """
+        asset_ids = [
+            row.asset_id for row in rows
+            if row.type == ApprovalType.ASSET_SUBMIT and row.asset_id
+        ]
+        if asset_ids:
+            invalidate_after_commit(self.db, *(asset_tag(asset_id) for asset_id in asset_ids))
+            await self.db.execute(
+                update(Asset)
+                .where(Asset.id.in_(asset_ids))
+                .values(status=_ASSET_STATUS_BY_RESULT[status])
+                .execution_options(synchronize_session=False)
+            )
+        
+        if status != ApprovalStatus.APPROVED:
+            return
+        
+        verified_ids = [
+            row.target_id for row in rows
+            if row.type == ApprovalType.ENTERPRISE_CREATE and row.target_type == "enterprise"
+        ]
+        if verified_ids:
+            invalidate_after_commit(self.db, *(enterprise_tag(enterprise_id) for enterprise_id in verified_ids))
+            await self.db.execute(
+                update(Enterprise)
+                .where(Enterprise.id.in_(verified_ids))
+                .values(is_verified=True)
+                .execution_options(synchronize_session=False)
+            )
+        
+        for row in rows:
+            if row.type == ApprovalType.ENTERPRISE_UPDATE and row.target_type == "enterprise":
+                await self._apply_enterprise_changes(row.target_id, row.changes)
+    
     async def _send_notification_to_applicant(
         self,
         approval: Approval,
@@ -331,18 +579,10 @@ class ApprovalService:
             action: 操作类型
             operator_id: 操作人ID
         """
-        # 根据操作类型确定通知内容
-        if action == ApprovalAction.APPROVE:
-            title = "审批已通过"
-            message = f"您的{self._get_approval_type_name(approval.type)}申请已通过审批。"
-        elif action == ApprovalAction.REJECT:
-            title = "审批已拒绝"
-            message = f"您的{self._get_approval_type_name(approval.type)}申请已被拒绝。"
-        elif action == ApprovalAction.RETURN:
-            title = "审批已退回"
-            message = f"您的{self._get_approval_type_name(approval.type)}申请需要补充材料。"
-        else:
+        content = self._build_result_notification(approval.type, action)
+        if content is None:
             return
+        title, message = content
         
         notification = ApprovalNotification(
             type="approval_result",
@@ -353,6 +593,30 @@ class ApprovalService:
         )
         
         await self.notification_repo.create_notification(notification)
+
+    def _build_result_notification(
+        self,
+        approval_type: ApprovalType,
+        action: ApprovalAction,
+    ) -> Optional[Tuple[str, str]]:
+        """
+        根据审批类型和操作生成结果通知的标题与内容。
+        
+        Args:
+            approval_type: 审批类型
+            action: 操作类型
+            
+        Returns:
+            Optional[Tuple[str, str]]: (标题, 内容)，不需要通知的操作返回 None
+        """
+        type_name = self._get_approval_type_name(approval_type)
+        if action == ApprovalAction.APPROVE:
+            return "审批已通过", f"您的{type_name}申请已通过审批。"
+        if action == ApprovalAction.REJECT:
+            return "审批已拒绝", f"您的{type_name}申请已被拒绝。"
+        if action == ApprovalAction.RETURN:
+            return "审批已退回", f"您的{type_name}申请需要补充材料。"
+        return None
     
     def _get_approval_type_name(self, approval_type: ApprovalType) -> str:
         """
@@ -405,6 +669,7 @@ class ApprovalService:
         if approval.target_type == "enterprise":
             enterprise = await self.enterprise_repo.get_by_id(approval.target_id)
             if enterprise:
+                invalidate_after_commit(self.db, enterprise_tag(enterprise.id))
                 await self.enterprise_repo.update(enterprise.id, is_verified=True)
     
     async def _handle_enterprise_update_approval(self, approval: Approval) -> None:
@@ -414,15 +679,26 @@ class ApprovalService:
         Args:
             approval: 审批记录
         """
-        if approval.target_type == "enterprise" and approval.changes:
-            enterprise = await self.enterprise_repo.get_by_id(approval.target_id)
-            if enterprise:
-                update_data = {}
-                for key, value in approval.changes.get("new_values", {}).items():
-                    if hasattr(enterprise, key):
-                        update_data[key] = value
-                if update_data:
-                    await self.enterprise_repo.update(enterprise.id, **update_data)
+        if approval.target_type == "enterprise":
+            await self._apply_enterprise_changes(approval.target_id, approval.changes)
+
+    async def _apply_enterprise_changes(self, enterprise_id: UUID, changes: Optional[dict]) -> None:
+        """
+        把企业信息变更申请的新值写入企业表（单个与批量审批共用，随审批事务一起提交）。
+
+        Args:
+            enterprise_id: 企业ID
+            changes: 审批记录的 ``changes``
+        """
+        update_data = _enterprise_update_values(changes)
+        if not update_data:
+            return
+        invalidate_after_commit(self.db, enterprise_tag(enterprise_id))
+        await self.db.execute(
+            update(Enterprise)
+            .where(Enterprise.id == enterprise_id)
+            .values(**update_data)
+        )
     
     async def _handle_asset_submit_approval(self, approval: Approval) -> None:
         """
@@ -437,6 +713,7 @@ class ApprovalService:
         asset_repo = AssetRepository(self.db)
         asset = await asset_repo.get_asset_by_id(approval.asset_id)
         if asset:
+            invalidate_after_commit(self.db, asset_tag(asset.id))
             asset.status = AssetStatus.APPROVED
             await asset_repo.update_asset(asset)
     
@@ -453,6 +730,7 @@ class ApprovalService:
         asset_repo = AssetRepository(self.db)
         asset = await asset_repo.get_asset_by_id(approval.asset_id)
         if asset:
+            invalidate_after_commit(self.db, asset_tag(asset.id))
             asset.status = AssetStatus.REJECTED
             await asset_repo.update_asset(asset)
     
@@ -469,6 +747,7 @@ class ApprovalService:
         asset_repo = AssetRepository(self.db)
         asset = await asset_repo.get_asset_by_id(approval.asset_id)
         if asset:
+            invalidate_after_commit(self.db, asset_tag(asset.id))
             asset.status = AssetStatus.DRAFT
             await asset_repo.update_asset(asset)
     
@@ -502,7 +781,7 @@ class ApprovalService:
         page: int = 1,
         page_size: int = 20,
         approval_type: Optional[ApprovalType] = None,
-    ) -> Tuple[List[Approval], int]:
+    ) -> Tuple[List[dict], int]:
         """
         获取待审批列表。
         
@@ -512,7 +791,7 @@ class ApprovalService:
             approval_type: 审批类型筛选
             
         Returns:
-            Tuple[List[Approval], int]: (审批列表, 总数)
+            Tuple[List[dict], int]: (按 ApprovalResponse 字段投影的审批行列表, 总数)
         """
         return await self.approval_repo.get_pending_approvals(
             page=page,
@@ -524,45 +803,41 @@ class ApprovalService:
         """
         获取审批统计数据。
         
+        读取增量维护的 ``approval_counters`` 计数表（行数只与状态数 × 类型数有关），
+        结果经应用缓存按 ``APPROVAL_STATS_CACHE_TTL`` 缓存，计数表变更提交后失效。
+        
         Returns:
-            dict: 统计数据，包括待处理、已通过、已拒绝等数量
+            dict: 各状态数量与总数，以及 ``by_type`` 下按审批类型细分的数量
         """
-        from sqlalchemy import select, func
-        from app.models.approval import Approval, ApprovalStatus
-        
-        # 统计各状态的审批数量
-        stats = {}
-        
-        # 待处理
-        pending_result = await self.db.execute(
-            select(func.count(Approval.id)).where(Approval.status == ApprovalStatus.PENDING)
-        )
-        stats["pending"] = pending_result.scalar() or 0
-        
-        # 已通过
-        approved_result = await self.db.execute(
-            select(func.count(Approval.id)).where(Approval.status == ApprovalStatus.APPROVED)
-        )
-        stats["approved"] = approved_result.scalar() or 0
-        
-        # 已拒绝
-        rejected_result = await self.db.execute(
-            select(func.count(Approval.id)).where(Approval.status == ApprovalStatus.REJECTED)
-        )
-        stats["rejected"] = rejected_result.scalar() or 0
+        async def load() -> dict:
+            return self._build_statistics(await self.counter_repo.get_counts())
         
-        # 已退回
-        returned_result = await self.db.execute(
-            select(func.count(Approval.id)).where(Approval.status == ApprovalStatus.RETURNED)
+        cached = await cache_service.get_or_load(
+            "approval_stats", "all", load, tags=(APPROVAL_STATS_TAG,), ttl=settings.APPROVAL_STATS_CACHE_TTL
         )
-        stats["returned"] = returned_result.scalar() or 0
-        
-        # 总计
-        total_result = await self.db.execute(
-            select(func.count(Approval.id))
-        )
-        stats["total"] = total_result.scalar() or 0
+        return copy.deepcopy(cached)
+    
+    @staticmethod
+    def _build_statistics(counts: Dict[Tuple[ApprovalStatus, ApprovalType], int]) -> dict:
+        """
+        把 (状态, 类型) 计数汇总为统计结果。
         
+        Args:
+            counts: (状态, 类型) 到数量的映射
+            
+        Returns:
+            dict: 统计数据
+        """
+        def empty() -> Dict[str, int]:
+            return {status.value: 0 for status in ApprovalStatus} | {"total": 0}
+        
+        stats = empty()
+        by_type = {approval_type.value: empty() for approval_type in ApprovalType}
+        for (status, approval_type), count in counts.items():
+            for bucket in (stats, by_type[approval_type.value]):
+                bucket[status.value] += count
+                bucket["total"] += count
+        stats["by_type"] = by_type
         return stats
     
     async def get_approval_history(
@@ -571,7 +846,7 @@ class ApprovalService:
         page_size: int = 20,
         status: Optional[ApprovalStatus] = None,
         approval_type: Optional[ApprovalType] = None,
-    ) -> Tuple[List[Approval], int]:
+    ) -> Tuple[List[dict], int]:
         """
         获取审批历史记录。
         
@@ -584,7 +859,7 @@ class ApprovalService:
             approval_type: 审批类型筛选
             
         Returns:
-            Tuple[List[Approval], int]: (审批列表, 总数)
+            Tuple[List[dict], int]: (按 ApprovalResponse 字段投影的审批行列表, 总数)
         """
         return await self.approval_repo.get_approval_history(
             page=page,
@@ -599,7 +874,7 @@ class ApprovalService:
         page: int = 1,
         page_size: int = 20,
         status: Optional[ApprovalStatus] = None,
-    ) -> Tuple[List[Approval], int]:
+    ) -> Tuple[List[dict], int]:
         """
         获取用户提交的审批申请列表。
         
@@ -610,7 +885,7 @@ class ApprovalService:
             status: 状态筛选
             
         Returns:
-            Tuple[List[Approval], int]: (审批列表, 总数)
+            Tuple[List[dict], int]: (按 ApprovalResponse 字段投影的审批行列表, 总数)
         """
         return await self.approval_repo.get_user_approvals(
             user_id=user_id,
@@ -659,7 +934,12 @@ class ApprovalService:
         Returns:
             int: 未读通知数量
         """
-        return await self.notification_repo.get_unread_count(user_id)
+        return await cache_service.get_or_load(
+            "unread_notifications",
+            user_id,
+            lambda: self.notification_repo.get_unread_count(user_id),
+            tags=(user_tag(user_id),),
+        )
     
     async def mark_notification_as_read(
         self,
@@ -688,4 +968,5 @@ class ApprovalService:
         if notification.recipient_id != user_id:
             raise ApprovalPermissionDeniedError("您无权操作此通知")
         
+        await self.db.commit()
         return notification
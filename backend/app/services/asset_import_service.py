@@ -0,0 +1,757 @@
+"""资产批量导入服务。
+
+接口只把清单（CSV / JSON）与附件压缩包（zip / tar）暂存到本地并创建 ``asset_import_jobs``
+任务，立即返回；后台 ``AssetImportWorker`` 领取任务后按 ``IMPORT_BATCH_SIZE`` 分批处理：
+
+1. 整批交给 ``TypeAdapter(List[AssetCreateRequest])`` 一次校验，出错的行写入错误表；
+2. 检查附件（压缩包中存在、扩展名、大小、数量），解出文件写入上传暂存区；
+3. 资产、附件、上传任务各用一条 executemany INSERT 写入，与任务进度、单行错误在同一事务中提交。
+
+附件由已有的 ``UploadWorker`` 在其并发上限内上传到 IPFS。进程崩溃后租约过期，
+其他工作进程从 ``processed_rows`` 处续跑；进度按旧值做条件更新，已提交的批次不会被重复导入。
+"""
+import asyncio
+import csv
+import json
+import logging
+import mimetypes
+import posixpath
+import shutil
+import tarfile
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.events import publish_after_commit, user_topic
+from app.models.asset import Asset, AssetStatus, Attachment, AttachmentUploadStatus
+from app.models.asset_import import AssetImportError, AssetImportJob, AssetImportStatus
+from app.models.upload_task import UploadTask, UploadTaskStatus
+from app.schemas.asset import AssetCreateRequest
+from app.services.asset_service_with_ipfs import AssetServiceWithIPFS
+from app.services.pinata_service import ALLOWED_EXTENSIONS, get_file_extension
+from app.services.upload_queue_service import (
+    PINATA_PROVIDER,
+    remove_spool_file,
+    spool_dir,
+    write_spool_file,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FORMATS = {".csv": "csv", ".json": "json"}
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+# CSV 清单中 inventors、files 列的多个值以分号分隔
+LIST_SEPARATOR = ";"
+
+_ROWS_ADAPTER = TypeAdapter(List[AssetCreateRequest])
+
+
+class ImportManifestError(Exception):
+    """清单或附件压缩包无法读取，整个导入任务失败。"""
+
+
+class ManifestRowError(Exception):
+    """清单中某一行的结构错误。"""
+
+    def __init__(self, field: Optional[str], message: str):
+        super().__init__(message)
+        self.field = field
+        self.message = message
+
+
+@dataclass
+class RowError:
+    """单行错误。"""
+
+    row_number: int
+    field: Optional[str]
+    message: str
+
+
+@dataclass
+class ValidRow:
+    """通过校验的一行：资产数据与附件在压缩包中的路径。"""
+
+    row_number: int
+    request: AssetCreateRequest
+    files: List[str] = field(default_factory=list)
+
+
+def manifest_format_for(filename: Optional[str]) -> Optional[str]:
+    """按文件扩展名判断清单格式，不支持时返回 None。"""
+    return MANIFEST_FORMATS.get(get_file_extension(filename or ""))
+
+
+def archive_suffix_for(filename: Optional[str]) -> Optional[str]:
+    """返回压缩包的扩展名（含 ``.tar.gz`` 这类双扩展名），不支持时返回 None。"""
+    lowered = (filename or "").lower()
+    for suffix in ARCHIVE_SUFFIXES:
+        if lowered.endswith(suffix):
+            return suffix
+    return None
+
+
+def _import_spool_dir() -> Path:
+    path = Path(settings.IMPORT_SPOOL_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def spool_import_file(source: BinaryIO, suffix: str) -> str:
+    """
+    把上传的清单或压缩包复制到导入暂存区。
+
+    Args:
+        source: 上传文件对象
+        suffix: 暂存文件扩展名
+
+    Returns:
+        str: 暂存路径
+    """
+    path = _import_spool_dir() / f"{uuid.uuid4().hex}{suffix}"
+    tmp_path = path.with_suffix(path.suffix + ".part")
+    with open(tmp_path, "wb") as fh:
+        shutil.copyfileobj(source, fh, 1024 * 1024)
+    tmp_path.replace(path)
+    return str(path)
+
+
+def _normalize_member_name(name: str) -> str:
+    name = name.replace("\\", "/").lstrip("/")
+    return posixpath.normpath(name) if name else name
+
+
+class ImportArchive:
+    """附件压缩包的只读索引（zip 或 tar，tar 可带 gzip 压缩）。"""
+
+    def __init__(self, path: str):
+        """
+        打开压缩包并建立成员索引。
+
+        Args:
+            path: 压缩包路径
+
+        Raises:
+            ImportManifestError: 压缩包无法读取
+        """
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        # 路径 -> (成员在包内的偏移量, 文件大小, 成员对象)
+        self.entries: Dict[str, Tuple[int, int, Any]] = {}
+        try:
+            if zipfile.is_zipfile(path):
+                self._zip = zipfile.ZipFile(path)
+                for info in self._zip.infolist():
+                    if not info.is_dir():
+                        self.entries[_normalize_member_name(info.filename)] = (info.header_offset, info.file_size, info)
+            else:
+                self._tar = tarfile.open(path, "r:*")
+                for member in self._tar.getmembers():
+                    if member.isfile():
+                        self.entries[_normalize_member_name(member.name)] = (member.offset_data, member.size, member)
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as exc:
+            self.close()
+            raise ImportManifestError(f"无法读取附件压缩包：{exc}") from exc
+
+    def size(self, name: str) -> Optional[int]:
+        """返回成员大小，不存在时返回 None。"""
+        entry = self.entries.get(name)
+        return entry[1] if entry else None
+
+    def offset(self, name: str) -> int:
+        """返回成员在包内的偏移量，用于按存储顺序读取。"""
+        return self.entries[name][0]
+
+    def read(self, name: str) -> bytes:
+        """读取成员内容。"""
+        member = self.entries[name][2]
+        if self._zip is not None:
+            return self._zip.read(member)
+        fh = self._tar.extractfile(member)
+        try:
+            return fh.read()
+        finally:
+            fh.close()
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+
+def load_manifest(path: str, manifest_format: str) -> List[Any]:
+    """
+    读取清单的全部行（尚未校验）。
+
+    Args:
+        path: 清单路径
+        manifest_format: ``csv`` 或 ``json``
+
+    Returns:
+        List[Any]: CSV 为每行的列名到单元格的映射，JSON 为数组元素
+
+    Raises:
+        ImportManifestError: 清单无法解析
+    """
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as fh:
+            if manifest_format == "csv":
+                reader = csv.DictReader(fh)
+                if not reader.fieldnames:
+                    raise ImportManifestError("CSV 清单缺少表头")
+                return list(reader)
+            rows = json.load(fh)
+    except (OSError, UnicodeDecodeError, csv.Error, json.JSONDecodeError) as exc:
+        raise ImportManifestError(f"无法解析清单：{exc}") from exc
+    if not isinstance(rows, list):
+        raise ImportManifestError("JSON 清单必须是对象数组")
+    return rows
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(LIST_SEPARATOR) if item.strip()]
+
+
+def _normalize_row(raw: Any, manifest_format: str) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    把清单中的一行转换为 ``AssetCreateRequest`` 的输入与附件路径列表。
+
+    Raises:
+        ManifestRowError: 行结构错误
+    """
+    if not isinstance(raw, dict):
+        raise ManifestRowError(None, "每一行必须是 JSON 对象")
+    data = {key.strip(): value for key, value in raw.items() if isinstance(key, str)}
+    files = data.pop("files", None)
+    if manifest_format == "csv":
+        data["inventors"] = _split_list(data.get("inventors"))
+        metadata = (data.get("asset_metadata") or "").strip()
+        try:
+            data["asset_metadata"] = json.loads(metadata) if metadata else {}
+        except json.JSONDecodeError as exc:
+            raise ManifestRowError("asset_metadata", f"asset_metadata 不是合法的 JSON：{exc.msg}")
+        return data, _split_list(files)
+    if files is None:
+        return data, []
+    if not isinstance(files, list) or not all(isinstance(name, str) for name in files):
+        raise ManifestRowError("files", "files 必须是字符串数组")
+    return data, [name.strip() for name in files if name.strip()]
+
+
+def _check_files(files: List[str], archive: Optional[ImportArchive]) -> Optional[str]:
+    """检查一行的附件，返回第一条错误信息，全部通过时返回 None。"""
+    if len(files) > AssetServiceWithIPFS.MAX_FILES_PER_REQUEST:
+        return f"每个资产最多 {AssetServiceWithIPFS.MAX_FILES_PER_REQUEST} 个附件"
+    for name in files:
+        if archive is None:
+            return f"清单引用了附件 {name}，但未上传附件压缩包"
+        size = archive.size(_normalize_member_name(name))
+        if size is None:
+            return f"压缩包中不存在附件 {name}"
+        extension = get_file_extension(name)
+        if extension not in ALLOWED_EXTENSIONS:
+            return f"不支持的文件类型: {extension}"
+        if size > AssetServiceWithIPFS.MAX_FILE_SIZE:
+            return f"附件 {name} 超过大小限制（最大 {AssetServiceWithIPFS.MAX_FILE_SIZE // 1024 // 1024}MB）"
+    return None
+
+
+def validate_batch(
+    raw_rows: List[Any],
+    first_row_number: int,
+    manifest_format: str,
+    archive: Optional[ImportArchive],
+) -> Tuple[List[ValidRow], List[RowError]]:
+    """
+    校验一批清单行。
+
+    整批只调用一次 ``TypeAdapter.validate_python``；有行出错时按错误位置剔除这些行，
+    再校验剩余的行（通常只需再调用一次）。
+
+    Args:
+        raw_rows: 清单行
+        first_row_number: 第一行的行号
+        manifest_format: 清单格式
+        archive: 附件压缩包
+
+    Returns:
+        Tuple[List[ValidRow], List[RowError]]: (通过校验的行, 单行错误)
+    """
+    errors: List[RowError] = []
+    pending: List[Tuple[int, Dict[str, Any], List[str]]] = []
+    for offset, raw in enumerate(raw_rows):
+        row_number = first_row_number + offset
+        try:
+            data, files = _normalize_row(raw, manifest_format)
+        except ManifestRowError as exc:
+            errors.append(RowError(row_number, exc.field, exc.message))
+            continue
+        pending.append((row_number, data, files))
+
+    requests: List[AssetCreateRequest] = []
+    while pending:
+        try:
+            requests = _ROWS_ADAPTER.validate_python([data for _, data, _ in pending])
+            break
+        except ValidationError as exc:
+            failed: Dict[int, List[dict]] = {}
+            for error in exc.errors(include_url=False, include_input=False):
+                failed.setdefault(error["loc"][0], []).append(error)
+            for index, row_errors in sorted(failed.items()):
+                for error in row_errors:
+                    loc = ".".join(str(part) for part in error["loc"][1:])
+                    errors.append(RowError(pending[index][0], loc or None, error["msg"]))
+            pending = [row for index, row in enumerate(pending) if index not in failed]
+
+    valid: List[ValidRow] = []
+    for (row_number, _, files), request in zip(pending, requests):
+        message = _check_files(files, archive)
+        if message:
+            errors.append(RowError(row_number, "files", message))
+            continue
+        valid.append(ValidRow(row_number, request, [_normalize_member_name(name) for name in files]))
+    errors.sort(key=lambda error: error.row_number)
+    return valid, errors
+
+
+def _extract_files(archive: ImportArchive, items: List[Tuple[str, Path]]) -> None:
+    """按成员在包内的顺序解出附件写入上传暂存区（压缩的 tar 只能顺序读取）。"""
+    for name, spool_path in sorted(items, key=lambda item: archive.offset(item[0])):
+        write_spool_file(spool_path, archive.read(name))
+
+
+class AssetImportService:
+    """资产批量导入业务逻辑。"""
+
+    def __init__(self, db: AsyncSession, batch_size: Optional[int] = None):
+        """
+        初始化导入服务。
+
+        Args:
+            db: 数据库会话
+            batch_size: 每批处理的行数，默认 ``IMPORT_BATCH_SIZE``
+        """
+        self.db = db
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+
+    async def create_job(
+        self,
+        enterprise_id: uuid.UUID,
+        created_by: uuid.UUID,
+        manifest_format: str,
+        manifest_path: str,
+        archive_path: Optional[str] = None,
+    ) -> AssetImportJob:
+        """
+        创建待处理的导入任务并提交。
+
+        Args:
+            enterprise_id: 企业 ID
+            created_by: 发起导入的用户 ID
+            manifest_format: 清单格式
+            manifest_path: 清单暂存路径
+            archive_path: 附件压缩包暂存路径
+
+        Returns:
+            AssetImportJob: 导入任务
+        """
+        job = AssetImportJob(
+            enterprise_id=enterprise_id,
+            created_by=created_by,
+            manifest_format=manifest_format,
+            manifest_path=manifest_path,
+            archive_path=archive_path,
+            status=AssetImportStatus.PENDING,
+            processed_rows=0,
+            imported_rows=0,
+            failed_rows=0,
+            attachments_enqueued=0,
+        )
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def get_job(self, job_id: uuid.UUID) -> Optional[AssetImportJob]:
+        """按 ID 获取导入任务。"""
+        return await self.db.get(AssetImportJob, job_id)
+
+    async def list_errors(
+        self,
+        job_id: uuid.UUID,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> Tuple[List[AssetImportError], int]:
+        """
+        分页获取导入任务的单行错误（按行号排序）。
+
+        Args:
+            job_id: 导入任务 ID
+            page: 页码
+            page_size: 每页数量
+
+        Returns:
+            Tuple[List[AssetImportError], int]: (错误列表, 总数)
+        """
+        total = await self.db.scalar(
+            select(func.count()).select_from(AssetImportError).where(AssetImportError.job_id == job_id)
+        )
+        result = await self.db.execute(
+            select(AssetImportError)
+            .where(AssetImportError.job_id == job_id)
+            .order_by(AssetImportError.row_number, AssetImportError.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        return list(result.scalars().all()), total or 0
+
+    async def run_job(self, job: AssetImportJob, stopping: Optional[asyncio.Event] = None) -> None:
+        """
+        处理已领取的导入任务，从 ``processed_rows`` 处继续。
+
+        Args:
+            job: 状态为 RUNNING 的导入任务
+            stopping: 工作进程停止信号；置位后在批次之间把任务退回 PENDING，下次启动立即续跑
+        """
+        archive: Optional[ImportArchive] = None
+        try:
+            rows = await asyncio.to_thread(load_manifest, job.manifest_path, job.manifest_format)
+            if len(rows) > settings.IMPORT_MAX_ROWS:
+                raise ImportManifestError(f"清单行数 {len(rows)} 超过上限 {settings.IMPORT_MAX_ROWS}")
+            if job.archive_path:
+                archive = await asyncio.to_thread(ImportArchive, job.archive_path)
+        except ImportManifestError as exc:
+            await self.finish_job(job, AssetImportStatus.FAILED, str(exc))
+            return
+
+        try:
+            if job.total_rows != len(rows):
+                job.total_rows = len(rows)
+                await self.db.commit()
+            while job.processed_rows < len(rows):
+                if stopping is not None and stopping.is_set():
+                    job.status = AssetImportStatus.PENDING
+                    job.locked_at = None
+                    await self.db.commit()
+                    return
+                start = job.processed_rows
+                batch = rows[start:start + self.batch_size]
+                if not await self._import_batch(job, batch, start, archive):
+                    logger.warning("导入任务 %s 已被其他工作进程接管，停止处理", job.id)
+                    return
+        finally:
+            if archive is not None:
+                await asyncio.to_thread(archive.close)
+        await self.finish_job(job, AssetImportStatus.COMPLETED)
+
+    async def finish_job(self, job: AssetImportJob, status: AssetImportStatus, error: Optional[str] = None) -> None:
+        """
+        把任务标记为完成或失败，并删除暂存的清单与压缩包。
+
+        Args:
+            job: 导入任务
+            status: COMPLETED 或 FAILED
+            error: 任务级错误信息
+        """
+        job.status = status
+        job.error = error
+        job.locked_at = None
+        job.finished_at = datetime.now(timezone.utc)
+        publish_after_commit(self.db, user_topic(job.created_by), "asset_import.progress", self._progress(job))
+        await self.db.commit()
+        for path in (job.manifest_path, job.archive_path):
+            if path:
+                await asyncio.to_thread(remove_spool_file, path)
+        logger.info(
+            "asset_import_finished",
+            extra={
+                "job_id": str(job.id),
+                "status": status.value,
+                "imported_rows": job.imported_rows,
+                "failed_rows": job.failed_rows,
+                "error": error,
+            },
+        )
+
+    async def _import_batch(
+        self,
+        job: AssetImportJob,
+        batch: List[Any],
+        start: int,
+        archive: Optional[ImportArchive],
+    ) -> bool:
+        """
+        校验并写入一批行，与任务进度在同一事务中提交。
+
+        Returns:
+            bool: False 表示进度已被其他工作进程推进（租约被接管），本批已回滚
+        """
+        valid, errors = await asyncio.to_thread(validate_batch, batch, start + 1, job.manifest_format, archive)
+
+        now = datetime.now(timezone.utc)
+        asset_rows: List[dict] = []
+        attachment_rows: List[dict] = []
+        task_rows: List[dict] = []
+        spool_items: List[Tuple[str, Path]] = []
+        upload_dir = spool_dir()
+        for row in valid:
+            request = row.request
+            asset_id = uuid.uuid4()
+            asset_rows.append({
+                "id": asset_id,
+                "enterprise_id": job.enterprise_id,
+                "creator_user_id": job.created_by,
+                "name": request.name,
+                "type": request.type,
+                "description": request.description,
+                "creator_name": request.creator_name,
+                "inventors": request.inventors,
+                "creation_date": request.creation_date,
+                "legal_status": request.legal_status,
+                "application_number": request.application_number,
+                "rights_declaration": request.rights_declaration,
+                "asset_metadata": request.asset_metadata,
+                "status": AssetStatus.DRAFT,
+                "created_at": now,
+                "updated_at": now,
+            })
+            for index, name in enumerate(row.files):
+                attachment_id = uuid.uuid4()
+                file_name = posixpath.basename(name)
+                content_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+                file_size = archive.size(name)
+                spool_path = upload_dir / f"{uuid.uuid4().hex}{get_file_extension(file_name)}"
+                spool_items.append((name, spool_path))
+                attachment_rows.append({
+                    "id": attachment_id,
+                    "asset_id": asset_id,
+                    "file_name": file_name,
+                    "file_type": content_type,
+                    "file_size": file_size,
+                    "ipfs_cid": None,
+                    "upload_status": AttachmentUploadStatus.PENDING_UPLOAD,
+                    "is_primary": index == 0,
+                    "uploaded_at": now,
+                })
+                task_rows.append({
+                    "id": uuid.uuid4(),
+                    "attachment_id": attachment_id,
+                    "asset_id": asset_id,
+                    "provider": PINATA_PROVIDER,
+                    "spool_path": str(spool_path),
+                    "file_name": file_name,
+                    "content_type": content_type,
+                    "file_size": file_size,
+                    "upload_metadata": {
+                        "asset_name": request.name,
+                        "file_name": file_name,
+                        "content_type": content_type,
+                    },
+                    "status": UploadTaskStatus.PENDING,
+                    "attempts": 0,
+                    "max_attempts": settings.UPLOAD_MAX_ATTEMPTS,
+                    "next_attempt_at": now,
+                })
+
+        if spool_items:
+            await asyncio.to_thread(_extract_files, archive, spool_items)
+
+        processed = start + len(batch)
+        imported = job.imported_rows + len(valid)
+        failed = job.failed_rows + len({error.row_number for error in errors})
+        enqueued = job.attachments_enqueued + len(attachment_rows)
+        try:
+            if asset_rows:
+                await self.db.execute(insert(Asset.__table__), asset_rows)
+            if attachment_rows:
+                await self.db.execute(insert(Attachment.__table__), attachment_rows)
+                await self.db.execute(insert(UploadTask.__table__), task_rows)
+            if errors:
+                await self.db.execute(
+                    insert(AssetImportError.__table__),
+                    [
+                        {
+                            "id": uuid.uuid4(),
+                            "job_id": job.id,
+                            "row_number": error.row_number,
+                            "field": error.field,
+                            "message": error.message,
+                        }
+                        for error in errors
+                    ],
+                )
+            # 以旧的 processed_rows 为条件：租约过期被其他进程接管时本批整体回滚，不会重复导入
+            result = await self.db.execute(
+                update(AssetImportJob)
+                .where(AssetImportJob.id == job.id, AssetImportJob.processed_rows == start)
+                .values(
+                    processed_rows=processed,
+                    imported_rows=imported,
+                    failed_rows=failed,
+                    attachments_enqueued=enqueued,
+                    locked_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                await self.db.rollback()
+                await self._discard_spool_files(spool_items)
+                return False
+            publish_after_commit(
+                self.db,
+                user_topic(job.created_by),
+                "asset_import.progress",
+                {
+                    **self._progress(job),
+                    "processed_rows": processed,
+                    "imported_rows": imported,
+                    "failed_rows": failed,
+                },
+            )
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            await self._discard_spool_files(spool_items)
+            raise
+        await self.db.refresh(job)
+        return True
+
+    @staticmethod
+    async def _discard_spool_files(items: List[Tuple[str, Path]]) -> None:
+        for _, spool_path in items:
+            await asyncio.to_thread(remove_spool_file, str(spool_path))
+
+    @staticmethod
+    def _progress(job: AssetImportJob) -> Dict[str, Any]:
+        return {
+            "job_id": str(job.id),
+            "enterprise_id": str(job.enterprise_id),
+            "status": job.status.value if isinstance(job.status, AssetImportStatus) else job.status,
+            "total_rows": job.total_rows,
+            "processed_rows": job.processed_rows,
+            "imported_rows": job.imported_rows,
+            "failed_rows": job.failed_rows,
+        }
+
+
+class AssetImportWorker:
+    """
+    后台导入工作进程。
+
+    每次领取一个待处理（或租约已过期）的导入任务并逐批处理，
+    多个工作进程之间通过 ``FOR UPDATE SKIP LOCKED`` 与租约超时避免重复处理。
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self._session_factory = session_factory
+        self.poll_interval = poll_interval if poll_interval is not None else settings.IMPORT_WORKER_POLL_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台轮询任务。"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="asset-import-worker")
+        logger.info("导入工作进程已启动")
+
+    async def stop(self) -> None:
+        """停止后台轮询任务，等待当前批次结束；未处理完的任务退回待处理状态。"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=30)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        finally:
+            self._task = None
+        logger.info("导入工作进程已停止")
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            processed = 0
+            try:
+                processed = await self.run_once()
+            except Exception as exc:
+                logger.error(f"导入工作进程轮询失败：{exc}")
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> int:
+        """
+        领取并处理一个导入任务。
+
+        Returns:
+            int: 本次处理的任务数（0 或 1）
+        """
+        job_id = await self._claim_job()
+        if job_id is None:
+            return 0
+        async with self.session_factory() as db:
+            job = await db.get(AssetImportJob, job_id)
+            try:
+                await AssetImportService(db).run_job(job, self._stopping)
+            except Exception as exc:
+                logger.error(f"导入任务 {job_id} 处理失败：{exc}")
+                await db.rollback()
+                job = await db.get(AssetImportJob, job_id, populate_existing=True)
+                await AssetImportService(db).finish_job(job, AssetImportStatus.FAILED, f"导入中断：{exc}")
+        return 1
+
+    async def _claim_job(self) -> Optional[uuid.UUID]:
+        now = datetime.now(timezone.utc)
+        lease_expired_at = now - timedelta(seconds=settings.IMPORT_JOB_LEASE_SECONDS)
+        async with self.session_factory() as db:
+            stmt = (
+                select(AssetImportJob)
+                .where(
+                    or_(
+                        AssetImportJob.status == AssetImportStatus.PENDING,
+                        and_(
+                            AssetImportJob.status == AssetImportStatus.RUNNING,
+                            AssetImportJob.locked_at <= lease_expired_at,
+                        ),
+                    )
+                )
+                .order_by(AssetImportJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = (await db.execute(stmt)).scalars().first()
+            if job is None:
+                return None
+            job.status = AssetImportStatus.RUNNING
+            job.locked_at = now
+            job.started_at = job.started_at or now
+            await db.commit()
+            return job.id
+
+
+# 全局导入工作进程实例
+asset_import_worker = AssetImportWorker()
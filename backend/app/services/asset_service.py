@@ -93,7 +93,7 @@ class AssetService:
         self,
         enterprise_id: UUID,
         filters: AssetFilterParams,
-    ) -> Tuple[List[Asset], int]:
+    ) -> Tuple[List[dict], int]:
         """
         获取企业的资产列表。
         
@@ -102,11 +102,11 @@ class AssetService:
             filters: 筛选参数
             
         Returns:
-            Tuple[List[Asset], int]: (资产列表, 总数)
+            Tuple[List[dict], int]: (按 AssetResponse 字段投影的资产行列表, 总数)
         """
         skip = (filters.page - 1) * filters.page_size
         
-        assets, total = await self.asset_repo.get_assets_by_enterprise(
+        assets, total = await self.asset_repo.list_enterprise_asset_rows(
             enterprise_id=enterprise_id,
             asset_type=filters.type,
             status=filters.status,
@@ -307,6 +307,11 @@ class AssetService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="附件不存在",
             )
+        if not attachment.ipfs_cid:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="附件尚未完成 IPFS 上传",
+            )
 
         gateway_url = get_pinata_service().get_gateway_url(attachment.ipfs_cid)
         try:
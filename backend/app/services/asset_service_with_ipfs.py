@@ -1,4 +1,4 @@
-"""支持IPFS自动上传的资产业务逻辑层。"""
+"""支持IPFS后台上传的资产业务逻辑层。"""
 from typing import Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime
@@ -8,12 +8,10 @@ from fastapi import HTTPException, status, UploadFile
 from app.models.asset import Asset, Attachment, AssetStatus
 from app.repositories.asset_repository import AssetRepository
 from app.services.pinata_service import (
-    get_pinata_service,
-    PinataUploadError,
-    PinataFileTooLargeError,
     ALLOWED_EXTENSIONS,
     get_file_extension,
 )
+from app.services.upload_queue_service import UploadQueueService
 from app.schemas.asset import (
     AssetCreateRequest,
 )
@@ -36,7 +34,6 @@ class AssetServiceWithIPFS:
             asset_repo: 资产仓库
         """
         self.asset_repo = asset_repo
-        self.pinata_service = get_pinata_service()
     
     def _get_file_extension(self, filename: str) -> str:
         """获取文件扩展名。"""
@@ -71,78 +68,29 @@ class AssetServiceWithIPFS:
                 detail=self._error_detail("UNSUPPORTED_FILE_TYPE", f"不支持的文件类型: {ext}"),
             )
     
-    async def _upload_file_to_ipfs(
-        self, 
-        file: UploadFile,
-        asset_name: str,
-        asset_id: UUID,
-    ) -> dict:
+    async def _read_file_content(self, file: UploadFile) -> bytes:
         """
-        上传单个文件到IPFS。
+        读取上传文件内容并检查大小。
         
         Args:
             file: 上传的文件
-            asset_name: 资产名称（用于元数据）
             
         Returns:
-            dict: 上传结果，包含cid、gateway_url等信息
+            bytes: 文件内容
             
         Raises:
-            HTTPException: 上传失败
+            HTTPException: 文件超过大小限制
         """
-        try:
-            # 读取文件内容
-            content = await file.read()
-            
-            # 检查文件大小
-            if len(content) > self.MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail=self._error_detail(
-                        "FILE_TOO_LARGE",
-                        f"文件大小超过限制（最大 {self.MAX_FILE_SIZE // 1024 // 1024}MB）",
-                    ),
-                )
-            
-            # 准备元数据
-            metadata = {
-                "asset_name": asset_name,
-                "file_name": file.filename,
-                "content_type": file.content_type or "application/octet-stream"
-            }
-            
-            # 上传到Pinata
-            result = self.pinata_service.upload_file(
-                file_content=content,
-                file_name=file.filename or "unnamed",
-                metadata=metadata
-            )
-            logger.info(
-                "pinata_file_uploaded",
-                extra={
-                    "asset_id": str(asset_id),
-                    "cid": result.get("cid"),
-                    "file_name": file.filename or "unnamed",
-                },
-            )
-            
-            return result
-            
-        except PinataFileTooLargeError as e:
+        content = await file.read()
+        if len(content) > self.MAX_FILE_SIZE:
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=self._error_detail("FILE_TOO_LARGE", str(e)),
-            )
-        except PinataUploadError as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=self._error_detail("PINATA_UPLOAD_FAILED", f"上传到IPFS失败: {str(e)}"),
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=self._error_detail("FILE_PROCESSING_FAILED", f"文件处理失败: {str(e)}"),
+                detail=self._error_detail(
+                    "FILE_TOO_LARGE",
+                    f"文件大小超过限制（最大 {self.MAX_FILE_SIZE // 1024 // 1024}MB）",
+                ),
             )
+        return content
     
     async def create_asset_with_attachments(
         self,
@@ -152,26 +100,43 @@ class AssetServiceWithIPFS:
         files: Optional[List[UploadFile]] = None,
     ) -> Tuple[Asset, List[Attachment]]:
         """
-        创建资产并自动上传附件到IPFS。
+        创建资产并把附件加入 IPFS 后台上传队列。
         
         这是主要的资产创建方法，支持：
         1. 创建资产基本信息
-        2. 自动将文件上传到IPFS
-        3. 创建附件记录关联到资产
+        2. 将文件暂存到本地磁盘并写入上传发件箱
+        3. 创建状态为 PENDING_UPLOAD 的附件记录，CID 由后台上传完成后回填
         
         Args:
             enterprise_id: 企业ID
             creator_user_id: 创建者用户ID
             asset_data: 资产创建数据
-            files: 可选的文件列表，自动上传到IPFS
+            files: 可选的文件列表，由后台工作进程上传到IPFS
             
         Returns:
-            Tuple[Asset, List[Attachment]]: (创建的资产, 附件列表)
+            Tuple[Asset, List[Attachment]]: (创建的资产, 待上传附件列表)
             
         Raises:
-            HTTPException: 创建失败或上传失败
+            HTTPException: 文件校验失败或暂存失败
         """
-        # 步骤1：创建资产基本信息
+        if files and len(files) > self.MAX_FILES_PER_REQUEST:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=self._error_detail(
+                    "TOO_MANY_FILES",
+                    f"一次最多只能上传{self.MAX_FILES_PER_REQUEST}个文件",
+                ),
+            )
+        
+        # 步骤1：在创建资产前完成全部文件校验，避免产生半成品资产
+        pending_files: List[Tuple[UploadFile, bytes]] = []
+        for file in files or []:
+            if not file or not file.filename:
+                continue
+            self._validate_file(file)
+            pending_files.append((file, await self._read_file_content(file)))
+        
+        # 步骤2：创建资产基本信息
         asset = Asset(
             enterprise_id=enterprise_id,
             creator_user_id=creator_user_id,
@@ -193,82 +158,42 @@ class AssetServiceWithIPFS:
         # 保存资产到数据库
         created_asset = await self.asset_repo.create_asset(asset)
         
-        # 步骤2：如果有文件，自动上传到IPFS并创建附件
+        # 步骤3：暂存文件并写入上传发件箱，与附件记录在同一事务中提交
         attachments: List[Attachment] = []
-        
-        if files and len(files) > self.MAX_FILES_PER_REQUEST:
+        upload_queue = UploadQueueService(self.asset_repo.db)
+        current_file_name = ""
+        try:
+            for index, (file, content) in enumerate(pending_files):
+                current_file_name = file.filename or ""
+                attachment = await upload_queue.enqueue_attachment(
+                    asset=created_asset,
+                    file_name=file.filename,
+                    content_type=file.content_type or "application/octet-stream",
+                    content=content,
+                    is_primary=index == 0,
+                    metadata={
+                        "asset_name": created_asset.name,
+                        "file_name": file.filename,
+                        "content_type": file.content_type or "application/octet-stream",
+                    },
+                )
+                attachments.append(attachment)
+            await self.asset_repo.db.commit()
+        except Exception as e:
+            logger.error(
+                "asset_attachment_enqueue_failed",
+                extra={
+                    "asset_id": str(created_asset.id),
+                    "cid": "",
+                    "file_name": current_file_name,
+                    "error": str(e),
+                },
+            )
+            await self.asset_repo.db.rollback()
+            await self.asset_repo.delete_asset(created_asset)
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=self._error_detail(
-                    "TOO_MANY_FILES",
-                    f"一次最多只能上传{self.MAX_FILES_PER_REQUEST}个文件",
-                ),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=self._error_detail("ATTACHMENT_ENQUEUE_FAILED", f"附件暂存失败: {str(e)}"),
             )
-
-        if files:
-            for index, file in enumerate(files):
-                if not file or not file.filename:
-                    continue
-                
-                # 验证文件
-                self._validate_file(file)
-                
-                try:
-                    # 上传到IPFS
-                    upload_result = await self._upload_file_to_ipfs(
-                        file=file,
-                        asset_name=created_asset.name,
-                        asset_id=created_asset.id,
-                    )
-                    
-                    # 创建附件记录
-                    attachment = Attachment(
-                        asset_id=created_asset.id,
-                        file_name=file.filename,
-                        file_type=file.content_type or "application/octet-stream",
-                        file_size=upload_result.get("size", 0),
-                        ipfs_cid=upload_result["cid"],
-                        is_primary=index == 0,
-                        uploaded_at=datetime.utcnow(),
-                    )
-                    
-                    # 保存附件 - 使用 add_attachment 方法
-                    saved_attachment = await self.asset_repo.add_attachment(attachment)
-                    attachments.append(saved_attachment)
-                    logger.info(
-                        "asset_attachment_persisted",
-                        extra={
-                            "asset_id": str(created_asset.id),
-                            "cid": saved_attachment.ipfs_cid,
-                            "file_name": saved_attachment.file_name,
-                        },
-                    )
-                    
-                except HTTPException:
-                    logger.error(
-                        "asset_attachment_upload_failed",
-                        extra={
-                            "asset_id": str(created_asset.id),
-                            "cid": "",
-                            "file_name": file.filename or "",
-                        },
-                    )
-                    await self.asset_repo.delete_asset(created_asset)
-                    raise
-                except Exception as e:
-                    logger.error(
-                        "asset_attachment_upload_failed",
-                        extra={
-                            "asset_id": str(created_asset.id),
-                            "cid": "",
-                            "file_name": file.filename or "",
-                            "error": str(e),
-                        },
-                    )
-                    await self.asset_repo.delete_asset(created_asset)
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=self._error_detail("ATTACHMENT_UPLOAD_FAILED", f"附件上传失败: {str(e)}"),
-                    )
         
         return created_asset, attachments
@@ -6,10 +6,9 @@ import hashlib
 import secrets
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from eth_account.messages import encode_defunct
-from web3 import Web3
 
 from app.core.config import settings
+from app.core.wallet import verify_wallet_signature
 from app.core.exceptions import (
     AppException,
     BadRequestException,
@@ -17,15 +16,14 @@ from app.core.exceptions import (
     ForbiddenException,
     NotFoundException,
 )
+from app.core.auth_cache import principal_cache
+from app.core.password_hasher import password_hasher
 from app.core.security import (
-    verify_password,
-    get_password_hash,
     create_access_token,
     create_refresh_token,
     decode_token,
 )
 from app.models.user import User
-from app.models.refresh_token import RefreshToken
 from app.repositories.user_repository import UserRepository
 from app.repositories.token_repository import TokenRepository
 from app.repositories.password_reset_token_repository import PasswordResetTokenRepository
@@ -39,7 +37,8 @@ from app.schemas.auth import (
     UserResponse,
     AuthResponse,
 )
-from app.services.email_service import email_service
+from app.services.email_outbox_service import EmailOutboxService
+from app.services.token_revocation_service import revocation_list
 
 
 class InvalidCredentialsError(UnauthorizedException):
@@ -161,13 +160,23 @@ class AuthService:
         user = User(
             email=data.email.lower(),
             username=data.username.lower(),
-            hashed_password=get_password_hash(data.password),
+            hashed_password=await password_hasher.hash(data.password),
             full_name=data.full_name,
         )
         user = await self.user_repo.create(user)
         
         # 生成令牌
         tokens = await self._create_tokens(user, ip_address, device_info)
+
+        # 验证邮件写入发件箱，与用户记录同一事务提交，由后台工作进程发送
+        if settings.EMAIL_VERIFICATION_ON_REGISTER:
+            raw_token = await self._issue_verification_token(user.id)
+            await EmailOutboxService(self.db).enqueue_verification(
+                to_email=user.email,
+                verification_token=raw_token,
+                user_name=user.full_name or user.username,
+            )
+        await self.db.commit()
         
         return AuthResponse(
             user=self._user_to_response(user),
@@ -197,8 +206,8 @@ class AuthService:
             InvalidCredentialsError: 如果凭据无效。
             AccountDisabledError: 如果账户被禁用。
         """
-        # 根据邮箱获取用户
-        user = await self.user_repo.get_by_email(data.email)
+        # 根据邮箱获取用户（不加载关联集合）
+        user = await self.user_repo.get_for_login(data.email)
         
         if not user:
             raise InvalidCredentialsError()
@@ -207,18 +216,23 @@ class AuthService:
         if not user.is_active:
             raise AccountDisabledError()
         
-        # 验证密码
-        if not verify_password(data.password, user.hashed_password):
+        # 验证密码（在哈希进程池中执行，不阻塞事件循环）
+        password_ok, new_hash = await password_hasher.verify_and_update(
+            data.password, user.hashed_password
+        )
+        if not password_ok:
             raise InvalidCredentialsError()
         
-        # 更新最后登录时间
-        await self.user_repo.update_last_login(user.id)
+        # 旧版 bcrypt 等过时哈希透明升级，随最后登录时间一起提交
+        if new_hash:
+            user.hashed_password = new_hash
+        
+        # 更新最后登录时间（随令牌写入一起提交，内存中的用户已是最新状态，无需重新加载）
+        user.last_login_at = datetime.now(timezone.utc)
         
         # 生成令牌（传递remember_me参数）
         tokens = await self._create_tokens(user, ip_address, device_info, remember_me)
-        
-        # 刷新用户数据
-        user = await self.user_repo.get_by_id(user.id)
+        await self.db.commit()
         
         return AuthResponse(
             user=self._user_to_response(user),
@@ -253,32 +267,38 @@ class AuthService:
         # 获取令牌哈希
         token_hash = self._hash_token(refresh_token)
         
-        # 在数据库中验证令牌
-        stored_token = await self.token_repo.get_valid_token(token_hash)
-        if not stored_token:
+        # 原子地撤销旧令牌（令牌轮换）并获取用户；令牌无效时不会产生任何修改
+        user = await self.token_repo.rotate_token(token_hash)
+        if not user:
             raise InvalidTokenError("令牌已被撤销或已过期")
-        
-        # 获取用户
-        user = await self.user_repo.get_by_id(stored_token.user_id)
-        if not user or not user.is_active:
+        if not user.is_active:
+            await self.db.rollback()
             raise InvalidTokenError("用户未找到或已被禁用")
         
-        # 撤销旧令牌（令牌轮换）
-        await self.token_repo.revoke_token(token_hash)
-        
         # 生成新令牌
-        return await self._create_tokens(user, ip_address, device_info)
+        tokens = await self._create_tokens(user, ip_address, device_info)
+        await self.db.commit()
+        return tokens
     
-    async def logout(self, refresh_token: str) -> bool:
+    async def logout(self, refresh_token: str, access_token: Optional[str] = None) -> bool:
         """
         通过撤销刷新令牌注销登录。
         
         Args:
             refresh_token (str): 刷新令牌。
+            access_token (Optional[str]): 当前访问令牌，提供时一并撤销。
             
         Returns:
             bool: 注销是否成功。
         """
+        payload = decode_token(refresh_token, expected_type="refresh")
+        if payload and payload.get("sub"):
+            principal_cache.invalidate(payload["sub"])
+            if access_token:
+                access_payload = decode_token(access_token, expected_type="access")
+                # 只撤销属于同一用户的访问令牌
+                if access_payload and access_payload.get("sub") == payload["sub"]:
+                    await revocation_list.revoke_token(self.db, access_payload)
         token_hash = self._hash_token(refresh_token)
         return await self.token_repo.revoke_token(token_hash)
     
@@ -292,6 +312,9 @@ class AuthService:
         Returns:
             int: 被撤销的令牌数量。
         """
+        principal_cache.invalidate(str(user_id))
+        # 此前签发的访问令牌一并失效
+        await revocation_list.revoke_user(self.db, user_id)
         return await self.token_repo.revoke_all_user_tokens(user_id)
     
     async def bind_wallet(
@@ -334,6 +357,7 @@ class AuthService:
         
         # 更新钱包地址
         user = await self.user_repo.update_wallet_address(user_id, wallet_address)
+        principal_cache.invalidate(str(user_id))
         
         return self._user_to_response(user)
     
@@ -363,7 +387,7 @@ class AuthService:
         remember_me: bool = False,
     ) -> TokenResponse:
         """
-        创建访问令牌和刷新令牌。
+        创建访问令牌和刷新令牌（不提交事务）。
         
         Args:
             user (User): 用户模型实例。
@@ -374,12 +398,6 @@ class AuthService:
         Returns:
             TokenResponse: 包含新生成的令牌的响应。
         """
-        # 检查会话限制
-        active_count = await self.token_repo.count_active_tokens(user.id)
-        if active_count >= self.MAX_ACTIVE_SESSIONS:
-            # 如果超过限制，撤销该用户的所有旧令牌
-            await self.token_repo.revoke_all_user_tokens(user.id)
-        
         # 创建访问令牌
         access_token = create_access_token(
             data={"sub": str(user.id), "email": user.email}
@@ -403,14 +421,15 @@ class AuthService:
                 days=settings.REFRESH_TOKEN_EXPIRE_DAYS
             )
         
-        stored_token = RefreshToken(
-            token_hash=token_hash,
+        # 会话数达到上限时撤销该用户的所有旧令牌，并写入新令牌（由调用方提交）
+        await self.token_repo.issue_token(
             user_id=user.id,
+            token_hash=token_hash,
+            expires_at=expires_at,
+            max_active=self.MAX_ACTIVE_SESSIONS,
             ip_address=ip_address,
             device_info=device_info,
-            expires_at=expires_at,
         )
-        await self.token_repo.create(stored_token)
         
         return TokenResponse(
             access_token=access_token,
@@ -438,7 +457,7 @@ class AuthService:
         message: str,
     ) -> bool:
         """
-        使用 Web3 验证钱包签名。
+        验证钱包签名（EIP-191 personal_sign）。
         
         Args:
             wallet_address (str): 钱包地址。
@@ -448,15 +467,7 @@ class AuthService:
         Returns:
             bool: 签名是否有效。
         """
-        try:
-            w3 = Web3()
-            message_hash = encode_defunct(text=message)
-            recovered_address = w3.eth.account.recover_message(
-                message_hash, signature=signature
-            )
-            return recovered_address.lower() == wallet_address.lower()
-        except Exception:
-            return False
+        return verify_wallet_signature(wallet_address, signature, message)
     
     def _user_to_response(self, user: User) -> UserResponse:
         """
@@ -514,8 +525,6 @@ class AuthService:
         await reset_token_repo.revoke_user_tokens(user.id)
         
         # 生成新的重置令牌
-        import secrets
-        import hashlib
         raw_token = secrets.token_urlsafe(32)
         token_hash = hashlib.sha256(raw_token.encode()).hexdigest()
         
@@ -528,8 +537,8 @@ class AuthService:
         )
         await reset_token_repo.create(reset_token)
         
-        # 发送重置邮件
-        await email_service.send_password_reset_email(
+        # 重置邮件写入发件箱（由后台工作进程发送）
+        await EmailOutboxService(self.db).enqueue_password_reset(
             to_email=user.email,
             reset_token=raw_token,
             user_name=user.full_name or user.username,
@@ -579,19 +588,20 @@ class AuthService:
             raise ResetTokenError("重置令牌无效或已过期")
         
         # 更新用户密码
-        from app.core.security import get_password_hash
         user = await self.user_repo.get_by_id(reset_token.user_id)
         if not user:
             raise ResetTokenError("用户不存在")
         
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await password_hasher.hash(new_password)
         await self.db.flush()
         
         # 标记令牌为已使用
         await reset_token_repo.mark_as_used(token_hash)
         
-        # 撤销该用户的所有刷新令牌（强制重新登录）
+        # 撤销该用户的所有刷新令牌与访问令牌（强制重新登录）
+        await revocation_list.revoke_user(self.db, user.id)
         await self.token_repo.revoke_all_user_tokens(user.id)
+        principal_cache.invalidate(str(user.id))
         
         return True
     
@@ -626,26 +636,10 @@ class AuthService:
         if await verification_repo.has_recent_request(user.id, seconds=60):
             raise TooManyRequestsError("请稍后再试，邮件发送过于频繁")
         
-        # 撤销该用户所有未使用的旧令牌
-        await verification_repo.revoke_user_tokens(user.id)
-        
-        # 生成新的验证令牌
-        import secrets
-        import hashlib
-        raw_token = secrets.token_urlsafe(32)
-        token_hash = hashlib.sha256(raw_token.encode()).hexdigest()
+        raw_token = await self._issue_verification_token(user.id)
         
-        # 创建令牌记录（24小时过期）
-        expires_at = datetime.now(timezone.utc) + timedelta(hours=24)
-        verification_token = EmailVerificationToken(
-            token_hash=token_hash,
-            user_id=user.id,
-            expires_at=expires_at,
-        )
-        await verification_repo.create(verification_token)
-        
-        # 发送验证邮件
-        await email_service.send_verification_email(
+        # 验证邮件写入发件箱（由后台工作进程发送）
+        await EmailOutboxService(self.db).enqueue_verification(
             to_email=user.email,
             verification_token=raw_token,
             user_name=user.full_name or user.username,
@@ -653,6 +647,29 @@ class AuthService:
         
         return True
     
+    async def _issue_verification_token(self, user_id: UUID) -> str:
+        """
+        撤销用户未使用的旧验证令牌并生成新令牌（24小时过期）。
+        
+        Args:
+            user_id: 用户ID
+            
+        Returns:
+            str: 原始验证令牌
+        """
+        verification_repo = EmailVerificationTokenRepository(self.db)
+        await verification_repo.revoke_user_tokens(user_id)
+        
+        raw_token = secrets.token_urlsafe(32)
+        await verification_repo.create(
+            EmailVerificationToken(
+                token_hash=hashlib.sha256(raw_token.encode()).hexdigest(),
+                user_id=user_id,
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=24),
+            )
+        )
+        return raw_token
+    
     async def verify_email(self, token: str) -> bool:
         """
         验证邮箱。
@@ -682,6 +699,7 @@ class AuthService:
         
         user.is_verified = True
         await self.db.flush()
+        principal_cache.invalidate(str(user.id))
         
         # 标记令牌为已使用
         await verification_repo.mark_as_used(token_hash)
@@ -0,0 +1,210 @@
+"""仪表盘业务逻辑服务。
+
+仪表盘接口只读取汇总表（``dashboard_asset_counts``、``dashboard_transfer_daily``、
+``dashboard_approval_backlog``），行数只与企业数、枚举取值数和天数有关，加载耗时不随数据量增长。
+汇总表由维护任务 ``dashboard_rollups`` 定期刷新：
+
+- 资产数量与待审批积压按 GROUP BY 重算，只写入变化的行；
+- 每日转移量只重算上次成功刷新前 ``DASHBOARD_TRANSFER_RECOMPUTE_DAYS`` 天以来的记录，
+  更早的日期不再变化；从未成功刷新过时全量回填。
+
+数据因此最多滞后一个刷新间隔，响应中的 ``refreshed_at`` 为最近一次刷新完成的时间。
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.approval import ApprovalType
+from app.models.asset import AssetStatus, AssetType, LegalStatus
+from app.repositories.dashboard_repository import DashboardRepository
+
+# 维护任务名称（也用于从任务锁表读取最近一次刷新时间）
+DASHBOARD_ROLLUP_JOB = "dashboard_rollups"
+
+# 铸造漏斗各阶段包含的资产状态（每个阶段包含其后所有阶段）
+_SUBMITTED_STATUSES = {status for status in AssetStatus if status != AssetStatus.DRAFT}
+_MINTED_STATUSES = {AssetStatus.MINTED, AssetStatus.TRANSFERRED, AssetStatus.LICENSED, AssetStatus.STAKED}
+_MINT_ATTEMPTED_STATUSES = _MINTED_STATUSES | {AssetStatus.MINTING, AssetStatus.MINT_FAILED}
+_APPROVED_STATUSES = _MINT_ATTEMPTED_STATUSES | {AssetStatus.APPROVED}
+
+
+def _rate(numerator: int, denominator: int) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite 返回不带时区的时间
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class DashboardService:
+    """仪表盘服务。"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        初始化仪表盘服务。
+
+        Args:
+            db: 数据库会话
+        """
+        self.db = db
+        self.repo = DashboardRepository(db)
+
+    async def refresh_rollups(self, full: bool = False) -> int:
+        """
+        按源表刷新全部汇总表（不提交事务）。
+
+        Args:
+            full: 是否全量重算每日转移量
+
+        Returns:
+            int: 写入或删除的汇总行数
+        """
+        changed = await self.repo.sync_asset_counts(await self.repo.compute_asset_counts())
+        changed += await self.repo.sync_approval_backlog(await self.repo.compute_approval_backlog())
+
+        since = None if full else await self._transfer_recompute_start()
+        transfers = await self.repo.compute_transfer_daily(since)
+        changed += await self.repo.sync_transfer_daily(transfers, since)
+        return changed
+
+    async def _transfer_recompute_start(self) -> Optional[date]:
+        """上次成功刷新前若干天；从未成功刷新时返回 None（全量回填）。"""
+        state = await self.repo.get_job_state(DASHBOARD_ROLLUP_JOB)
+        if state is None:
+            return None
+        finished_at, error = state
+        if finished_at is None or error is not None:
+            return None
+        return finished_at.date() - timedelta(days=settings.DASHBOARD_TRANSFER_RECOMPUTE_DAYS)
+
+    async def get_asset_summary(self, enterprise_ids: Iterable[UUID]) -> Dict[str, Any]:
+        """
+        获取资产分布与铸造漏斗。
+
+        Args:
+            enterprise_ids: 企业 ID 列表
+
+        Returns:
+            Dict[str, Any]: total、by_type、by_status、by_legal_status 与 mint_funnel
+        """
+        rows = await self.repo.get_asset_counts(enterprise_ids)
+        return self._build_asset_summary(rows)
+
+    @staticmethod
+    def _build_asset_summary(rows: List[Tuple]) -> Dict[str, Any]:
+        by_type = {asset_type.value: 0 for asset_type in AssetType}
+        by_status = {asset_status.value: 0 for asset_status in AssetStatus}
+        by_legal_status = {legal_status.value: 0 for legal_status in LegalStatus}
+        total = 0
+        for asset_type, asset_status, legal_status, count in rows:
+            count = int(count)
+            total += count
+            by_type[asset_type.value] += count
+            by_status[asset_status.value] += count
+            by_legal_status[legal_status.value] += count
+
+        def stage(statuses) -> int:
+            return sum(by_status[asset_status.value] for asset_status in statuses)
+
+        submitted = stage(_SUBMITTED_STATUSES)
+        approved = stage(_APPROVED_STATUSES)
+        attempted = stage(_MINT_ATTEMPTED_STATUSES)
+        minted = stage(_MINTED_STATUSES)
+        return {
+            "total": total,
+            "by_type": by_type,
+            "by_status": by_status,
+            "by_legal_status": by_legal_status,
+            "mint_funnel": {
+                "created": total,
+                "submitted": submitted,
+                "approved": approved,
+                "mint_attempted": attempted,
+                "minted": minted,
+                "minting": by_status[AssetStatus.MINTING.value],
+                "mint_failed": by_status[AssetStatus.MINT_FAILED.value],
+                "rejected": by_status[AssetStatus.REJECTED.value],
+                "submit_rate": _rate(submitted, total),
+                "approval_rate": _rate(approved, submitted),
+                "mint_success_rate": _rate(minted, attempted),
+                "conversion_rate": _rate(minted, total),
+            },
+        }
+
+    async def get_transfer_volume(self, enterprise_ids: Iterable[UUID], days: int) -> List[Dict[str, Any]]:
+        """
+        获取最近 ``days`` 天（含今天，UTC）的每日转移量，没有记录的日期补零。
+
+        Args:
+            enterprise_ids: 企业 ID 列表
+            days: 天数
+
+        Returns:
+            List[Dict[str, Any]]: 按日期升序的 day、incoming、outgoing 与 by_type
+        """
+        today = datetime.now(timezone.utc).date()
+        since = today - timedelta(days=days - 1)
+        series = {
+            since + timedelta(days=offset): {"incoming": 0, "outgoing": 0, "by_type": {}}
+            for offset in range(days)
+        }
+        for day, direction, transfer_type, count in await self.repo.get_transfer_daily(enterprise_ids, since):
+            bucket = series.get(day)
+            if bucket is None:
+                continue
+            count = int(count)
+            bucket["incoming" if direction == "in" else "outgoing"] += count
+            bucket["by_type"][transfer_type] = bucket["by_type"].get(transfer_type, 0) + count
+        return [{"day": day, **bucket} for day, bucket in sorted(series.items())]
+
+    async def get_approval_backlog(self, enterprise_ids: Iterable[UUID]) -> List[Dict[str, Any]]:
+        """
+        获取各企业的待审批积压，按数量降序。
+
+        Args:
+            enterprise_ids: 企业 ID 列表
+
+        Returns:
+            List[Dict[str, Any]]: enterprise_id、enterprise_name、pending、by_type 与 oldest_pending_at
+        """
+        backlog: Dict[UUID, Dict[str, Any]] = {}
+        for enterprise_id, name, approval_type, count, oldest in await self.repo.get_approval_backlog(enterprise_ids):
+            item = backlog.setdefault(enterprise_id, {
+                "enterprise_id": enterprise_id,
+                "enterprise_name": name,
+                "pending": 0,
+                "by_type": {approval_type.value: 0 for approval_type in ApprovalType},
+                "oldest_pending_at": None,
+            })
+            item["pending"] += count
+            item["by_type"][approval_type.value] += count
+            oldest = _aware(oldest)
+            if oldest is not None and (item["oldest_pending_at"] is None or oldest < item["oldest_pending_at"]):
+                item["oldest_pending_at"] = oldest
+        return sorted(backlog.values(), key=lambda item: (-item["pending"], str(item["enterprise_id"])))
+
+    async def get_overview(self, enterprise_ids: List[UUID], days: int = 30) -> Dict[str, Any]:
+        """
+        获取仪表盘全部数据（一次请求加载）。
+
+        Args:
+            enterprise_ids: 企业 ID 列表
+            days: 转移量统计的天数
+
+        Returns:
+            Dict[str, Any]: 资产分布与漏斗、每日转移量、待审批积压与刷新时间
+        """
+        state = await self.repo.get_job_state(DASHBOARD_ROLLUP_JOB)
+        return {
+            "enterprise_ids": enterprise_ids,
+            "assets": await self.get_asset_summary(enterprise_ids),
+            "transfer_volume": await self.get_transfer_volume(enterprise_ids, days),
+            "approval_backlog": await self.get_approval_backlog(enterprise_ids),
+            "refreshed_at": _aware(state[0]) if state is not None else None,
+        }
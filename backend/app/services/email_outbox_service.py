@@ -0,0 +1,349 @@
+"""邮件发件箱服务。
+
+请求线程只渲染邮件并写入 ``email_outbox`` 表（与业务数据同一事务提交），
+后台 ``EmailWorker`` 复用 SMTP 连接批量发送，按服务商限速，失败时按抖动指数退避重试。
+注册、找回密码等接口因此不再等待 SMTP 往返。
+
+重置密码、邮箱验证邮件的正文含明文令牌，邮件进入终态（SENT / DEAD）时即清空正文，
+终态记录到期后由清理任务删除。
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import limited_delete
+from app.core.retry import compute_backoff_delay, get_circuit_breaker
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.services.email_service import EmailService, SMTPConnectionPool, email_service
+
+logger = logging.getLogger(__name__)
+
+
+def _is_permanent_failure(exc: Exception) -> bool:
+    """SMTP 5xx 响应（如收件人不存在）重试也不会成功。"""
+    code = getattr(exc, "code", None)
+    if isinstance(code, int) and 500 <= code < 600:
+        return True
+    # 所有收件人均被拒绝（aiosmtplib / smtplib）
+    recipients = getattr(exc, "recipients", None)
+    if isinstance(recipients, list) and recipients:
+        return all(500 <= getattr(r, "code", 0) < 600 for r in recipients)
+    return False
+
+
+class EmailOutboxService:
+    """负责把邮件写入发件箱。"""
+
+    def __init__(self, db: AsyncSession, service: Optional[EmailService] = None):
+        """
+        初始化发件箱服务。
+
+        Args:
+            db: 数据库会话
+            service: 邮件服务（用于渲染模板），默认使用全局实例
+        """
+        self.db = db
+        self.service = service or email_service
+
+    async def enqueue(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        template: Optional[str] = None,
+    ) -> EmailOutbox:
+        """
+        写入一封待发送邮件（仅 flush，不提交）。
+
+        Args:
+            to_email: 收件人邮箱地址
+            subject: 邮件主题
+            html_content: 邮件HTML内容
+            template: 模板名称
+
+        Returns:
+            EmailOutbox: 发件箱记录
+        """
+        message = EmailOutbox(
+            to_email=to_email,
+            subject=subject,
+            html_body=html_content,
+            template=template,
+            provider=self.service.provider,
+            status=EmailOutboxStatus.PENDING,
+            attempts=0,
+            max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+        self.db.add(message)
+        await self.db.flush()
+        logger.info(f"邮件已写入发件箱：{message.id} -> {to_email}（{template or 'custom'}）")
+        return message
+
+    async def enqueue_password_reset(self, to_email: str, reset_token: str, user_name: str = "") -> EmailOutbox:
+        """写入密码重置邮件。"""
+        subject, html_content = self.service.render_password_reset_email(reset_token, user_name)
+        return await self.enqueue(to_email, subject, html_content, template="reset_password")
+
+    async def enqueue_verification(self, to_email: str, verification_token: str, user_name: str = "") -> EmailOutbox:
+        """写入邮箱验证邮件。"""
+        subject, html_content = self.service.render_verification_email(verification_token, user_name)
+        return await self.enqueue(to_email, subject, html_content, template="verify_email")
+
+    async def purge_finished(self, before: datetime, limit: Optional[int] = None) -> int:
+        """
+        删除在指定时间之前进入终态（已发送或不再重试）的邮件（清理任务）。
+
+        Args:
+            before: 最后更新时间早于该时间的终态邮件将被删除
+            limit: 单批最多删除的数量
+
+        Returns:
+            int: 删除的数量
+        """
+        result = await self.db.execute(
+            limited_delete(
+                EmailOutbox,
+                EmailOutbox.status.in_([EmailOutboxStatus.SENT, EmailOutboxStatus.DEAD]),
+                EmailOutbox.updated_at < before,
+                limit=limit,
+            )
+        )
+        return result.rowcount
+
+
+class ProviderRateLimiter:
+    """按服务商平滑限速：相邻两次发送至少间隔 60 / per_minute 秒。"""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._clock = clock
+        self._next_slot: Dict[str, float] = {}
+
+    def reserve(self, provider: str) -> float:
+        """
+        预约下一个发送时间片。
+
+        Returns:
+            float: 需要等待的秒数
+        """
+        now = self._clock()
+        slot = max(now, self._next_slot.get(provider, now))
+        self._next_slot[provider] = slot + self.interval
+        return slot - now
+
+    async def acquire(self, provider: str) -> None:
+        """等待直到允许向该服务商发送下一封邮件。"""
+        delay = self.reserve(provider)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class EmailWorker:
+    """
+    后台邮件发送工作进程。
+
+    周期性领取到期邮件，通过连接池复用 SMTP 连接发送（并发数即连接池大小）。
+    多个工作进程之间通过 ``FOR UPDATE SKIP LOCKED`` 与租约超时避免重复发送。
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        service: Optional[EmailService] = None,
+        transport: Optional[SMTPConnectionPool] = None,
+        poll_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        rate_limiter: Optional[ProviderRateLimiter] = None,
+    ):
+        self._session_factory = session_factory
+        self.service = service or email_service
+        self._transport = transport
+        self.poll_interval = poll_interval if poll_interval is not None else settings.EMAIL_WORKER_POLL_INTERVAL
+        self.batch_size = batch_size or settings.EMAIL_WORKER_BATCH_SIZE
+        self.rate_limiter = rate_limiter or ProviderRateLimiter(settings.EMAIL_RATE_LIMIT_PER_MINUTE)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    @property
+    def transport(self) -> Optional[SMTPConnectionPool]:
+        return self._transport if self._transport is not None else self.service.get_transport()
+
+    @property
+    def concurrency(self) -> int:
+        transport = self.transport
+        return transport.size if transport is not None else 1
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台轮询任务。"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="email-worker")
+        logger.info("邮件工作进程已启动")
+
+    async def stop(self) -> None:
+        """停止后台轮询任务，等待当前批次结束并关闭连接池。"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=30)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        finally:
+            self._task = None
+        if self._transport is not None:
+            await self._transport.close()
+        logger.info("邮件工作进程已停止")
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            processed = 0
+            try:
+                processed = await self.run_once()
+            except Exception as exc:
+                logger.error(f"邮件工作进程轮询失败：{exc}")
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> int:
+        """
+        领取并发送一批到期邮件。
+
+        Returns:
+            int: 本次处理的邮件数
+        """
+        message_ids = await self._claim_due_messages()
+        if not message_ids:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _guarded(message_id: uuid.UUID) -> None:
+            async with semaphore:
+                await self._process_message(message_id)
+
+        await asyncio.gather(*(_guarded(message_id) for message_id in message_ids))
+        return len(message_ids)
+
+    async def _claim_due_messages(self) -> List[uuid.UUID]:
+        now = datetime.now(timezone.utc)
+        lease_expired_at = now - timedelta(seconds=settings.EMAIL_TASK_LEASE_SECONDS)
+        async with self.session_factory() as db:
+            stmt = (
+                select(EmailOutbox)
+                .where(
+                    or_(
+                        and_(
+                            EmailOutbox.status == EmailOutboxStatus.PENDING,
+                            EmailOutbox.next_attempt_at <= now,
+                        ),
+                        and_(
+                            EmailOutbox.status == EmailOutboxStatus.SENDING,
+                            EmailOutbox.locked_at <= lease_expired_at,
+                        ),
+                    )
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            messages = list((await db.execute(stmt)).scalars().all())
+            for message in messages:
+                message.status = EmailOutboxStatus.SENDING
+                message.locked_at = now
+            await db.commit()
+            return [message.id for message in messages]
+
+    async def _process_message(self, message_id: uuid.UUID) -> None:
+        async with self.session_factory() as db:
+            message = await db.get(EmailOutbox, message_id)
+            if message is None or message.status != EmailOutboxStatus.SENDING:
+                return
+
+            breaker = get_circuit_breaker(f"email:{message.provider}")
+            if not breaker.allow():
+                # 熔断期间不消耗重试次数，直接顺延
+                message.status = EmailOutboxStatus.PENDING
+                message.locked_at = None
+                message.next_attempt_at = datetime.now(timezone.utc) + timedelta(
+                    seconds=max(breaker.retry_after(), 1.0)
+                )
+                await db.commit()
+                return
+
+            message.attempts += 1
+            try:
+                await self.rate_limiter.acquire(message.provider)
+                try:
+                    await self.service.deliver(
+                        self.service.build_message(message.to_email, message.subject, message.html_body),
+                        transport=self.transport,
+                    )
+                except Exception as exc:
+                    if _is_permanent_failure(exc):
+                        self._mark_dead(message, str(exc))
+                    else:
+                        breaker.record_failure()
+                        self._schedule_retry(message, str(exc))
+                    await db.commit()
+                    return
+
+                breaker.record_success()
+                message.status = EmailOutboxStatus.SENT
+                message.html_body = ""
+                message.locked_at = None
+                message.last_error = None
+                message.sent_at = datetime.now(timezone.utc)
+                await db.commit()
+            finally:
+                # 收件人被拒等未记录结果的出口也要释放半开探测名额
+                breaker.release()
+
+    def _schedule_retry(self, message: EmailOutbox, error: str) -> None:
+        if message.attempts >= message.max_attempts:
+            self._mark_dead(message, error)
+            return
+        delay = compute_backoff_delay(
+            message.attempts,
+            settings.EMAIL_RETRY_BASE_DELAY,
+            settings.EMAIL_RETRY_MAX_DELAY,
+        )
+        message.status = EmailOutboxStatus.PENDING
+        message.locked_at = None
+        message.last_error = error
+        message.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        logger.warning(
+            f"邮件 {message.id} 第 {message.attempts}/{message.max_attempts} 次发送失败，"
+            f"{delay:.1f} 秒后重试：{error}"
+        )
+
+    def _mark_dead(self, message: EmailOutbox, error: str) -> None:
+        message.status = EmailOutboxStatus.DEAD
+        message.html_body = ""
+        message.locked_at = None
+        message.last_error = error
+        logger.error(f"邮件 {message.id} 发送失败，不再重试：{error}")
+
+
+# 全局邮件工作进程实例
+email_worker = EmailWorker()
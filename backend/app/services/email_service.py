@@ -1,53 +1,220 @@
-"""用于发送邮件的异步邮件服务模块。"""
-import os
+"""用于发送邮件的异步邮件服务模块。
+
+模板在服务初始化时编译一次；投递由 ``SMTPConnectionPool`` 复用 SMTP 连接完成。
+业务代码应通过发件箱（``app.services.email_outbox_service``）异步发送邮件，
+``send_email`` 仅保留给需要当场发送的场景。
+"""
+import asyncio
+import html
+import logging
+import re
+import smtplib
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from email.message import EmailMessage
+from email.utils import formataddr
 from pathlib import Path
-from typing import Optional
-
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-# 尝试导入aiosmtplib，如果不可用则使用同步发送
-# 这是为了支持测试环境和开发环境
+# aiosmtplib 为可选依赖，未安装时在线程池中使用同步 smtplib 发送，不阻塞事件循环
 try:
     import aiosmtplib
     ASYNC_MAIL_AVAILABLE = True
 except ImportError:
+    aiosmtplib = None
     ASYNC_MAIL_AVAILABLE = False
-    import smtplib
-    from email.mime.text import MIMEText
-    from email.mime.multipart import MIMEMultipart
+
+try:
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+except ImportError:
+    Environment = None
 
 from app.core.config import settings
+from app.core.instrumentation import EMAIL, instrumented
+
+logger = logging.getLogger(__name__)
+
+# 模板渲染函数：接收上下文字典，返回 HTML
+TemplateRenderer = Callable[[dict], str]
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def compile_simple_template(source: str) -> TemplateRenderer:
+    """
+    把只含 ``{{ name }}`` 占位符的模板预先切分为文本片段与变量名。
+
+    Jinja2 不可用时使用，渲染时一次拼接，变量值做 HTML 转义。
+
+    Args:
+        source: 模板源码
+
+    Returns:
+        TemplateRenderer: 渲染函数
+    """
+    parts = _PLACEHOLDER.split(source)
+    texts, names = parts[0::2], parts[1::2]
+
+    def render(context: dict) -> str:
+        out = [texts[0]]
+        for name, text in zip(names, texts[1:]):
+            value = context.get(name)
+            out.append("" if value is None else html.escape(str(value)))
+            out.append(text)
+        return "".join(out)
+
+    return render
+
+
+class SMTPConnectionPool:
+    """
+    复用 SMTP 连接的连接池。
+
+    同时在用的连接数不超过 ``size``；连接用完放回空闲列表，空闲超过 ``max_idle`` 秒
+    或已断开的连接在下次取用时丢弃重建。发送出错的连接直接关闭，不再复用。
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = False,
+        start_tls: Optional[bool] = True,
+        timeout: float = 30.0,
+        size: int = 2,
+        max_idle: float = 60.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self.size = max(1, size)
+        self.max_idle = max_idle
+        self._idle: List[Tuple[object, float]] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # 便于观测连接复用情况
+        self.connections_opened = 0
+
+    async def _connect(self):
+        client = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if self.username:
+            await client.login(self.username, self.password)
+        self.connections_opened += 1
+        return client
+
+    @staticmethod
+    async def _discard(client) -> None:
+        try:
+            await client.quit()
+        except Exception:
+            client.close()
+
+    async def _take(self):
+        while self._idle:
+            client, released_at = self._idle.pop()
+            if client.is_connected and time.monotonic() - released_at < self.max_idle:
+                return client
+            await self._discard(client)
+        return await self._connect()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[object]:
+        """借出一个已连接并登录的 SMTP 客户端。"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+        async with self._semaphore:
+            client = await self._take()
+            try:
+                yield client
+            except BaseException:
+                await self._discard(client)
+                raise
+            self._idle.append((client, time.monotonic()))
+
+    def _send_blocking(self, message: EmailMessage) -> None:
+        smtp_cls = smtplib.SMTP_SSL if self.use_tls else smtplib.SMTP
+        with smtp_cls(self.host, self.port, timeout=self.timeout) as server:
+            if self.start_tls and not self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+            server.send_message(message)
+
+    async def send(self, message: EmailMessage) -> None:
+        """
+        发送一封邮件，失败时抛出异常。
+
+        Args:
+            message: 邮件消息
+        """
+        if aiosmtplib is None:
+            await asyncio.to_thread(self._send_blocking, message)
+            return
+        async with self.connection() as client:
+            await client.send_message(message)
+
+    async def close(self) -> None:
+        """关闭所有空闲连接。"""
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            await self._discard(client)
 
 
 class EmailService:
-    """处理所有邮件发送任务的邮件服务类。"""
+    """处理邮件模板渲染与投递的邮件服务类。"""
+    
+    TEMPLATE_NAMES = ("reset_password", "verify_email")
     
     def __init__(self):
-        """初始化邮件服务，加载模板引擎。"""
+        """初始化邮件服务，编译邮件模板。"""
         # 设置模板目录 - 支持从项目根目录查找
         current_file = Path(__file__).resolve()
         # 向上回溯到app目录，然后找templates
         app_dir = current_file.parent.parent
-        template_dir = app_dir / "templates" / "email"
+        self.template_dir = app_dir / "templates" / "email"
+        self.template_env = self._create_template_env()
+        self._templates: Dict[str, TemplateRenderer] = self._compile_templates()
         
-        # 如果模板目录不存在，使用内存模板（开发/测试环境）
-        if template_dir.exists():
-            self.template_env = Environment(
-                loader=FileSystemLoader(str(template_dir)),
-                autoescape=select_autoescape(['html', 'xml'])
-            )
-        else:
-            # 使用内存中的简单模板
-            self.template_env = None
-        
-        # 邮件服务器配置 - 从settings或环境变量读取
-        self.smtp_host = getattr(settings, 'SMTP_HOST', os.getenv('SMTP_HOST', 'smtp.gmail.com'))
-        self.smtp_port = int(getattr(settings, 'SMTP_PORT', os.getenv('SMTP_PORT', '587')))
-        self.smtp_user = getattr(settings, 'SMTP_USER', os.getenv('SMTP_USER', ''))
-        self.smtp_password = getattr(settings, 'SMTP_PASSWORD', os.getenv('SMTP_PASSWORD', ''))
-        self.email_from = getattr(settings, 'EMAIL_FROM', os.getenv('EMAIL_FROM', self.smtp_user))
-        self.email_from_name = getattr(settings, 'EMAIL_FROM_NAME', os.getenv('EMAIL_FROM_NAME', 'IP-NFT Platform'))
+        # 邮件服务器配置
+        self.smtp_host = settings.SMTP_HOST
+        self.smtp_port = settings.SMTP_PORT
+        self.smtp_user = settings.SMTP_USER
+        self.smtp_password = settings.SMTP_PASSWORD
+        self.email_from = settings.EMAIL_FROM or self.smtp_user
+        self.email_from_name = settings.EMAIL_FROM_NAME
+        self._pool: Optional[SMTPConnectionPool] = None
+    
+    @property
+    def provider(self) -> str:
+        """发送服务商标识（用于按服务商限速）。"""
+        return self.smtp_host or "log"
+    
+    @property
+    def is_configured(self) -> bool:
+        """是否配置了 SMTP 凭据；未配置时邮件只写日志（开发/测试环境）。"""
+        return bool(self.smtp_user and self.smtp_password)
+    
+    def _create_template_env(self):
+        if Environment is None:
+            return None
+        try:
+            loader = FileSystemLoader(str(self.template_dir)) if self.template_dir.exists() else None
+            return Environment(loader=loader, autoescape=select_autoescape(["html", "xml"]))
+        except Exception:
+            return None
     
     def _get_default_reset_template(self) -> str:
         """返回默认的密码重置邮件HTML模板。"""
@@ -152,9 +319,40 @@ class EmailService:
 </html>
         """.strip()
     
-    def _render_template(self, template_name: str, context: dict) -> str:
+    def _compile_templates(self) -> Dict[str, TemplateRenderer]:
+        """
+        编译全部邮件模板（仅在初始化时执行一次）。
+
+        模板目录中存在同名文件时优先使用文件模板，否则使用内置默认模板。
+
+        Returns:
+            Dict[str, TemplateRenderer]: 模板名 -> 渲染函数
+        """
+        sources = {
+            "reset_password": self._get_default_reset_template(),
+            "verify_email": self._get_default_verify_template(),
+            "generic": "<html><body>{{ content }}</body></html>",
+        }
+        for name in self.TEMPLATE_NAMES:
+            path = self.template_dir / f"{name}.html"
+            if path.exists():
+                sources[name] = path.read_text(encoding="utf-8")
+
+        compiled = {}
+        for name, source in sources.items():
+            renderer = None
+            if self.template_env is not None:
+                try:
+                    template = self.template_env.from_string(source)
+                    renderer = lambda context, _template=template: _template.render(**context)
+                except Exception:
+                    renderer = None
+            compiled[name] = renderer or compile_simple_template(source)
+        return compiled
+    
+    def render_template(self, template_name: str, context: dict) -> str:
         """
-        渲染邮件模板，支持文件模板和默认模板。
+        使用预编译的模板渲染邮件。
         
         Args:
             template_name: 模板名称（如 'reset_password'）
@@ -163,31 +361,67 @@ class EmailService:
         Returns:
             str: 渲染后的HTML内容
         """
-        # 首先尝试从文件系统加载模板
-        if self.template_env:
-            try:
-                template = self.template_env.get_template(f"{template_name}.html")
-                return template.render(**context)
-            except Exception:
-                # 模板文件不存在，使用默认模板
-                pass
-        
-        # 使用默认模板
-        if template_name == "reset_password":
-            template_str = self._get_default_reset_template()
-        elif template_name == "verify_email":
-            template_str = self._get_default_verify_template()
-        else:
-            # 通用模板
-            template_str = "<html><body>{{ content }}</body></html>"
+        renderer = self._templates.get(template_name) or self._templates["generic"]
+        return renderer(context)
+    
+    def build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_name: Optional[str] = None,
+    ) -> EmailMessage:
+        """
+        构造 HTML 邮件消息。
         
-        # 简单的模板变量替换
-        result = template_str
-        for key, value in context.items():
-            placeholder = "{{ " + key + " }}"
-            result = result.replace(placeholder, str(value))
+        Args:
+            to_email: 收件人邮箱地址
+            subject: 邮件主题
+            html_content: 邮件HTML内容
+            from_name: 发件人显示名称（可选）
+            
+        Returns:
+            EmailMessage: 邮件消息
+        """
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = formataddr((from_name or self.email_from_name, self.email_from or "noreply@localhost"))
+        message["To"] = to_email
+        message.set_content(html_content, subtype="html", charset="utf-8")
+        return message
+    
+    def get_transport(self) -> Optional[SMTPConnectionPool]:
+        """获取（并在首次调用时创建）SMTP 连接池；未配置 SMTP 时返回 None。"""
+        if not self.is_configured:
+            return None
+        if self._pool is None:
+            self._pool = SMTPConnectionPool(
+                host=self.smtp_host,
+                port=self.smtp_port,
+                username=self.smtp_user,
+                password=self.smtp_password,
+                use_tls=settings.SMTP_USE_TLS,
+                start_tls=settings.SMTP_START_TLS,
+                timeout=settings.SMTP_TIMEOUT,
+                size=settings.SMTP_POOL_SIZE,
+                max_idle=settings.SMTP_CONNECTION_MAX_IDLE,
+            )
+        return self._pool
+    
+    @instrumented(EMAIL)
+    async def deliver(self, message: EmailMessage, transport: Optional[SMTPConnectionPool] = None) -> None:
+        """
+        投递邮件，失败时抛出异常（由发件箱工作进程决定是否重试）。
         
-        return result
+        Args:
+            message: 邮件消息
+            transport: 指定的连接池，默认使用按配置创建的连接池
+        """
+        transport = transport or self.get_transport()
+        if transport is None:
+            logger.info(f"[EMAIL] To: {message['To']}, Subject: {message['Subject']}")
+            return
+        await transport.send(message)
     
     async def send_email(
         self,
@@ -197,7 +431,7 @@ class EmailService:
         from_name: Optional[str] = None,
     ) -> bool:
         """
-        发送邮件到指定邮箱地址。
+        立即发送邮件到指定邮箱地址（业务流程请使用发件箱）。
         
         Args:
             to_email: 收件人邮箱地址
@@ -208,82 +442,32 @@ class EmailService:
         Returns:
             bool: 发送是否成功
         """
-        # 如果没有配置SMTP，记录日志并返回成功（开发/测试环境）
-        if not self.smtp_user or not self.smtp_password:
-            print(f"[EMAIL] To: {to_email}, Subject: {subject}")
-            print(f"[EMAIL] Content preview: {html_content[:200]}...")
-            return True
-        
-        from_email = self.email_from or self.smtp_user
-        from_display = from_name or self.email_from_name
-        
         try:
-            if ASYNC_MAIL_AVAILABLE and aiosmtplib:
-                # 使用异步SMTP发送
-                message = MIMEMultipart('alternative')
-                message['Subject'] = subject
-                message['From'] = f"{from_display} <{from_email}>"
-                message['To'] = to_email
-                
-                html_part = MIMEText(html_content, 'html', 'utf-8')
-                message.attach(html_part)
-                
-                await aiosmtplib.send(
-                    message,
-                    hostname=self.smtp_host,
-                    port=self.smtp_port,
-                    start_tls=True,
-                    username=self.smtp_user,
-                    password=self.smtp_password,
-                )
-            else:
-                # 同步发送（阻塞，不推荐生产环境使用）
-                message = MIMEMultipart('alternative')
-                message['Subject'] = subject
-                message['From'] = f"{from_display} <{from_email}>"
-                message['To'] = to_email
-                
-                html_part = MIMEText(html_content, 'html', 'utf-8')
-                message.attach(html_part)
-                
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(message)
-            
+            await self.deliver(self.build_message(to_email, subject, html_content, from_name))
             return True
         except Exception as e:
-            print(f"[EMAIL ERROR] Failed to send email: {e}")
-            # 在开发/测试环境返回True以避免中断流程
-            return True
+            logger.error(f"[EMAIL ERROR] Failed to send email: {e}")
+            return False
     
-    async def send_password_reset_email(
+    def render_password_reset_email(
         self,
-        to_email: str,
         reset_token: str,
         user_name: str = "",
         frontend_url: str = "",
-    ) -> bool:
+    ) -> Tuple[str, str]:
         """
-        发送密码重置邮件。
+        渲染密码重置邮件。
         
         Args:
-            to_email: 收件人邮箱地址
             reset_token: 密码重置令牌
             user_name: 用户名称（用于个性化邮件）
             frontend_url: 前端应用URL
             
         Returns:
-            bool: 发送是否成功
+            Tuple[str, str]: (邮件主题, HTML内容)
         """
-        # 构建重置URL - 使用前端URL + 重置路由
-        if not frontend_url:
-            frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:5173')
-        
-        reset_url = f"{frontend_url}/auth/reset-password?token={reset_token}"
-        
-        # 渲染邮件模板
-        html_content = self._render_template(
+        reset_url = f"{frontend_url or settings.FRONTEND_URL}/auth/reset-password?token={reset_token}"
+        html_content = self.render_template(
             "reset_password",
             {
                 "user_name": user_name or "用户",
@@ -292,40 +476,27 @@ class EmailService:
                 "current_year": datetime.now(timezone.utc).year,
             }
         )
-        
-        return await self.send_email(
-            to_email=to_email,
-            subject="重置您的 IP-NFT 平台密码",
-            html_content=html_content,
-        )
+        return "重置您的 IP-NFT 平台密码", html_content
     
-    async def send_verification_email(
+    def render_verification_email(
         self,
-        to_email: str,
         verification_token: str,
         user_name: str = "",
         frontend_url: str = "",
-    ) -> bool:
+    ) -> Tuple[str, str]:
         """
-        发送邮箱验证邮件。
+        渲染邮箱验证邮件。
         
         Args:
-            to_email: 收件人邮箱地址
             verification_token: 邮箱验证令牌
             user_name: 用户名称
             frontend_url: 前端应用URL
             
         Returns:
-            bool: 发送是否成功
+            Tuple[str, str]: (邮件主题, HTML内容)
         """
-        # 构建验证URL
-        if not frontend_url:
-            frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:5173')
-        
-        verify_url = f"{frontend_url}/auth/verify-email?token={verification_token}"
-        
-        # 渲染邮件模板
-        html_content = self._render_template(
+        verify_url = f"{frontend_url or settings.FRONTEND_URL}/auth/verify-email?token={verification_token}"
+        html_content = self.render_template(
             "verify_email",
             {
                 "user_name": user_name or "用户",
@@ -334,12 +505,34 @@ class EmailService:
                 "current_year": datetime.now(timezone.utc).year,
             }
         )
-        
-        return await self.send_email(
-            to_email=to_email,
-            subject="请验证您的 IP-NFT 平台邮箱",
-            html_content=html_content,
-        )
+        return "请验证您的 IP-NFT 平台邮箱", html_content
+    
+    async def send_password_reset_email(
+        self,
+        to_email: str,
+        reset_token: str,
+        user_name: str = "",
+        frontend_url: str = "",
+    ) -> bool:
+        """立即发送密码重置邮件。"""
+        subject, html_content = self.render_password_reset_email(reset_token, user_name, frontend_url)
+        return await self.send_email(to_email=to_email, subject=subject, html_content=html_content)
+    
+    async def send_verification_email(
+        self,
+        to_email: str,
+        verification_token: str,
+        user_name: str = "",
+        frontend_url: str = "",
+    ) -> bool:
+        """立即发送邮箱验证邮件。"""
+        subject, html_content = self.render_verification_email(verification_token, user_name, frontend_url)
+        return await self.send_email(to_email=to_email, subject=subject, html_content=html_content)
+    
+    async def close(self) -> None:
+        """关闭 SMTP 连接池。"""
+        if self._pool is not None:
+            await self._pool.close()
 
 
 # 创建全局邮件服务实例
@@ -3,9 +3,8 @@ from typing import Optional, List
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from eth_account.messages import encode_defunct
-from web3 import Web3
 
+from app.core.cache import cache_service, enterprise_tag, invalidate_after_commit, user_tag
 from app.core.exceptions import (
     AppException,
     NotFoundException,
@@ -13,6 +12,7 @@ from app.core.exceptions import (
     ConflictException,
     BadRequestException,
 )
+from app.core.wallet import verify_wallet_signature
 from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
 from app.repositories.enterprise_repository import (
     EnterpriseRepository,
@@ -217,15 +217,27 @@ class EnterpriseService:
             EnterpriseNotFoundError: 如果企业不存在。
             PermissionDeniedError: 如果用户不是企业成员。
         """
-        enterprise = await self.enterprise_repo.get_by_id(enterprise_id)
-        if not enterprise:
+        async def load() -> Optional[dict]:
+            enterprise = await self.enterprise_repo.get_by_id(enterprise_id)
+            if not enterprise:
+                return None
+            return self._enterprise_to_detail_response(enterprise).model_dump(mode="json")
+        
+        # 详情（含成员及其用户资料）经应用缓存读取，企业或成员变更提交后失效；成员校验不缓存
+        detail = await cache_service.get_or_load(
+            "enterprise_detail",
+            enterprise_id,
+            load,
+            tags=lambda value: [enterprise_tag(enterprise_id)] + [user_tag(m["user_id"]) for m in value["members"]],
+        )
+        if detail is None:
             raise EnterpriseNotFoundError()
         
         # 验证用户是企业成员
         if not await self.member_repo.is_member(enterprise_id, user_id):
             raise PermissionDeniedError("您不是该企业的成员")
         
-        return self._enterprise_to_detail_response(enterprise)
+        return EnterpriseDetailResponse.model_validate(detail)
     
     async def get_user_enterprises(
         self,
@@ -296,6 +308,7 @@ class EnterpriseService:
         
         # 更新企业
         update_data = data.model_dump(exclude_unset=True)
+        invalidate_after_commit(self.db, enterprise_tag(enterprise_id))
         enterprise = await self.enterprise_repo.update(enterprise_id, **update_data)
         
         return self._enterprise_to_detail_response(enterprise)
@@ -328,6 +341,7 @@ class EnterpriseService:
         # 验证权限（只有 OWNER 可以删除）
         await self._check_owner_permission(enterprise_id, user_id)
         
+        invalidate_after_commit(self.db, enterprise_tag(enterprise_id))
         return await self.enterprise_repo.delete(enterprise_id)
 
     async def invite_member(
@@ -385,6 +399,7 @@ class EnterpriseService:
             user_id=user_id,
             role=data.role,
         )
+        invalidate_after_commit(self.db, enterprise_tag(enterprise_id))
         member = await self.member_repo.create(member)
         
         # 重新获取完整数据
@@ -435,6 +450,7 @@ class EnterpriseService:
             raise PermissionDeniedError("不能更改所有者的角色")
         
         # 更新角色
+        invalidate_after_commit(self.db, enterprise_tag(enterprise_id))
         member = await self.member_repo.update_role(
             enterprise_id, target_user_id, data.role
         )
@@ -484,6 +500,7 @@ class EnterpriseService:
         if operator_id != target_user_id:
             await self._check_admin_permission(enterprise_id, operator_id)
         
+        invalidate_after_commit(self.db, enterprise_tag(enterprise_id))
         return await self.member_repo.delete(enterprise_id, target_user_id)
     
     async def get_enterprise_members(
@@ -562,6 +579,7 @@ class EnterpriseService:
             raise WalletBindError("无效的钱包签名")
         
         # 更新钱包地址
+        invalidate_after_commit(self.db, enterprise_tag(enterprise_id))
         enterprise = await self.enterprise_repo.update_wallet_address(
             enterprise_id, wallet_address
         )
@@ -613,7 +631,7 @@ class EnterpriseService:
         message: str,
     ) -> bool:
         """
-        使用 Web3 验证钱包签名。
+        验证钱包签名（EIP-191 personal_sign）。
         
         Args:
             wallet_address (str): 钱包地址。
@@ -623,15 +641,7 @@ class EnterpriseService:
         Returns:
             bool: 签名是否有效。
         """
-        try:
-            w3 = Web3()
-            message_hash = encode_defunct(text=message)
-            recovered_address = w3.eth.account.recover_message(
-                message_hash, signature=signature
-            )
-            return recovered_address.lower() == wallet_address.lower()
-        except Exception:
-            return False
+        return verify_wallet_signature(wallet_address, signature, message)
     
     def _enterprise_to_response(
         self,
@@ -0,0 +1,485 @@
+"""数据导出服务。
+
+合规导出需要完整数据集，不能走每页最多 100 条、逐行构造字典和 Pydantic 模型的列表接口。
+导出查询只选择需要的列（不加载 ORM 实体及其 selectin 关系），通过服务端游标（``yield_per``）
+按批读取，每批直接编码为一个 CSV / NDJSON 分块交给 ``StreamingResponse``（分块传输编码），
+可选 gzip 压缩。任何时刻进程内只持有一批行，内存占用与导出总行数无关。
+
+响应体在路由返回之后才读取游标，因此每次导出从会话工厂打开自己的会话，由返回的 ``ExportStream``
+持有：迭代结束时关闭，响应在开始迭代前就被取消时由 ``aclose`` 关闭，不依赖请求作用域会话的关闭时机。
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import ARRAY, JSON, Date, DateTime, Select, String, Uuid, and_, func, or_, select
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession, async_sessionmaker
+from sqlalchemy.types import TypeEngine
+
+from app.core.config import settings
+from app.models.asset import Asset, MintRecord
+from app.models.ownership import NFTTransferRecord
+from app.repositories.asset_repository import AssetRepository
+from app.schemas.asset import AssetFilterParams
+
+logger = logging.getLogger(__name__)
+
+# 以这些字符开头的单元格会被电子表格当作公式执行，导出 CSV 时加单引号前缀
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportFormat(str, Enum):
+    """导出格式。"""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+# 各格式的文件扩展名与媒体类型
+_EXTENSIONS = {ExportFormat.CSV: "csv", ExportFormat.NDJSON: "ndjson"}
+_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+@dataclass(frozen=True)
+class ExportQuery:
+    """一个导出任务：文件名前缀与只选择导出列的查询（列标签即表头）。"""
+
+    name: str
+    statement: Select
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.statement.selected_columns.keys())
+
+    @property
+    def column_types(self) -> List[TypeEngine]:
+        return [column.type for column in self.statement.selected_columns]
+
+
+def export_filename(name: str, export_format: ExportFormat, compress: bool, now: datetime) -> str:
+    """
+    生成导出文件名。
+
+    Args:
+        name: 文件名前缀
+        export_format: 导出格式
+        compress: 是否 gzip 压缩
+        now: 导出时间
+
+    Returns:
+        str: 文件名，例如 ``assets-20261019T080000Z.csv.gz``
+    """
+    filename = f"{name}-{now:%Y%m%dT%H%M%SZ}.{_EXTENSIONS[export_format]}"
+    return filename + ".gz" if compress else filename
+
+
+def export_media_type(export_format: ExportFormat, compress: bool) -> str:
+    """导出响应的媒体类型（压缩后为 application/gzip，下载得到 .gz 文件）。"""
+    return "application/gzip" if compress else _MEDIA_TYPES[export_format]
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+def _json_text(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _escape_formula(value: str) -> str:
+    return "'" + value if value.startswith(_FORMULA_PREFIXES) else value
+
+
+def _column_converters(column_types: Sequence[TypeEngine], csv_output: bool) -> List[Tuple[int, Callable[[Any], Any]]]:
+    """
+    按列类型选定每列的值转换函数（每次导出只判断一次，而不是逐个单元格判断类型）。
+
+    CSV 中 UUID、数字与布尔值交给 csv 模块按 ``str()`` 输出，None 输出为空串；
+    JSON 中 JSON 列保持原生结构，只转换枚举、时间与 UUID。
+
+    Args:
+        column_types: 各列的 SQL 类型
+        csv_output: 是否为 CSV 输出
+
+    Returns:
+        List[Tuple[int, Callable[[Any], Any]]]: 需要转换的列下标与转换函数
+    """
+    converters = []
+    for index, column_type in enumerate(column_types):
+        if isinstance(column_type, SAEnum):
+            converter = _enum_value
+        elif isinstance(column_type, (DateTime, Date)):
+            converter = _isoformat
+        elif isinstance(column_type, (JSON, ARRAY)):
+            converter = _json_text if csv_output else None
+        elif isinstance(column_type, String):
+            converter = _escape_formula if csv_output else None
+        elif isinstance(column_type, Uuid):
+            converter = None if csv_output else str
+        else:
+            converter = None
+        if converter is not None:
+            converters.append((index, converter))
+    return converters
+
+
+def _convert_rows(rows: Sequence[Row], converters: List[Tuple[int, Callable[[Any], Any]]]) -> List[List[Any]]:
+    converted = []
+    for row in rows:
+        values = list(row)
+        for index, converter in converters:
+            value = values[index]
+            if value is not None:
+                values[index] = converter(value)
+        converted.append(values)
+    return converted
+
+
+def encode_csv_batch(rows: Sequence[Sequence[Any]]) -> bytes:
+    """
+    将一批（已转换的）行编码为 CSV。
+
+    Args:
+        rows: 行
+
+    Returns:
+        bytes: UTF-8 编码的 CSV 片段
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson_batch(columns: List[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """
+    将一批（已转换的）行编码为 NDJSON（每行一个 JSON 对象）。
+
+    Args:
+        columns: 列名
+        rows: 行
+
+    Returns:
+        bytes: UTF-8 编码的 NDJSON 片段
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    lines = [dumps(dict(zip(columns, row))) for row in rows]
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+class BatchEncoder:
+    """
+    按批编码导出行（同步，在线程中运行）。
+
+    一批行的类型转换、CSV / NDJSON 编码与 gzip 压缩都是纯 CPU 工作，放到线程中执行，
+    导出大文件时事件循环仍能及时处理其他请求（zlib 压缩期间会释放 GIL）。
+    """
+
+    def __init__(self, export: "ExportQuery", export_format: ExportFormat, compress: bool, level: int = 6):
+        """
+        初始化编码器。
+
+        Args:
+            export: 导出查询
+            export_format: 导出格式
+            compress: 是否 gzip 压缩
+            level: gzip 压缩级别
+        """
+        self.columns = export.columns
+        self.csv_output = export_format == ExportFormat.CSV
+        self.converters = _column_converters(export.column_types, self.csv_output)
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+    def _output(self, data: bytes) -> bytes:
+        return self.compressor.compress(data) if self.compressor else data
+
+    def header(self) -> bytes:
+        """文件头（CSV 表头；NDJSON 没有文件头）。"""
+        return self._output(encode_csv_batch([self.columns])) if self.csv_output else b""
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        """
+        编码一批行。
+
+        Args:
+            rows: 查询结果行
+
+        Returns:
+            bytes: 响应体分块（压缩时可能为空，数据暂存在压缩器中）
+        """
+        converted = _convert_rows(rows, self.converters)
+        if self.csv_output:
+            return self._output(encode_csv_batch(converted))
+        return self._output(encode_ndjson_batch(self.columns, converted))
+
+    def finish(self) -> bytes:
+        """文件尾（压缩时输出压缩器中剩余的数据与 gzip 尾部）。"""
+        return self.compressor.flush() if self.compressor else b""
+
+
+class ExportService:
+    """导出服务。"""
+
+    def __init__(self, session_factory: async_sessionmaker, batch_size: Optional[int] = None):
+        """
+        初始化导出服务。
+
+        Args:
+            session_factory: 会话工厂（每次导出打开一个会话，响应体读完后关闭）
+            batch_size: 每批读取的行数，默认取 ``EXPORT_BATCH_SIZE``
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+
+    # ------------------------------------------------------------------ #
+    # 导出查询                                                              #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def assets_query(enterprise_id: UUID, filters: AssetFilterParams) -> ExportQuery:
+        """
+        企业资产导出（筛选条件与资产列表接口一致，不分页）。
+
+        Args:
+            enterprise_id: 企业 ID
+            filters: 筛选参数（忽略分页参数）
+
+        Returns:
+            ExportQuery: 导出查询
+        """
+        statement = select(
+            Asset.id,
+            Asset.name,
+            Asset.type,
+            Asset.status,
+            Asset.legal_status,
+            Asset.description,
+            Asset.creator_name,
+            Asset.inventors,
+            Asset.creation_date,
+            Asset.application_number,
+            Asset.nft_token_id,
+            Asset.nft_contract_address,
+            Asset.nft_chain,
+            Asset.metadata_uri,
+            Asset.mint_tx_hash,
+            Asset.created_at,
+            Asset.updated_at,
+        )
+        statement = AssetRepository.filter_enterprise_assets(
+            statement,
+            enterprise_id,
+            asset_type=filters.type,
+            status=filters.status,
+            legal_status=filters.legal_status,
+            start_date=filters.start_date,
+            end_date=filters.end_date,
+            search=filters.search,
+        )
+        return ExportQuery("assets", statement.order_by(Asset.created_at.desc(), Asset.id.desc()))
+
+    @staticmethod
+    def _transfers_statement(*conditions) -> Select:
+        return (
+            select(
+                NFTTransferRecord.id,
+                NFTTransferRecord.token_id,
+                NFTTransferRecord.contract_address,
+                NFTTransferRecord.transfer_type,
+                NFTTransferRecord.from_address,
+                NFTTransferRecord.from_enterprise_id,
+                NFTTransferRecord.from_enterprise_name,
+                NFTTransferRecord.to_address,
+                NFTTransferRecord.to_enterprise_id,
+                NFTTransferRecord.to_enterprise_name,
+                NFTTransferRecord.tx_hash,
+                NFTTransferRecord.block_number,
+                func.coalesce(NFTTransferRecord.confirmed_at, NFTTransferRecord.created_at).label("timestamp"),
+                NFTTransferRecord.status,
+                NFTTransferRecord.remarks,
+            )
+            .where(and_(*conditions))
+            .order_by(NFTTransferRecord.created_at.desc(), NFTTransferRecord.id)
+        )
+
+    def token_transfers_query(self, token_id: int, contract_address: Optional[str] = None) -> ExportQuery:
+        """
+        单个 NFT 的完整权属变更历史导出（列与历史接口一致）。
+
+        Args:
+            token_id: Token ID
+            contract_address: 合约地址
+
+        Returns:
+            ExportQuery: 导出查询
+        """
+        conditions = [NFTTransferRecord.token_id == token_id]
+        if contract_address:
+            conditions.append(NFTTransferRecord.contract_address == contract_address)
+        return ExportQuery(f"token-{token_id}-transfers", self._transfers_statement(*conditions))
+
+    def enterprise_transfers_query(self, enterprise_id: UUID) -> ExportQuery:
+        """
+        企业转入与转出的全部权属变更记录导出。
+
+        Args:
+            enterprise_id: 企业 ID
+
+        Returns:
+            ExportQuery: 导出查询
+        """
+        statement = self._transfers_statement(
+            or_(
+                NFTTransferRecord.from_enterprise_id == enterprise_id,
+                NFTTransferRecord.to_enterprise_id == enterprise_id,
+            )
+        )
+        return ExportQuery("transfers", statement)
+
+    @staticmethod
+    def mint_history_query(enterprise_id: UUID, status_filter: Optional[str] = None) -> ExportQuery:
+        """
+        企业铸造历史导出（列与铸造历史接口一致）。
+
+        Args:
+            enterprise_id: 企业 ID
+            status_filter: 记录状态筛选
+
+        Returns:
+            ExportQuery: 导出查询
+        """
+        statement = (
+            select(
+                MintRecord.id.label("mint_record_id"),
+                Asset.id.label("asset_id"),
+                Asset.name.label("asset_name"),
+                Asset.status.label("asset_status"),
+                MintRecord.operation,
+                MintRecord.stage,
+                MintRecord.status,
+                MintRecord.signature_verified,
+                MintRecord.token_id,
+                MintRecord.tx_hash,
+                MintRecord.block_number,
+                MintRecord.error_code,
+                MintRecord.error_message,
+                MintRecord.created_at,
+                MintRecord.completed_at,
+            )
+            .join(Asset, Asset.id == MintRecord.asset_id)
+            .where(Asset.enterprise_id == enterprise_id)
+        )
+        if status_filter:
+            statement = statement.where(MintRecord.status == status_filter.upper())
+        return ExportQuery("mint-history", statement.order_by(MintRecord.created_at.desc(), MintRecord.id))
+
+    # ------------------------------------------------------------------ #
+    # 流式编码                                                              #
+    # ------------------------------------------------------------------ #
+
+    async def open(
+        self,
+        export: ExportQuery,
+        export_format: ExportFormat,
+        compress: bool = False,
+    ) -> "ExportStream":
+        """
+        执行导出查询并返回响应体分块。
+
+        查询在返回前执行，SQL 错误仍能以错误响应返回；之后的行在迭代分块时才从游标读取。
+        导出会话归返回的 ``ExportStream`` 所有，迭代结束（包括中断）或调用 ``aclose`` 时关闭。
+
+        Args:
+            export: 导出查询
+            export_format: 导出格式
+            compress: 是否 gzip 压缩
+
+        Returns:
+            ExportStream: 响应体分块（每批行一个分块）
+        """
+        db: AsyncSession = self.session_factory()
+        try:
+            result = await db.stream(export.statement.execution_options(yield_per=self.batch_size))
+        except Exception:
+            await db.close()
+            raise
+        encoder = BatchEncoder(export, export_format, compress, settings.EXPORT_GZIP_LEVEL)
+        return ExportStream(self._encode(export.name, db, result, encoder), db, result)
+
+    async def _encode(
+        self,
+        name: str,
+        db: AsyncSession,
+        result: AsyncResult,
+        encoder: BatchEncoder,
+    ) -> AsyncIterator[bytes]:
+        rows = 0
+        try:
+            header = encoder.header()
+            if header:
+                yield header
+            async for partition in result.partitions():
+                rows += len(partition)
+                chunk = await asyncio.to_thread(encoder.encode, partition)
+                if chunk:
+                    yield chunk
+            tail = encoder.finish()
+            if tail:
+                yield tail
+        except Exception:
+            # 响应头已发出，只能中断连接；客户端会收到不完整的分块响应
+            logger.exception("导出 %s 在第 %d 行后中断", name, rows)
+            raise
+        finally:
+            await result.close()
+            await db.close()
+        logger.info("导出 %s 完成: %d 行", name, rows)
+
+
+class ExportStream:
+    """
+    导出响应体：按批产出分块，并持有导出会话与服务端游标。
+
+    分块生成器只在开始迭代后才会执行自身的 ``finally``；响应在发出第一个分块前被取消时，
+    由 ``aclose`` 关闭游标并把连接归还连接池，不必等到垃圾回收。
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], db: AsyncSession, result: AsyncResult):
+        self._chunks = chunks
+        self._db = db
+        self._result = result
+        self._closed = False
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._chunks
+
+    async def aclose(self) -> None:
+        """关闭分块生成器、游标与会话（可重复调用）。"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._chunks.aclose()
+        finally:
+            try:
+                await self._result.close()
+            finally:
+                await self._db.close()
@@ -0,0 +1,291 @@
+"""后台维护任务调度器。
+
+在应用进程内定期清理过期的刷新令牌、邮箱验证令牌、密码重置令牌、访问令牌撤销记录，
+以及超过保留期的已读通知、已发送或放弃发送的邮件与无任务引用的上传暂存文件；并按审批表的实际数量校正审批计数表
+（级联删除审批时不会经过服务层的增量计数），按源表刷新仪表盘汇总表。
+
+- 清理任务分批删除（``LIMIT`` 子查询），每批单独提交并在批间暂停，避免长时间持有锁；
+  计数校正、汇总刷新等重算任务（``batched=False``）每次运行只执行一次；
+- 每个任务运行前获取数据库租约锁，多个工作进程中同一时刻只有一个执行；
+- 每个任务的运行次数、耗时与删除行数保存在内存中（``get_stats``），
+  最近一次结果同时写入 ``job_locks`` 表，便于跨进程查看。
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.approval_repository import ApprovalCounterRepository, ApprovalNotificationRepository
+from app.repositories.email_verification_token_repository import EmailVerificationTokenRepository
+from app.repositories.job_lock_repository import JobLockRepository
+from app.repositories.password_reset_token_repository import PasswordResetTokenRepository
+from app.repositories.token_repository import TokenRepository
+from app.repositories.token_revocation_repository import TokenRevocationRepository
+from app.services.dashboard_service import DASHBOARD_ROLLUP_JOB, DashboardService
+from app.services.email_outbox_service import EmailOutboxService
+from app.services.upload_queue_service import UploadQueueService
+
+logger = logging.getLogger(__name__)
+
+# 单批删除函数：接收会话与批大小，返回本批删除（重算任务为写入）的行数（不提交事务）
+BatchDelete = Callable[[AsyncSession, int], Awaitable[int]]
+
+
+@dataclass
+class MaintenanceJob:
+    """
+    一个维护任务。
+
+    ``batched`` 为真时按批重复调用直到某批不足批大小；为假时是重算任务，每次运行只调用一次，
+    返回的行数是写入而非删除的行数。
+    """
+
+    name: str
+    delete_batch: BatchDelete
+    interval: float = field(default_factory=lambda: settings.MAINTENANCE_JOB_INTERVAL)
+    batched: bool = True
+
+
+@dataclass
+class JobStats:
+    """单个任务在本进程内的运行统计。"""
+
+    runs: int = 0
+    skipped: int = 0
+    failures: int = 0
+    total_rows: int = 0
+    last_rows: int = 0
+    last_duration_ms: float = 0.0
+    last_started_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
+async def _delete_expired_refresh_tokens(db: AsyncSession, limit: int) -> int:
+    revoked_before = datetime.now(timezone.utc) - timedelta(days=settings.REVOKED_REFRESH_TOKEN_RETENTION_DAYS)
+    return await TokenRepository(db).delete_expired_tokens(limit=limit, revoked_before=revoked_before)
+
+
+async def _delete_expired_email_verification_tokens(db: AsyncSession, limit: int) -> int:
+    return await EmailVerificationTokenRepository(db).delete_expired_tokens(limit=limit)
+
+
+async def _delete_expired_password_reset_tokens(db: AsyncSession, limit: int) -> int:
+    return await PasswordResetTokenRepository(db).delete_expired_tokens(limit=limit)
+
+
+async def _delete_expired_access_token_revocations(db: AsyncSession, limit: int) -> int:
+    return await TokenRevocationRepository(db).delete_expired(datetime.now(timezone.utc), limit=limit)
+
+
+async def _delete_old_read_notifications(db: AsyncSession, limit: int) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.READ_NOTIFICATION_RETENTION_DAYS)
+    return await ApprovalNotificationRepository(db).delete_read_before(cutoff, limit=limit)
+
+
+async def _delete_old_finished_emails(db: AsyncSession, limit: int) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.SENT_EMAIL_RETENTION_DAYS)
+    return await EmailOutboxService(db).purge_finished(cutoff, limit=limit)
+
+
+async def _delete_orphan_spool_files(db: AsyncSession, limit: int) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.UPLOAD_SPOOL_ORPHAN_GRACE_HOURS)
+    return await UploadQueueService(db).purge_orphan_spool_files(cutoff, limit=limit)
+
+
+async def _reconcile_approval_counters(db: AsyncSession, limit: int) -> int:
+    return await ApprovalCounterRepository(db).reconcile()
+
+
+async def _refresh_dashboard_rollups(db: AsyncSession, limit: int) -> int:
+    return await DashboardService(db).refresh_rollups()
+
+
+def default_jobs() -> List[MaintenanceJob]:
+    """默认的维护任务列表。"""
+    return [
+        MaintenanceJob("refresh_tokens", _delete_expired_refresh_tokens),
+        MaintenanceJob("email_verification_tokens", _delete_expired_email_verification_tokens),
+        MaintenanceJob("password_reset_tokens", _delete_expired_password_reset_tokens),
+        MaintenanceJob("revoked_access_tokens", _delete_expired_access_token_revocations),
+        MaintenanceJob("read_notifications", _delete_old_read_notifications),
+        MaintenanceJob("sent_emails", _delete_old_finished_emails),
+        MaintenanceJob("upload_spool_files", _delete_orphan_spool_files),
+        MaintenanceJob("approval_counters", _reconcile_approval_counters, batched=False),
+        MaintenanceJob(
+            DASHBOARD_ROLLUP_JOB,
+            _refresh_dashboard_rollups,
+            interval=settings.DASHBOARD_ROLLUP_INTERVAL,
+            batched=False,
+        ),
+    ]
+
+
+class MaintenanceScheduler:
+    """进程内的维护任务调度器。"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        jobs: Optional[List[MaintenanceJob]] = None,
+        poll_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        batch_pause: Optional[float] = None,
+        max_batches: Optional[int] = None,
+        lock_ttl: Optional[float] = None,
+        owner: Optional[str] = None,
+    ):
+        """
+        初始化调度器。
+
+        Args:
+            session_factory: 会话工厂，默认使用应用的 SessionLocal
+            jobs: 任务列表，默认为 ``default_jobs()``
+            poll_interval: 检查到期任务的间隔（秒）
+            batch_size: 单批删除行数
+            batch_pause: 批间暂停（秒），限制删除速率
+            max_batches: 单次运行最多执行的批数
+            lock_ttl: 任务锁租约时长（秒）
+            owner: 锁持有者标识，默认为 主机名:进程号
+        """
+        self._session_factory = session_factory
+        self.jobs = jobs if jobs is not None else default_jobs()
+        self.poll_interval = poll_interval if poll_interval is not None else settings.MAINTENANCE_POLL_INTERVAL
+        self.batch_size = batch_size or settings.MAINTENANCE_BATCH_SIZE
+        self.batch_pause = batch_pause if batch_pause is not None else settings.MAINTENANCE_BATCH_PAUSE
+        self.max_batches = max_batches or settings.MAINTENANCE_MAX_BATCHES
+        self.lock_ttl = lock_ttl or settings.MAINTENANCE_LOCK_TTL
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.stats: Dict[str, JobStats] = {job.name: JobStats() for job in self.jobs}
+        self._next_run: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台调度任务。"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="maintenance-scheduler")
+        logger.info("维护任务调度器已启动")
+
+    async def stop(self) -> None:
+        """停止调度器，等待当前批次结束。"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=30)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        finally:
+            self._task = None
+        logger.info("维护任务调度器已停止")
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_due()
+            except Exception as exc:
+                logger.error(f"维护任务调度失败：{exc}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_due(self) -> int:
+        """
+        运行所有到期的任务。
+
+        Returns:
+            int: 本次删除的总行数
+        """
+        total = 0
+        for job in self.jobs:
+            if self._stopping.is_set():
+                break
+            now = time.monotonic()
+            if self._next_run.get(job.name, 0.0) > now:
+                continue
+            self._next_run[job.name] = now + job.interval
+            rows = await self.run_job(job)
+            total += rows or 0
+        return total
+
+    async def run_job(self, job: MaintenanceJob) -> Optional[int]:
+        """
+        在任务锁保护下执行一个任务（清理任务分批执行，重算任务只执行一次）。
+
+        Args:
+            job: 维护任务
+
+        Returns:
+            Optional[int]: 删除（重算任务为写入）的行数；锁被其他进程持有或未到间隔时返回 None
+        """
+        stats = self.stats.setdefault(job.name, JobStats())
+        async with self.session_factory() as db:
+            locks = JobLockRepository(db)
+            # 其他进程正在执行或刚执行完毕时跳过（留出一点余量，避免各进程调度时间的微小偏差）
+            if not await locks.try_acquire(job.name, self.owner, self.lock_ttl, min_interval=job.interval * 0.9):
+                stats.skipped += 1
+                logger.debug(f"维护任务 {job.name} 正由其他进程执行或刚执行过，跳过")
+                return None
+
+            started = time.perf_counter()
+            stats.last_started_at = datetime.now(timezone.utc)
+            rows = 0
+            error = None
+            try:
+                for _ in range(self.max_batches if job.batched else 1):
+                    deleted = await job.delete_batch(db, self.batch_size)
+                    await db.commit()
+                    rows += deleted
+                    if not job.batched or deleted < self.batch_size or self._stopping.is_set():
+                        break
+                    await locks.extend(job.name, self.owner, self.lock_ttl)
+                    if self.batch_pause > 0:
+                        await asyncio.sleep(self.batch_pause)
+            except Exception as exc:
+                await db.rollback()
+                error = str(exc)[:1000]
+                stats.failures += 1
+                logger.error(f"维护任务 {job.name} 执行失败：{exc}")
+
+            duration_ms = (time.perf_counter() - started) * 1000
+            stats.runs += 1
+            stats.last_rows = rows
+            stats.total_rows += rows
+            stats.last_duration_ms = duration_ms
+            stats.last_error = error
+            await locks.release(job.name, self.owner, duration_ms, rows, error)
+
+        if rows:
+            action = "删除" if job.batched else "更新"
+            logger.info(f"维护任务 {job.name} {action} {rows} 行，耗时 {duration_ms:.1f}ms")
+        return rows
+
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        获取本进程内各任务的运行统计。
+
+        Returns:
+            Dict[str, dict]: 任务名 -> 统计信息
+        """
+        return {name: asdict(stats) for name, stats in self.stats.items()}
+
+
+# 全局调度器实例
+maintenance_scheduler = MaintenanceScheduler()
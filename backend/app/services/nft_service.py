@@ -3,20 +3,23 @@
 提供NFT铸造、元数据生成和区块链交互功能。
 """
 import asyncio
+import time
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, cast, String
-from eth_account.messages import encode_defunct
-from web3 import Web3
 
-from app.models.asset import Asset, AssetStatus, Attachment, MintRecord
+from app.models.asset import Asset, AssetStatus, Attachment, AttachmentUploadStatus, MintRecord
 from app.models.enterprise import Enterprise
 from app.models.ownership import NFTTransferRecord, TransferStatus, TransferType
 from app.core.blockchain import get_blockchain_client
+from app.core.cache import asset_tag, enterprise_tag, invalidate_after_commit
+from app.core.events import event_bus, publish_after_commit, user_topic
 from app.core.exceptions import NotFoundException, BadRequestException, BlockchainException
+from app.core.metrics import observe_mint_stage
+from app.core.wallet import verify_wallet_signature
 from app.services.pinata_service import get_pinata_service
 
 
@@ -111,8 +114,7 @@ class NFTService:
             select(Asset)
             .where(
                 Asset.status == AssetStatus.MINTED,
-                Asset.nft_token_id.is_not(None),
-                Asset.nft_token_id != "",
+                Asset.token_id.is_not(None),
             )
             .order_by(Asset.created_at.asc())
         )
@@ -125,7 +127,7 @@ class NFTService:
             try:
                 _, was_created = await self._ensure_mint_history_record(
                     asset=asset,
-                    token_id=asset.nft_token_id,
+                    token_id=asset.token_id,
                     tx_hash=asset.mint_tx_hash,
                 )
             except BadRequestException:
@@ -143,6 +145,42 @@ class NFTService:
             "skipped": skipped,
         }
 
+    def _publish_mint_progress(
+        self,
+        asset: Asset,
+        operator_id: Optional[UUID],
+        stage: str,
+        status: str,
+        after_commit: bool = False,
+    ) -> None:
+        """推送铸造进度给操作者。
+
+        中间阶段尚未提交，立即推送；完成事件在事务提交后推送，客户端收到后查询即可看到最终状态。
+
+        Args:
+            asset: 资产
+            operator_id: 操作者用户ID（为空时不推送）
+            stage: 阶段名（与 mint_stage_duration_seconds 的 stage 标签一致，完成时为 completed）
+            status: success / failed
+            after_commit: 是否等事务提交后再推送
+        """
+        if operator_id is None:
+            return
+        data = {
+            "asset_id": str(asset.id),
+            "stage": stage,
+            "status": status,
+            "mint_stage": asset.mint_stage,
+            "progress": asset.mint_progress,
+            "token_id": asset.nft_token_id,
+            "error_code": asset.last_mint_error_code if status == "failed" else None,
+        }
+        topic = user_topic(operator_id)
+        if after_commit:
+            publish_after_commit(self.db, topic, "mint.progress", data)
+        else:
+            event_bus.publish(topic, "mint.progress", data)
+
     async def mint_asset_nft(
         self,
         asset_id: UUID,
@@ -190,6 +228,8 @@ class NFTService:
             )
         resolved_minter_address = await self._resolve_minter_address(asset, minter_address)
 
+        # 各阶段耗时写入 mint_stage_duration_seconds 直方图
+        mint_started = stage_started = time.perf_counter()
         mint_record = MintRecord(
             asset_id=asset_id,
             operation="REQUEST",
@@ -231,6 +271,20 @@ class NFTService:
                 "Please upload at least one attachment."
             )
 
+        if any(
+            att.upload_status != AttachmentUploadStatus.UPLOADED or not att.ipfs_cid
+            for att in attachments
+        ):
+            mint_record.status = "FAILED"
+            mint_record.error_code = "ATTACHMENTS_NOT_UPLOADED"
+            mint_record.error_message = "Asset attachments are still uploading to IPFS."
+            mint_record.completed_at = datetime.now(timezone.utc)
+            await self.db.flush()
+            raise BadRequestException(
+                "Asset attachments are still uploading to IPFS or failed to upload. "
+                "Please wait for the uploads to complete and try again."
+            )
+
         # 更新铸造尝试信息
         asset.mint_attempt_count = (asset.mint_attempt_count or 0) + 1
         asset.last_mint_attempt_at = datetime.now(timezone.utc)
@@ -254,6 +308,8 @@ class NFTService:
         asset.mint_stage = "SUBMITTING"
         asset.mint_progress = 30
         await self.db.flush()
+        stage_started = observe_mint_stage("preparing", "success", stage_started)
+        self._publish_mint_progress(asset, operator_id, "preparing", "success")
 
         try:
             pinata_service = get_pinata_service()
@@ -274,7 +330,11 @@ class NFTService:
             asset.metadata_cid = metadata_cid
             asset.metadata_uri = metadata_uri
             mint_record.metadata_uri = metadata_uri
+            stage_started = observe_mint_stage("metadata_upload", "success", stage_started)
+            self._publish_mint_progress(asset, operator_id, "metadata_upload", "success")
         except Exception as e:
+            observe_mint_stage("metadata_upload", "failed", stage_started)
+            observe_mint_stage("total", "failed", mint_started)
             asset.status = AssetStatus.MINT_FAILED
             asset.mint_stage = "FAILED"
             asset.mint_progress = 0
@@ -287,6 +347,7 @@ class NFTService:
             mint_record.completed_at = datetime.now(timezone.utc)
             
             await self.db.flush()
+            self._publish_mint_progress(asset, operator_id, "metadata_upload", "failed")
             raise BadRequestException(f"Failed to upload metadata to Pinata: {str(e)}")
 
         # 6. 调用智能合约铸造NFT
@@ -310,8 +371,12 @@ class NFTService:
             mint_record.stage = "SUBMITTING"
             
             await self.db.flush()
+            observe_mint_stage("contract_submit", "success", stage_started)
+            self._publish_mint_progress(asset, operator_id, "contract_submit", "success")
             
         except Exception as e:
+            observe_mint_stage("contract_submit", "failed", stage_started)
+            observe_mint_stage("total", "failed", mint_started)
             asset.status = AssetStatus.MINT_FAILED
             asset.mint_stage = "FAILED"
             asset.mint_progress = 0
@@ -332,11 +397,13 @@ class NFTService:
             mint_record.completed_at = datetime.now(timezone.utc)
             
             await self.db.flush()
+            self._publish_mint_progress(asset, operator_id, "contract_submit", "failed")
             raise BlockchainException(f"Failed to mint NFT: {str(e)}")
 
         # 7. 更新资产状态为已铸造
+        invalidate_after_commit(self.db, asset_tag(asset.id), enterprise_tag(asset.enterprise_id))
         asset.status = AssetStatus.MINTED
-        asset.nft_token_id = str(token_id)
+        asset.nft_token_id = str(token_id)  # 同时写入整数列 token_id
         asset.nft_contract_address = get_blockchain_client().contract_address
         asset.nft_chain = str(get_blockchain_client().chain_id) if get_blockchain_client().chain_id else "31337"
         asset.mint_stage = "COMPLETED"
@@ -361,6 +428,8 @@ class NFTService:
             tx_hash=tx_hash,
             operator_id=operator_id,
         )
+        observe_mint_stage("total", "success", mint_started)
+        self._publish_mint_progress(asset, operator_id, "completed", "success", after_commit=True)
 
         return {
             "message": "NFT minted successfully",
@@ -772,12 +841,7 @@ class NFTService:
             return False
         if not signature or not message:
             return False
-        try:
-            message_hash = encode_defunct(text=message)
-            recovered_address = Web3().eth.account.recover_message(message_hash, signature=signature)
-            return recovered_address.lower() == wallet_address.lower()
-        except Exception:
-            return False
+        return verify_wallet_signature(wallet_address, signature, message)
 
     async def update_asset_status_after_approval(
         self,
@@ -10,8 +10,26 @@ from app.models.asset import Asset, AssetStatus
 from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
 from app.models.ownership import NFTTransferRecord, OwnershipStatus, TransferType, TransferStatus
 from app.core.blockchain import get_blockchain_client
+from app.core.cache import asset_tag, cache_service, enterprise_tag, invalidate_after_commit
 from app.core.exceptions import NotFoundException, BadRequestException, ForbiddenException, BlockchainException
 
+# 权属资产响应需要的资产列（只读查询按列投影，不构造 ORM 实体，也不触发 Asset 关系的 selectin 级联）
+OWNERSHIP_ASSET_COLUMNS = (
+    Asset.id,
+    Asset.name,
+    Asset.type,
+    Asset.status,
+    Asset.enterprise_id,
+    Asset.current_owner_enterprise_id,
+    Asset.token_id,
+    Asset.nft_contract_address,
+    Asset.owner_address,
+    Asset.ownership_status,
+    Asset.metadata_uri,
+    Asset.created_at,
+    Asset.updated_at,
+)
+
 
 class OwnershipService:
     """权属管理服务。
@@ -28,8 +46,7 @@ class OwnershipService:
     def _is_enterprise_owned_asset(self, enterprise_id: UUID):
         """兼容历史数据：老数据可能缺少 current_owner_enterprise_id。"""
         return and_(
-            Asset.nft_token_id.isnot(None),
-            Asset.nft_token_id != "",
+            Asset.token_id.isnot(None),
             (
                 (Asset.current_owner_enterprise_id == enterprise_id) |
                 (
@@ -54,75 +71,70 @@ class OwnershipService:
             return asset.enterprise_id
         return None
 
-    def _parse_token_id(self, asset: Asset) -> Optional[int]:
-        raw_token_id = (asset.nft_token_id or "").strip()
-        if not raw_token_id:
-            return None
-        try:
-            token_id = int(raw_token_id)
-        except (TypeError, ValueError):
-            return None
-        return token_id if token_id > 0 else None
+    @staticmethod
+    def _ownership_tags(asset: Asset) -> List[str]:
+        """资产权属变更时需要失效的缓存标签：资产本身，以及登记企业与当前持有企业。"""
+        tags = [asset_tag(asset.id), enterprise_tag(asset.enterprise_id)]
+        if asset.current_owner_enterprise_id:
+            tags.append(enterprise_tag(asset.current_owner_enterprise_id))
+        return tags
+
+    def _select_by_token(self, token_id: int, contract_address: Optional[str], *entities):
+        """按 (token_id, nft_contract_address) 唯一索引定位资产；不带合约地址时取最近铸造的一条。"""
+        stmt = select(*entities).where(Asset.token_id == token_id)
+        if contract_address:
+            return stmt.where(Asset.nft_contract_address == contract_address)
+
+        # 同一 Token ID 只可能对应各合约中的一条，排序的行数以部署过的合约数为上限
+        return stmt.order_by(
+            Asset.mint_completed_at.desc(),
+            Asset.mint_confirmed_at.desc(),
+            Asset.updated_at.desc(),
+            Asset.created_at.desc(),
+        ).limit(1)
 
     async def _resolve_asset_record(
         self,
         token_id: int,
         contract_address: Optional[str] = None,
     ) -> Optional[Asset]:
-        conditions = [Asset.nft_token_id == str(token_id)]
-        if contract_address:
-            conditions.append(Asset.nft_contract_address == contract_address)
-
-        stmt = (
-            select(Asset)
-            .where(and_(*conditions))
-            .order_by(
-                Asset.mint_completed_at.desc(),
-                Asset.mint_confirmed_at.desc(),
-                Asset.updated_at.desc(),
-                Asset.created_at.desc(),
-            )
-            .limit(1)
-        )
+        stmt = self._select_by_token(token_id, contract_address, Asset)
         return (await self.db.execute(stmt)).scalar_one_or_none()
 
     # ------------------------------------------------------------------ #
     # 查询                                                                  #
     # ------------------------------------------------------------------ #
 
-    async def _get_owned_assets_for_enterprise(self, enterprise_id: UUID) -> List[Asset]:
-        stmt = (
-            select(Asset)
-            .where(self._is_enterprise_owned_asset(enterprise_id))
-            .order_by(Asset.created_at.desc())
+    async def get_enterprise_stats(self, enterprise_id: UUID) -> Dict[str, int]:
+        """获取企业 NFT 资产权属统计（经应用缓存，企业名下资产权属变更提交后失效）。"""
+        return await cache_service.get_or_load(
+            "ownership_stats",
+            enterprise_id,
+            lambda: self._load_enterprise_stats(enterprise_id),
+            tags=(enterprise_tag(enterprise_id),),
         )
-        return list((await self.db.execute(stmt)).scalars().all())
 
-    async def get_enterprise_stats(self, enterprise_id: UUID) -> Dict[str, int]:
-        """获取企业 NFT 资产权属统计。"""
-        assets = [
-            asset
-            for asset in await self._get_owned_assets_for_enterprise(enterprise_id)
-            if self._parse_token_id(asset) is not None
-        ]
+    async def _load_enterprise_stats(self, enterprise_id: UUID) -> Dict[str, int]:
+        # 一次聚合查询按权属状态计数，不加载资产实体
+        def count_status(status: OwnershipStatus):
+            return func.count(case((Asset.ownership_status == status, 1)))
+
+        stmt = select(
+            func.count(Asset.id),
+            func.count(case(
+                (Asset.ownership_status.is_(None) | (Asset.ownership_status == OwnershipStatus.ACTIVE), 1)
+            )),
+            count_status(OwnershipStatus.LICENSED),
+            count_status(OwnershipStatus.STAKED),
+            count_status(OwnershipStatus.TRANSFERRED),
+        ).where(self._is_enterprise_owned_asset(enterprise_id))
+        total, active, licensed, staked, transferred = (await self.db.execute(stmt)).one()
         return {
-            "total_count": len(assets),
-            "active_count": sum(
-                1 for asset in assets
-                if (asset.ownership_status or OwnershipStatus.ACTIVE) == OwnershipStatus.ACTIVE
-            ),
-            "licensed_count": sum(
-                1 for asset in assets
-                if asset.ownership_status == OwnershipStatus.LICENSED
-            ),
-            "staked_count": sum(
-                1 for asset in assets
-                if asset.ownership_status == OwnershipStatus.STAKED
-            ),
-            "transferred_count": sum(
-                1 for asset in assets
-                if asset.ownership_status == OwnershipStatus.TRANSFERRED
-            ),
+            "total_count": total,
+            "active_count": active,
+            "licensed_count": licensed,
+            "staked_count": staked,
+            "transferred_count": transferred,
         }
 
     async def get_enterprise_assets(
@@ -149,10 +161,10 @@ class OwnershipService:
         count_stmt = select(func.count(Asset.id)).where(and_(*conditions))
         total = (await self.db.execute(count_stmt)).scalar() or 0
 
-        # 列表（JOIN Enterprise 一次性取企业名，避免 N+1）
+        # 列表（JOIN Enterprise 一次性取企业名，避免 N+1；只取响应需要的列，不构造 ORM 实体）
         offset = (page - 1) * page_size
         stmt = (
-            select(Asset, Enterprise.name.label("enterprise_name"))
+            select(*OWNERSHIP_ASSET_COLUMNS, Enterprise.name.label("enterprise_name"))
             .outerjoin(Enterprise, Asset.current_owner_enterprise_id == Enterprise.id)
             .where(and_(*conditions))
             .order_by(Asset.created_at.desc())
@@ -162,21 +174,19 @@ class OwnershipService:
         rows = (await self.db.execute(stmt)).all()
 
         items = []
-        for asset, enterprise_name in rows:
-            token_id = self._parse_token_id(asset)
-            if token_id is None:
-                continue
+        for asset in rows:
+            owner_enterprise_id = self._resolve_owner_enterprise_id(asset)
 
             items.append(
                 {
                     "asset_id": str(asset.id),
                     "asset_name": asset.name,
                     "asset_type": asset.type.value,
-                    "token_id": token_id,
+                    "token_id": asset.token_id,
                     "contract_address": asset.nft_contract_address or "",
                     "owner_address": asset.owner_address or "",
-                    "owner_enterprise_id": str(self._resolve_owner_enterprise_id(asset)) if self._resolve_owner_enterprise_id(asset) else None,
-                    "owner_enterprise_name": enterprise_name,
+                    "owner_enterprise_id": str(owner_enterprise_id) if owner_enterprise_id else None,
+                    "owner_enterprise_name": asset.enterprise_name,
                     "ownership_status": asset.ownership_status or OwnershipStatus.ACTIVE,
                     "metadata_uri": asset.metadata_uri or "",
                     "created_at": asset.created_at.isoformat(),
@@ -186,13 +196,29 @@ class OwnershipService:
         return items, len(items)
 
     async def get_asset_by_token_id(self, token_id: int) -> Optional[Dict]:
-        """根据 Token ID 获取资产详情。"""
-        asset = await self._resolve_asset_record(token_id)
-        if not asset:
-            return None
+        """
+        根据 Token ID 获取资产详情（按列查询，不加载资产实体）。
+
+        结果经应用缓存，标记资产与所属企业，资产权属变更或企业改名提交后失效；返回值不得原地修改。
+        """
+        return await cache_service.get_or_load(
+            "token_asset",
+            token_id,
+            lambda: self._load_asset_by_token_id(token_id),
+            tags=self._token_asset_tags,
+        )
 
-        parsed_token_id = self._parse_token_id(asset)
-        if parsed_token_id is None:
+    @staticmethod
+    def _token_asset_tags(asset: Dict[str, Any]) -> List[str]:
+        tags = [asset_tag(asset["asset_id"])]
+        if asset["owner_enterprise_id"]:
+            tags.append(enterprise_tag(asset["owner_enterprise_id"]))
+        return tags
+
+    async def _load_asset_by_token_id(self, token_id: int) -> Optional[Dict]:
+        stmt = self._select_by_token(token_id, None, *OWNERSHIP_ASSET_COLUMNS)
+        asset = (await self.db.execute(stmt)).first()
+        if not asset:
             return None
 
         effective_owner_enterprise_id = self._resolve_owner_enterprise_id(asset)
@@ -206,17 +232,52 @@ class OwnershipService:
             "asset_id": str(asset.id),
             "asset_name": asset.name,
             "asset_type": asset.type.value,
-            "token_id": parsed_token_id,
+            "token_id": asset.token_id,
             "contract_address": asset.nft_contract_address or "",
             "owner_address": asset.owner_address or "",
             "owner_enterprise_id": str(effective_owner_enterprise_id) if effective_owner_enterprise_id else None,
             "owner_enterprise_name": enterprise_name,
-            "ownership_status": asset.ownership_status or OwnershipStatus.ACTIVE,
+            "ownership_status": OwnershipStatus(asset.ownership_status or OwnershipStatus.ACTIVE).value,
             "metadata_uri": asset.metadata_uri or "",
             "created_at": asset.created_at.isoformat(),
             "updated_at": asset.updated_at.isoformat(),
         }
 
+    async def get_transfer_history_version(
+        self,
+        token_id: int,
+        contract_address: Optional[str] = None,
+    ) -> Tuple:
+        """
+        获取权属变更历史的版本信息（用于生成 ETag）。
+
+        转移记录只会新增或在确认/失败时变更状态，按状态聚合的记录数与最新的创建、确认时间
+        足以反映任何变化，无需读取记录本身。
+
+        Args:
+            token_id: Token ID
+            contract_address: 合约地址
+
+        Returns:
+            Tuple: 按状态排序的 (状态, 记录数, 最新创建时间, 最新确认时间)
+        """
+        conditions = [NFTTransferRecord.token_id == token_id]
+        if contract_address:
+            conditions.append(NFTTransferRecord.contract_address == contract_address)
+
+        stmt = (
+            select(
+                NFTTransferRecord.status,
+                func.count(NFTTransferRecord.id),
+                func.max(NFTTransferRecord.created_at),
+                func.max(NFTTransferRecord.confirmed_at),
+            )
+            .where(and_(*conditions))
+            .group_by(NFTTransferRecord.status)
+            .order_by(NFTTransferRecord.status)
+        )
+        return tuple(tuple(row) for row in (await self.db.execute(stmt)).all())
+
     async def get_transfer_history(
         self,
         token_id: int,
@@ -269,8 +330,8 @@ class OwnershipService:
     # ------------------------------------------------------------------ #
 
     async def verify_enterprise_member(self, enterprise_id: UUID, user_id: UUID) -> bool:
-        """校验用户是否为企业成员（任意角色）。"""
-        stmt = select(EnterpriseMember).where(
+        """校验用户是否为企业成员（任意角色）。只查主键，不加载成员实体及其级联关系。"""
+        stmt = select(EnterpriseMember.id).where(
             and_(
                 EnterpriseMember.enterprise_id == enterprise_id,
                 EnterpriseMember.user_id == user_id,
@@ -380,6 +441,10 @@ class OwnershipService:
         self.db.add(record)
 
         # 5. 更新资产权属
+        tags = self._ownership_tags(asset)
+        if to_enterprise_id:
+            tags.append(enterprise_tag(to_enterprise_id))
+        invalidate_after_commit(self.db, *tags)
         asset.owner_address = to_address
         asset.current_owner_enterprise_id = to_enterprise_id
         asset.ownership_status = OwnershipStatus.TRANSFERRED if not to_enterprise_id else OwnershipStatus.ACTIVE
@@ -440,6 +505,7 @@ class OwnershipService:
         )
         self.db.add(record)
 
+        invalidate_after_commit(self.db, *self._ownership_tags(asset))
         asset.ownership_status = new_status
         await self.db.flush()
 
@@ -10,6 +10,8 @@ from typing import Optional, Union
 import requests
 
 from app.core.config import settings
+from app.core.instrumentation import UPLOAD, instrumented
+from app.core.metrics import PINATA_UPLOAD_BYTES
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,6 @@ DEFAULT_TIMEOUT = 60
 MAX_RETRIES = 3
 RETRY_DELAY = 1
 
-PINATA_API_URL = "https://api.pinata.cloud"
 PINATA_IPFS_GATEWAY = settings.PINATA_GATEWAY_URL.rstrip("/")
 ALLOWED_EXTENSIONS = {
     ".jpg",
@@ -128,12 +129,14 @@ class PinataService:
         jwt_token: Optional[str] = None,
         max_file_size: int = MAX_FILE_SIZE,
         timeout: int = DEFAULT_TIMEOUT,
+        api_url: Optional[str] = None,
     ):
         self.api_key = api_key or settings.PINATA_API_KEY or None
         self.api_secret = api_secret or settings.PINATA_API_SECRET or None
         self.jwt_token = jwt_token or settings.PINATA_JWT_TOKEN or None
         self.max_file_size = max_file_size
         self.timeout = timeout
+        self.api_url = (api_url or settings.PINATA_API_URL).rstrip("/")
 
         if not self.jwt_token and not (self.api_key and self.api_secret):
             logger.warning("pinata_credentials_missing")
@@ -160,7 +163,7 @@ class PinataService:
             )
 
     def _build_url(self, endpoint: str) -> str:
-        return f"{PINATA_API_URL}{endpoint}"
+        return f"{self.api_url}{endpoint}"
 
     def _build_pinata_metadata(
         self,
@@ -182,6 +185,16 @@ class PinataService:
         file_name: str,
         metadata: Optional[dict] = None,
     ) -> dict:
+        return self.pin_file(file_content, file_name, metadata)
+
+    @instrumented(UPLOAD)
+    def pin_file(
+        self,
+        file_content: bytes,
+        file_name: str,
+        metadata: Optional[dict] = None,
+    ) -> dict:
+        """Pin a file with a single attempt; callers own the retry policy."""
         self._check_file_size(file_content)
 
         try:
@@ -194,6 +207,8 @@ class PinataService:
             )
             response.raise_for_status()
             result = response.json()
+            if settings.METRICS_ENABLED:
+                PINATA_UPLOAD_BYTES.inc(len(file_content))
 
             logger.info(
                 "pinata_upload_succeeded",
@@ -249,6 +264,7 @@ class PinataService:
             )
             raise PinataUploadError(f"上传失败：{str(exc)}") from exc
 
+    @instrumented(UPLOAD)
     @retry_on_error()
     def upload_json(
         self,
@@ -273,6 +289,7 @@ class PinataService:
             )
             raise PinataUploadError(f"JSON 上传失败：{str(exc)}") from exc
 
+    @instrumented(UPLOAD)
     @retry_on_error()
     def delete_file(self, cid: str) -> bool:
         if not cid:
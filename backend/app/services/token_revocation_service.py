@@ -0,0 +1,199 @@
+"""访问令牌撤销服务。
+
+撤销记录持久化在数据库中（按 jti 撤销单个令牌，或按用户水位线撤销某时间点之前签发的
+全部令牌），每个进程在内存中维护一份镜像：
+
+- 已撤销 jti 放入 Bloom 过滤器，绝大多数未撤销令牌在内存中即可判定，
+  只有过滤器命中时才回表确认（排除假阳性）；
+- 用户水位线保存在字典中，精确比较令牌的签发时间。
+
+镜像按 ``TOKEN_REVOCATION_SYNC_INTERVAL`` 增量同步：每次校验前若距上次同步已超过间隔，
+先拉取该间隔内新增的记录。因此其他进程写入的撤销最迟在一个同步间隔后生效，
+本进程写入的撤销立即生效。撤销记录只需保留到令牌过期，镜像定期全量重建以剔除过期条目。
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bloom_filter import BloomFilter
+from app.core.config import settings
+from app.repositories.token_revocation_repository import TokenRevocationRepository
+
+logger = logging.getLogger(__name__)
+
+# 增量同步时向前回看的时间，容忍事务提交延迟与进程间时钟偏差（重复记录无副作用）
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class RevocationList:
+    """进程内的访问令牌撤销列表。"""
+
+    def __init__(
+        self,
+        sync_interval: Optional[float] = None,
+        rebuild_interval: Optional[float] = None,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.sync_interval = settings.TOKEN_REVOCATION_SYNC_INTERVAL if sync_interval is None else sync_interval
+        self.rebuild_interval = (
+            settings.TOKEN_REVOCATION_REBUILD_INTERVAL if rebuild_interval is None else rebuild_interval
+        )
+        self.capacity = capacity or settings.TOKEN_REVOCATION_BLOOM_CAPACITY
+        self.error_rate = error_rate or settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE
+        self._clock = clock
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+        self._watermarks: Dict[str, float] = {}
+        self._cursor: Optional[datetime] = None
+        self._synced_at: Optional[float] = None
+        self._rebuilt_at: Optional[float] = None
+        # 全量重建期间本进程新写入的 jti，重建完成后合并进新过滤器
+        self._recorded_during_rebuild: Optional[List[str]] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        """距上次同步是否已超过同步间隔。"""
+        return self._synced_at is None or self._clock() - self._synced_at >= self.sync_interval
+
+    async def sync(self, db: AsyncSession, full: bool = False) -> None:
+        """
+        从数据库同步撤销记录。
+
+        Args:
+            db (AsyncSession): 数据库异步会话。
+            full (bool): 是否强制全量重建。
+        """
+        async with self._lock:
+            # 等锁期间可能已有其他协程完成同步
+            if not full and not self.is_stale:
+                return
+
+            started = self._clock()
+            now = datetime.now(timezone.utc)
+            full = (
+                full
+                or self._cursor is None
+                or self._bloom.is_saturated
+                or started - self._rebuilt_at >= self.rebuild_interval
+            )
+            repo = TokenRevocationRepository(db)
+
+            if full:
+                self._recorded_during_rebuild = []
+                try:
+                    jtis = await repo.list_active_jtis(now)
+                    watermarks = await repo.list_watermarks()
+                    bloom = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+                    for jti in jtis + self._recorded_during_rebuild:
+                        bloom.add(jti)
+                finally:
+                    self._recorded_during_rebuild = None
+                self._bloom = bloom
+                merged = {str(user_id): ts.timestamp() for user_id, ts in watermarks}
+                for user_id, ts in self._watermarks.items():
+                    if ts > merged.get(user_id, float("-inf")):
+                        merged[user_id] = ts
+                self._watermarks = merged
+                self._rebuilt_at = started
+                logger.debug(
+                    f"撤销列表已全量重建：{len(jtis)} 个 jti，{len(merged)} 条水位线，"
+                    f"过滤器 {bloom.size_bytes} 字节"
+                )
+            else:
+                since = self._cursor - SYNC_OVERLAP
+                for jti in await repo.list_active_jtis(now, revoked_since=since):
+                    self._bloom.add(jti)
+                for user_id, ts in await repo.list_watermarks(updated_since=since):
+                    self._apply_watermark(str(user_id), ts.timestamp())
+
+            self._cursor = now
+            self._synced_at = started
+
+    async def is_revoked(self, db: AsyncSession, payload: Dict[str, Any]) -> bool:
+        """
+        判断访问令牌是否已被撤销。
+
+        Args:
+            db (AsyncSession): 数据库异步会话（同步镜像与确认假阳性时使用）。
+            payload (Dict[str, Any]): 已验签的令牌载荷。
+
+        Returns:
+            bool: 是否已撤销。
+        """
+        if self.is_stale:
+            await self.sync(db)
+
+        watermark = self._watermarks.get(payload.get("sub"))
+        if watermark is not None:
+            issued_at = payload.get("iat")
+            if not isinstance(issued_at, (int, float)) or issued_at < watermark:
+                return True
+
+        jti = payload.get("jti")
+        if not jti or jti not in self._bloom:
+            return False
+        # 过滤器命中可能是假阳性，回表确认
+        return await TokenRevocationRepository(db).is_revoked(jti)
+
+    async def revoke_token(self, db: AsyncSession, payload: Dict[str, Any]) -> bool:
+        """
+        撤销单个访问令牌（由调用方提交事务）。
+
+        Args:
+            db (AsyncSession): 数据库异步会话。
+            payload (Dict[str, Any]): 已验签的令牌载荷。
+
+        Returns:
+            bool: 载荷是否包含可撤销的 jti。
+        """
+        jti, sub, exp = payload.get("jti"), payload.get("sub"), payload.get("exp")
+        if not jti or not sub or not isinstance(exp, (int, float)):
+            return False
+        await TokenRevocationRepository(db).revoke_jti(
+            jti, UUID(sub), datetime.fromtimestamp(exp, tz=timezone.utc)
+        )
+        self.record_jti(jti)
+        return True
+
+    async def revoke_user(self, db: AsyncSession, user_id: UUID, revoked_before: Optional[datetime] = None) -> None:
+        """
+        撤销用户在某时间点之前签发的全部访问令牌（由调用方提交事务）。
+
+        Args:
+            db (AsyncSession): 数据库异步会话。
+            user_id (UUID): 用户 ID。
+            revoked_before (Optional[datetime]): 水位线，默认为当前时间。
+        """
+        watermark = await TokenRevocationRepository(db).raise_watermark(
+            user_id, revoked_before or datetime.now(timezone.utc)
+        )
+        self._apply_watermark(str(user_id), watermark.timestamp())
+
+    def record_jti(self, jti: str) -> None:
+        """在本进程镜像中立即记录已撤销的 jti。"""
+        self._bloom.add(jti)
+        if self._recorded_during_rebuild is not None:
+            self._recorded_during_rebuild.append(jti)
+
+    def _apply_watermark(self, user_id: str, ts: float) -> None:
+        if ts > self._watermarks.get(user_id, float("-inf")):
+            self._watermarks[user_id] = ts
+
+    def reset(self) -> None:
+        """清空镜像，下次校验时全量重建。"""
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+        self._watermarks = {}
+        self._cursor = None
+        self._synced_at = None
+        self._rebuilt_at = None
+
+
+# 全局撤销列表实例
+revocation_list = RevocationList()
@@ -0,0 +1,464 @@
+"""附件异步上传队列服务。
+
+请求线程只负责把文件暂存到本地磁盘并写入 ``upload_tasks`` 发件箱，
+后台 ``UploadWorker`` 按抖动指数退避重试上传到 IPFS，并为每个服务商维护熔断器。
+上传完成后回填附件的 CID，请求延迟与 Pinata 可用性解耦。
+没有任务引用的暂存文件（如批量导入在解出附件后、提交前崩溃）由维护任务按宽限期清理。
+"""
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from sqlalchemy import select, or_, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.retry import compute_backoff_delay, get_circuit_breaker
+from app.models.asset import Asset, Attachment, AttachmentUploadStatus
+from app.models.upload_task import UploadTask, UploadTaskStatus
+from app.services.pinata_service import (
+    PinataFileTooLargeError,
+    PinataService,
+    get_file_extension,
+    get_pinata_service,
+)
+
+logger = logging.getLogger(__name__)
+
+PINATA_PROVIDER = "pinata"
+
+
+def spool_dir() -> Path:
+    """返回上传暂存目录（不存在时创建）。"""
+    path = Path(settings.UPLOAD_SPOOL_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def write_spool_file(path: Path, content: bytes) -> None:
+    """写入暂存文件：先写 ``.part`` 临时文件并落盘，再原子替换为目标路径。"""
+    tmp_path = path.with_suffix(path.suffix + ".part")
+    with open(tmp_path, "wb") as fh:
+        fh.write(content)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_spool_file(path: str) -> bytes:
+    """读取暂存文件内容。"""
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def _list_spool_files(modified_before: float) -> List[str]:
+    """列出修改时间早于指定时间戳的暂存文件（含未完成的 ``.part`` 文件），按修改时间升序。"""
+    directory = spool_dir()
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            mtime = entry.stat().st_mtime
+            if mtime < modified_before:
+                files.append((mtime, str(directory / entry.name)))
+    return [path for _, path in sorted(files)]
+
+
+def remove_spool_file(path: str) -> None:
+    """删除暂存文件，文件不存在时忽略。"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class UploadQueueService:
+    """负责把附件写入本地暂存区和上传发件箱。"""
+
+    def __init__(self, db: AsyncSession, provider: str = PINATA_PROVIDER):
+        """
+        初始化上传队列服务。
+
+        Args:
+            db: 数据库会话
+            provider: 存储服务商名称
+        """
+        self.db = db
+        self.provider = provider
+
+    async def enqueue_attachment(
+        self,
+        asset: Asset,
+        file_name: str,
+        content_type: str,
+        content: bytes,
+        is_primary: bool = False,
+        metadata: Optional[dict] = None,
+    ) -> Attachment:
+        """
+        暂存文件并创建待上传附件与上传任务（仅 flush，不提交）。
+
+        Args:
+            asset: 所属资产
+            file_name: 文件名
+            content_type: 文件 MIME 类型
+            content: 文件内容
+            is_primary: 是否主附件
+            metadata: 上传时附带的元数据
+
+        Returns:
+            Attachment: 状态为 PENDING_UPLOAD 的附件
+        """
+        spool_path = spool_dir() / f"{uuid.uuid4().hex}{get_file_extension(file_name)}"
+        await asyncio.to_thread(write_spool_file, spool_path, content)
+
+        now = datetime.now(timezone.utc)
+        attachment = Attachment(
+            asset_id=asset.id,
+            file_name=file_name,
+            file_type=content_type,
+            file_size=len(content),
+            ipfs_cid=None,
+            upload_status=AttachmentUploadStatus.PENDING_UPLOAD,
+            is_primary=is_primary,
+            uploaded_at=now,
+        )
+        self.db.add(attachment)
+        await self.db.flush()
+
+        task = UploadTask(
+            attachment_id=attachment.id,
+            asset_id=asset.id,
+            provider=self.provider,
+            spool_path=str(spool_path),
+            file_name=file_name,
+            content_type=content_type,
+            file_size=len(content),
+            upload_metadata=metadata,
+            status=UploadTaskStatus.PENDING,
+            attempts=0,
+            max_attempts=settings.UPLOAD_MAX_ATTEMPTS,
+            next_attempt_at=now,
+        )
+        self.db.add(task)
+        await self.db.flush()
+
+        logger.info(
+            "upload_task_enqueued",
+            extra={
+                "asset_id": str(asset.id),
+                "cid": "",
+                "file_name": file_name,
+                "upload_task_id": str(task.id),
+            },
+        )
+        return attachment
+
+    async def purge_orphan_spool_files(self, before: datetime, limit: Optional[int] = None) -> int:
+        """
+        删除没有待上传任务引用的暂存文件（清理任务）。
+
+        只处理修改时间早于 ``before`` 的文件，正在写入或所在事务尚未提交的文件不会被误删；
+        已成功或 DEAD 的任务不再需要暂存文件，其遗留文件同样会被删除。
+
+        Args:
+            before: 修改时间早于该时间的文件才会被检查
+            limit: 单批最多删除的数量
+
+        Returns:
+            int: 删除的文件数
+        """
+        candidates = await asyncio.to_thread(_list_spool_files, before.timestamp())
+        chunk_size = limit or 1000
+        orphans: List[str] = []
+        for offset in range(0, len(candidates), chunk_size):
+            chunk = candidates[offset:offset + chunk_size]
+            referenced = set((await self.db.execute(
+                select(UploadTask.spool_path).where(
+                    UploadTask.spool_path.in_(chunk),
+                    UploadTask.status.in_((UploadTaskStatus.PENDING, UploadTaskStatus.IN_PROGRESS)),
+                )
+            )).scalars())
+            orphans.extend(path for path in chunk if path not in referenced)
+            if limit is not None and len(orphans) >= limit:
+                break
+        orphans = orphans[:limit] if limit is not None else orphans
+        for path in orphans:
+            await asyncio.to_thread(remove_spool_file, path)
+        if orphans:
+            logger.info(f"已删除 {len(orphans)} 个无任务引用的暂存文件")
+        return len(orphans)
+
+
+class UploadWorker:
+    """
+    后台上传工作进程。
+
+    周期性领取到期的上传任务，受并发信号量和服务商熔断器约束。
+    多个工作进程之间通过 ``FOR UPDATE SKIP LOCKED`` 与租约超时避免重复处理。
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        pinata_service: Optional[PinataService] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self._session_factory = session_factory
+        self._pinata_service = pinata_service
+        self.concurrency = concurrency or settings.UPLOAD_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval if poll_interval is not None else settings.UPLOAD_WORKER_POLL_INTERVAL
+        self.batch_size = batch_size or settings.UPLOAD_WORKER_BATCH_SIZE
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    @property
+    def pinata_service(self) -> PinataService:
+        if self._pinata_service is None:
+            self._pinata_service = get_pinata_service()
+        return self._pinata_service
+
+    @property
+    def breaker(self):
+        return get_circuit_breaker(
+            PINATA_PROVIDER,
+            failure_threshold=settings.UPLOAD_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.UPLOAD_CIRCUIT_RESET_SECONDS,
+        )
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台轮询任务。"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="upload-worker")
+        logger.info("上传工作进程已启动")
+
+    async def stop(self) -> None:
+        """停止后台轮询任务，等待当前批次结束。"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=30)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        finally:
+            self._task = None
+        logger.info("上传工作进程已停止")
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            processed = 0
+            try:
+                processed = await self.run_once()
+            except Exception as exc:
+                logger.error(f"上传工作进程轮询失败：{exc}")
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> int:
+        """
+        领取并处理一批到期任务。
+
+        Returns:
+            int: 本次处理的任务数
+        """
+        # 熔断打开时不领取任务，避免把任务反复领取又顺延
+        if self.breaker.state == self.breaker.OPEN:
+            return 0
+        task_ids = await self._claim_due_tasks()
+        if not task_ids:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _guarded(task_id: uuid.UUID) -> None:
+            async with semaphore:
+                await self._process_task(task_id)
+
+        await asyncio.gather(*(_guarded(task_id) for task_id in task_ids))
+        return len(task_ids)
+
+    async def _claim_due_tasks(self) -> List[uuid.UUID]:
+        now = datetime.now(timezone.utc)
+        lease_expired_at = now - timedelta(seconds=settings.UPLOAD_TASK_LEASE_SECONDS)
+        async with self.session_factory() as db:
+            stmt = (
+                select(UploadTask)
+                .where(
+                    or_(
+                        and_(
+                            UploadTask.status == UploadTaskStatus.PENDING,
+                            UploadTask.next_attempt_at <= now,
+                        ),
+                        and_(
+                            UploadTask.status == UploadTaskStatus.IN_PROGRESS,
+                            UploadTask.locked_at <= lease_expired_at,
+                        ),
+                    )
+                )
+                .order_by(UploadTask.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            tasks = list((await db.execute(stmt)).scalars().all())
+            for task in tasks:
+                task.status = UploadTaskStatus.IN_PROGRESS
+                task.locked_at = now
+            await db.commit()
+            return [task.id for task in tasks]
+
+    async def _process_task(self, task_id: uuid.UUID) -> None:
+        async with self.session_factory() as db:
+            task = await db.get(UploadTask, task_id)
+            if task is None or task.status != UploadTaskStatus.IN_PROGRESS:
+                return
+            attachment = await db.get(Attachment, task.attachment_id)
+            if attachment is None:
+                task.status = UploadTaskStatus.DEAD
+                task.last_error = "附件已被删除"
+                task.completed_at = datetime.now(timezone.utc)
+                await self._commit_outcome(db, task)
+                return
+
+            breaker = self.breaker
+            if not breaker.allow():
+                # 熔断期间不消耗重试次数，直接顺延
+                task.status = UploadTaskStatus.PENDING
+                task.locked_at = None
+                task.next_attempt_at = datetime.now(timezone.utc) + timedelta(
+                    seconds=max(breaker.retry_after(), 1.0)
+                )
+                await db.commit()
+                return
+
+            task.attempts += 1
+            try:
+                try:
+                    content = await asyncio.to_thread(read_spool_file, task.spool_path)
+                    result = await asyncio.to_thread(
+                        self.pinata_service.pin_file,
+                        content,
+                        task.file_name,
+                        task.upload_metadata,
+                    )
+                except FileNotFoundError as exc:
+                    self._mark_dead(task, attachment, f"暂存文件丢失：{exc}")
+                    await self._commit_outcome(db, task)
+                    return
+                except PinataFileTooLargeError as exc:
+                    self._mark_dead(task, attachment, str(exc))
+                    await self._commit_outcome(db, task)
+                    return
+                except Exception as exc:
+                    breaker.record_failure()
+                    self._schedule_retry(task, attachment, str(exc))
+                    await self._commit_outcome(db, task)
+                    return
+
+                breaker.record_success()
+                now = datetime.now(timezone.utc)
+                attachment.ipfs_cid = result["cid"]
+                attachment.upload_status = AttachmentUploadStatus.UPLOADED
+                attachment.uploaded_at = now
+                task.status = UploadTaskStatus.SUCCEEDED
+                task.last_error = None
+                task.completed_at = now
+                try:
+                    await db.commit()
+                except IntegrityError as exc:
+                    # 回填失败会连同 attempts 一起回滚，任务若停在 IN_PROGRESS 将在租约过期后被无限重传
+                    await db.rollback()
+                    await db.refresh(task)
+                    await db.refresh(attachment)
+                    task.attempts += 1
+                    self._schedule_retry(task, attachment, f"回填 CID 失败：{exc.orig}")
+                    await self._commit_outcome(db, task)
+                    return
+                await asyncio.to_thread(remove_spool_file, task.spool_path)
+                logger.info(
+                    "upload_task_succeeded",
+                    extra={
+                        "asset_id": str(task.asset_id),
+                        "cid": result["cid"],
+                        "file_name": task.file_name,
+                        "attempts": task.attempts,
+                    },
+                )
+            finally:
+                # 暂存文件丢失、文件过大等未记录结果的出口也要释放半开探测名额
+                breaker.release()
+
+    async def _commit_outcome(self, db: AsyncSession, task: UploadTask) -> None:
+        """提交任务结果；任务已终结（成功或 DEAD）时删除其暂存文件，不再等待重试。"""
+        await db.commit()
+        if task.status in (UploadTaskStatus.SUCCEEDED, UploadTaskStatus.DEAD):
+            await asyncio.to_thread(remove_spool_file, task.spool_path)
+
+    def _schedule_retry(self, task: UploadTask, attachment: Attachment, error: str) -> None:
+        if task.attempts >= task.max_attempts:
+            self._mark_dead(task, attachment, error)
+            return
+        delay = compute_backoff_delay(
+            task.attempts,
+            settings.UPLOAD_RETRY_BASE_DELAY,
+            settings.UPLOAD_RETRY_MAX_DELAY,
+        )
+        task.status = UploadTaskStatus.PENDING
+        task.locked_at = None
+        task.last_error = error
+        task.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        logger.warning(
+            "upload_task_retry_scheduled",
+            extra={
+                "asset_id": str(task.asset_id),
+                "cid": "",
+                "file_name": task.file_name,
+                "attempt": task.attempts,
+                "max_retries": task.max_attempts,
+                "wait_seconds": round(delay, 2),
+                "error": error,
+            },
+        )
+
+    def _mark_dead(self, task: UploadTask, attachment: Attachment, error: str) -> None:
+        now = datetime.now(timezone.utc)
+        task.status = UploadTaskStatus.DEAD
+        task.locked_at = None
+        task.last_error = error
+        task.completed_at = now
+        attachment.upload_status = AttachmentUploadStatus.FAILED
+        logger.error(
+            "upload_task_dead",
+            extra={
+                "asset_id": str(task.asset_id),
+                "cid": "",
+                "file_name": task.file_name,
+                "attempt": task.attempts,
+                "error": error,
+            },
+        )
+
+
+# 全局上传工作进程实例
+upload_worker = UploadWorker()
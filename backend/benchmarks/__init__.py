@@ -0,0 +1,14 @@
+"""可复现的性能基准套件。
+
+- ``datagen``：按规模（smoke / 10k / 100k / 1m）生成确定性的企业、资产、附件、审批与转移记录；
+- ``fakes``：Pinata HTTP 服务与区块链客户端的本地替身；
+- ``scenarios``：资产列表/搜索、铸造、批量铸造、权属统计、审批队列、仪表盘与登录场景；
+- ``run``：运行入口，结果写入 JSON；
+- ``compare``：对比两次结果，发现回退；
+- ``connections``：推送通道（SSE / WebSocket）单进程连接容量与广播扇出延迟；
+- ``exports``：流式导出的吞吐（行/秒）与导出期间服务端内存增量；
+- ``imports``：清单 + 压缩包批量导入的吞吐（资产/秒），对比逐个创建资产的路径；
+- ``serialization``：100 行一页的资产与待审批列表，对比 ORM 实体、orjson 与列投影三种路径的取数与序列化耗时；
+- ``conditional``：回放请求日志，对比携带 ETag 重新校验与不缓存时的响应字节数与 CPU 时间；
+- ``token_lookup``：按 Token ID 查询资产与企业权属统计的取数耗时，并输出查询计划。
+"""
@@ -0,0 +1,86 @@
+"""对比两次基准结果，找出性能回退。
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --threshold 10
+
+吞吐下降或 p99 延迟上升超过阈值（百分比）、每请求 SQL 语句数明显增加时视为回退，退出码为 1。
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# 随机翻页会让每请求语句数有小幅波动；平均每请求多出半条以上才视为新增查询
+QUERY_TOLERANCE = 0.5
+
+
+def _change(base: float, head: float) -> float:
+    return (head - base) / base * 100 if base else 0.0
+
+
+def compare_results(base: dict, head: dict, threshold: float = 10.0) -> Tuple[List[dict], List[str]]:
+    """
+    逐场景对比两次结果。
+
+    Args:
+        base: 基线结果
+        head: 新结果
+        threshold: 回退阈值（百分比）
+
+    Returns:
+        Tuple[List[dict], List[str]]: (每个场景的对比行, 回退说明)
+    """
+    rows: List[dict] = []
+    regressions: List[str] = []
+    for name, head_stats in head["scenarios"].items():
+        base_stats = base["scenarios"].get(name)
+        if base_stats is None:
+            continue
+        row = {
+            "scenario": name,
+            "rps_change": _change(base_stats["rps"], head_stats["rps"]),
+            "p50_change": _change(base_stats["p50_ms"], head_stats["p50_ms"]),
+            "p99_change": _change(base_stats["p99_ms"], head_stats["p99_ms"]),
+            "queries": (base_stats.get("queries_per_request"), head_stats.get("queries_per_request")),
+        }
+        rows.append(row)
+        if row["rps_change"] < -threshold:
+            regressions.append(f"{name}: 吞吐下降 {-row['rps_change']:.1f}%")
+        if row["p99_change"] > threshold:
+            regressions.append(f"{name}: p99 延迟上升 {row['p99_change']:.1f}%")
+        base_queries, head_queries = row["queries"]
+        if base_queries is not None and head_queries is not None and head_queries > base_queries + QUERY_TOLERANCE:
+            regressions.append(f"{name}: 每请求 SQL 语句数 {base_queries} -> {head_queries}")
+    return rows, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="回退阈值（百分比）")
+    args = parser.parse_args(argv)
+
+    base = json.loads(args.base.read_text())
+    head = json.loads(args.head.read_text())
+    for label, result in (("base", base), ("head", head)):
+        meta = result["meta"]
+        print(f"{label}: {(meta.get('commit') or '?')[:8]} scale={meta['scale']} db={meta['database']}")
+    if base["meta"]["scale"] != head["meta"]["scale"]:
+        print("警告：两次结果的数据规模不同，对比意义有限")
+
+    rows, regressions = compare_results(base, head, args.threshold)
+    print(f"{'scenario':<16} {'req/s':>9} {'p50':>9} {'p99':>9} {'queries':>12}")
+    for row in rows:
+        base_queries, head_queries = row["queries"]
+        print(
+            f"{row['scenario']:<16} {row['rps_change']:>+8.1f}% {row['p50_change']:>+8.1f}% "
+            f"{row['p99_change']:>+8.1f}% {str(base_queries):>5} -> {str(head_queries):<5}"
+        )
+    for message in regressions:
+        print(f"回退：{message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""条件请求基准：回放读多写少的请求日志，对比客户端不缓存与携带 ETag 重新校验时的带宽与 CPU。
+
+    python -m benchmarks.conditional --scale 10k --requests 5000
+    python -m benchmarks.conditional --log requests.jsonl
+
+请求日志每行一个 JSON 对象：``{"path": "/api/v1/..."}`` 表示一次 GET，
+``{"touch": "<asset_id>"}`` 表示一次资产写入（刷新 updated_at，使该资产的 ETag 失效）。
+未指定 ``--log`` 时按热点分布生成日志：资产详情、权属详情与转移历史三类读请求，
+热点资产的访问量远高于长尾，并按 ``--write-ratio`` 穿插写入；``--save-log`` 可保存生成的日志。
+
+同一日志回放两遍（进程内 ASGI）：``unconditional`` 不缓存任何响应；``conditional`` 按路径缓存响应体与
+ETag，之后的请求携带 ``If-None-Match``，304 时复用缓存。统计响应体字节数、304 比例、墙钟时间与进程 CPU 时间。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.datagen import SCALES
+from benchmarks.run import RESULTS_DIR, git_revision
+
+HOT_POOL = 200
+
+
+async def build_log(factory, dataset, requests: int, write_ratio: float, seed: int) -> List[Dict[str, str]]:
+    """按热点分布生成请求日志。"""
+    from sqlalchemy import select
+
+    from app.models.asset import Asset
+
+    async with factory() as session:
+        asset_ids = (await session.execute(
+            select(Asset.id)
+            .where(Asset.enterprise_id == dataset.hot_enterprise_id)
+            .order_by(Asset.id)
+            .limit(HOT_POOL)
+        )).scalars().all()
+        token_ids = (await session.execute(
+            select(Asset.nft_token_id)
+            .where(Asset.enterprise_id == dataset.hot_enterprise_id, Asset.nft_token_id.isnot(None))
+            .order_by(Asset.id)
+            .limit(HOT_POOL)
+        )).scalars().all()
+
+    rng = random.Random(seed)
+
+    def pick(pool):
+        # 近似 Zipf：排名越靠前越热
+        return rng.choices(pool, weights=[1 / (rank + 1) for rank in range(len(pool))])[0]
+
+    log: List[Dict[str, str]] = []
+    for _ in range(requests):
+        if rng.random() < write_ratio:
+            log.append({"touch": str(pick(asset_ids))})
+            continue
+        kind = rng.random()
+        if kind < 0.5 or not token_ids:
+            log.append({"path": f"/api/v1/assets/{pick(asset_ids)}"})
+        elif kind < 0.75:
+            log.append({"path": f"/api/v1/ownership/assets/{pick(token_ids)}"})
+        else:
+            log.append({"path": f"/api/v1/ownership/assets/{pick(token_ids)}/history"})
+    return log
+
+
+async def touch(factory, asset_id: str) -> None:
+    from uuid import UUID
+
+    from sqlalchemy import update
+
+    from app.models.asset import Asset
+
+    async with factory() as session:
+        await session.execute(
+            update(Asset).where(Asset.id == UUID(asset_id)).values(updated_at=datetime.now(timezone.utc))
+        )
+        await session.commit()
+
+
+async def replay(client, factory, headers: Dict[str, str], log: List[Dict[str, str]], conditional: bool) -> Dict[str, Any]:
+    """回放一遍请求日志。"""
+    cache: Dict[str, tuple] = {}
+    body_bytes = not_modified = reads = errors = 0
+    wall = cpu = 0.0
+    for entry in log:
+        if "touch" in entry:
+            await touch(factory, entry["touch"])
+            continue
+        path = entry["path"]
+        request_headers = dict(headers)
+        if conditional and path in cache:
+            request_headers["If-None-Match"] = cache[path][0]
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        response = await client.get(path, headers=request_headers)
+        wall += time.perf_counter() - wall_started
+        cpu += time.process_time() - cpu_started
+        reads += 1
+        body_bytes += len(response.content)
+        if response.status_code == 304:
+            not_modified += 1
+        elif response.status_code == 200:
+            if conditional and "etag" in response.headers:
+                cache[path] = (response.headers["etag"], response.content)
+        else:
+            errors += 1
+    return {
+        "reads": reads,
+        "errors": errors,
+        "not_modified": not_modified,
+        "not_modified_ratio": round(not_modified / reads, 3) if reads else None,
+        "body_bytes": body_bytes,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_ms_per_read": round(cpu * 1000 / reads, 3) if reads else None,
+    }
+
+
+async def run(args, directory: Path) -> Dict[str, Any]:
+    import httpx
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.database import Base, engine_options
+    from app.core.security import create_access_token
+    from benchmarks.datagen import seed_dataset
+    from benchmarks.run import build_app
+
+    database_url = f"sqlite+aiosqlite:///{directory}/conditional.db"
+    engine = create_async_engine(database_url, **engine_options(database_url))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        dataset = await seed_dataset(factory, scale=args.scale, seed=args.seed)
+        if args.log:
+            log = [json.loads(line) for line in args.log.read_text().splitlines() if line.strip()]
+        else:
+            log = await build_log(factory, dataset, args.requests, args.write_ratio, args.seed)
+            if args.save_log:
+                args.save_log.write_text("".join(json.dumps(entry) + "\n" for entry in log))
+
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(dataset.user_id)})}"}
+        transport = httpx.ASGITransport(app=build_app(factory))
+        results: Dict[str, Any] = {"log_entries": len(log)}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            # 预热：导入、首次查询编译等一次性开销不计入任一模式
+            for entry in log[:20]:
+                if "path" in entry:
+                    await client.get(entry["path"], headers=headers)
+            for mode in ("unconditional", "conditional"):
+                results[mode] = await replay(client, factory, headers, log, conditional=mode == "conditional")
+    finally:
+        await engine.dispose()
+
+    plain, conditional = results["unconditional"], results["conditional"]
+    if plain["body_bytes"] and plain["cpu_seconds"]:
+        results["savings"] = {
+            "body_bytes": round(1 - conditional["body_bytes"] / plain["body_bytes"], 3),
+            "cpu": round(1 - conditional["cpu_seconds"] / plain["cpu_seconds"], 3),
+            "wall": round(1 - conditional["wall_seconds"] / plain["wall_seconds"], 3),
+        }
+    for mode in ("unconditional", "conditional"):
+        stats = results[mode]
+        print(
+            f"{mode}: {stats['reads']} reads, {stats['not_modified']} x 304, {stats['body_bytes']} body bytes, "
+            f"cpu {stats['cpu_seconds']} s ({stats['cpu_ms_per_read']} ms/read), wall {stats['wall_seconds']} s"
+        )
+    if "savings" in results:
+        print(f"savings: {results['savings']}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k", help="数据规模")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--requests", type=int, default=5000, help="生成日志的条目数")
+    parser.add_argument("--write-ratio", type=float, default=0.02, help="生成日志中写入的比例")
+    parser.add_argument("--log", type=Path, help="回放已有的请求日志（JSONL）")
+    parser.add_argument("--save-log", type=Path, help="保存生成的请求日志")
+    parser.add_argument("--output", type=Path, help="结果 JSON 路径")
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(args, Path(tmp)))
+
+    result = {
+        "meta": {
+            **git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+            "scale": args.scale,
+            "requests": args.requests,
+            "write_ratio": args.write_ratio,
+            "log": str(args.log) if args.log else None,
+        },
+        "conditional": results,
+    }
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    output = args.output or RESULTS_DIR / f"conditional-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"结果已写入 {output}")
+    return 0 if not results["unconditional"]["errors"] and not results["conditional"]["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""推送通道容量基准：单个工作进程能保持多少 SSE / WebSocket 连接，以及广播扇出延迟。
+
+    python -m benchmarks.connections --connections 5000
+    python -m benchmarks.connections --protocol sse --connections 2000 --broadcasts 20
+
+服务端在独立子进程中运行（单个 uvicorn 工作进程，临时 SQLite 库），客户端在本进程建立连接，
+两者的内存与 CPU 互不干扰。结果包括：成功保持的连接数、建连耗时、服务端每连接内存（RSS 增量），
+以及经 ``approvals`` 主题广播的事件到达全部连接的延迟分位数。
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+
+from app.core.security import create_access_token
+from benchmarks.run import RESULTS_DIR, git_revision
+
+
+def raise_fd_limit() -> int:
+    """把打开文件数软限制提高到硬限制，返回新的软限制。"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def rss_kib(pid: int) -> Optional[int]:
+    """进程常驻内存（KiB），非 Linux 平台返回 None。"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def serve(port: int, database_url: str, max_connections: int) -> None:
+    """子进程：启动单工作进程服务端，附加一个只在基准中存在的广播接口。"""
+    import logging
+
+    import uvicorn
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.config import settings
+    from app.core.database import Base, engine_options
+    from app.core.events import APPROVALS_TOPIC, event_bus
+    from benchmarks.run import build_app
+
+    raise_fd_limit()
+    logging.getLogger("app").setLevel(logging.ERROR)
+    settings.EVENTS_MAX_CONNECTIONS = max_connections
+    # 心跳不参与测量
+    settings.EVENTS_HEARTBEAT_SECONDS = 3600.0
+
+    engine = create_async_engine(database_url, **engine_options(database_url))
+
+    async def main() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        app = build_app(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+
+        @app.post("/bench/broadcast", include_in_schema=False)
+        async def broadcast(seq: int) -> Dict[str, int]:
+            before = event_bus.delivered
+            event_bus.publish(APPROVALS_TOPIC, "bench.broadcast", {"seq": seq, "sent_at": time.time()})
+            return {"delivered": event_bus.delivered - before, "connections": event_bus.connections}
+
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off", backlog=4096)
+        await uvicorn.Server(config).serve()
+
+    asyncio.run(main())
+
+
+class Collector:
+    """汇总客户端收到的广播事件。"""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[int, List[float]] = {}
+
+    def record(self, message: str) -> None:
+        payload = json.loads(message)
+        if payload.get("type") != "bench.broadcast":
+            return
+        data = payload["data"]
+        self.latencies.setdefault(data["seq"], []).append(time.time() - data["sent_at"])
+
+
+async def hold_websocket(url: str, token: str, collector: Collector, opened: asyncio.Event, stop: asyncio.Event) -> None:
+    import websockets
+
+    async with websockets.connect(
+        f"{url.replace('http', 'ws', 1)}/api/v1/events/ws?topics=approvals",
+        additional_headers={"Authorization": f"Bearer {token}"},
+        open_timeout=60,
+        ping_interval=None,
+    ) as ws:
+        opened.set()
+        while not stop.is_set():
+            try:
+                collector.record(await asyncio.wait_for(ws.recv(), 1.0))
+            except asyncio.TimeoutError:
+                continue
+
+
+async def hold_sse(client: httpx.AsyncClient, token: str, collector: Collector, opened: asyncio.Event, stop: asyncio.Event) -> None:
+    async with client.stream(
+        "GET", "/api/v1/events/stream", params={"topics": "approvals"}, headers={"Authorization": f"Bearer {token}"}
+    ) as response:
+        response.raise_for_status()
+        lines = response.aiter_lines()
+        while not stop.is_set():
+            line = await lines.__anext__()
+            if line.startswith(": connected"):
+                opened.set()
+            elif line.startswith("data: "):
+                collector.record(line[6:])
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def run_connections(
+    url: str,
+    server_pid: int,
+    protocol: str,
+    connections: int,
+    ramp_concurrency: int,
+    broadcasts: int,
+) -> dict:
+    """
+    建立连接、保持并广播，返回测量结果。
+
+    Args:
+        url: 服务端地址
+        server_pid: 服务端进程 ID（用于读取 RSS）
+        protocol: ``ws`` 或 ``sse``
+        connections: 目标连接数
+        ramp_concurrency: 同时进行的握手数
+        broadcasts: 广播次数
+
+    Returns:
+        dict: 测量结果
+    """
+    collector = Collector()
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(ramp_concurrency)
+    client = httpx.AsyncClient(
+        base_url=url,
+        timeout=httpx.Timeout(60, read=None),
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=0),
+    )
+    # 每个连接使用不同用户，与真实场景一致（各自订阅私有主题）
+    tokens = [create_access_token({"sub": f"00000000-0000-4000-8000-{i:012d}"}) for i in range(connections)]
+    rss_before = rss_kib(server_pid)
+
+    async def open_one(token: str) -> bool:
+        opened = asyncio.Event()
+        async with semaphore:
+            if protocol == "ws":
+                task = asyncio.create_task(hold_websocket(url, token, collector, opened, stop))
+            else:
+                task = asyncio.create_task(hold_sse(client, token, collector, opened, stop))
+            waiter = asyncio.create_task(opened.wait())
+            await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+        holders.append(task)
+        return opened.is_set()
+
+    holders: List[asyncio.Task] = []
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(open_one(token) for token in tokens))
+    open_seconds = time.perf_counter() - started
+    held = sum(outcomes)
+    await asyncio.sleep(1.0)
+    rss_after = rss_kib(server_pid)
+
+    delivered: List[int] = []
+    for seq in range(broadcasts):
+        response = await client.post("/bench/broadcast", params={"seq": seq})
+        delivered.append(response.json()["delivered"])
+        await asyncio.sleep(0.2)
+    # 等待最后一次广播到达
+    deadline = time.time() + 30
+    while time.time() < deadline and len(collector.latencies.get(broadcasts - 1, [])) < held:
+        await asyncio.sleep(0.1)
+
+    stop.set()
+    for task in holders:
+        task.cancel()
+    await asyncio.gather(*holders, return_exceptions=True)
+    await client.aclose()
+
+    latencies = [value for values in collector.latencies.values() for value in values]
+    # 每次广播送达最后一个连接的耗时
+    completion = [max(values) for values in collector.latencies.values()]
+    errors = sum(1 for task in holders if not task.cancelled() and task.exception() is not None)
+    return {
+        "requested": connections,
+        "held": held,
+        "errors": errors,
+        "open_seconds": round(open_seconds, 2),
+        "connections_per_second": round(held / open_seconds, 1) if open_seconds else None,
+        "server_rss_kib": {"before": rss_before, "after": rss_after},
+        "rss_per_connection_kib": (
+            round((rss_after - rss_before) / held, 1) if held and rss_before and rss_after else None
+        ),
+        "broadcasts": broadcasts,
+        "delivered_per_broadcast": delivered,
+        "received": len(latencies),
+        "fanout_p50_ms": round(_percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "fanout_p99_ms": round(_percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "broadcast_complete_ms": round(statistics.median(completion) * 1000, 2) if completion else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--protocol", choices=["ws", "sse"], default="ws")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--ramp-concurrency", type=int, default=200, help="同时进行的握手数")
+    parser.add_argument("--broadcasts", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--output", type=Path, help="结果 JSON 路径")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--database-url", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.port, args.database_url, args.connections + 100)
+        return 0
+
+    fd_limit = raise_fd_limit()
+    if fd_limit < args.connections + 100:
+        print(f"打开文件数限制为 {fd_limit}，不足以建立 {args.connections} 个连接", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "benchmarks.connections", "--serve",
+                "--port", str(args.port), "--connections", str(args.connections),
+                "--database-url", f"sqlite+aiosqlite:///{tmp}/bench.db",
+            ],
+            cwd=ROOT,
+        )
+        url = f"http://127.0.0.1:{args.port}"
+        try:
+            for _ in range(300):
+                try:
+                    httpx.get(f"{url}/health", timeout=1)
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            else:
+                print("服务端未能启动", file=sys.stderr)
+                return 1
+            stats = asyncio.run(
+                run_connections(url, server.pid, args.protocol, args.connections, args.ramp_concurrency, args.broadcasts)
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    result = {
+        "meta": {
+            **git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+            "protocol": args.protocol,
+            "fd_limit": fd_limit,
+        },
+        "connections": stats,
+    }
+    print(
+        f"{args.protocol}: held {stats['held']}/{stats['requested']} in {stats['open_seconds']} s, "
+        f"rss/conn {stats['rss_per_connection_kib']} KiB, fan-out p50 {stats['fanout_p50_ms']} ms "
+        f"p99 {stats['fanout_p99_ms']} ms, broadcast complete {stats['broadcast_complete_ms']} ms"
+    )
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    output = args.output or RESULTS_DIR / f"connections-{args.protocol}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"结果已写入 {output}")
+    return 0 if stats["held"] == stats["requested"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""导出吞吐基准：流式导出每秒输出的行数，以及服务端内存是否随导出行数增长。
+
+    python -m benchmarks.exports --rows 100000,1000000
+    python -m benchmarks.exports --rows 1000000 --format ndjson --gzip
+
+同一企业的资产逐级补齐到每个目标行数后，通过 ``/api/v1/exports/assets`` 整体导出一次。
+服务端在独立子进程中运行（单个 uvicorn 工作进程，临时 SQLite 库），客户端边接收边丢弃数据，
+并每 20 ms 采样一次服务端 RSS。结果包括：行数/秒、字节/秒、首字节耗时，以及导出期间服务端
+RSS 相对导出前的峰值增量；流式导出时该增量应与行数无关。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+
+from app.core.security import create_access_token
+from benchmarks.connections import rss_kib
+from benchmarks.run import RESULTS_DIR, git_revision
+
+# 与 datagen 一样避开只由数字组成的十六进制串（SQLite 会存成数字）
+BENCH_USER_ID = uuid.UUID("ec0b0000-0000-4000-8000-000000000001")
+BENCH_ENTERPRISE_ID = uuid.UUID("ec0b0000-0000-4000-8000-000000000002")
+
+
+def serve(port: int, database_url: str, batch_size: Optional[int]) -> None:
+    """子进程：启动单工作进程服务端。"""
+    import logging
+
+    import uvicorn
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.config import settings
+    from app.core.database import engine_options
+    from benchmarks.run import build_app
+
+    logging.getLogger("app").setLevel(logging.ERROR)
+    if batch_size:
+        settings.EXPORT_BATCH_SIZE = batch_size
+    engine = create_async_engine(database_url, **engine_options(database_url))
+    app = build_app(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+    asyncio.run(uvicorn.Server(config).serve())
+
+
+async def seed(database_url: str) -> "SeedState":
+    """建表并写入基准用户与企业，返回可逐级补齐资产的生成器状态。"""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.database import Base, engine_options
+    from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+    from app.models.user import User
+    from benchmarks.datagen import _insert
+
+    engine = create_async_engine(database_url, **engine_options(database_url))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        await _insert(session, User, [
+            {"id": BENCH_USER_ID, "email": "export@bench.example.com", "username": "bench_export", "hashed_password": "!"}
+        ])
+        await _insert(session, Enterprise, [{"id": BENCH_ENTERPRISE_ID, "name": "Bench Export Enterprise"}])
+        await _insert(session, EnterpriseMember, [
+            {"enterprise_id": BENCH_ENTERPRISE_ID, "user_id": BENCH_USER_ID, "role": MemberRole.OWNER}
+        ])
+        await session.commit()
+    return SeedState(engine, factory)
+
+
+class SeedState:
+    """已写入的资产数量，按需补齐到目标行数。"""
+
+    def __init__(self, engine, factory) -> None:
+        self.engine = engine
+        self.factory = factory
+        self.rows = 0
+        self.rng = random.Random(42)
+
+    async def fill_to(self, target: int) -> float:
+        from app.models.asset import Asset, AssetStatus
+        from benchmarks.datagen import _insert, asset_row
+
+        started = time.perf_counter()
+        async with self.factory() as session:
+            rows = (
+                asset_row(
+                    self.rng,
+                    index,
+                    BENCH_ENTERPRISE_ID,
+                    BENCH_USER_ID,
+                    AssetStatus.MINTED if index % 2 else AssetStatus.APPROVED,
+                    token_id=index,
+                )
+                for index in range(self.rows, target)
+            )
+            await _insert(session, Asset, rows)
+            await session.commit()
+        self.rows = max(self.rows, target)
+        return time.perf_counter() - started
+
+
+async def measure_export(url: str, server_pid: int, export_format: str, compress: bool) -> dict:
+    """
+    导出一次，边接收边丢弃，同时采样服务端 RSS。
+
+    Args:
+        url: 服务端地址
+        server_pid: 服务端进程 ID
+        export_format: ``csv`` 或 ``ndjson``
+        compress: 是否 gzip
+
+    Returns:
+        dict: 测量结果
+    """
+    token = create_access_token({"sub": str(BENCH_USER_ID)})
+    params = {"enterprise_id": str(BENCH_ENTERPRISE_ID), "format": export_format, "gzip": str(compress).lower()}
+    rss_before = rss_kib(server_pid)
+    peak = rss_before or 0
+    done = asyncio.Event()
+
+    async def sample() -> None:
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, rss_kib(server_pid) or 0)
+            await asyncio.sleep(0.02)
+
+    sampler = asyncio.create_task(sample())
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if compress else None
+    wire_bytes = lines = 0
+    first_byte = None
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=url, timeout=httpx.Timeout(60, read=None)) as client:
+        async with client.stream(
+            "GET", "/api/v1/exports/assets", params=params, headers={"Authorization": f"Bearer {token}"}
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_raw():
+                if first_byte is None:
+                    first_byte = time.perf_counter() - started
+                wire_bytes += len(chunk)
+                lines += (decompressor.decompress(chunk) if decompressor else chunk).count(b"\n")
+    seconds = time.perf_counter() - started
+    done.set()
+    await sampler
+
+    rows = lines - 1 if export_format == "csv" else lines
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 2),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+        "wire_mib": round(wire_bytes / 2**20, 1),
+        "mib_per_second": round(wire_bytes / 2**20 / seconds, 1) if seconds else None,
+        "first_byte_ms": round(first_byte * 1000, 1) if first_byte is not None else None,
+        "server_rss_kib": {"before": rss_before, "peak": peak},
+        "rss_peak_delta_kib": peak - rss_before if rss_before else None,
+    }
+
+
+async def run_exports(url: str, server_pid: int, state: SeedState, targets: List[int], export_format: str, compress: bool) -> List[dict]:
+    results = []
+    for target in targets:
+        seed_seconds = await state.fill_to(target)
+        # 首轮先导出一次预热，避免测量包含冷启动
+        if not results:
+            await measure_export(url, server_pid, export_format, compress)
+        stats = await measure_export(url, server_pid, export_format, compress)
+        stats["seed_seconds"] = round(seed_seconds, 1)
+        results.append(stats)
+        print(
+            f"{stats['rows']:>9} rows: {stats['rows_per_second']} rows/s, {stats['mib_per_second']} MiB/s, "
+            f"first byte {stats['first_byte_ms']} ms, server rss +{stats['rss_peak_delta_kib']} KiB"
+        )
+    await state.engine.dispose()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="100000,1000000", help="逗号分隔的导出行数（逐级补齐）")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--batch-size", type=int, help="覆盖 EXPORT_BATCH_SIZE")
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--output", type=Path, help="结果 JSON 路径")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--database-url", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.port, args.database_url, args.batch_size)
+        return 0
+
+    targets = sorted(int(value) for value in args.rows.split(","))
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        loop = asyncio.new_event_loop()
+        state = loop.run_until_complete(seed(database_url))
+        command = [
+            sys.executable, "-m", "benchmarks.exports", "--serve",
+            "--port", str(args.port), "--database-url", database_url,
+        ]
+        if args.batch_size:
+            command += ["--batch-size", str(args.batch_size)]
+        server = subprocess.Popen(command, cwd=ROOT)
+        url = f"http://127.0.0.1:{args.port}"
+        try:
+            for _ in range(300):
+                try:
+                    httpx.get(f"{url}/health", timeout=1)
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            else:
+                print("服务端未能启动", file=sys.stderr)
+                return 1
+            runs = loop.run_until_complete(run_exports(url, server.pid, state, targets, args.format, args.gzip))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            loop.close()
+
+    result = {
+        "meta": {
+            **git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+            "format": args.format,
+            "gzip": args.gzip,
+            "batch_size": args.batch_size,
+        },
+        "exports": runs,
+    }
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    suffix = f"{args.format}{'-gzip' if args.gzip else ''}"
+    output = args.output or RESULTS_DIR / f"exports-{suffix}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"结果已写入 {output}")
+    return 0 if all(run["rows"] == target for run, target in zip(runs, targets)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
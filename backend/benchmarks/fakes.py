@@ -0,0 +1,142 @@
+"""外部依赖的本地替身：Pinata HTTP 服务与区块链客户端。
+
+- ``FakePinataServer`` 是真实的 HTTP 服务（线程模式），``PinataService`` 仍走 requests 与完整的
+  序列化、重试路径，只是把网络往返换成本机并按配置注入延迟；
+- ``FakeChainClient`` 与 ``BlockchainClient`` 的铸造接口一致，按配置延迟后返回递增的 token ID。
+  需要测量真实链交互时，改用 ``--chain-url`` 指向本地 anvil / hardhat 节点（需先部署合约并设置
+  ``CONTRACT_ADDRESS``）。
+"""
+import asyncio
+import hashlib
+import itertools
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from app.core.instrumentation import RPC, instrumented
+from benchmarks.datagen import CONTRACT_ADDRESS
+
+
+class _PinataHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - 覆盖基类签名
+        pass
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.server.latency)
+        if self.path != "/pinning/pinFileToIPFS":
+            self._reply(404, {"error": "not found"})
+            return
+        self.server.uploads += 1
+        self.server.bytes_received += len(body)
+        self._reply(
+            200,
+            {
+                "IpfsHash": "bafy" + hashlib.sha256(body).hexdigest()[:52],
+                "PinSize": len(body),
+                "Timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+
+    def do_DELETE(self) -> None:
+        time.sleep(self.server.latency)
+        self._reply(200 if self.path.startswith("/pinning/unpin/") else 404, {})
+
+
+class FakePinataServer:
+    """本地 Pinata API 替身，监听随机端口。"""
+
+    def __init__(self, latency: float = 0.05):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _PinataHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.uploads = 0
+        self._server.bytes_received = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def uploads(self) -> int:
+        return self._server.uploads
+
+    def start(self) -> "FakePinataServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-pinata", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakePinataServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class FakeChainClient:
+    """区块链客户端替身：模拟交易提交与确认延迟。"""
+
+    def __init__(self, latency: float = 0.2, chain_id: int = 31337, first_token_id: int = 10_000_000):
+        self.latency = latency
+        self.chain_id = chain_id
+        self.contract_address = CONTRACT_ADDRESS
+        self.deployer_address = "0x" + "d" * 40
+        self._token_ids = itertools.count(first_token_id)
+        self._block_number = 1_000_000
+        self.minted = 0
+
+    @instrumented(RPC)
+    async def mint_nft(
+        self,
+        to_address: str,
+        metadata_uri: str,
+        royalty_receiver: Optional[str] = None,
+        royalty_fee_bps: Optional[int] = None,
+    ) -> tuple:
+        await asyncio.sleep(self.latency)
+        token_id = next(self._token_ids)
+        self._block_number += 1
+        self.minted += 1
+        tx_hash = "0x" + hashlib.sha256(f"{token_id}:{to_address}:{metadata_uri}".encode()).hexdigest()
+        return token_id, tx_hash
+
+    @instrumented(RPC)
+    async def get_block_number(self) -> int:
+        return self._block_number
+
+
+def install_fakes(pinata_url: str, chain_client: Optional[object] = None) -> None:
+    """
+    让应用使用本地替身：Pinata 单例指向 ``pinata_url``，区块链单例替换为 ``chain_client``。
+
+    Args:
+        pinata_url: 替身 Pinata 服务地址
+        chain_client: 区块链客户端（为 None 时保留真实客户端，例如连接 anvil）
+    """
+    from app.core import blockchain
+    from app.services import pinata_service
+
+    pinata_service._pinata_service = pinata_service.PinataService(jwt_token="bench", api_url=pinata_url)
+    if chain_client is not None:
+        blockchain._blockchain_client = chain_client
@@ -0,0 +1,273 @@
+"""批量导入吞吐基准：清单 + 压缩包导入每秒写入的资产数，对比逐个调用单资产创建路径。
+
+    python -m benchmarks.imports --rows 10000
+    python -m benchmarks.imports --rows 10000 --files-per-asset 2 --drain-uploads
+
+生成 ``--rows`` 行 CSV 清单和包含全部附件的 zip，通过导入服务创建任务后由 ``AssetImportWorker``
+在进程内处理到完成（临时 SQLite 库）。对照组把前 ``--baseline-rows`` 行逐个交给
+``AssetServiceWithIPFS.create_asset_with_attachments``（即 ``/assets/with-attachments`` 的服务层），
+按其速率外推到全部行数。``--drain-uploads`` 时再用本地 Pinata 替身测量 ``UploadWorker``
+以有界并发清空导入产生的上传队列所需的时间。
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.run import RESULTS_DIR, git_revision
+
+# 与 datagen 一样避开只由数字组成的十六进制串（SQLite 会存成数字）
+BENCH_USER_ID = uuid.UUID("ec0b0000-0000-4000-8000-000000000011")
+BENCH_ENTERPRISE_ID = uuid.UUID("ec0b0000-0000-4000-8000-000000000012")
+FIELDS = ["name", "type", "description", "creator_name", "inventors", "creation_date", "legal_status", "asset_metadata", "files"]
+
+
+def build_inputs(directory: Path, rows: int, files_per_asset: int, file_size: int) -> dict:
+    """生成清单与附件压缩包，返回每行的数据（供对照组复用）。"""
+    records = []
+    payload = os.urandom(file_size)
+    archive_path = directory / "files.zip"
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for index in range(rows):
+            files = [f"assets/{index}/doc{n}.pdf" for n in range(files_per_asset)]
+            for name in files:
+                archive.writestr(name, payload)
+            records.append({
+                "name": f"Imported patent {index}",
+                "type": "PATENT",
+                "description": f"Benchmark import asset {index} covering batch onboarding",
+                "creator_name": "Bench Creator",
+                "inventors": "Alice;Bob",
+                "creation_date": "2024-01-01",
+                "legal_status": "GRANTED",
+                "asset_metadata": json.dumps({"source": "bench", "index": index}),
+                "files": ";".join(files),
+            })
+    manifest_path = directory / "assets.csv"
+    with open(manifest_path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    return {"manifest": manifest_path, "archive": archive_path, "records": records, "payload": payload}
+
+
+async def seed(factory) -> None:
+    from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+    from app.models.user import User
+    from benchmarks.datagen import _insert
+
+    async with factory() as session:
+        await _insert(session, User, [
+            {"id": BENCH_USER_ID, "email": "import@bench.example.com", "username": "bench_import", "hashed_password": "!"}
+        ])
+        await _insert(session, Enterprise, [{"id": BENCH_ENTERPRISE_ID, "name": "Bench Import Enterprise"}])
+        await _insert(session, EnterpriseMember, [
+            {"enterprise_id": BENCH_ENTERPRISE_ID, "user_id": BENCH_USER_ID, "role": MemberRole.OWNER}
+        ])
+        await session.commit()
+
+
+async def measure_import(factory, inputs: dict, spool: Path) -> dict:
+    """通过导入任务导入全部行。"""
+    from app.models.asset_import import AssetImportJob
+    from app.services.asset_import_service import AssetImportService, AssetImportWorker
+
+    manifest = spool / "manifest.csv"
+    archive = spool / "archive.zip"
+    shutil.copy(inputs["manifest"], manifest)
+    shutil.copy(inputs["archive"], archive)
+    async with factory() as session:
+        job = await AssetImportService(session).create_job(
+            BENCH_ENTERPRISE_ID, BENCH_USER_ID, "csv", str(manifest), str(archive)
+        )
+    started = time.perf_counter()
+    await AssetImportWorker(session_factory=factory, poll_interval=0).run_once()
+    seconds = time.perf_counter() - started
+    async with factory() as session:
+        job = await session.get(AssetImportJob, job.id)
+    return {
+        "status": job.status,
+        "rows": job.total_rows,
+        "imported_rows": job.imported_rows,
+        "failed_rows": job.failed_rows,
+        "attachments": job.attachments_enqueued,
+        "seconds": round(seconds, 2),
+        "assets_per_second": round(job.imported_rows / seconds) if seconds else None,
+    }
+
+
+async def measure_sequential(factory, inputs: dict, rows: int) -> dict:
+    """对照组：逐个调用单资产创建服务（每个资产一次提交，附件逐个暂存）。"""
+    from fastapi import UploadFile
+    from starlette.datastructures import Headers
+
+    from app.repositories.asset_repository import AssetRepository
+    from app.schemas.asset import AssetCreateRequest
+    from app.services.asset_service_with_ipfs import AssetServiceWithIPFS
+
+    records = inputs["records"][:rows]
+    started = time.perf_counter()
+    for record in records:
+        data = {
+            **record,
+            "inventors": record["inventors"].split(";"),
+            "asset_metadata": json.loads(record["asset_metadata"]),
+        }
+        files = [
+            UploadFile(
+                io.BytesIO(inputs["payload"]),
+                filename=name.rsplit("/", 1)[-1],
+                headers=Headers({"content-type": "application/pdf"}),
+            )
+            for name in data.pop("files").split(";")
+        ]
+        async with factory() as session:
+            await AssetServiceWithIPFS(AssetRepository(session)).create_asset_with_attachments(
+                enterprise_id=BENCH_ENTERPRISE_ID,
+                creator_user_id=BENCH_USER_ID,
+                asset_data=AssetCreateRequest(**data),
+                files=files,
+            )
+    seconds = time.perf_counter() - started
+    rate = len(records) / seconds if seconds else None
+    return {
+        "rows": len(records),
+        "seconds": round(seconds, 2),
+        "assets_per_second": round(rate) if rate else None,
+    }
+
+
+async def measure_upload_drain(factory, pinata_latency: float) -> dict:
+    """用本地 Pinata 替身清空上传队列。"""
+    from sqlalchemy import func, select
+
+    from app.core.config import settings
+    from app.models.upload_task import UploadTask, UploadTaskStatus
+    from app.services.upload_queue_service import UploadWorker
+    from benchmarks.fakes import FakePinataServer, install_fakes
+
+    with FakePinataServer(latency=pinata_latency) as pinata:
+        install_fakes(pinata.url)
+        worker = UploadWorker(session_factory=factory, poll_interval=0)
+        started = time.perf_counter()
+        while await worker.run_once():
+            pass
+        seconds = time.perf_counter() - started
+        uploads = pinata.uploads
+    async with factory() as session:
+        pending = await session.scalar(
+            select(func.count()).select_from(UploadTask).where(UploadTask.status != UploadTaskStatus.SUCCEEDED)
+        )
+    return {
+        "uploads": uploads,
+        "not_succeeded": pending,
+        "concurrency": settings.UPLOAD_WORKER_CONCURRENCY,
+        "pinata_latency_ms": round(pinata_latency * 1000),
+        "seconds": round(seconds, 2),
+        "files_per_second": round(uploads / seconds, 1) if seconds else None,
+    }
+
+
+async def run(args, directory: Path) -> dict:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.config import settings
+    from app.core.database import Base, engine_options
+
+    settings.UPLOAD_SPOOL_DIR = str(directory / "upload_spool")
+    settings.IMPORT_SPOOL_DIR = str(directory / "import_spool")
+    if args.batch_size:
+        settings.IMPORT_BATCH_SIZE = args.batch_size
+    spool = Path(settings.IMPORT_SPOOL_DIR)
+    spool.mkdir(parents=True, exist_ok=True)
+
+    inputs = build_inputs(directory, args.rows, args.files_per_asset, args.file_size)
+    results = {}
+    for name in ("bulk", "sequential"):
+        database_url = f"sqlite+aiosqlite:///{directory}/{name}.db"
+        engine = create_async_engine(database_url, **engine_options(database_url))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await seed(factory)
+        if name == "bulk":
+            results["bulk"] = await measure_import(factory, inputs, spool)
+            print(
+                f"bulk import: {results['bulk']['imported_rows']} assets, {results['bulk']['attachments']} attachments "
+                f"in {results['bulk']['seconds']} s ({results['bulk']['assets_per_second']} assets/s)"
+            )
+            if args.drain_uploads:
+                results["upload_drain"] = await measure_upload_drain(factory, args.pinata_latency)
+                drain = results["upload_drain"]
+                print(f"upload drain: {drain['uploads']} files in {drain['seconds']} s ({drain['files_per_second']} files/s)")
+        else:
+            sequential = await measure_sequential(factory, inputs, min(args.baseline_rows, args.rows))
+            rate = sequential["assets_per_second"]
+            sequential["extrapolated_seconds"] = round(args.rows / rate, 1) if rate else None
+            results["sequential"] = sequential
+            print(
+                f"sequential: {sequential['rows']} assets in {sequential['seconds']} s ({rate} assets/s, "
+                f"~{sequential['extrapolated_seconds']} s for {args.rows})"
+            )
+        await engine.dispose()
+    bulk_rate = results["bulk"]["assets_per_second"]
+    if bulk_rate and results["sequential"]["assets_per_second"]:
+        results["speedup"] = round(bulk_rate / results["sequential"]["assets_per_second"], 1)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="清单行数")
+    parser.add_argument("--files-per-asset", type=int, default=1)
+    parser.add_argument("--file-size", type=int, default=4096, help="每个附件的字节数")
+    parser.add_argument("--batch-size", type=int, help="覆盖 IMPORT_BATCH_SIZE")
+    parser.add_argument("--baseline-rows", type=int, default=500, help="对照组实际执行的行数（按速率外推）")
+    parser.add_argument("--drain-uploads", action="store_true", help="测量上传队列清空时间")
+    parser.add_argument("--pinata-latency", type=float, default=0.01, help="Pinata 替身单次上传延迟（秒）")
+    parser.add_argument("--output", type=Path, help="结果 JSON 路径")
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(args, Path(tmp)))
+
+    result = {
+        "meta": {
+            **git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+            "rows": args.rows,
+            "files_per_asset": args.files_per_asset,
+            "file_size": args.file_size,
+            "batch_size": args.batch_size,
+        },
+        "imports": results,
+    }
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    output = args.output or RESULTS_DIR / f"imports-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"结果已写入 {output}")
+    return 0 if results["bulk"]["imported_rows"] == args.rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
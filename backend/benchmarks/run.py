@@ -0,0 +1,254 @@
+"""基准套件入口：生成数据、启动本地替身、运行场景并把结果写入 JSON。
+
+    python -m benchmarks.run --scale 10k
+    python -m benchmarks.run --scale 100k --scenarios asset_list,ownership_stats --requests 2000
+    python -m benchmarks.run --database-url postgresql+asyncpg://... --reset --scale 1m
+    python -m benchmarks.run --chain-url http://127.0.0.1:8545   # 使用本地 anvil / hardhat 节点
+
+默认使用临时 SQLite 文件；结果写入 ``benchmarks/results/<scale>-<commit>-<时间>.json``，
+用 ``python -m benchmarks.compare`` 对比两次结果。
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, engine_options, get_db, get_read_db
+from app.core.rate_limiter import RateLimiter, RateLimitMiddleware, RateLimitPolicyRegistry
+from app.core.security import create_access_token
+from app.main import create_app
+from benchmarks.datagen import SCALES, Dataset, seed_dataset
+from benchmarks.fakes import FakeChainClient, FakePinataServer, install_fakes
+from benchmarks.scenarios import SCENARIOS, BenchContext, run_scenario
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def git_revision() -> Dict[str, Optional[str]]:
+    """当前提交与工作区是否有未提交改动。"""
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=ROOT, capture_output=True, text=True, check=True, timeout=30
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+
+def build_app(session_factory: async_sessionmaker):
+    """构建应用：数据库依赖指向基准库，限流放开（基准测的是接口本身）。"""
+    app = create_app()
+    registry = RateLimitPolicyRegistry(RateLimiter(requests_per_minute=10**9, requests_per_hour=10**9))
+    for middleware in app.user_middleware:
+        if middleware.cls is RateLimitMiddleware:
+            middleware.kwargs["registry"] = registry
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    return app
+
+
+async def run_benchmarks(
+    database_url: str,
+    scale: str,
+    scenario_names: List[str],
+    requests: int,
+    concurrency: int,
+    seed: int = 42,
+    reset: bool = False,
+    pinata_latency: float = 0.05,
+    chain_latency: float = 0.2,
+    chain_url: Optional[str] = None,
+    server: str = "asgi",
+    port: int = 8766,
+) -> dict:
+    """
+    运行基准并返回结果（可直接序列化为 JSON）。
+
+    Args:
+        database_url: 基准库连接 URL（应为空库或配合 ``reset`` 使用）
+        scale: 数据规模
+        scenario_names: 要运行的场景
+        requests: 每个场景的基准请求数（按场景的 ``request_factor`` 折算）
+        concurrency: 并发数
+        seed: 随机种子
+        reset: 运行前删除并重建所有表
+        pinata_latency: Pinata 替身的单次请求延迟（秒）
+        chain_latency: 链替身的单次铸造延迟（秒）
+        chain_url: 真实节点地址；指定时不使用链替身
+        server: ``asgi``（进程内）或 ``uvicorn``（经本机 TCP）
+
+    Returns:
+        dict: 包含 meta、dataset 与 scenarios 的结果
+    """
+    engine = create_async_engine(database_url, **engine_options(database_url))
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    dataset: Dataset = await seed_dataset(session_factory, scale=scale, seed=seed)
+    seed_seconds = time.perf_counter() - started
+
+    if chain_url:
+        from app.core.blockchain import BlockchainClient
+
+        chain_client = BlockchainClient(provider_url=chain_url)
+    else:
+        chain_client = FakeChainClient(latency=chain_latency)
+
+    app = build_app(session_factory)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(dataset.user_id)})}"}
+    results: Dict[str, dict] = {}
+
+    with FakePinataServer(latency=pinata_latency) as pinata:
+        install_fakes(pinata.url, chain_client)
+        uvicorn_server = server_task = None
+        if server == "uvicorn":
+            import uvicorn
+
+            config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+            uvicorn_server = uvicorn.Server(config)
+            server_task = asyncio.create_task(uvicorn_server.serve())
+            while not uvicorn_server.started:
+                await asyncio.sleep(0.05)
+            client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120)
+        else:
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120)
+
+        try:
+            ctx = BenchContext(
+                client=client,
+                dataset=dataset,
+                session_factory=session_factory,
+                headers=headers,
+                rng=random.Random(seed),
+            )
+            for name in scenario_names:
+                scenario = SCENARIOS[name]
+                count = int(requests * scenario.request_factor)
+                results[name] = await run_scenario(ctx, scenario, count, concurrency)
+                print(_format_row(name, results[name]), flush=True)
+        finally:
+            await client.aclose()
+            if uvicorn_server is not None:
+                uvicorn_server.should_exit = True
+                await server_task
+    await engine.dispose()
+
+    return {
+        "meta": {
+            **git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "server": server,
+            "scale": scale,
+            "seed": seed,
+            "requests": requests,
+            "concurrency": concurrency,
+            "pinata_latency_s": pinata_latency,
+            "chain": chain_url or f"fake (latency {chain_latency}s)",
+        },
+        "dataset": {"counts": dataset.counts, "seed_seconds": round(seed_seconds, 2)},
+        "scenarios": results,
+    }
+
+
+def _format_row(name: str, stats: dict) -> str:
+    queries = stats["queries_per_request"]
+    return (
+        f"{name:<16} {stats['rps']:>9.1f} req/s  p50 {stats['p50_ms']:>8.2f} ms  "
+        f"p99 {stats['p99_ms']:>8.2f} ms  queries {queries if queries is not None else '-':>6}  "
+        f"errors {stats['errors']}"
+    )
+
+
+def default_output_path(result: dict) -> Path:
+    meta = result["meta"]
+    commit = (meta.get("commit") or "nogit")[:8]
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return RESULTS_DIR / f"{meta['scale']}-{commit}-{stamp}.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument(
+        "--scenarios", default="all", help=f"逗号分隔的场景名，或 all（可选：{', '.join(SCENARIOS)}）"
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="默认使用临时 SQLite 文件")
+    parser.add_argument("--reset", action="store_true", help="运行前删除并重建所有表（慎用于非临时库）")
+    parser.add_argument("--pinata-latency", type=float, default=0.05)
+    parser.add_argument("--chain-latency", type=float, default=0.2)
+    parser.add_argument("--chain-url", help="本地 anvil / hardhat 节点地址；不指定时使用链替身")
+    parser.add_argument("--server", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", type=Path, help="结果 JSON 路径")
+    args = parser.parse_args(argv)
+
+    names = list(SCENARIOS) if args.scenarios == "all" else [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"未知场景：{', '.join(unknown)}")
+
+    # 慢查询与查询数告警已汇总在结果的 queries_per_request 中，运行期间不逐条输出
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{tmp}/bench.db"
+        result = asyncio.run(
+            run_benchmarks(
+                database_url,
+                args.scale,
+                names,
+                args.requests,
+                args.concurrency,
+                seed=args.seed,
+                reset=args.reset,
+                pinata_latency=args.pinata_latency,
+                chain_latency=args.chain_latency,
+                chain_url=args.chain_url,
+                server=args.server,
+                port=args.port,
+            )
+        )
+
+    output = args.output or default_output_path(result)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"结果已写入 {output}")
+    return 1 if any(stats["errors"] for stats in result["scenarios"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
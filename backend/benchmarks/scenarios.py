@@ -0,0 +1,217 @@
+"""基准场景：热点接口的请求构造与执行统计。
+
+每个场景给出单次请求的构造方式；会消耗数据的场景（铸造）在运行前通过 ``prepare``
+生成所需的待铸造资产。执行器按固定并发发送请求，统计吞吐、延迟分位数与每请求 SQL 语句数
+（取自 ``Server-Timing`` 响应头）。
+"""
+import asyncio
+import random
+import re
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.datagen import SEARCH_TERMS, Dataset, seed_mintable_assets
+
+BATCH_MINT_SIZE = 10
+_QUERIES_PATTERN = re.compile(r'db;dur=[0-9.]+;desc="(\d+) queries"')
+
+
+@dataclass
+class BenchContext:
+    """场景运行所需的共享状态。"""
+
+    client: httpx.AsyncClient
+    dataset: Dataset
+    session_factory: async_sessionmaker
+    headers: Dict[str, str]
+    rng: random.Random
+    mint_pool: List = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    基准场景。
+
+    Attributes:
+        name: 场景名
+        description: 说明
+        request: 发送第 i 个请求
+        prepare: 运行前准备数据（参数为请求数）
+        expected_status: 视为成功的状态码
+        request_factor: 相对 ``--requests`` 的请求数比例（重场景取较小值）
+        warmup: 是否先发送预热请求（消耗数据的场景不预热）
+    """
+
+    name: str
+    description: str
+    request: Callable[[BenchContext, int], Awaitable[httpx.Response]]
+    prepare: Optional[Callable[[BenchContext, int], Awaitable[None]]] = None
+    expected_status: Tuple[int, ...] = (200,)
+    request_factor: float = 1.0
+    warmup: bool = True
+
+
+def _asset_list(ctx: BenchContext, i: int) -> Awaitable[httpx.Response]:
+    params = {"enterprise_id": str(ctx.dataset.hot_enterprise_id), "page": ctx.rng.randint(1, 20), "page_size": 20}
+    return ctx.client.get("/api/v1/assets", params=params, headers=ctx.headers)
+
+
+def _asset_search(ctx: BenchContext, i: int) -> Awaitable[httpx.Response]:
+    params = {
+        "enterprise_id": str(ctx.dataset.hot_enterprise_id),
+        "search": ctx.rng.choice(SEARCH_TERMS),
+        "page_size": 20,
+    }
+    return ctx.client.get("/api/v1/assets", params=params, headers=ctx.headers)
+
+
+async def _prepare_mint(ctx: BenchContext, requests: int) -> None:
+    ctx.mint_pool = await seed_mintable_assets(ctx.session_factory, ctx.dataset, requests, seed=1)
+
+
+async def _prepare_batch_mint(ctx: BenchContext, requests: int) -> None:
+    ctx.mint_pool = await seed_mintable_assets(
+        ctx.session_factory, ctx.dataset, requests * BATCH_MINT_SIZE, seed=2
+    )
+
+
+def _mint(ctx: BenchContext, i: int) -> Awaitable[httpx.Response]:
+    asset_id = ctx.mint_pool.pop()
+    return ctx.client.post(
+        "/api/v1/nft/mint",
+        params={"asset_id": str(asset_id)},
+        json={"minter_address": ctx.dataset.wallet_address},
+        headers=ctx.headers,
+    )
+
+
+def _batch_mint(ctx: BenchContext, i: int) -> Awaitable[httpx.Response]:
+    asset_ids = [str(ctx.mint_pool.pop()) for _ in range(BATCH_MINT_SIZE)]
+    return ctx.client.post(
+        "/api/v1/nft/batch-mint",
+        json={"asset_ids": asset_ids, "minter_address": ctx.dataset.wallet_address},
+        headers=ctx.headers,
+    )
+
+
+def _ownership_stats(ctx: BenchContext, i: int) -> Awaitable[httpx.Response]:
+    return ctx.client.get(f"/api/v1/ownership/{ctx.dataset.hot_enterprise_id}/stats", headers=ctx.headers)
+
+
+def _approval_queue(ctx: BenchContext, i: int) -> Awaitable[httpx.Response]:
+    params = {"page": ctx.rng.randint(1, 10), "page_size": 20}
+    return ctx.client.get("/api/v1/approvals/pending", params=params, headers=ctx.headers)
+
+
+async def _prepare_dashboard(ctx: BenchContext, requests: int) -> None:
+    from app.services.dashboard_service import DashboardService
+
+    async with ctx.session_factory() as session:
+        await DashboardService(session).refresh_rollups(full=True)
+        await session.commit()
+
+
+def _dashboard(ctx: BenchContext, i: int) -> Awaitable[httpx.Response]:
+    params = {"enterprise_id": str(ctx.dataset.hot_enterprise_id), "days": 30}
+    return ctx.client.get("/api/v1/dashboard", params=params, headers=ctx.headers)
+
+
+def _login(ctx: BenchContext, i: int) -> Awaitable[httpx.Response]:
+    return ctx.client.post(
+        "/api/v1/auth/login",
+        json={"email": ctx.dataset.email, "password": ctx.dataset.password},
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("asset_list", "热点企业资产列表（随机翻页）", _asset_list),
+        Scenario("asset_search", "热点企业资产关键词搜索", _asset_search),
+        Scenario(
+            "mint", "单个资产铸造（Pinata 元数据上传 + 合约调用）", _mint,
+            prepare=_prepare_mint, expected_status=(201,), request_factor=0.1, warmup=False,
+        ),
+        Scenario(
+            "batch_mint", f"批量铸造（每批 {BATCH_MINT_SIZE} 个）", _batch_mint,
+            prepare=_prepare_batch_mint, expected_status=(201,), request_factor=0.02, warmup=False,
+        ),
+        Scenario("ownership_stats", "热点企业权属统计", _ownership_stats),
+        Scenario("approval_queue", "待审批队列（随机翻页）", _approval_queue),
+        Scenario("dashboard", "热点企业仪表盘（读取汇总表）", _dashboard, prepare=_prepare_dashboard),
+        Scenario("login", "邮箱密码登录（含密码哈希校验）", _login, request_factor=0.2),
+    )
+}
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(ctx: BenchContext, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    """
+    以固定并发执行场景。
+
+    Args:
+        ctx: 场景上下文
+        scenario: 场景
+        requests: 请求总数（已按 ``request_factor`` 折算）
+        concurrency: 并发数
+
+    Returns:
+        dict: 吞吐、延迟分位数（毫秒）、状态码分布与每请求 SQL 语句数
+    """
+    requests = max(1, requests)
+    if scenario.prepare is not None:
+        await scenario.prepare(ctx, requests)
+    if scenario.warmup:
+        for i in range(min(20, requests)):
+            await scenario.request(ctx, i)
+
+    latencies: List[float] = []
+    queries: List[int] = []
+    statuses: Counter = Counter()
+    errors: List[str] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            response = await scenario.request(ctx, i)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+            if response.status_code not in scenario.expected_status and len(errors) < 5:
+                errors.append(f"{response.status_code}: {response.text[:200]}")
+            match = _QUERIES_PATTERN.search(response.headers.get("Server-Timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    failed = sum(count for status, count in statuses.items() if status not in scenario.expected_status)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "rps": round(requests / elapsed, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+        "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+        "errors": failed,
+        "error_samples": errors,
+    }
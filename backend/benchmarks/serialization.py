@@ -0,0 +1,251 @@
+"""列表接口序列化基准：100 行一页的资产列表与待审批列表，对比取数与序列化的三种路径。
+
+    python -m benchmarks.serialization --scale 10k --repeat 50
+
+在临时 SQLite 库中生成 ``--scale`` 规模的数据后，分别测量：
+
+- ``orm``：加载 ORM 实体（含 selectin 级联）后逐行 ``model_validate`` 构造响应模型，
+  再经 FastAPI 的响应校验与 pydantic-core ``dump_json``（原实现）；
+- ``orjson``：同样的 ORM 路径，改用 ``ORJSONResponse`` 的序列化方式
+  （响应校验后 ``serialize`` 出 Python 对象再 ``orjson.dumps``）；
+- ``projection``：只查询响应需要的列，映射为字典后由响应模型一次性校验并 ``dump_json``（现实现）。
+
+取数（fetch）与序列化（serialize）分开计时，序列化按路由的 ``response_model`` 构造响应字段后调用
+``fastapi.routing.serialize_response``，与 FastAPI 处理响应的步骤一致。
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.datagen import SCALES
+from benchmarks.run import RESULTS_DIR, git_revision
+
+PAGE_SIZE = 100
+
+
+def _response_field(response_model: Any):
+    """按 FastAPI 为路由创建响应字段的方式构造字段（用于校验并序列化返回值）。"""
+    from fastapi.utils import create_model_field
+
+    return create_model_field(name="Response_benchmark", type_=response_model, mode="serialization")
+
+
+async def _timed(repeat: int, func: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+    """重复执行 ``func``，返回毫秒级中位数 / p95 与最后一次的结果。"""
+    samples: List[float] = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "result": result,
+    }
+
+
+async def _serialize(field, content: Any, variant: str) -> bytes:
+    from fastapi.routing import serialize_response
+
+    if variant == "orjson":
+        import orjson
+
+        return orjson.dumps(await serialize_response(field=field, response_content=content))
+    return await serialize_response(field=field, response_content=content, dump_json=True)
+
+
+async def measure_assets(factory, dataset, repeat: int) -> Dict[str, Any]:
+    """资产列表：``GET /api/v1/assets``。"""
+    from app.repositories.asset_repository import AssetRepository
+    from app.schemas.asset import AssetListResponse, AssetResponse
+
+    field = _response_field(AssetListResponse)
+    enterprise_id = dataset.hot_enterprise_id
+
+    async def fetch_orm():
+        async with factory() as session:
+            return await AssetRepository(session).get_assets_by_enterprise(enterprise_id, skip=0, limit=PAGE_SIZE)
+
+    async def fetch_projection():
+        async with factory() as session:
+            return await AssetRepository(session).list_enterprise_asset_rows(enterprise_id, skip=0, limit=PAGE_SIZE)
+
+    def build_orm(page):
+        assets, total = page
+        return AssetListResponse(
+            items=[AssetResponse.model_validate(asset) for asset in assets],
+            total=total,
+            page=1,
+            page_size=PAGE_SIZE,
+            total_pages=(total + PAGE_SIZE - 1) // PAGE_SIZE,
+        )
+
+    def build_projection(page):
+        rows, total = page
+        return AssetListResponse.model_validate({
+            "items": rows,
+            "total": total,
+            "page": 1,
+            "page_size": PAGE_SIZE,
+            "total_pages": (total + PAGE_SIZE - 1) // PAGE_SIZE,
+        })
+
+    return await _measure_variants(repeat, field, fetch_orm, build_orm, fetch_projection, build_projection)
+
+
+async def measure_approvals(factory, repeat: int) -> Dict[str, Any]:
+    """待审批列表：``GET /api/v1/approvals/pending``。"""
+    from sqlalchemy import desc, select
+
+    from app.models.approval import Approval, ApprovalStatus
+    from app.repositories.approval_repository import ApprovalRepository
+    from app.schemas.approval import ApprovalResponse
+    from app.schemas.response import ApiResponse, PageResult
+
+    field = _response_field(ApiResponse[PageResult[ApprovalResponse]])
+
+    async def fetch_orm():
+        async with factory() as session:
+            result = await session.execute(
+                select(Approval)
+                .where(Approval.status == ApprovalStatus.PENDING)
+                .order_by(desc(Approval.created_at))
+                .limit(PAGE_SIZE)
+            )
+            return list(result.scalars().all()), PAGE_SIZE
+
+    async def fetch_projection():
+        async with factory() as session:
+            return await ApprovalRepository(session).get_pending_approvals(page=1, page_size=PAGE_SIZE)
+
+    def page_result(items, total):
+        return ApiResponse(
+            data=PageResult(
+                items=items,
+                total=total,
+                page=1,
+                page_size=PAGE_SIZE,
+                total_pages=(total + PAGE_SIZE - 1) // PAGE_SIZE,
+            )
+        )
+
+    def build_orm(page):
+        approvals, total = page
+        return page_result([ApprovalResponse.model_validate(approval) for approval in approvals], total)
+
+    def build_projection(page):
+        rows, total = page
+        return page_result(rows, total)
+
+    return await _measure_variants(repeat, field, fetch_orm, build_orm, fetch_projection, build_projection)
+
+
+async def _measure_variants(repeat, field, fetch_orm, build_orm, fetch_projection, build_projection) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    orm = await _timed(repeat, fetch_orm)
+    projection = await _timed(repeat, fetch_projection)
+    orm_page, projection_page = orm.pop("result"), projection.pop("result")
+    results["rows"] = len(projection_page[0])
+    results["fetch"] = {"orm": orm, "projection": projection}
+
+    serialize: Dict[str, Any] = {}
+    for variant, build, page in (
+        ("orm", build_orm, orm_page),
+        ("orjson", build_orm, orm_page),
+        ("projection", build_projection, projection_page),
+    ):
+        if variant == "orjson":
+            try:
+                import orjson  # noqa: F401
+            except ImportError:
+                continue
+
+        async def run_variant(variant=variant, build=build, page=page):
+            return await _serialize(field, build(page), variant)
+
+        timing = await _timed(repeat, run_variant)
+        timing["bytes"] = len(timing.pop("result"))
+        serialize[variant] = timing
+    results["serialize"] = serialize
+    return results
+
+
+async def run(args, directory: Path) -> Dict[str, Any]:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.database import Base, engine_options
+    from benchmarks.datagen import seed_dataset
+
+    database_url = f"sqlite+aiosqlite:///{directory}/serialization.db"
+    engine = create_async_engine(database_url, **engine_options(database_url))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        dataset = await seed_dataset(factory, scale=args.scale, seed=args.seed)
+        results = {
+            "assets": await measure_assets(factory, dataset, args.repeat),
+            "approvals": await measure_approvals(factory, args.repeat),
+        }
+    finally:
+        await engine.dispose()
+
+    for name, result in results.items():
+        fetch, serialize = result["fetch"], result["serialize"]
+        print(
+            f"{name} ({result['rows']} rows): fetch orm {fetch['orm']['median_ms']} ms / "
+            f"projection {fetch['projection']['median_ms']} ms; serialize "
+            + ", ".join(f"{variant} {timing['median_ms']} ms" for variant, timing in serialize.items())
+        )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k", help="数据规模")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--repeat", type=int, default=50, help="每种路径的重复次数")
+    parser.add_argument("--output", type=Path, help="结果 JSON 路径")
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(args, Path(tmp)))
+
+    result = {
+        "meta": {
+            **git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+            "scale": args.scale,
+            "page_size": PAGE_SIZE,
+            "repeat": args.repeat,
+        },
+        "serialization": results,
+    }
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    output = args.output or RESULTS_DIR / f"serialization-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"结果已写入 {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
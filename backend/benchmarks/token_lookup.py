@@ -0,0 +1,141 @@
+"""Token 查询基准：按 Token ID 定位资产与企业权属统计的取数耗时（绕过应用缓存）。
+
+    python -m benchmarks.token_lookup --scale 10k --lookups 2000
+
+在临时 SQLite 库中生成 ``--scale`` 规模的数据后，分别测量：
+
+- ``lookup``：``OwnershipService`` 按 Token ID 查询资产权属详情（权属详情、转移、状态变更的入口查询），
+  随机抽取已铸造资产的 Token ID，另有一成查询不存在的 Token；
+- ``stats``：热点企业的权属统计。
+
+同时输出按 Token 查询语句的 ``EXPLAIN QUERY PLAN``，确认是否走索引。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.datagen import SCALES
+from benchmarks.run import RESULTS_DIR, git_revision
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 4),
+        "p95_ms": round(samples[int(len(samples) * 0.95)] * 1000, 4),
+    }
+
+
+async def run(args, directory: Path) -> Dict[str, Any]:
+    from sqlalchemy import select, text
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.database import Base, engine_options
+    from app.models.asset import Asset, AssetStatus
+    from app.services.ownership_service import OwnershipService
+    from benchmarks.datagen import seed_dataset
+
+    database_url = f"sqlite+aiosqlite:///{directory}/token_lookup.db"
+    engine = create_async_engine(database_url, **engine_options(database_url))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    results: Dict[str, Any] = {}
+    try:
+        dataset = await seed_dataset(factory, scale=args.scale, seed=args.seed)
+        async with factory() as session:
+            tokens = [
+                int(raw) for raw in (await session.execute(
+                    select(Asset.nft_token_id).where(Asset.status == AssetStatus.MINTED)
+                )).scalars()
+            ]
+        rng = random.Random(args.seed)
+        missing = max(tokens) + 1
+        sample = [missing + i if rng.random() < 0.1 else rng.choice(tokens) for i in range(args.lookups)]
+
+        async with factory() as session:
+            service = OwnershipService(session)
+            stmt = service._select_by_token(sample[0], None, Asset.id)
+            compiled = stmt.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+            plan = (await session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+            results["lookup_plan"] = [row[-1] for row in plan]
+
+            # 预热：首次查询编译等一次性开销不计入
+            for token_id in sample[:20]:
+                await service._load_asset_by_token_id(token_id)
+            lookups = []
+            found = 0
+            for token_id in sample:
+                started = time.perf_counter()
+                asset = await service._load_asset_by_token_id(token_id)
+                lookups.append(time.perf_counter() - started)
+                found += asset is not None
+            results["lookup"] = {**_summary(lookups), "found": found}
+
+            stats = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                await service._load_enterprise_stats(dataset.hot_enterprise_id)
+                stats.append(time.perf_counter() - started)
+            results["stats"] = _summary(stats)
+    finally:
+        await engine.dispose()
+
+    print("lookup plan: " + " | ".join(results["lookup_plan"]))
+    for name in ("lookup", "stats"):
+        summary = results[name]
+        print(f"{name}: mean {summary['mean_ms']} ms, p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k", help="数据规模")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--lookups", type=int, default=2000, help="按 Token ID 查询的次数")
+    parser.add_argument("--repeat", type=int, default=20, help="权属统计的重复次数")
+    parser.add_argument("--output", type=Path, help="结果 JSON 路径")
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(args, Path(tmp)))
+
+    result = {
+        "meta": {
+            **git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+            "scale": args.scale,
+            "lookups": args.lookups,
+            "repeat": args.repeat,
+        },
+        "token_lookup": results,
+    }
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    output = args.output or RESULTS_DIR / f"token_lookup-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"结果已写入 {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
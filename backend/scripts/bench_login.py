@@ -0,0 +1,100 @@
+"""登录基准：每次登录的 SQL 语句数，以及并发下的 p50 / p99 延迟。
+
+默认使用临时 SQLite 文件；传入 --database-url 可针对 PostgreSQL 运行
+（PostgreSQL 上会话上限撤销与令牌插入合并为一条语句）。
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.core.password_hasher import password_hasher
+from app.core.security import get_password_hash
+from app.models.user import User
+from app.schemas.auth import UserLoginRequest
+from app.services.auth_service import AuthService
+
+
+async def _run(database_url: str, logins: int, concurrency: int, users: int) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    hashed = get_password_hash("Secret123!")
+    async with session_factory() as db:
+        db.add_all(
+            User(email=f"bench{i}@example.com", username=f"bench{i}", hashed_password=hashed)
+            for i in range(users)
+        )
+        await db.commit()
+
+    statements = 0
+
+    def _count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            async with session_factory() as db:
+                await AuthService(db).login(
+                    UserLoginRequest(email=f"bench{i % users}@example.com", password="Secret123!")
+                )
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(i) for i in range(logins)))
+    elapsed = time.perf_counter() - start
+    event.remove(engine.sync_engine, "before_cursor_execute", _count)
+    await engine.dispose()
+
+    latencies.sort()
+    print(f"logins={logins} concurrency={concurrency} users={users} backend={engine.dialect.name}")
+    print(f"statements/login: {statements / logins:.2f}")
+    print(f"throughput: {logins / elapsed:.1f} logins/s")
+    print(
+        f"latency p50: {statistics.median(latencies) * 1000:.1f}ms  "
+        f"p99: {latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000:.1f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--hasher", choices=["process", "thread", "inline"], default="thread")
+    args = parser.parse_args()
+
+    password_hasher.mode = args.hasher
+    password_hasher.max_pending = args.logins + 1
+
+    if args.database_url:
+        await _run(args.database_url, args.logins, args.concurrency, args.users)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        await _run(f"sqlite+aiosqlite:///{tmp}/bench.db", args.logins, args.concurrency, args.users)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
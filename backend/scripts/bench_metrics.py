@@ -0,0 +1,104 @@
+"""指标开销基准：开启与关闭 METRICS_ENABLED 时的吞吐对比，以及单次指标更新的耗时。
+
+两种配置交替运行多轮、取中位数，降低噪声对对比结果的影响。数据库使用临时 SQLite 文件。
+
+    python scripts/bench_metrics.py --requests 3000 --concurrency 32 --rounds 5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.core.metrics import observe_external_call, observe_request
+from app.core.rate_limiter import RateLimiter, RateLimitMiddleware, RateLimitPolicyRegistry
+from app.main import create_app
+
+
+def _build_app(session_factory):
+    app = create_app()
+    registry = RateLimitPolicyRegistry(RateLimiter(requests_per_minute=10**9, requests_per_hour=10**9))
+    for middleware in app.user_middleware:
+        if middleware.cls is RateLimitMiddleware:
+            middleware.kwargs["registry"] = registry
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+async def _run_load(client: httpx.AsyncClient, url: str, total: int, concurrency: int) -> float:
+    counter = iter(range(total))
+
+    async def worker():
+        for _ in counter:
+            response = await client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} 返回 {response.status_code}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+def _micro_benchmark(number: int = 200_000) -> None:
+    request_us = timeit.timeit(
+        lambda: observe_request("GET", "/api/v1/assets/{asset_id}", 200, 0.012), number=number
+    ) / number * 1e6
+    rpc_us = timeit.timeit(lambda: observe_external_call("rpc", "get_balance", 0.05), number=number) / number * 1e6
+    print(f"observe_request        {request_us:>7.2f} us/call")
+    print(f"observe_external_call  {rpc_us:>7.2f} us/call")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    _micro_benchmark()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        app = _build_app(session_factory)
+
+        samples = {False: [], True: []}
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            await _run_load(client, "/health", 200, args.concurrency)
+            for _ in range(args.rounds):
+                for enabled in (False, True):
+                    settings.METRICS_ENABLED = enabled
+                    samples[enabled].append(
+                        await _run_load(client, "/health", args.requests, args.concurrency)
+                    )
+        await engine.dispose()
+
+    baseline = statistics.median(samples[False])
+    instrumented = statistics.median(samples[True])
+    print(f"requests={args.requests} concurrency={args.concurrency} rounds={args.rounds}")
+    print(f"/health metrics off    {baseline:>9.0f} req/s")
+    print(f"/health metrics on     {instrumented:>9.0f} req/s")
+    print(f"overhead               {(1 - instrumented / baseline) * 100:>8.2f} %")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
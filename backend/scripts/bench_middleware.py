@@ -0,0 +1,215 @@
+"""中间件栈基准：对比纯 ASGI 中间件与 BaseHTTPMiddleware 实现的吞吐与 p99 延迟。
+
+覆盖 ``/health`` 与资产列表接口，数据库使用临时 SQLite 文件。
+
+    python scripts/bench_middleware.py --requests 2000 --concurrency 32
+    python scripts/bench_middleware.py --server uvicorn
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.database import Base, get_db
+from app.core.middleware import RequestIdMiddleware, TimingMiddleware
+from app.core.rate_limiter import (
+    RateLimiter,
+    RateLimitMiddleware,
+    RateLimitPolicyRegistry,
+)
+from app.core.security import create_access_token
+from app.main import create_app
+from app.models.asset import Asset, AssetStatus, AssetType, LegalStatus
+from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+from app.models.user import User
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """改造前的 BaseHTTPMiddleware 版本，仅用于对比。"""
+
+    def __init__(self, app, registry):
+        super().__init__(app)
+        self.registry = registry
+
+    async def dispatch(self, request, call_next):
+        limiter = self.registry.resolve(request.url.path)
+        decision = await limiter.acquire(request.client.host if request.client else "unknown")
+        response = await call_next(request)
+        response.headers["X-RateLimit-Remaining-Minute"] = str(decision.minute_remaining)
+        response.headers["X-RateLimit-Remaining-Hour"] = str(decision.hour_remaining)
+        return response
+
+
+class LegacyTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        response.headers["X-Response-Time"] = f"{(time.perf_counter() - start) * 1000:.2f}ms"
+        return response
+
+
+class LegacyRequestIdMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+_LEGACY = {
+    RateLimitMiddleware: LegacyRateLimitMiddleware,
+    TimingMiddleware: LegacyTimingMiddleware,
+    RequestIdMiddleware: LegacyRequestIdMiddleware,
+}
+
+
+async def _seed(session_factory) -> tuple:
+    async with session_factory() as db:
+        user = User(id=uuid.uuid4(), email="bench@example.com", username="bench", hashed_password="x")
+        enterprise = Enterprise(id=uuid.uuid4(), name="Bench Enterprise")
+        db.add_all([user, enterprise])
+        await db.flush()
+        db.add(EnterpriseMember(enterprise_id=enterprise.id, user_id=user.id, role=MemberRole.OWNER))
+        for i in range(50):
+            db.add(
+                Asset(
+                    enterprise_id=enterprise.id,
+                    name=f"Bench Asset {i}",
+                    type=AssetType.PATENT,
+                    description="benchmark asset",
+                    creator_name="Bench",
+                    inventors=["Bench"],
+                    creation_date=date(2024, 1, 1),
+                    legal_status=LegalStatus.PENDING,
+                    status=AssetStatus.DRAFT,
+                )
+            )
+        await db.commit()
+        return user.id, enterprise.id
+
+
+def _build_app(variant: str, session_factory):
+    app = create_app()
+    registry = RateLimitPolicyRegistry(RateLimiter(requests_per_minute=10**9, requests_per_hour=10**9))
+    stack = []
+    for middleware in app.user_middleware:
+        cls = middleware.cls
+        kwargs = dict(middleware.kwargs)
+        if cls is RateLimitMiddleware:
+            kwargs["registry"] = registry
+        if variant == "legacy" and cls in _LEGACY:
+            cls = _LEGACY[cls]
+        stack.append(Middleware(cls, *middleware.args, **kwargs))
+    app.user_middleware = stack
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+async def _run_load(client: httpx.AsyncClient, url: str, headers: dict, total: int, concurrency: int):
+    latencies = []
+    counter = iter(range(total))
+
+    async def worker():
+        for _ in counter:
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} 返回 {response.status_code}: {response.text[:200]}")
+
+    # 预热
+    for _ in range(min(50, total)):
+        await client.get(url, headers=headers)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def _bench_variant(variant: str, args, session_factory, user_id, enterprise_id):
+    app = _build_app(variant, session_factory)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    targets = {
+        "/health": "/health",
+        "asset list": f"/api/v1/assets?enterprise_id={enterprise_id}&page_size=20",
+    }
+
+    server = server_task = None
+    if args.server == "uvicorn":
+        import uvicorn
+
+        config = uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning", lifespan="off")
+        server = uvicorn.Server(config)
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}")
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    try:
+        results = {}
+        for name, url in targets.items():
+            results[name] = await _run_load(client, url, headers, args.requests, args.concurrency)
+        return results
+    finally:
+        await client.aclose()
+        if server is not None:
+            server.should_exit = True
+            await server_task
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--server", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        user_id, enterprise_id = await _seed(session_factory)
+
+        print(f"server={args.server} requests={args.requests} concurrency={args.concurrency}")
+        print(f"{'variant':<8} {'endpoint':<12} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+        for variant in ("legacy", "asgi"):
+            results = await _bench_variant(variant, args, session_factory, user_id, enterprise_id)
+            for name, stats in results.items():
+                print(
+                    f"{variant:<8} {name:<12} {stats['rps']:>10.0f} "
+                    f"{stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
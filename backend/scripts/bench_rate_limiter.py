@@ -0,0 +1,46 @@
+"""限流器微基准：100k 个不同 IP 的检查吞吐与内存占用。"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.rate_limiter import RateLimiter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ips", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--shards", type=int, default=64)
+    args = parser.parse_args()
+
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.ips)]
+    limiter = RateLimiter(requests_per_minute=120, requests_per_hour=1000, shards=args.shards)
+
+    for round_no in range(1, args.rounds + 1):
+        start = time.perf_counter()
+        for key in keys:
+            limiter.check(key)
+        elapsed = time.perf_counter() - start
+        print(
+            f"round {round_no}: {args.ips} checks in {elapsed:.3f}s "
+            f"({args.ips / elapsed:,.0f} checks/s, {elapsed / args.ips * 1e6:.2f} us/check)"
+        )
+
+    # 内存单独测量，避免 tracemalloc 影响计时
+    tracemalloc.start()
+    fresh = RateLimiter(requests_per_minute=120, requests_per_hour=1000, shards=args.shards)
+    for key in keys:
+        fresh.check(key)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"tracked keys: {len(fresh)}, state memory: {current / 1024 / 1024:.1f} MiB ({current / args.ips:.0f} B/key)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""启动基准：冷启动耗时与首个请求延迟。
+
+每个场景在独立子进程中运行，保证模块导入是真正的冷启动：
+
+- import：导入 app.main 的耗时；
+- lifespan：执行应用生命周期启动（create_all / skip 两种结构处理方式）到可接受请求、到就绪的耗时；
+- first request：首个钱包签名校验请求的延迟（有无预热）。
+
+    python scripts/bench_startup.py --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _child_import() -> dict:
+    started = time.perf_counter()
+    import app.main  # noqa: F401
+
+    return {"import_ms": (time.perf_counter() - started) * 1000}
+
+
+def _child_lifespan() -> dict:
+    import asyncio
+
+    started = time.perf_counter()
+    from app.core.readiness import readiness
+    from app.main import app, lifespan
+
+    imported = time.perf_counter()
+
+    async def run() -> dict:
+        async with lifespan(app):
+            serving = time.perf_counter()
+            while not readiness.is_ready:
+                await asyncio.sleep(0.005)
+            ready = time.perf_counter()
+        return {
+            "import_ms": (imported - started) * 1000,
+            "serving_ms": (serving - started) * 1000,
+            "ready_ms": (ready - started) * 1000,
+        }
+
+    return asyncio.run(run())
+
+
+def _child_first_request() -> dict:
+    import asyncio
+
+    from app.core import wallet
+
+    if os.environ.get("BENCH_WARM_UP") == "1":
+        asyncio.run(asyncio.to_thread(wallet.warm_up))
+    started = time.perf_counter()
+    assert wallet.verify_wallet_signature(
+        os.environ["BENCH_ADDRESS"], os.environ["BENCH_SIGNATURE"], "login"
+    )
+    return {"first_request_ms": (time.perf_counter() - started) * 1000}
+
+
+def _sign_login_message() -> dict:
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+
+    account = Account.from_key("0x" + "11" * 32)
+    signature = Account.sign_message(encode_defunct(text="login"), account.key).signature.hex()
+    return {"BENCH_ADDRESS": account.address, "BENCH_SIGNATURE": signature}
+
+
+CHILDREN = {
+    "import": _child_import,
+    "lifespan": _child_lifespan,
+    "first_request": _child_first_request,
+}
+
+
+def _spawn(scenario: str, env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", scenario],
+        cwd=ROOT,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _report(label: str, samples: list, key: str) -> None:
+    values = [sample[key] for sample in samples]
+    print(f"{label:<44} {statistics.median(values):>9.1f} ms")
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        base_env = {
+            "DATABASE_URL": f"sqlite+aiosqlite:///{tmp}/bench.db",
+            "UPLOAD_WORKER_ENABLED": "false",
+            "MAINTENANCE_ENABLED": "false",
+            "EMAIL_WORKER_ENABLED": "false",
+            "PASSWORD_HASH_EXECUTOR": "inline",
+            # 本地通常没有区块链节点，预热时连接会失败并标记为 degraded
+            "WEB3_PROVIDER_URL": "http://127.0.0.1:9",
+        }
+        _spawn("lifespan", {**base_env, "DB_SCHEMA_STARTUP_MODE": "create_all"})
+
+        samples = [_spawn("import", base_env) for _ in range(args.runs)]
+        _report("import app.main", samples, "import_ms")
+
+        for mode in ("create_all", "skip"):
+            env = {**base_env, "DB_SCHEMA_STARTUP_MODE": mode}
+            samples = [_spawn("lifespan", env) for _ in range(args.runs)]
+            _report(f"lifespan ({mode}): accepting requests", samples, "serving_ms")
+            _report(f"lifespan ({mode}): ready", samples, "ready_ms")
+
+        # 签名在父进程中准备，子进程只走校验路径
+        signed = _sign_login_message()
+        for warm in ("0", "1"):
+            env = {**base_env, **signed, "BENCH_WARM_UP": warm}
+            samples = [_spawn("first_request", env) for _ in range(args.runs)]
+            label = "first wallet login" + (" (after warm-up)" if warm == "1" else " (cold)")
+            _report(label, samples, "first_request_ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", choices=sorted(CHILDREN), help=argparse.SUPPRESS)
+    parsed = parser.parse_args()
+    if parsed.child:
+        print(json.dumps(CHILDREN[parsed.child]()))
+    else:
+        main(parsed)
@@ -22,7 +22,9 @@ if "jinja2" not in sys.modules:
     sys.modules["jinja2"] = jinja2_stub
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.cache import cache_service
+from app.core.config import settings
+from app.core.database import Base, get_db, get_read_db, get_read_session_factory
 from app.core.security import create_access_token
 
 
@@ -40,6 +42,21 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(autouse=True)
+def clear_app_cache():
+    """每个用例使用独立的内存数据库，清空应用缓存，避免条目跨用例残留。"""
+    cache_service.clear()
+    yield
+    cache_service.clear()
+
+
+@pytest.fixture(autouse=True)
+def spool_dirs(tmp_path, monkeypatch):
+    """暂存目录默认相对当前目录，测试改用临时目录，避免在源码树中生成 var/。"""
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_DIR", str(tmp_path / "upload_spool"))
+    monkeypatch.setattr(settings, "IMPORT_SPOOL_DIR", str(tmp_path / "import_spool"))
+
+
 # 只在需要时创建数据库表
 @pytest_asyncio.fixture(scope="function")
 async def db_session():
@@ -76,6 +93,11 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # 流式导出自行打开会话，改用测试库的会话工厂
+    app.dependency_overrides[get_read_session_factory] = lambda: async_sessionmaker(
+        db_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
 
     async with AsyncClient(
         transport=ASGITransport(app=app, raise_app_exceptions=False),
@@ -3,6 +3,7 @@ from uuid import uuid4
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import create_access_token
@@ -115,3 +116,63 @@ async def test_get_approval_history_api_returns_processed_records(
     assert payload["data"]["total"] == 1
     assert payload["data"]["items"][0]["id"] == str(approval.id)
     assert payload["data"]["items"][0]["status"] == ApprovalStatus.APPROVED.value
+
+
+@pytest.mark.asyncio
+async def test_batch_process_approvals_api_returns_item_results(
+    client: AsyncClient,
+    db_session: AsyncSession,
+) -> None:
+    user = User(
+        id=uuid4(),
+        email="approval-api-batch@example.com",
+        username="approval_api_batch",
+        hashed_password="hashed_password",
+    )
+    reviewer = User(
+        id=uuid4(),
+        email="approval-api-batch-admin@example.com",
+        username="approval_api_batch_admin",
+        hashed_password="hashed_password",
+        is_superuser=True,
+    )
+    approvals = [
+        Approval(
+            id=uuid4(),
+            type=ApprovalType.ENTERPRISE_UPDATE,
+            target_id=uuid4(),
+            target_type="enterprise",
+            applicant_id=user.id,
+            status=status,
+        )
+        for status in (ApprovalStatus.PENDING, ApprovalStatus.APPROVED)
+    ]
+    db_session.add_all([user, reviewer, *approvals])
+    await db_session.commit()
+    body = {"approval_ids": [str(a.id) for a in approvals], "action": "reject", "comment": "批量拒绝"}
+
+    # 非管理员（包括申请人本人）不能批量处理
+    denied = await client.post(
+        "/api/v1/approvals/batch-process",
+        json=body,
+        headers=build_auth_headers(str(user.id)),
+    )
+    assert denied.json()["code"] == "APPROVAL_PERMISSION_DENIED"
+    assert await db_session.scalar(
+        select(Approval.status).where(Approval.id == approvals[0].id)
+    ) == ApprovalStatus.PENDING
+
+    response = await client.post(
+        "/api/v1/approvals/batch-process",
+        json=body,
+        headers=build_auth_headers(str(reviewer.id)),
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["code"] == "SUCCESS"
+    assert payload["data"]["total"] == 2
+    assert payload["data"]["succeeded"] == 1
+    items = payload["data"]["items"]
+    assert items[0]["status"] == ApprovalStatus.REJECTED.value
+    assert items[1]["code"] == "APPROVAL_ALREADY_PROCESSED"
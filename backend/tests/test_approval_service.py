@@ -4,14 +4,28 @@ from datetime import date
 from types import SimpleNamespace
 from uuid import uuid4
 
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.config import settings
 from app.core.database import Base
+from app.core.exceptions import BadRequestException
+from app.core.instrumentation import track_metrics
+from app.models.approval import (
+    Approval,
+    ApprovalAction,
+    ApprovalNotification,
+    ApprovalProcess,
+    ApprovalStatus,
+    ApprovalType,
+)
 from app.models.asset import Asset, AssetStatus, AssetType, LegalStatus
 from app.models.enterprise import Enterprise
 from app.models.user import User
-from app.services.approval_service import ApprovalService
+from app.core.cache import cache_service
+from app.repositories.approval_repository import ApprovalCounterRepository
+from app.services.approval_service import ApprovalService, InvalidApprovalActionError
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -76,3 +90,275 @@ async def test_asset_submit_approval_no_asset_id_noop(db_session: AsyncSession):
     service = ApprovalService(db_session)
     approval = SimpleNamespace(asset_id=None)
     await service._handle_asset_submit_approval(approval)
+
+
+async def _seed_pending_asset_approvals(db_session: AsyncSession, count: int):
+    enterprise = Enterprise(id=uuid4(), name=f"Batch Enterprise {count}")
+    user = User(
+        id=uuid4(),
+        email=f"batch{count}@example.com",
+        username=f"batch_user_{count}",
+        hashed_password="hashed_password",
+    )
+    assets, approvals, processes = [], [], []
+    for index in range(count):
+        asset = Asset(
+            id=uuid4(),
+            enterprise_id=enterprise.id,
+            creator_user_id=user.id,
+            name=f"Batch Asset {index}",
+            type=AssetType.PATENT,
+            description="Batch Asset Description",
+            creator_name="Creator",
+            inventors=["Creator"],
+            creation_date=date(2024, 1, 1),
+            legal_status=LegalStatus.PENDING,
+            status=AssetStatus.PENDING,
+        )
+        approval = Approval(
+            id=uuid4(),
+            type=ApprovalType.ASSET_SUBMIT,
+            target_id=asset.id,
+            target_type="asset",
+            applicant_id=user.id,
+            asset_id=asset.id,
+            status=ApprovalStatus.PENDING,
+        )
+        processes.append(ApprovalProcess(
+            approval_id=approval.id,
+            step=1,
+            action=ApprovalAction.SUBMIT,
+            operator_id=user.id,
+            operator_role="applicant",
+        ))
+        assets.append(asset)
+        approvals.append(approval)
+    db_session.add_all([enterprise, user, *assets, *approvals, *processes])
+    await db_session.commit()
+    return user, assets, approvals
+
+
+@pytest.mark.asyncio
+async def test_process_approvals_batch_reports_per_item(db_session: AsyncSession):
+    user, assets, approvals = await _seed_pending_asset_approvals(db_session, 3)
+    pending_enterprise = Enterprise(id=uuid4(), name="Pending Enterprise", is_verified=False)
+    enterprise_approval = Approval(
+        id=uuid4(),
+        type=ApprovalType.ENTERPRISE_CREATE,
+        target_id=pending_enterprise.id,
+        target_type="enterprise",
+        applicant_id=user.id,
+        status=ApprovalStatus.PENDING,
+    )
+    processed = Approval(
+        id=uuid4(),
+        type=ApprovalType.ASSET_SUBMIT,
+        target_id=uuid4(),
+        target_type="asset",
+        applicant_id=user.id,
+        status=ApprovalStatus.REJECTED,
+    )
+    reviewer_id = uuid4()
+    own = Approval(
+        id=uuid4(),
+        type=ApprovalType.ENTERPRISE_UPDATE,
+        target_id=uuid4(),
+        target_type="enterprise",
+        applicant_id=reviewer_id,
+        status=ApprovalStatus.PENDING,
+    )
+    db_session.add_all([pending_enterprise, enterprise_approval, processed, own])
+    await db_session.commit()
+
+    missing_id = uuid4()
+    requested = [approvals[0].id, processed.id, approvals[1].id, missing_id, enterprise_approval.id, own.id, approvals[2].id, approvals[0].id]
+    results = await ApprovalService(db_session).process_approvals_batch(
+        approval_ids=requested,
+        operator_id=reviewer_id,
+        action=ApprovalAction.APPROVE,
+        comment="批量通过",
+    )
+
+    assert [r["approval_id"] for r in results] == requested[:-1]
+    by_id = {r["approval_id"]: r for r in results}
+    assert by_id[processed.id]["success"] is False
+    assert by_id[processed.id]["code"] == "APPROVAL_ALREADY_PROCESSED"
+    assert by_id[missing_id]["code"] == "APPROVAL_NOT_FOUND"
+    # 审批人不能处理本人提交的申请
+    assert by_id[own.id]["code"] == "APPROVAL_PERMISSION_DENIED"
+    assert await db_session.scalar(select(Approval.status).where(Approval.id == own.id)) == ApprovalStatus.PENDING
+    assert sum(r["success"] for r in results) == 4
+    assert by_id[approvals[1].id]["status"] == ApprovalStatus.APPROVED.value
+
+    statuses = (await db_session.execute(
+        select(Asset.status).where(Asset.id.in_([a.id for a in assets]))
+    )).scalars().all()
+    assert statuses == [AssetStatus.APPROVED] * 3
+    assert await db_session.scalar(
+        select(Enterprise.is_verified).where(Enterprise.id == pending_enterprise.id)
+    ) is True
+
+    steps = (await db_session.execute(
+        select(ApprovalProcess.step)
+        .where(ApprovalProcess.approval_id == approvals[0].id)
+        .order_by(ApprovalProcess.step)
+    )).scalars().all()
+    assert steps == [1, 2]
+    notifications = await db_session.scalar(
+        select(func.count()).select_from(ApprovalNotification).where(ApprovalNotification.recipient_id == user.id)
+    )
+    assert notifications == 4
+
+
+@pytest.mark.asyncio
+async def test_process_approvals_batch_query_count_is_independent_of_size(db_session: AsyncSession):
+    user, assets, approvals = await _seed_pending_asset_approvals(db_session, 40)
+    service = ApprovalService(db_session)
+    reviewer_id = uuid4()
+
+    with track_metrics() as small:
+        await service.process_approvals_batch([a.id for a in approvals[:2]], reviewer_id, ApprovalAction.RETURN, "退回")
+    with track_metrics() as large:
+        await service.process_approvals_batch([a.id for a in approvals[2:]], reviewer_id, ApprovalAction.RETURN, "退回")
+
+    assert 0 < large.db_queries == small.db_queries
+    statuses = set((await db_session.execute(
+        select(Asset.status).where(Asset.id.in_([a.id for a in assets]))
+    )).scalars().all())
+    assert statuses == {AssetStatus.DRAFT}
+
+
+@pytest.mark.asyncio
+async def test_process_approvals_batch_rejects_oversized_batches(db_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(settings, "APPROVAL_BATCH_MAX_ITEMS", 2)
+    service = ApprovalService(db_session)
+
+    with pytest.raises(BadRequestException) as exc_info:
+        await service.process_approvals_batch([uuid4() for _ in range(3)], uuid4(), ApprovalAction.APPROVE, "通过")
+    assert exc_info.value.code == "APPROVAL_BATCH_TOO_LARGE"
+
+    with pytest.raises(InvalidApprovalActionError):
+        await service.process_approvals_batch([uuid4()], uuid4(), ApprovalAction.TRANSFER, "转交")
+
+
+@pytest.mark.asyncio
+async def test_enterprise_update_changes_apply_the_same_via_single_and_batch(db_session: AsyncSession):
+    applicant = User(id=uuid4(), email="changes@example.com", username="changes_user", hashed_password="x")
+    changes = {
+        "old_values": {"description": "旧简介", "website": "https://old.example.com"},
+        "new_values": {
+            "description": None,
+            "website": "https://new.example.com",
+            "name": None,
+            "id": str(uuid4()),
+            "members": [],
+        },
+    }
+    enterprises = [
+        Enterprise(id=uuid4(), name=f"Changes Enterprise {i}", description="旧简介", website="https://old.example.com")
+        for i in range(2)
+    ]
+    approvals = [
+        Approval(
+            id=uuid4(),
+            type=ApprovalType.ENTERPRISE_UPDATE,
+            target_id=enterprise.id,
+            target_type="enterprise",
+            applicant_id=applicant.id,
+            status=ApprovalStatus.PENDING,
+            changes=changes,
+        )
+        for enterprise in enterprises
+    ]
+    db_session.add_all([applicant, *enterprises, *approvals])
+    await db_session.commit()
+
+    service = ApprovalService(db_session)
+    reviewer_id = uuid4()
+    await service.process_approval(approvals[0].id, reviewer_id, ApprovalAction.APPROVE, "单个通过")
+    await service.process_approvals_batch([approvals[1].id], reviewer_id, ApprovalAction.APPROVE, "批量通过")
+
+    rows = (await db_session.execute(
+        select(Enterprise.id, Enterprise.name, Enterprise.description, Enterprise.website)
+        .where(Enterprise.id.in_([e.id for e in enterprises]))
+    )).all()
+    by_id = {row.id: row for row in rows}
+    single, batch = (by_id[e.id] for e in enterprises)
+    assert (single.name, single.description, single.website) == (
+        "Changes Enterprise 0", None, "https://new.example.com"
+    )
+    assert (batch.description, batch.website) == (single.description, single.website)
+    assert batch.name == "Changes Enterprise 1"
+
+
+@pytest.mark.asyncio
+async def test_statistics_follow_counters_and_cache(db_session: AsyncSession):
+    cache_service.clear()
+    user, _, approvals = await _seed_pending_asset_approvals(db_session, 0)
+    service = ApprovalService(db_session)
+    enterprises = [Enterprise(id=uuid4(), name=f"Stats Enterprise {i}") for i in range(3)]
+    db_session.add_all(enterprises)
+    await db_session.commit()
+    created = [
+        await service.submit_enterprise_create_approval(applicant_id=user.id, enterprise_id=e.id)
+        for e in enterprises
+    ]
+
+    stats = await service.get_statistics()
+    assert stats["pending"] == 3 and stats["total"] == 3
+    assert stats["by_type"]["enterprise_create"]["pending"] == 3
+    assert stats["by_type"]["asset_submit"]["total"] == 0
+
+    with track_metrics() as cached:
+        assert await service.get_statistics() == stats
+    assert cached.db_queries == 0
+
+    reviewer_id = uuid4()
+    await service.process_approval(created[0].id, reviewer_id, ApprovalAction.APPROVE, "通过")
+    await service.process_approvals_batch([created[1].id], reviewer_id, ApprovalAction.REJECT, "拒绝")
+    stats = await service.get_statistics()
+    assert (stats["pending"], stats["approved"], stats["rejected"], stats["total"]) == (1, 1, 1, 3)
+    assert stats["by_type"]["enterprise_create"]["approved"] == 1
+    cache_service.clear()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_corrects_counter_drift(db_session: AsyncSession):
+    user, _, approvals = await _seed_pending_asset_approvals(db_session, 4)
+    counters = ApprovalCounterRepository(db_session)
+    # 直接写入的审批未经过计数；再制造一行多余的计数
+    await counters.adjust({(ApprovalStatus.APPROVED, ApprovalType.MEMBER_JOIN): 2})
+    await db_session.commit()
+
+    assert await counters.reconcile() == 2
+    await db_session.commit()
+    assert await counters.get_counts() == {
+        (ApprovalStatus.PENDING, ApprovalType.ASSET_SUBMIT): 4,
+        (ApprovalStatus.APPROVED, ApprovalType.MEMBER_JOIN): 0,
+    }
+    assert await counters.reconcile() == 0
+
+
+@pytest.mark.asyncio
+async def test_reconcile_locks_counter_rows_before_counting(db_session: AsyncSession):
+    counters = ApprovalCounterRepository(db_session)
+    calls = []
+    get_counts = counters.get_counts
+
+    async def spy_get_counts(for_update=False):
+        calls.append(("get_counts", for_update))
+        return await get_counts(for_update=for_update)
+
+    async def spy_count(self):
+        calls.append(("group_by", None))
+        return {}
+
+    counters.get_counts = spy_get_counts
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "app.repositories.approval_repository.ApprovalRepository.count_by_status_and_type", spy_count
+        )
+        await counters.reconcile()
+
+    # 统计审批表之前已锁定计数行，期间提交的 adjust 不会被校正值覆盖
+    assert calls == [("get_counts", True), ("group_by", None)]
@@ -0,0 +1,222 @@
+"""资产批量导入测试。"""
+import csv
+import io
+import json
+import os
+import tarfile
+import zipfile
+from datetime import date, datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.asset import Asset, Attachment, AttachmentUploadStatus
+from app.models.asset_import import AssetImportJob, AssetImportStatus
+from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+from app.models.upload_task import UploadTask, UploadTaskStatus
+from app.models.user import User
+from app.services.asset_import_service import AssetImportService, AssetImportWorker, validate_batch
+
+FIELDS = ["name", "type", "description", "creator_name", "inventors", "creation_date", "legal_status", "asset_metadata", "files"]
+
+
+@pytest.fixture(autouse=True)
+def spool_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_SPOOL_DIR", str(tmp_path / "imports"))
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+
+
+def _row(name, files="", description="A sufficiently long description", **overrides):
+    row = {
+        "name": name,
+        "type": "PATENT",
+        "description": description,
+        "creator_name": "Creator",
+        "inventors": "甲;乙",
+        "creation_date": "2024-01-01",
+        "legal_status": "GRANTED",
+        "asset_metadata": '{"ipc": "G06F"}',
+        "files": files,
+    }
+    row.update(overrides)
+    return row
+
+
+def _csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _zip(files) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+async def _seed(db: AsyncSession):
+    user = User(id=uuid4(), email="import@example.com", username="importer", hashed_password="x")
+    outsider = User(id=uuid4(), email="outsider@example.com", username="outsider", hashed_password="x")
+    enterprise = Enterprise(id=uuid4(), name="Import Enterprise")
+    member = EnterpriseMember(id=uuid4(), enterprise_id=enterprise.id, user_id=user.id, role=MemberRole.OWNER)
+    db.add_all([user, outsider, enterprise, member])
+    await db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    outsider_headers = {"Authorization": f"Bearer {create_access_token({'sub': str(outsider.id)})}"}
+    return user, enterprise, headers, outsider_headers
+
+
+def _worker(db: AsyncSession) -> AssetImportWorker:
+    factory = async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    return AssetImportWorker(session_factory=factory, poll_interval=0)
+
+
+@pytest.mark.asyncio
+async def test_import_csv_with_zip_archive(client, db_session: AsyncSession):
+    user, enterprise, headers, outsider_headers = await _seed(db_session)
+    manifest = _csv([
+        _row("Asset one", files="docs/a.pdf;./docs/b.png"),
+        _row("Asset two"),
+        _row("Asset three", description="short"),
+        _row("Asset four", files="docs/missing.pdf"),
+        _row("Asset five", files="tools/run.exe"),
+    ])
+    archive = _zip({"docs/a.pdf": b"%PDF-a", "docs/b.png": b"\x89PNG", "tools/run.exe": b"MZ"})
+
+    response = await client.post(
+        "/api/v1/asset-imports",
+        params={"enterprise_id": str(enterprise.id)},
+        files={"manifest": ("assets.csv", manifest, "text/csv"), "archive": ("files.zip", archive, "application/zip")},
+        headers=headers,
+    )
+    assert response.status_code == 202
+    job = response.json()["data"]
+    assert job["status"] == "PENDING"
+
+    assert await _worker(db_session).run_once() == 1
+    assert await _worker(db_session).run_once() == 0
+
+    response = await client.get(f"/api/v1/asset-imports/{job['id']}", headers=headers)
+    job = response.json()["data"]
+    assert job["status"] == "COMPLETED"
+    assert (job["total_rows"], job["processed_rows"], job["imported_rows"], job["failed_rows"]) == (5, 5, 2, 3)
+    assert job["attachments_enqueued"] == 2
+
+    response = await client.get(f"/api/v1/asset-imports/{job['id']}/errors", headers=headers)
+    errors = response.json()["data"]
+    assert errors["total"] == 3
+    assert [(error["row_number"], error["field"]) for error in errors["items"]] == [
+        (3, "description"), (4, "files"), (5, "files")
+    ]
+    assert "不存在" in errors["items"][1]["message"]
+
+    response = await client.get(f"/api/v1/asset-imports/{job['id']}", headers=outsider_headers)
+    assert response.status_code == 403
+
+    assets = (await db_session.execute(select(Asset).where(Asset.enterprise_id == enterprise.id))).scalars().all()
+    assert sorted(asset.name for asset in assets) == ["Asset one", "Asset two"]
+    imported = next(asset for asset in assets if asset.name == "Asset one")
+    assert imported.inventors == ["甲", "乙"]
+    assert imported.asset_metadata == {"ipc": "G06F"}
+    assert imported.creator_user_id == user.id
+
+    attachments = (await db_session.execute(
+        select(Attachment).where(Attachment.asset_id == imported.id).order_by(Attachment.file_name)
+    )).scalars().all()
+    assert [(a.file_name, a.is_primary, a.upload_status) for a in attachments] == [
+        ("a.pdf", True, AttachmentUploadStatus.PENDING_UPLOAD),
+        ("b.png", False, AttachmentUploadStatus.PENDING_UPLOAD),
+    ]
+    tasks = (await db_session.execute(select(UploadTask).where(UploadTask.asset_id == imported.id))).scalars().all()
+    assert {task.status for task in tasks} == {UploadTaskStatus.PENDING}
+    contents = {task.file_name: open(task.spool_path, "rb").read() for task in tasks}
+    assert contents == {"a.pdf": b"%PDF-a", "b.png": b"\x89PNG"}
+
+    # 任务完成后删除暂存的清单与压缩包
+    assert os.listdir(settings.IMPORT_SPOOL_DIR) == []
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_from_processed_rows(db_session: AsyncSession, tmp_path):
+    user, enterprise, _, _ = await _seed(db_session)
+    manifest = tmp_path / "assets.json"
+    manifest.write_text(json.dumps([
+        {**_row(f"Asset {index}", inventors=["甲"], asset_metadata={}), "files": [f"f{index}.pdf"]}
+        for index in range(5)
+    ]))
+    archive = tmp_path / "files.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        for index in range(5):
+            info = tarfile.TarInfo(f"f{index}.pdf")
+            info.size = 3
+            tar.addfile(info, io.BytesIO(b"pdf"))
+
+    # 模拟进程在提交前两批后崩溃：任务仍为 RUNNING、租约已过期
+    job = await AssetImportService(db_session).create_job(enterprise.id, user.id, "json", str(manifest), str(archive))
+    job.status = AssetImportStatus.RUNNING
+    job.processed_rows = 4
+    job.imported_rows = 4
+    job.locked_at = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    await db_session.commit()
+
+    assert await _worker(db_session).run_once() == 1
+
+    await db_session.refresh(job)
+    assert job.status == AssetImportStatus.COMPLETED
+    assert (job.processed_rows, job.imported_rows, job.attachments_enqueued) == (5, 5, 1)
+    names = (await db_session.execute(select(Asset.name))).scalars().all()
+    assert names == ["Asset 4"]
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_bad_uploads_and_archives(client, db_session: AsyncSession, tmp_path):
+    user, enterprise, headers, outsider_headers = await _seed(db_session)
+    params = {"enterprise_id": str(enterprise.id)}
+
+    response = await client.post(
+        "/api/v1/asset-imports", params=params, files={"manifest": ("assets.xml", b"<x/>")}, headers=headers
+    )
+    assert response.status_code == 415
+    response = await client.post(
+        "/api/v1/asset-imports", params=params, files={"manifest": ("assets.csv", _csv([]))}, headers=outsider_headers
+    )
+    assert response.status_code == 403
+
+    response = await client.post(
+        "/api/v1/asset-imports",
+        params=params,
+        files={"manifest": ("assets.csv", _csv([_row("A")])), "archive": ("files.zip", b"not a zip")},
+        headers=headers,
+    )
+    assert response.status_code == 202
+    await _worker(db_session).run_once()
+
+    job = await db_session.get(AssetImportJob, UUID(response.json()["data"]["id"]), populate_existing=True)
+    assert job.status == AssetImportStatus.FAILED
+    assert "压缩包" in job.error
+    assert (await db_session.execute(select(Asset.id))).first() is None
+
+
+def test_validate_batch_reports_every_row_error():
+    rows = [
+        _row("ok", inventors=["甲"], asset_metadata={}, files=[]),
+        "not an object",
+        _row("", inventors=[], asset_metadata={}, files=[]),
+        _row("bad files", inventors=["甲"], asset_metadata={}, files="a.pdf"),
+        _row("ok too", inventors=["甲"], asset_metadata={}, creation_date=date(2024, 5, 1).isoformat(), files=[]),
+    ]
+    valid, errors = validate_batch(rows, 11, "json", None)
+
+    assert [row.row_number for row in valid] == [11, 15]
+    assert [(error.row_number, error.field) for error in errors] == [
+        (12, None), (13, "name"), (13, "inventors"), (14, "files")
+    ]
@@ -2,11 +2,12 @@
 import pytest
 from datetime import datetime, timezone, date
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.models.enterprise import Enterprise
-from app.models.asset import Asset, Attachment, AssetType, LegalStatus, AssetStatus
+from app.models.asset import Asset, Attachment, AssetType, LegalStatus, AssetStatus, parse_token_id
 
 
 @pytest.mark.anyio
@@ -111,10 +112,50 @@ class TestAssetModel:
 
         assert asset.status == AssetStatus.MINTED
         assert asset.nft_token_id == "12345"
+        assert asset.token_id == 12345
         assert asset.nft_contract_address == "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb"
         assert asset.nft_chain == "ethereum"
         assert asset.metadata_uri == "ipfs://cid123"
 
+    async def test_token_id_follows_nft_token_id_and_is_unique_per_contract(self, db_session: AsyncSession):
+        """测试整数 token_id 随 nft_token_id 写入，且同一合约内唯一。"""
+        assert [parse_token_id(raw) for raw in (" 42 ", "0", "-1", "0x2a", "", None, "٤٢", str(2**63))] == [
+            42, None, None, None, None, None, None, None,
+        ]
+
+        enterprise = Enterprise(name="Token Enterprise")
+        db_session.add(enterprise)
+        await db_session.commit()
+
+        def minted(token: str, contract: str) -> Asset:
+            return Asset(
+                enterprise_id=enterprise.id,
+                name=f"Token {token}",
+                type=AssetType.PATENT,
+                description="Token asset",
+                creator_name="Creator",
+                creation_date=date(2024, 1, 1),
+                legal_status=LegalStatus.GRANTED,
+                asset_metadata={},
+                status=AssetStatus.MINTED,
+                nft_token_id=token,
+                nft_contract_address=contract,
+            )
+
+        asset = minted("7", "0x" + "1" * 40)
+        db_session.add_all([asset, minted("7", "0x" + "2" * 40)])
+        await db_session.commit()
+        assert asset.token_id == 7
+
+        asset.nft_token_id = "8"
+        await db_session.commit()
+        assert (await db_session.execute(select(Asset.token_id).where(Asset.id == asset.id))).scalar_one() == 8
+
+        db_session.add(minted("8", "0x" + "1" * 40))
+        with pytest.raises(IntegrityError):
+            await db_session.commit()
+        await db_session.rollback()
+
     async def test_asset_enterprise_relationship(self, db_session: AsyncSession):
         """测试资产与企业的关系。"""
         enterprise = Enterprise(name="Relation Enterprise")
@@ -429,8 +470,8 @@ class TestAttachmentModel:
         assert attachment.ipfs_cid == "QmUniqueHash123"
         assert attachment.uploaded_at is not None
 
-    async def test_attachment_unique_cid(self, db_session: AsyncSession):
-        """测试 IPFS CID 唯一性约束。"""
+    async def test_attachments_share_cid(self, db_session: AsyncSession):
+        """测试内容相同的附件可以共用 IPFS CID。"""
         enterprise = Enterprise(name="Unique CID Enterprise")
         db_session.add(enterprise)
         await db_session.commit()
@@ -476,9 +517,12 @@ class TestAttachmentModel:
             ipfs_cid="QmDuplicate",
         )
         db_session.add(attachment2)
-        with pytest.raises(Exception):
-            await db_session.commit()
-        await db_session.rollback()
+        await db_session.commit()
+
+        result = await db_session.execute(
+            select(Attachment).where(Attachment.ipfs_cid == "QmDuplicate")
+        )
+        assert {a.asset_id for a in result.scalars()} == {asset1.id, asset2.id}
 
     async def test_attachment_asset_relationship(self, db_session: AsyncSession):
         """测试附件与资产的关系。"""
@@ -0,0 +1,90 @@
+"""认证缓存测试。"""
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.api import deps
+from app.core import security
+from app.core.auth_cache import PrincipalCache, VerifiedTokenCache, principal_cache, verified_token_cache
+from app.core.security import create_access_token, verify_access_token
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    verified_token_cache.clear()
+    principal_cache.clear()
+    yield
+    verified_token_cache.clear()
+    principal_cache.clear()
+
+
+def test_token_cache_is_bounded_lru_and_honours_exp():
+    cache = VerifiedTokenCache(maxsize=2)
+    future = time.time() + 60
+    cache.put("a", {"sub": "1", "exp": future})
+    cache.put("b", {"sub": "2", "exp": future})
+    assert cache.get("a")["sub"] == "1"  # a 变为最近使用
+    cache.put("c", {"sub": "3", "exp": future})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c", now=future + 1) is None
+    assert len(cache) == 1
+
+
+def test_verify_access_token_skips_decode_on_hit(monkeypatch):
+    token = create_access_token({"sub": "user-1"})
+    calls = []
+    original = security.decode_token
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(security, "decode_token", counting_decode)
+
+    assert verify_access_token(token)["sub"] == "user-1"
+    assert verify_access_token(token)["sub"] == "user-1"
+    assert len(calls) == 1
+    # 篡改后的令牌摘要不同，不会命中缓存
+    assert verify_access_token(token[:-2] + "xx") is None
+    assert len(calls) == 2
+
+
+def test_expired_token_is_not_cached():
+    token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=-1))
+    assert verify_access_token(token) is None
+    assert len(verified_token_cache) == 0
+
+
+def test_principal_cache_ttl():
+    cache = PrincipalCache(ttl=0.05)
+    cache.put("u", {"id": 1})
+    assert cache.get("u") == {"id": 1}
+    time.sleep(0.06)
+    assert cache.get("u") is None
+    assert PrincipalCache(ttl=0).get("u") is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_principal_cache_until_invalidated(db_session):
+    user = User(email="cache@example.com", username="cache", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    user_id = str(user.id)
+
+    first = await deps.get_current_user(user_id, db_session)
+    user.full_name = "Renamed"
+    await db_session.commit()
+    cached = await deps.get_current_user(user_id, db_session)
+
+    assert cached is not first
+    assert cached.full_name is None
+    assert cached.email == "cache@example.com"
+
+    await AuthService(db_session).logout_all(user.id)
+    refreshed = await deps.get_current_user(user_id, db_session)
+    assert refreshed.full_name == "Renamed"
@@ -0,0 +1,124 @@
+"""认证服务登录 / 刷新流程测试。"""
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects import postgresql
+
+from app.core import password_hasher as password_hasher_module
+from app.core.security import get_password_hash
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.schemas.auth import UserLoginRequest
+from app.services.auth_service import AuthService, InvalidTokenError
+
+
+@pytest.fixture(autouse=True)
+def inline_hasher(monkeypatch):
+    monkeypatch.setattr(password_hasher_module.password_hasher, "mode", "inline")
+
+
+async def _create_user(db_session, email="login@example.com"):
+    user = User(email=email, username=email.split("@")[0], hashed_password=get_password_hash("Secret123!"))
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+def _count_statements(db_session):
+    statements = []
+    engine = db_session.bind.sync_engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
+
+
+async def _active_tokens(db_session, user_id):
+    return (
+        await db_session.execute(
+            select(func.count(RefreshToken.id)).where(
+                RefreshToken.user_id == user_id, RefreshToken.is_revoked == False
+            )
+        )
+    ).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_login_issues_token_with_few_statements(db_session):
+    user = await _create_user(db_session)
+    statements, stop = _count_statements(db_session)
+    try:
+        result = await AuthService(db_session).login(
+            UserLoginRequest(email="login@example.com", password="Secret123!")
+        )
+    finally:
+        stop()
+
+    assert result.user.last_login_at is not None
+    assert result.tokens.refresh_token
+    assert await _active_tokens(db_session, user.id) == 1
+    # 查询用户 + 会话上限撤销 + 插入令牌 + 更新用户（PostgreSQL 上撤销与插入合并为一条）
+    assert len(statements) == 4
+
+
+@pytest.mark.asyncio
+async def test_login_revokes_old_sessions_at_limit(db_session):
+    user = await _create_user(db_session)
+    service = AuthService(db_session)
+    request = UserLoginRequest(email="login@example.com", password="Secret123!")
+
+    for _ in range(AuthService.MAX_ACTIVE_SESSIONS):
+        await service.login(request)
+    assert await _active_tokens(db_session, user.id) == AuthService.MAX_ACTIVE_SESSIONS
+
+    await service.login(request)
+    assert await _active_tokens(db_session, user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_token_once(db_session):
+    user = await _create_user(db_session)
+    service = AuthService(db_session)
+    login = await service.login(UserLoginRequest(email="login@example.com", password="Secret123!"))
+
+    refreshed = await service.refresh_tokens(login.tokens.refresh_token)
+
+    assert refreshed.refresh_token != login.tokens.refresh_token
+    assert await _active_tokens(db_session, user.id) == 1
+    with pytest.raises(InvalidTokenError):
+        await service.refresh_tokens(login.tokens.refresh_token)
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_inactive_user(db_session):
+    user = await _create_user(db_session)
+    user_id = user.id
+    service = AuthService(db_session)
+    login = await service.login(UserLoginRequest(email="login@example.com", password="Secret123!"))
+    user.is_active = False
+    await db_session.commit()
+
+    with pytest.raises(InvalidTokenError):
+        await service.refresh_tokens(login.tokens.refresh_token)
+    assert await _active_tokens(db_session, user_id) == 1
+
+
+def test_postgres_statements_use_writable_ctes():
+    from datetime import datetime, timezone
+    from uuid import uuid4
+    from sqlalchemy import insert, update
+
+    now = datetime.now(timezone.utc)
+    revoked = (
+        update(RefreshToken)
+        .where(RefreshToken.user_id == uuid4())
+        .values(is_revoked=True, revoked_at=now)
+        .returning(RefreshToken.id)
+        .cte("revoked")
+    )
+    stmt = insert(RefreshToken).values(token_hash="h", user_id=uuid4(), expires_at=now).add_cte(revoked)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("WITH revoked AS")
+    assert "UPDATE refresh_tokens" in sql and "INSERT INTO refresh_tokens" in sql
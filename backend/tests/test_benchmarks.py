@@ -0,0 +1,85 @@
+"""基准套件冒烟测试：数据生成可复现、场景可运行、结果对比能发现回退。"""
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import blockchain
+from app.core.database import Base
+from app.models.asset import Asset
+from app.services import pinata_service
+from benchmarks.compare import compare_results
+from benchmarks.datagen import seed_dataset
+from benchmarks.run import run_benchmarks
+
+
+async def _seeded(path, seed):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    dataset = await seed_dataset(session_factory, scale="smoke", seed=seed)
+    async with session_factory() as session:
+        asset_ids = (await session.execute(select(Asset.id).order_by(Asset.name))).scalars().all()
+        hot_assets = await session.scalar(
+            select(func.count()).select_from(Asset).where(Asset.enterprise_id == dataset.hot_enterprise_id)
+        )
+    await engine.dispose()
+    return dataset, asset_ids, hot_assets
+
+
+@pytest.mark.asyncio
+async def test_seed_is_reproducible(tmp_path):
+    first, first_ids, hot_assets = await _seeded(tmp_path / "a.db", seed=7)
+    second, second_ids, _ = await _seeded(tmp_path / "b.db", seed=7)
+    other, other_ids, _ = await _seeded(tmp_path / "c.db", seed=8)
+
+    assert first.counts == second.counts
+    assert first.counts["assets"] == 200
+    assert first.counts["approvals"] == 20
+    assert first.counts["transfer_records"] == 40
+    assert first_ids == second_ids
+    assert first_ids != other_ids
+    assert hot_assets > 200 // 5 // 2
+
+
+@pytest.mark.asyncio
+async def test_run_benchmarks_smoke(tmp_path, monkeypatch):
+    # 替身会替换全局单例，测试结束后恢复
+    monkeypatch.setattr(pinata_service, "_pinata_service", None)
+    monkeypatch.setattr(blockchain, "_blockchain_client", None)
+
+    result = await run_benchmarks(
+        f"sqlite+aiosqlite:///{tmp_path}/bench.db",
+        scale="smoke",
+        scenario_names=["asset_list", "asset_search", "mint", "ownership_stats", "approval_queue"],
+        requests=20,
+        concurrency=1,
+        pinata_latency=0,
+        chain_latency=0,
+    )
+
+    json.dumps(result)
+    assert result["meta"]["scale"] == "smoke"
+    assert result["meta"]["database"] == "sqlite"
+    scenarios = result["scenarios"]
+    assert set(scenarios) == {"asset_list", "asset_search", "mint", "ownership_stats", "approval_queue"}
+    for name, stats in scenarios.items():
+        assert stats["errors"] == 0, (name, stats["error_samples"])
+        assert stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+        assert stats["queries_per_request"] > 0
+    assert scenarios["mint"]["requests"] == 2
+    assert scenarios["mint"]["status_counts"] == {"201": 2}
+
+
+def test_compare_flags_regressions():
+    def result(rps, p99, queries):
+        return {"scenarios": {"asset_list": {"rps": rps, "p50_ms": 5.0, "p99_ms": p99, "queries_per_request": queries}}}
+
+    rows, regressions = compare_results(result(100, 10, 4), result(95, 10.5, 4), threshold=10)
+    assert rows[0]["rps_change"] == pytest.approx(-5)
+    assert regressions == []
+
+    _, regressions = compare_results(result(100, 10, 4), result(80, 15, 24), threshold=10)
+    assert len(regressions) == 3
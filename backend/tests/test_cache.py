@@ -0,0 +1,198 @@
+"""应用缓存：本地层 LRU/TTL 与标签、single-flight、提交后失效、共享层与业务读路径。"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache as cache_module
+from app.core.cache import (
+    MISSING,
+    CacheService,
+    LocalCacheTier,
+    RedisCacheTier,
+    cache_service,
+    enterprise_tag,
+    invalidate_after_commit,
+)
+from app.core.security import create_access_token
+from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+from app.models.user import User
+
+
+def test_local_tier_evicts_lru_expires_and_invalidates_by_tag(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    tier = LocalCacheTier(ttl=10, maxsize=2)
+
+    tier.put("a", 1, tags=["t:1"])
+    tier.put("b", 2, tags=["t:1", "t:2"])
+    assert tier.get("a") == 1
+    tier.put("c", 3, tags=["t:2"])
+    # "b" 最久未使用，被淘汰
+    assert tier.get("b") is MISSING and len(tier) == 2
+
+    assert tier.invalidate_tags(["t:2"]) == 1
+    assert tier.get("c") is MISSING and tier.get("a") == 1
+
+    tier.put("d", 0, ttl=5)
+    assert tier.get("d") == 0
+    now[0] += 6
+    assert tier.get("d") is MISSING
+    now[0] += 5
+    assert tier.get("a") is MISSING
+    assert len(tier) == 0 and not tier._tag_index
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once():
+    service = CacheService(local=LocalCacheTier(ttl=60))
+    release = asyncio.Event()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"value": calls}
+
+    tasks = [asyncio.create_task(service.get_or_load("ns", "k", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*tasks) == [{"value": 1}] * 5
+    assert await service.get_or_load("ns", "k", load) == {"value": 1}
+    assert calls == 1
+    assert service.get_stats()["namespaces"]["ns"] == {
+        "hits": 1, "shared_hits": 0, "misses": 1, "coalesced": 4, "hit_rate": round(5 / 6, 4),
+    }
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_cached():
+    service = CacheService(local=LocalCacheTier(ttl=60))
+    values = iter(["stale", "fresh"])
+
+    async def load():
+        value = next(values)
+        if value == "stale":
+            service.invalidate_local(["t"])
+        return value
+
+    assert await service.get_or_load("ns", "k", load, tags=["t"]) == "stale"
+    assert await service.get_or_load("ns", "k", load, tags=["t"]) == "fresh"
+    assert await service.get_or_load("ns", "k", load, tags=["t"]) == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_after_commit_discarded_on_rollback(db_session: AsyncSession):
+    tag = enterprise_tag(uuid4())
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        return loads
+
+    assert await cache_service.get_or_load("ns", "k", load, tags=[tag]) == 1
+
+    await db_session.execute(text("SELECT 1"))
+    invalidate_after_commit(db_session, tag)
+    await db_session.rollback()
+    assert await cache_service.get_or_load("ns", "k", load, tags=[tag]) == 1
+
+    await db_session.execute(text("SELECT 1"))
+    invalidate_after_commit(db_session, tag)
+    await db_session.commit()
+    assert await cache_service.get_or_load("ns", "k", load, tags=[tag]) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_serves_other_processes_until_tag_invalidated():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis()
+
+    def worker() -> CacheService:
+        return CacheService(local=LocalCacheTier(ttl=60), shared=RedisCacheTier(client=client))
+
+    first, second, third = worker(), worker(), worker()
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        return {"loads": loads}
+
+    tags = ["asset:1"]
+    assert await first.get_or_load("ns", "k", load, tags=tags) == {"loads": 1}
+    assert await second.get_or_load("ns", "k", load, tags=tags) == {"loads": 1}
+    assert second.get_stats()["namespaces"]["ns"]["shared_hits"] == 1
+
+    # 标签随共享层条目带回，本进程的按标签失效同样生效
+    await second.invalidate_tags(["asset:1"])
+    assert await third.get_or_load("ns", "k", load, tags=tags) == {"loads": 2}
+    assert await first.get_or_load("ns", "k", load, tags=tags) == {"loads": 1}  # 本地层滞后至 TTL
+    assert await second.get_or_load("ns", "k", load, tags=tags) == {"loads": 2}
+    assert loads == 2
+
+
+@pytest.mark.asyncio
+async def test_result_dependent_tags_bypass_shared_tier():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis()
+
+    def worker() -> CacheService:
+        return CacheService(local=LocalCacheTier(ttl=60), shared=RedisCacheTier(client=client))
+
+    first, second, third = worker(), worker(), worker()
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        if loads == 1:
+            # 另一进程在本次加载读库之后提交了权属变更
+            await second.invalidate_tags(["asset:1"])
+        return {"loads": loads}
+
+    tags = lambda value: ["asset:1"]
+    assert await first.get_or_load("ns", "k", load, tags=tags) == {"loads": 1}
+    assert await third.get_or_load("ns", "k", load, tags=tags) == {"loads": 2}
+    assert await client.keys("cache:ns:*") == []
+
+
+@pytest.mark.asyncio
+async def test_enterprise_detail_cached_until_member_role_changes(client: AsyncClient, db_session: AsyncSession):
+    owner = User(id=uuid4(), email="cache-owner@example.com", username="cache_owner", hashed_password="x")
+    member = User(id=uuid4(), email="cache-member@example.com", username="cache_member", hashed_password="x")
+    enterprise = Enterprise(id=uuid4(), name="Cache Enterprise")
+    db_session.add_all([
+        owner,
+        member,
+        enterprise,
+        EnterpriseMember(enterprise_id=enterprise.id, user_id=owner.id, role=MemberRole.OWNER),
+        EnterpriseMember(enterprise_id=enterprise.id, user_id=member.id, role=MemberRole.MEMBER),
+    ])
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(owner.id)})}"}
+    url = f"/api/v1/enterprises/{enterprise.id}"
+
+    def roles(response) -> dict:
+        return {m["user_id"]: m["role"] for m in response.json()["data"]["members"]}
+
+    first = await client.get(url, headers=headers)
+    assert first.status_code == 200
+    assert roles(first)[str(member.id)] == "member"
+    assert (await client.get(url, headers=headers)).json() == first.json()
+    assert cache_service.get_stats()["namespaces"]["enterprise_detail"]["hits"] == 1
+
+    # 非成员不能借缓存读取详情
+    outsider = {"Authorization": f"Bearer {create_access_token({'sub': str(uuid4())})}"}
+    assert (await client.get(url, headers=outsider)).status_code == 403
+
+    response = await client.put(f"{url}/members/{member.id}", json={"role": "admin"}, headers=headers)
+    assert response.status_code == 200
+    assert roles(await client.get(url, headers=headers))[str(member.id)] == "admin"
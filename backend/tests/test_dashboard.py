@@ -0,0 +1,195 @@
+"""仪表盘汇总表与接口测试。"""
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.models.approval import Approval, ApprovalStatus, ApprovalType
+from app.models.asset import Asset, AssetStatus, AssetType, LegalStatus
+from app.models.dashboard import AssetCountRollup, TransferDailyRollup
+from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+from app.models.job_lock import JobLock
+from app.models.ownership import NFTTransferRecord, TransferStatus, TransferType
+from app.models.user import User
+from app.services.dashboard_service import DASHBOARD_ROLLUP_JOB, DashboardService
+
+
+def _asset(enterprise: Enterprise, status: AssetStatus, asset_type=AssetType.PATENT, legal=LegalStatus.GRANTED):
+    return Asset(
+        id=uuid4(),
+        enterprise_id=enterprise.id,
+        name=f"{status.value} asset",
+        type=asset_type,
+        description="d",
+        creator_name="c",
+        inventors=["c"],
+        creation_date=date(2024, 1, 1),
+        legal_status=legal,
+        status=status,
+    )
+
+
+def _transfer(from_enterprise, to_enterprise, created_at, status=TransferStatus.CONFIRMED, kind=TransferType.TRANSFER):
+    return NFTTransferRecord(
+        token_id=1,
+        contract_address="0x" + "0" * 40,
+        transfer_type=kind,
+        from_address="0x" + "1" * 40,
+        from_enterprise_id=from_enterprise.id if from_enterprise else None,
+        to_address="0x" + "2" * 40,
+        to_enterprise_id=to_enterprise.id if to_enterprise else None,
+        status=status,
+        created_at=created_at,
+    )
+
+
+async def _seed(db: AsyncSession):
+    now = datetime.now(timezone.utc)
+    user = User(id=uuid4(), email="dash@example.com", username="dash", hashed_password="x")
+    ours = Enterprise(id=uuid4(), name="Ours")
+    theirs = Enterprise(id=uuid4(), name="Theirs")
+    member = EnterpriseMember(id=uuid4(), enterprise_id=ours.id, user_id=user.id, role=MemberRole.OWNER)
+    assets = [
+        _asset(ours, AssetStatus.DRAFT),
+        _asset(ours, AssetStatus.PENDING, AssetType.TRADEMARK, LegalStatus.PENDING),
+        _asset(ours, AssetStatus.MINTED),
+        _asset(ours, AssetStatus.TRANSFERRED),
+        _asset(ours, AssetStatus.MINT_FAILED),
+        _asset(theirs, AssetStatus.MINTED),
+    ]
+    approvals = [
+        Approval(
+            type=ApprovalType.ASSET_SUBMIT, target_id=assets[1].id, target_type="asset",
+            asset_id=assets[1].id, applicant_id=user.id, status=ApprovalStatus.PENDING,
+            created_at=now - timedelta(days=2),
+        ),
+        Approval(
+            type=ApprovalType.ENTERPRISE_UPDATE, target_id=ours.id, target_type="enterprise",
+            applicant_id=user.id, status=ApprovalStatus.PENDING,
+        ),
+        Approval(
+            type=ApprovalType.MEMBER_JOIN, target_id=member.id, target_type="member",
+            applicant_id=user.id, status=ApprovalStatus.PENDING,
+        ),
+        Approval(
+            type=ApprovalType.ENTERPRISE_UPDATE, target_id=ours.id, target_type="enterprise",
+            applicant_id=user.id, status=ApprovalStatus.APPROVED,
+        ),
+    ]
+    transfers = [
+        _transfer(ours, theirs, now),
+        _transfer(theirs, ours, now - timedelta(days=3)),
+        _transfer(None, ours, now, kind=TransferType.MINT),
+        _transfer(ours, theirs, now, status=TransferStatus.FAILED),
+    ]
+    db.add_all([user, ours, theirs, member, *assets, *approvals, *transfers])
+    await db.commit()
+    return user, ours, theirs, assets
+
+
+async def _count(db: AsyncSession, model) -> int:
+    return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_refresh_builds_rollups_and_only_writes_changes(db_session: AsyncSession):
+    user, ours, theirs, assets = await _seed(db_session)
+    service = DashboardService(db_session)
+
+    assert await service.refresh_rollups() > 0
+    await db_session.commit()
+    assert await service.refresh_rollups() == 0
+
+    summary = await service.get_asset_summary([ours.id])
+    assert summary["total"] == 5
+    assert summary["by_type"]["TRADEMARK"] == 1
+    assert summary["by_legal_status"] == {"APPLIED": 0, "PENDING": 1, "GRANTED": 4, "EXPIRED": 0}
+    funnel = summary["mint_funnel"]
+    assert (funnel["submitted"], funnel["approved"], funnel["mint_attempted"], funnel["minted"]) == (4, 3, 3, 2)
+    assert funnel["mint_success_rate"] == round(2 / 3, 4)
+    assert (await service.get_asset_summary([ours.id, theirs.id]))["total"] == 6
+
+    # 状态变化与删除只写入受影响的行
+    assets[0].status = AssetStatus.PENDING
+    await db_session.delete(assets[4])
+    await db_session.commit()
+    assert await service.refresh_rollups() == 3
+    await db_session.commit()
+    by_status = (await service.get_asset_summary([ours.id]))["by_status"]
+    assert (by_status["DRAFT"], by_status["PENDING"], by_status["MINT_FAILED"]) == (0, 2, 0)
+    assert await _count(db_session, AssetCountRollup) == 5
+
+
+@pytest.mark.asyncio
+async def test_transfer_volume_and_approval_backlog(db_session: AsyncSession):
+    user, ours, theirs, _ = await _seed(db_session)
+    service = DashboardService(db_session)
+    await service.refresh_rollups()
+    await db_session.commit()
+
+    volume = await service.get_transfer_volume([ours.id], days=7)
+    assert len(volume) == 7
+    assert volume[-1]["day"] == datetime.now(timezone.utc).date()
+    assert (volume[-1]["incoming"], volume[-1]["outgoing"]) == (1, 1)
+    assert volume[-1]["by_type"] == {"MINT": 1, "TRANSFER": 1}
+    assert volume[-4]["incoming"] == 1
+    assert sum(point["outgoing"] for point in volume) == 1
+
+    backlog = await service.get_approval_backlog([ours.id, theirs.id])
+    assert len(backlog) == 1
+    assert backlog[0]["enterprise_name"] == "Ours"
+    assert backlog[0]["pending"] == 3
+    assert backlog[0]["by_type"]["asset_submit"] == backlog[0]["by_type"]["member_join"] == 1
+    assert backlog[0]["oldest_pending_at"] < datetime.now(timezone.utc) - timedelta(days=1)
+
+
+@pytest.mark.asyncio
+async def test_transfer_refresh_only_recomputes_recent_days(db_session: AsyncSession):
+    user, ours, theirs, _ = await _seed(db_session)
+    service = DashboardService(db_session)
+    await service.refresh_rollups()
+    db_session.add(JobLock(name=DASHBOARD_ROLLUP_JOB, last_finished_at=datetime.now(timezone.utc)))
+    await db_session.commit()
+
+    old_day = datetime.now(timezone.utc) - timedelta(days=30)
+    db_session.add_all([_transfer(ours, theirs, old_day), _transfer(ours, theirs, datetime.now(timezone.utc))])
+    await db_session.commit()
+
+    await service.refresh_rollups()
+    await db_session.commit()
+    old_rows = await db_session.execute(select(TransferDailyRollup).where(TransferDailyRollup.day == old_day.date()))
+    assert old_rows.scalars().all() == []
+
+    await service.refresh_rollups(full=True)
+    await db_session.commit()
+    old_rows = await db_session.execute(select(TransferDailyRollup).where(TransferDailyRollup.day == old_day.date()))
+    assert {(row.direction, row.count) for row in old_rows.scalars()} == {("out", 1), ("in", 1)}
+
+
+@pytest.mark.asyncio
+async def test_dashboard_api_scopes_to_member_enterprises(client, db_session: AsyncSession):
+    user, ours, theirs, _ = await _seed(db_session)
+    await DashboardService(db_session).refresh_rollups()
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    response = await client.get("/api/v1/dashboard", params={"days": 14}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["enterprise_ids"] == [str(ours.id)]
+    assert body["assets"]["total"] == 5
+    assert len(body["transfer_volume"]) == 14
+    assert body["approval_backlog"][0]["pending"] == 3
+
+    response = await client.get("/api/v1/dashboard/assets", params={"enterprise_id": str(ours.id)}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["mint_funnel"]["minted"] == 2
+
+    response = await client.get("/api/v1/dashboard", params={"enterprise_id": str(theirs.id)}, headers=headers)
+    assert response.status_code == 403
+    response = await client.get("/api/v1/dashboard", params={"enterprise_id": str(uuid4())}, headers=headers)
+    assert response.status_code == 404
+    assert (await client.get("/api/v1/dashboard")).status_code in (401, 403)
@@ -0,0 +1,92 @@
+"""数据库引擎参数与读写路由测试。"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import Base, RoutingSession, engine_options
+from app.models.user import User
+
+
+def test_engine_options_for_asyncpg(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_READ_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 1500)
+
+    primary = engine_options("postgresql+asyncpg://u:p@db/app")
+    assert primary["pool_size"] == 7
+    assert primary["pool_use_lifo"] is True
+    assert primary["connect_args"]["prepared_statement_cache_size"] == settings.DB_STATEMENT_CACHE_SIZE
+    assert primary["connect_args"]["server_settings"]["statement_timeout"] == "1500"
+    assert "default_transaction_read_only" not in primary["connect_args"]["server_settings"]
+    assert "statement_cache_size" not in primary["connect_args"]
+
+    replica = engine_options("postgresql+asyncpg://u:p@replica/app", read_only=True)
+    assert replica["pool_size"] == 3
+    assert replica["connect_args"]["server_settings"]["default_transaction_read_only"] == "on"
+
+
+def test_engine_options_disable_statement_cache_for_pgbouncer(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+    connect_args = engine_options("postgresql+asyncpg://u:p@db/app")["connect_args"]
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["statement_cache_size"] == 0
+
+
+def test_engine_options_for_sqlite_skip_pool_settings():
+    options = engine_options("sqlite+aiosqlite:///:memory:")
+    assert "pool_size" not in options
+    assert "connect_args" not in options
+
+
+async def _make_engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_routing_session_reads_replica_until_first_write():
+    primary, replica = await _make_engine(), await _make_engine()
+    async with AsyncSession(replica) as db:
+        db.add(User(email="r@example.com", username="replica", hashed_password="x"))
+        await db.commit()
+    factory = async_sessionmaker(
+        class_=AsyncSession,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        primary=primary.sync_engine,
+        replica=replica.sync_engine,
+    )
+    try:
+        async with factory() as db:
+            names = (await db.execute(select(User.username))).scalars().all()
+            assert names == ["replica"]
+            assert not db.sync_session.pinned_to_primary
+
+            # 写入后固定到主库，之后的查询读到自己的写入
+            db.add(User(email="p@example.com", username="primary", hashed_password="x"))
+            await db.flush()
+            names = (await db.execute(select(User.username))).scalars().all()
+            assert names == ["primary"]
+            await db.commit()
+
+        async with factory() as db:
+            await db.execute(select(User).with_for_update())
+            assert db.sync_session.pinned_to_primary
+    finally:
+        await primary.dispose()
+        await replica.dispose()
+
+
+def test_routing_session_without_replica_always_uses_primary():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session = RoutingSession(primary=engine.sync_engine, replica=engine.sync_engine)
+    assert session.pinned_to_primary
+    assert session.get_bind(clause=select(User)) is engine.sync_engine
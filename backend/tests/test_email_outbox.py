@@ -0,0 +1,226 @@
+"""邮件发件箱与后台发送测试（使用本地 aiosmtpd 服务器）。"""
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.retry import _breakers, get_circuit_breaker
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.models.user import User
+from app.services.email_outbox_service import EmailOutboxService, EmailWorker, ProviderRateLimiter
+from app.services.email_service import EmailService, SMTPConnectionPool, compile_simple_template
+
+
+class _CollectingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = _CollectingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest.fixture(autouse=True)
+def _reset_breakers():
+    _breakers.clear()
+    yield
+    _breakers.clear()
+
+
+def _session_factory(db_session: AsyncSession):
+    return async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+def _worker(db_session: AsyncSession, port: int, **kwargs) -> EmailWorker:
+    # 测试库的所有会话共用同一个 SQLite 连接，并发处理会互相回滚，因此连接池大小取 1
+    transport = SMTPConnectionPool("127.0.0.1", port, start_tls=False, timeout=5, size=1)
+    return EmailWorker(
+        session_factory=_session_factory(db_session),
+        service=EmailService(),
+        transport=transport,
+        rate_limiter=ProviderRateLimiter(0),
+        **kwargs,
+    )
+
+
+async def _enqueue(db_session: AsyncSession, count: int):
+    outbox = EmailOutboxService(db_session)
+    for i in range(count):
+        await outbox.enqueue(f"user{i}@example.com", f"hello {i}", "<p>hi</p>")
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_worker_delivers_batch_over_reused_connection(db_session, smtp_server):
+    controller, handler = smtp_server
+    await _enqueue(db_session, 5)
+    worker = _worker(db_session, controller.port)
+
+    assert await worker.run_once() == 5
+    assert await worker.run_once() == 0
+    await worker.transport.close()
+
+    assert sorted(envelope.rcpt_tos[0] for envelope in handler.messages) == [
+        f"user{i}@example.com" for i in range(5)
+    ]
+    # 5 封邮件复用同一个 SMTP 连接
+    assert worker.transport.connections_opened == 1
+
+    rows = (await db_session.execute(select(EmailOutbox))).scalars().all()
+    for row in rows:
+        await db_session.refresh(row)
+        assert row.status == EmailOutboxStatus.SENT
+        assert row.attempts == 1
+        assert row.sent_at is not None
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server_schedules_retry_with_backoff(db_session):
+    await _enqueue(db_session, 1)
+    worker = _worker(db_session, _free_port())
+
+    assert await worker.run_once() == 1
+    row = (await db_session.execute(select(EmailOutbox))).scalar_one()
+    await db_session.refresh(row)
+    assert row.status == EmailOutboxStatus.PENDING
+    assert row.attempts == 1
+    assert row.last_error
+    next_attempt_at = row.next_attempt_at.replace(tzinfo=timezone.utc)
+    assert next_attempt_at <= datetime.now(timezone.utc) + timedelta(seconds=5)
+
+    # 达到最大次数后不再重试
+    row.max_attempts = 2
+    row.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await db_session.commit()
+    assert await worker.run_once() == 1
+    await db_session.refresh(row)
+    assert row.status == EmailOutboxStatus.DEAD
+    assert row.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(db_session, smtp_server):
+    controller, handler = smtp_server
+    await _enqueue(db_session, 1)
+    row = (await db_session.execute(select(EmailOutbox))).scalar_one()
+    row.status = EmailOutboxStatus.SENDING
+    row.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    await db_session.commit()
+
+    worker = _worker(db_session, controller.port)
+    assert await worker.run_once() == 1
+    await worker.transport.close()
+    assert len(handler.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_forgot_password_only_enqueues(client, db_session):
+    db_session.add(User(email="reset@example.com", username="reset", hashed_password="x"))
+    await db_session.commit()
+
+    started = time.perf_counter()
+    response = await client.post("/api/v1/auth/forgot-password", json={"email": "reset@example.com"})
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200
+    assert elapsed < 1.0
+
+    row = (await db_session.execute(select(EmailOutbox))).scalar_one()
+    assert row.to_email == "reset@example.com"
+    assert row.template == "reset_password"
+    assert row.status == EmailOutboxStatus.PENDING
+    assert "/auth/reset-password?token=" in row.html_body
+
+
+def test_rate_limiter_spaces_sends_per_provider():
+    now = [100.0]
+    limiter = ProviderRateLimiter(60, clock=lambda: now[0])
+    assert limiter.reserve("smtp") == 0
+    assert limiter.reserve("smtp") == pytest.approx(1.0)
+    assert limiter.reserve("smtp") == pytest.approx(2.0)
+    assert limiter.reserve("other") == 0
+
+
+def test_templates_are_compiled_once_and_escape_values():
+    service = EmailService()
+    renderer = service._templates["verify_email"]
+    html = service.render_template("verify_email", {"user_name": "<script>", "verify_url": "x"})
+    assert service._templates["verify_email"] is renderer
+    assert "<script>" not in html
+
+    render = compile_simple_template("Hi {{ name }}{{ missing }}!")
+    assert render({"name": "A&B"}) == "Hi A&amp;B!"
+
+
+class _RejectingHandler(_CollectingHandler):
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bad"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+
+@pytest.mark.asyncio
+async def test_rejected_half_open_probe_releases_breaker_and_clears_body(db_session):
+    handler = _RejectingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    try:
+        outbox = EmailOutboxService(db_session)
+        bad = await outbox.enqueue_password_reset("bad@example.com", "secret-reset-token")
+        bad.next_attempt_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+        await outbox.enqueue("good@example.com", "hello", "<p>hi</p>")
+        await db_session.commit()
+
+        worker = _worker(db_session, controller.port, batch_size=1)
+        breaker = get_circuit_breaker(f"email:{worker.service.provider}")
+        breaker.failure_threshold = 1
+        breaker.record_failure()
+        breaker.reset_timeout = 0.0
+
+        assert await worker.run_once() == 1
+        await db_session.refresh(bad)
+        assert bad.status == EmailOutboxStatus.DEAD
+        assert "secret-reset-token" not in bad.html_body
+        assert breaker.state == breaker.HALF_OPEN
+
+        # 探测名额已释放，下一封邮件可以作为探测发送并关闭熔断器
+        assert await worker.run_once() == 1
+        await worker.transport.close()
+        assert [envelope.rcpt_tos for envelope in handler.messages] == [["good@example.com"]]
+        assert breaker.state == breaker.CLOSED
+    finally:
+        controller.stop()
+
+
+@pytest.mark.asyncio
+async def test_purge_finished_removes_sent_and_dead_messages(db_session):
+    outbox = EmailOutboxService(db_session)
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    for status in (EmailOutboxStatus.SENT, EmailOutboxStatus.DEAD, EmailOutboxStatus.PENDING):
+        message = await outbox.enqueue(f"{status.lower()}@example.com", "hello", "<p>hi</p>")
+        message.status = status
+        message.updated_at = old
+    await db_session.commit()
+
+    assert await outbox.purge_finished(datetime.now(timezone.utc) - timedelta(days=7)) == 2
+    remaining = (await db_session.execute(select(EmailOutbox))).scalars().all()
+    assert [row.status for row in remaining] == [EmailOutboxStatus.PENDING]
@@ -0,0 +1,232 @@
+"""服务端推送：事件总线、提交后发布、审批与通知事件、SSE / WebSocket 端点。"""
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import httpx
+import pytest
+import uvicorn
+import websockets
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.v1.events import RevocationWatch, resolve_topics, sse_messages, TopicError
+from app.core import database
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.events import (
+    APPROVALS_TOPIC,
+    Event,
+    EventBus,
+    PostgresEventBridge,
+    event_bus,
+    publish_after_commit,
+    user_topic,
+)
+from app.core.security import create_access_token, verify_access_token
+from app.main import app
+from app.models.approval import Approval, ApprovalAction, ApprovalStatus, ApprovalType
+from app.models.user import User
+from app.services.approval_service import ApprovalService
+from app.services.token_revocation_service import revocation_list
+
+
+def test_bus_delivers_by_topic_and_drops_oldest_when_full():
+    bus = EventBus(queue_size=2)
+    alice = bus.subscribe([user_topic("alice"), APPROVALS_TOPIC])
+    bob = bus.subscribe([user_topic("bob")])
+    assert bus.connections == 2
+
+    bus.publish(user_topic("alice"), "notification.created", {"n": 1})
+    bus.publish(APPROVALS_TOPIC, "approval.submitted", {"n": 2})
+    bus.publish(APPROVALS_TOPIC, "approval.submitted", {"n": 3})
+    assert bob.queue.empty()
+    assert [alice.queue.get_nowait().data["n"] for _ in range(2)] == [2, 3]
+    assert alice.dropped == 1
+
+    alice.close()
+    alice.close()
+    assert bus.connections == 1
+    assert bus.dispatch(Event(topic=APPROVALS_TOPIC, type="x", data={})) == 0
+    bob.close()
+    assert bus.get_stats()["topics"] == 0
+
+
+@pytest.mark.asyncio
+async def test_publish_after_commit_only_on_commit(db_session: AsyncSession):
+    with event_bus.subscribe([user_topic("commit-test")]) as subscription:
+        await db_session.execute(text("SELECT 1"))
+        publish_after_commit(db_session, user_topic("commit-test"), "discarded", {})
+        await db_session.rollback()
+        publish_after_commit(db_session, user_topic("commit-test"), "kept", {})
+        assert subscription.queue.empty()
+        await db_session.commit()
+
+        assert (await subscription.get(1)).type == "kept"
+        assert subscription.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_processing_approval_pushes_result_and_notification(db_session: AsyncSession):
+    applicant = User(id=uuid4(), email="push@example.com", username="push_user", hashed_password="x")
+    approval = Approval(
+        id=uuid4(),
+        type=ApprovalType.ENTERPRISE_UPDATE,
+        target_id=uuid4(),
+        target_type="enterprise",
+        applicant_id=applicant.id,
+        status=ApprovalStatus.PENDING,
+    )
+    db_session.add_all([applicant, approval])
+    await db_session.commit()
+
+    with event_bus.subscribe([user_topic(applicant.id), APPROVALS_TOPIC]) as subscription:
+        await ApprovalService(db_session).process_approval(
+            approval.id, applicant.id, ApprovalAction.APPROVE, "通过"
+        )
+        events = [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+    assert [(e.topic, e.type) for e in events] == [
+        (user_topic(applicant.id), "notification.created"),
+        (user_topic(applicant.id), "approval.processed"),
+        (APPROVALS_TOPIC, "approval.processed"),
+    ]
+    assert events[1].data == {"approval_id": str(approval.id), "type": "enterprise_update", "status": "approved"}
+    assert events[2].data["approval_ids"] == [str(approval.id)]
+
+
+def test_postgres_bridge_ignores_own_notifications():
+    bus = EventBus()
+    bridge = PostgresEventBridge(bus, "postgresql+asyncpg://u:p@db:5432/app", "app_events")
+    assert bridge.dsn == "postgresql://u:p@db:5432/app"
+    subscription = bus.subscribe([APPROVALS_TOPIC])
+
+    evt = Event(topic=APPROVALS_TOPIC, type="approval.submitted", data={"approval_id": "a"})
+    payload = json.loads(evt.to_json())
+    bridge._on_notify(None, 1, "app_events", json.dumps({"origin": bus.origin, **payload}))
+    assert subscription.queue.empty()
+    bridge._on_notify(None, 1, "app_events", json.dumps({"origin": "other-worker", **payload}))
+    received = subscription.queue.get_nowait()
+    assert (received.id, received.data) == (evt.id, {"approval_id": "a"})
+    bridge._on_notify(None, 1, "app_events", "not json")
+    subscription.close()
+
+
+def test_resolve_topics_only_allows_public_topics():
+    assert resolve_topics("u1", "approvals, ") == [user_topic("u1"), APPROVALS_TOPIC]
+    with pytest.raises(TopicError):
+        resolve_topics("u1", "user:someone-else")
+
+
+@pytest.mark.asyncio
+async def test_sse_messages_heartbeat_events_and_expiry():
+    messages = sse_messages([user_topic("sse")], expires_at=time.time() + 0.3, heartbeat=0.1)
+    assert (await messages.__anext__()).startswith("retry: 3000")
+    assert event_bus.connections >= 1
+
+    event_bus.publish(user_topic("sse"), "notification.created", {"title": "hi"})
+    message = await messages.__anext__()
+    assert message.startswith("id: ") and "event: notification.created\n" in message
+    assert json.loads(message.split("data: ", 1)[1])["data"] == {"title": "hi"}
+
+    rest = [m async for m in messages]
+    assert ": ping\n\n" in rest
+    assert rest[-1].startswith("event: token.expired")
+    assert event_bus.get_stats()["topics"] == 0
+
+
+@asynccontextmanager
+async def _serve(db_session: AsyncSession):
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off"))
+    task = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        yield server.servers[0].sockets[0].getsockname()[1]
+    finally:
+        server.should_exit = True
+        await task
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_websocket_and_sse_endpoints_push_events(db_session: AsyncSession):
+    user_id = str(uuid4())
+    token = create_access_token({"sub": user_id})
+
+    async with _serve(db_session) as port:
+        with pytest.raises(websockets.exceptions.ConnectionClosed) as closed:
+            async with websockets.connect(f"ws://127.0.0.1:{port}/api/v1/events/ws?token=bad") as ws:
+                await ws.recv()
+        assert closed.value.rcvd.code == 1008
+
+        async with websockets.connect(
+            f"ws://127.0.0.1:{port}/api/v1/events/ws?topics=approvals",
+            additional_headers={"Authorization": f"Bearer {token}"},
+        ) as ws:
+            while event_bus.connections == 0:
+                await asyncio.sleep(0.01)
+            event_bus.publish(APPROVALS_TOPIC, "approval.submitted", {"approval_id": "a1"})
+            received = json.loads(await asyncio.wait_for(ws.recv(), 5))
+            assert (received["type"], received["data"]) == ("approval.submitted", {"approval_id": "a1"})
+        for _ in range(100):
+            if event_bus.connections == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert event_bus.connections == 0
+
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+            assert (await client.get("/api/v1/events/stream")).status_code == 401
+            async with client.stream("GET", "/api/v1/events/stream", params={"token": token}) as response:
+                assert response.headers["content-type"].startswith("text/event-stream")
+                lines = response.aiter_lines()
+                assert (await lines.__anext__()).startswith("retry:")
+                event_bus.publish(user_topic(user_id), "mint.progress", {"stage": "preparing"})
+                async for line in lines:
+                    if line.startswith("data: "):
+                        assert json.loads(line[6:])["data"] == {"stage": "preparing"}
+                        break
+
+
+@pytest.mark.asyncio
+async def test_streams_close_once_token_is_revoked(db_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(database, "SessionLocal", async_sessionmaker(db_session.bind, class_=AsyncSession))
+    monkeypatch.setattr(settings, "EVENTS_HEARTBEAT_SECONDS", 0.05)
+    user_id = uuid4()
+    token = create_access_token({"sub": str(user_id)})
+    payload = verify_access_token(token)
+    revocation_list.reset()
+    try:
+        messages = sse_messages([user_topic(str(user_id))], payload["exp"], 0.05, RevocationWatch(payload, 0.05))
+        assert (await messages.__anext__()).startswith("retry: 3000")
+        assert await messages.__anext__() == ": ping\n\n"
+
+        async with _serve(db_session) as port:
+            async with websockets.connect(
+                f"ws://127.0.0.1:{port}/api/v1/events/ws",
+                additional_headers={"Authorization": f"Bearer {token}"},
+            ) as ws:
+                assert json.loads(await asyncio.wait_for(ws.recv(), 5)) == {"type": "ping"}
+                # 全部登出：提高用户水位线
+                await revocation_list.revoke_user(db_session, user_id)
+                await db_session.commit()
+                # 撤销前已排队的心跳之后，下一次复查即推送 token.revoked
+                received = json.loads(await asyncio.wait_for(ws.recv(), 5))
+                if received == {"type": "ping"}:
+                    received = json.loads(await asyncio.wait_for(ws.recv(), 5))
+                assert received == {"type": "token.revoked"}
+                with pytest.raises(websockets.exceptions.ConnectionClosed) as closed:
+                    await asyncio.wait_for(ws.recv(), 5)
+                assert closed.value.rcvd.code == 1008
+
+        rest = [m async for m in messages]
+        assert rest[-1].startswith("event: token.revoked")
+    finally:
+        revocation_list.reset()
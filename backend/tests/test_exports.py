@@ -0,0 +1,204 @@
+"""流式导出接口测试。"""
+import csv
+import gzip
+import io
+import json
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.exports import ExportStreamingResponse
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.asset import Asset, AssetStatus, AssetType, LegalStatus, MintRecord
+from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+from app.models.ownership import NFTTransferRecord, TransferStatus, TransferType
+from app.models.user import User
+from app.services.export_service import ExportFormat, ExportService, encode_csv_batch
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    # 每批 2 行，让少量数据也经过多个分块
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+
+async def _seed(db: AsyncSession):
+    now = datetime.now(timezone.utc)
+    user = User(id=uuid4(), email="export@example.com", username="export", hashed_password="x")
+    ours = Enterprise(id=uuid4(), name="Ours")
+    theirs = Enterprise(id=uuid4(), name="Theirs")
+    member = EnterpriseMember(id=uuid4(), enterprise_id=ours.id, user_id=user.id, role=MemberRole.OWNER)
+    assets = [
+        Asset(
+            id=uuid4(),
+            enterprise_id=ours.id,
+            name="=HYPERLINK(\"x\")" if index == 0 else f"资产 {index}",
+            type=AssetType.PATENT,
+            description="d",
+            creator_name="c",
+            inventors=["甲", "乙"],
+            creation_date=date(2024, 1, 1),
+            legal_status=LegalStatus.GRANTED,
+            status=AssetStatus.MINTED if index % 2 else AssetStatus.DRAFT,
+            created_at=now - timedelta(minutes=index),
+        )
+        for index in range(5)
+    ]
+    other_asset = Asset(
+        id=uuid4(), enterprise_id=theirs.id, name="theirs", type=AssetType.PATENT, description="d",
+        creator_name="c", inventors=["c"], creation_date=date(2024, 1, 1), legal_status=LegalStatus.GRANTED,
+    )
+    mint_records = [
+        MintRecord(asset_id=assets[1].id, operation="MINT", status="SUCCESS", token_id=1),
+        MintRecord(asset_id=assets[3].id, operation="MINT", status="FAILED", error_message="gas"),
+        MintRecord(asset_id=other_asset.id, operation="MINT", status="SUCCESS", token_id=2),
+    ]
+    transfers = [
+        NFTTransferRecord(
+            token_id=token_id,
+            contract_address="0x" + "0" * 40,
+            transfer_type=TransferType.TRANSFER,
+            from_address="0x" + "1" * 40,
+            from_enterprise_id=from_id,
+            to_address="0x" + "2" * 40,
+            to_enterprise_id=to_id,
+            status=TransferStatus.CONFIRMED,
+        )
+        for token_id, from_id, to_id in [
+            (1, ours.id, theirs.id),
+            (3, theirs.id, ours.id),
+            (2, theirs.id, None),
+        ]
+    ]
+    db.add_all([user, ours, theirs, member, *assets, other_asset, *mint_records, *transfers])
+    await db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    return headers, ours, theirs, assets
+
+
+@pytest.mark.asyncio
+async def test_export_assets_csv_streams_every_row(client, db_session: AsyncSession):
+    headers, ours, _, assets = await _seed(db_session)
+
+    response = await client.get("/api/v1/exports/assets", params={"enterprise_id": str(ours.id)}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="assets-')
+    assert "content-length" not in response.headers
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [str(asset.id) for asset in assets]
+    assert rows[0]["name"] == "'=HYPERLINK(\"x\")"
+    assert rows[1]["status"] == "MINTED"
+    assert json.loads(rows[1]["inventors"]) == ["甲", "乙"]
+
+    response = await client.get(
+        "/api/v1/exports/assets",
+        params={"enterprise_id": str(ours.id), "asset_status": "MINTED", "format": "ndjson"},
+        headers=headers,
+    )
+    lines = response.text.splitlines()
+    assert len(lines) == 2
+    assert {json.loads(line)["id"] for line in lines} == {str(assets[1].id), str(assets[3].id)}
+
+
+@pytest.mark.asyncio
+async def test_export_transfers_ndjson_gzip(client, db_session: AsyncSession):
+    headers, ours, _, _ = await _seed(db_session)
+
+    response = await client.get(
+        "/api/v1/exports/transfers",
+        params={"enterprise_id": str(ours.id), "format": "ndjson", "gzip": "true"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.ndjson.gz"')
+
+    records = [json.loads(line) for line in gzip.decompress(response.content).decode().splitlines()]
+    assert sorted(record["token_id"] for record in records) == [1, 3]
+    assert records[0]["transfer_type"] == "TRANSFER"
+    assert records[0]["timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_export_mint_history_and_access(client, db_session: AsyncSession):
+    headers, ours, theirs, assets = await _seed(db_session)
+
+    response = await client.get(
+        "/api/v1/exports/mint-history",
+        params={"enterprise_id": str(ours.id), "record_status": "failed"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert (rows[0]["asset_id"], rows[0]["error_message"]) == (str(assets[3].id), "gas")
+
+    response = await client.get("/api/v1/exports/mint-history", params={"enterprise_id": str(theirs.id)}, headers=headers)
+    assert response.status_code == 403
+    response = await client.get("/api/v1/exports/assets", params={"enterprise_id": str(uuid4())}, headers=headers)
+    assert response.status_code == 404
+    response = await client.get("/api/v1/exports/assets", params={"enterprise_id": str(ours.id), "format": "xml"}, headers=headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_service_yields_one_chunk_per_batch(db_session: AsyncSession):
+    _, ours, _, _ = await _seed(db_session)
+    opened = []
+
+    def factory() -> AsyncSession:
+        session = AsyncSession(db_session.bind, expire_on_commit=False)
+        opened.append(session)
+        return session
+
+    service = ExportService(factory, batch_size=1)
+
+    export = service.enterprise_transfers_query(ours.id)
+    chunks = [chunk async for chunk in await service.open(export, ExportFormat.CSV)]
+    # 表头加每批一个分块
+    assert len(chunks) == 3
+    assert chunks[0] == b"id,token_id,contract_address,transfer_type,from_address,from_enterprise_id," \
+        b"from_enterprise_name,to_address,to_enterprise_id,to_enterprise_name,tx_hash,block_number,timestamp,status,remarks\n"
+
+    compressed = [chunk async for chunk in await service.open(export, ExportFormat.NDJSON, compress=True)]
+    assert len(gzip.decompress(b"".join(compressed)).splitlines()) == 2
+
+    # 每次导出打开自己的会话，分块读完即关闭
+    assert len(opened) == 2
+    assert all(not session.in_transaction() for session in opened)
+
+    assert encode_csv_batch([["a,b", None, 3, True]]) == b'"a,b",,3,True\n'
+
+
+@pytest.mark.asyncio
+async def test_export_session_closed_when_response_fails_before_first_chunk(db_session: AsyncSession):
+    _, ours, _, _ = await _seed(db_session)
+    opened = []
+
+    def factory() -> AsyncSession:
+        session = AsyncSession(db_session.bind, expire_on_commit=False)
+        opened.append(session)
+        return session
+
+    service = ExportService(factory)
+    chunks = await service.open(service.enterprise_transfers_query(ours.id), ExportFormat.CSV)
+    assert opened[0].in_transaction()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        # 客户端在响应头发出时已断开，分块生成器从未开始迭代
+        raise OSError("connection reset")
+
+    response = ExportStreamingResponse(chunks, media_type="text/csv")
+    with pytest.raises(Exception):
+        await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+
+    assert not opened[0].in_transaction()
@@ -1,5 +1,10 @@
+from uuid import uuid4
+
 import pytest
 
+from app.core.security import create_access_token
+from app.models.user import User
+
 
 @pytest.mark.anyio
 async def test_health_check(client):
@@ -9,3 +14,23 @@ async def test_health_check(client):
     data = response.json()
     assert data["status"] == "healthy"
     assert "version" in data
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/health/maintenance", "/health/events", "/health/cache"])
+async def test_operational_stats_require_superuser(client, db_session, path):
+    """Scheduler, push and cache stats expose host names and error text: superusers only."""
+    user = User(id=uuid4(), email="health-user@example.com", username="health_user", hashed_password="x")
+    admin = User(
+        id=uuid4(), email="health-admin@example.com", username="health_admin",
+        hashed_password="x", is_superuser=True,
+    )
+    db_session.add_all([user, admin])
+    await db_session.commit()
+
+    def headers(u):
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(u.id)})}"}
+
+    assert (await client.get(path)).status_code == 401
+    assert (await client.get(path, headers=headers(user))).status_code == 403
+    assert (await client.get(path, headers=headers(admin))).status_code == 200
@@ -0,0 +1,151 @@
+"""HTTP 条件请求（ETag / If-None-Match）测试。"""
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.core.http_cache import etag_matches, make_etag
+from app.core.security import create_access_token
+from app.models.asset import Asset, AssetStatus, AssetType, Attachment, AttachmentUploadStatus, LegalStatus
+from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+from app.models.ownership import NFTTransferRecord, TransferStatus, TransferType
+from app.models.user import User
+
+CONTRACT = "0x" + "c" * 40
+
+
+def build_auth_headers(user_id) -> dict[str, str]:
+    token = create_access_token({"sub": str(user_id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _request(if_none_match: str) -> Request:
+    return Request({"type": "http", "headers": [(b"if-none-match", if_none_match.encode())]})
+
+
+async def _seed(db: AsyncSession):
+    user = User(id=uuid4(), email="etag@example.com", username="etag", hashed_password="x")
+    outsider = User(id=uuid4(), email="etag-outsider@example.com", username="etag_outsider", hashed_password="x")
+    enterprise = Enterprise(id=uuid4(), name="ETag Enterprise")
+    member = EnterpriseMember(id=uuid4(), enterprise_id=enterprise.id, user_id=user.id, role=MemberRole.OWNER)
+    asset = Asset(
+        id=uuid4(),
+        enterprise_id=enterprise.id,
+        creator_user_id=user.id,
+        name="ETag asset",
+        type=AssetType.PATENT,
+        description="ETag asset description",
+        creator_name="Creator",
+        inventors=["甲"],
+        creation_date=date(2024, 1, 1),
+        legal_status=LegalStatus.GRANTED,
+        asset_metadata={},
+        status=AssetStatus.MINTED,
+        nft_token_id="7",
+        nft_contract_address=CONTRACT,
+        owner_address="0x" + "a" * 40,
+        metadata_uri="ipfs://QmMetadata",
+    )
+    attachment = Attachment(
+        id=uuid4(),
+        asset_id=asset.id,
+        file_name="doc.pdf",
+        file_type="application/pdf",
+        file_size=10,
+        upload_status=AttachmentUploadStatus.PENDING_UPLOAD,
+        is_primary=True,
+    )
+    transfer = NFTTransferRecord(
+        id=uuid4(),
+        token_id=7,
+        contract_address=CONTRACT,
+        transfer_type=TransferType.MINT,
+        from_address="0x" + "0" * 40,
+        to_address="0x" + "a" * 40,
+        status=TransferStatus.PENDING,
+    )
+    db.add_all([user, outsider, enterprise, member, asset, attachment, transfer])
+    await db.commit()
+    return user, outsider, asset, attachment, transfer
+
+
+def test_etag_matching_uses_weak_comparison():
+    etag = make_etag("asset", 1)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert make_etag("asset", 1) == etag != make_etag("asset", 2)
+    assert etag_matches(_request(etag), etag)
+    assert etag_matches(_request(f'"other", W/{etag}'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('"other"'), etag)
+
+
+@pytest.mark.asyncio
+async def test_asset_detail_revalidates_with_etag(client: AsyncClient, db_session: AsyncSession):
+    user, outsider, asset, attachment, _ = await _seed(db_session)
+    url = f"/api/v1/assets/{asset.id}"
+    headers = build_auth_headers(user.id)
+
+    response = await client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, no-cache"
+    etag = response.headers["etag"]
+
+    response = await client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    # 非成员即使持有 ETag 也不能得到 304
+    response = await client.get(url, headers={**build_auth_headers(outsider.id), "If-None-Match": etag})
+    assert response.status_code == 403
+
+    # 后台上传完成只改附件行，资产的 ETag 也随之变化
+    await db_session.execute(
+        update(Attachment)
+        .where(Attachment.id == attachment.id)
+        .values(ipfs_cid="QmUploaded", upload_status=AttachmentUploadStatus.UPLOADED)
+    )
+    await db_session.commit()
+    response = await client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["attachments"][0]["ipfs_cid"] == "QmUploaded"
+
+
+@pytest.mark.asyncio
+async def test_ownership_detail_and_history_revalidate(client: AsyncClient, db_session: AsyncSession):
+    user, _, asset, _, transfer = await _seed(db_session)
+    headers = build_auth_headers(user.id)
+
+    response = await client.get("/api/v1/ownership/assets/7", headers=headers)
+    assert response.status_code == 200
+    detail_etag = response.headers["etag"]
+    response = await client.get("/api/v1/ownership/assets/7", headers={**headers, "If-None-Match": detail_etag})
+    assert response.status_code == 304
+
+    url = "/api/v1/ownership/assets/7/history"
+    response = await client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["data"]["items"][0]["status"] == TransferStatus.PENDING.value
+    history_etag = response.headers["etag"]
+    response = await client.get(url, headers={**headers, "If-None-Match": history_etag})
+    assert response.status_code == 304
+
+    # 另一页的 ETag 不同
+    response = await client.get(url, params={"page": 2}, headers={**headers, "If-None-Match": history_etag})
+    assert response.status_code == 200
+
+    # 转移确认后历史的 ETag 变化
+    await db_session.execute(
+        update(NFTTransferRecord)
+        .where(NFTTransferRecord.id == transfer.id)
+        .values(status=TransferStatus.CONFIRMED, confirmed_at=datetime.now(timezone.utc))
+    )
+    await db_session.commit()
+    response = await client.get(url, headers={**headers, "If-None-Match": history_etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["items"][0]["status"] == TransferStatus.CONFIRMED.value
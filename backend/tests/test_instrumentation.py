@@ -0,0 +1,132 @@
+"""请求级性能埋点测试：SQL 计数、Server-Timing、慢查询日志与查询预算。"""
+import asyncio
+import logging
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.instrumentation import (
+    RPC,
+    UPLOAD,
+    QueryBudgetExceeded,
+    get_request_metrics,
+    instrumented,
+    query_budget,
+    track_metrics,
+)
+from app.core.middleware import TimingMiddleware
+from app.models.user import User
+
+
+@instrumented(RPC)
+async def _fake_rpc():
+    await asyncio.sleep(0.01)
+    return "0xabc"
+
+
+@instrumented(UPLOAD)
+def _fake_upload():
+    return "cid"
+
+
+@pytest.mark.asyncio
+async def test_query_budget_counts_statements(db_session):
+    with query_budget(3) as metrics:
+        await db_session.execute(text("SELECT 1"))
+        await db_session.execute(select(User))
+    assert metrics.db_queries == 2
+    assert metrics.db_time_ms > 0
+
+    with pytest.raises(QueryBudgetExceeded, match="超过预算 1 条"):
+        with query_budget(1):
+            for _ in range(3):
+                await db_session.execute(select(User).where(User.username == "n+1"))
+
+
+@pytest.mark.asyncio
+async def test_external_calls_are_recorded_per_kind():
+    assert get_request_metrics() is None
+    # 不在请求上下文中时装饰器不做任何记录
+    assert await _fake_rpc() == "0xabc"
+
+    with track_metrics() as metrics:
+        await _fake_rpc()
+        await asyncio.to_thread(_fake_upload)
+        await asyncio.to_thread(_fake_upload)
+
+    assert metrics.external_calls == {RPC: 1, UPLOAD: 2}
+    assert metrics.external_time_ms[RPC] >= 10
+    header = metrics.server_timing(12.5)
+    assert header.startswith('db;dur=0.00;desc="0 queries"')
+    assert 'rpc;dur=' in header and 'upload;dur=' in header
+    assert header.endswith("total;dur=12.50")
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header_and_request_log(db_session, caplog):
+    async def handler(request):
+        await db_session.execute(text("SELECT 1"))
+        await db_session.execute(text("SELECT 2"))
+        await _fake_rpc()
+        return PlainTextResponse("ok")
+
+    app = TimingMiddleware(Starlette(routes=[Route("/work", handler)]))
+    caplog.set_level(logging.DEBUG, logger="app.core.middleware")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/work")
+
+    timing = response.headers["Server-Timing"]
+    assert 'desc="2 queries"' in timing
+    assert 'rpc;dur=' in timing and 'desc="1 calls"' in timing
+    record = next(r for r in caplog.records if r.getMessage() == "request_completed")
+    assert record.db_queries == 2
+    assert record.rpc_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_query_count_warning_threshold(db_session, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_QUERY_WARN_THRESHOLD", 2)
+
+    async def chatty(request):
+        for _ in range(3):
+            await db_session.execute(text("SELECT 1"))
+        return PlainTextResponse("ok")
+
+    app = TimingMiddleware(Starlette(routes=[Route("/chatty", chatty)]))
+    caplog.set_level(logging.WARNING, logger="app.core.middleware")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/chatty")
+
+    assert any(r.getMessage() == "request_query_count_exceeded" for r in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log_includes_parameters(db_session, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.000001)
+    caplog.set_level(logging.WARNING, logger="app.sql.slow")
+
+    await db_session.execute(select(User).where(User.username == "slow-user"))
+
+    record = next(r for r in caplog.records if r.getMessage() == "slow_query")
+    assert "FROM users" in record.statement
+    assert "slow-user" in record.parameters
+    assert record.duration_ms >= 0
+
+
+@pytest.mark.asyncio
+async def test_endpoint_query_budget(client):
+    response = await client.get("/health")
+    assert 'desc="0 queries"' in response.headers["Server-Timing"]
+
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={"email": "budget@example.com", "username": "budget", "password": "Password123!"},
+    )
+    assert response.status_code in (200, 201), response.text
+    queries = int(response.headers["Server-Timing"].split('desc="')[1].split(" ")[0])
+    assert 0 < queries <= 25
@@ -0,0 +1,133 @@
+"""列表接口投影查询测试。"""
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.models.approval import Approval, ApprovalStatus, ApprovalType
+from app.models.asset import Asset, AssetStatus, AssetType, Attachment, LegalStatus
+from app.models.enterprise import Enterprise, EnterpriseMember, MemberRole
+from app.models.user import User
+
+
+def build_auth_headers(user_id: str) -> dict[str, str]:
+    token = create_access_token({"sub": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _asset(enterprise_id, user_id, name: str, created_at: datetime) -> Asset:
+    return Asset(
+        id=uuid4(),
+        enterprise_id=enterprise_id,
+        creator_user_id=user_id,
+        name=name,
+        type=AssetType.PATENT,
+        description=f"{name} description",
+        creator_name="Creator",
+        inventors=["甲", "乙"],
+        creation_date=date(2024, 1, 1),
+        legal_status=LegalStatus.GRANTED,
+        asset_metadata={"ipc": "G06F"},
+        status=AssetStatus.DRAFT,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_asset_list_returns_projected_rows_with_attachments(
+    client: AsyncClient,
+    db_session: AsyncSession,
+) -> None:
+    user = User(id=uuid4(), email="projection@example.com", username="projection", hashed_password="x")
+    enterprise = Enterprise(id=uuid4(), name="Projection Enterprise")
+    other = Enterprise(id=uuid4(), name="Other Enterprise")
+    member = EnterpriseMember(id=uuid4(), enterprise_id=enterprise.id, user_id=user.id, role=MemberRole.OWNER)
+    now = datetime.now(timezone.utc)
+    assets = [_asset(enterprise.id, user.id, f"Asset {index}", now + timedelta(minutes=index)) for index in range(3)]
+    foreign = _asset(other.id, user.id, "Foreign asset", now)
+    attachments = [
+        Attachment(
+            id=uuid4(),
+            asset_id=assets[2].id,
+            file_name=name,
+            file_type="application/pdf",
+            file_size=100,
+            is_primary=index == 0,
+            uploaded_at=now + timedelta(seconds=index),
+        )
+        for index, name in enumerate(["first.pdf", "second.pdf"])
+    ]
+    db_session.add_all([user, enterprise, other, member, *assets, foreign, *attachments])
+    await db_session.commit()
+
+    response = await client.get(
+        "/api/v1/assets",
+        params={"enterprise_id": str(enterprise.id), "page": 1, "page_size": 2},
+        headers=build_auth_headers(str(user.id)),
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["total"], payload["page"], payload["page_size"], payload["total_pages"]) == (3, 1, 2, 2)
+    assert [item["name"] for item in payload["items"]] == ["Asset 2", "Asset 1"]
+    newest = payload["items"][0]
+    assert newest["id"] == str(assets[2].id)
+    assert newest["type"] == AssetType.PATENT.value
+    assert newest["inventors"] == ["甲", "乙"]
+    assert newest["asset_metadata"] == {"ipc": "G06F"}
+    assert [a["file_name"] for a in newest["attachments"]] == ["first.pdf", "second.pdf"]
+    assert payload["items"][1]["attachments"] == []
+
+    response = await client.get(
+        "/api/v1/assets",
+        params={"enterprise_id": str(enterprise.id), "page": 2, "page_size": 2},
+        headers=build_auth_headers(str(user.id)),
+    )
+    assert [item["name"] for item in response.json()["items"]] == ["Asset 0"]
+
+
+@pytest.mark.asyncio
+async def test_pending_approvals_total_honours_type_filter(
+    client: AsyncClient,
+    db_session: AsyncSession,
+) -> None:
+    user = User(id=uuid4(), email="pending-projection@example.com", username="pending_projection", hashed_password="x")
+    approvals = [
+        Approval(
+            id=uuid4(),
+            type=approval_type,
+            target_id=uuid4(),
+            target_type="asset" if approval_type == ApprovalType.ASSET_SUBMIT else "enterprise",
+            applicant_id=user.id,
+            status=approval_status,
+            changes={"name": "变更"},
+        )
+        for approval_type, approval_status in (
+            (ApprovalType.ASSET_SUBMIT, ApprovalStatus.PENDING),
+            (ApprovalType.ENTERPRISE_CREATE, ApprovalStatus.PENDING),
+            (ApprovalType.ENTERPRISE_CREATE, ApprovalStatus.PENDING),
+            (ApprovalType.ASSET_SUBMIT, ApprovalStatus.APPROVED),
+        )
+    ]
+    db_session.add_all([user, *approvals])
+    await db_session.commit()
+
+    response = await client.get(
+        "/api/v1/approvals/pending",
+        params={"approval_type": ApprovalType.ASSET_SUBMIT.value},
+        headers=build_auth_headers(str(user.id)),
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 1
+    assert [item["id"] for item in data["items"]] == [str(approvals[0].id)]
+    assert data["items"][0]["type"] == ApprovalType.ASSET_SUBMIT.value
+    assert data["items"][0]["changes"] == {"name": "变更"}
+
+    response = await client.get("/api/v1/approvals/pending", headers=build_auth_headers(str(user.id)))
+    assert response.json()["data"]["total"] == 3
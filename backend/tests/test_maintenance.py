@@ -0,0 +1,174 @@
+"""后台维护任务调度器测试。"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.approval import ApprovalNotification
+from app.models.email_verification_token import EmailVerificationToken
+from app.models.job_lock import JobLock
+from app.models.password_reset_token import PasswordResetToken
+from app.models.refresh_token import RefreshToken
+from app.models.token_revocation import RevokedAccessToken
+from app.models.user import User
+from app.repositories.job_lock_repository import JobLockRepository
+from app.services.maintenance_service import MaintenanceJob, MaintenanceScheduler, default_jobs
+
+
+def _session_factory(db_session: AsyncSession):
+    return async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _count(db: AsyncSession, model) -> int:
+    return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+async def _seed(db: AsyncSession) -> None:
+    now = datetime.now(timezone.utc)
+    past, future = now - timedelta(hours=1), now + timedelta(hours=1)
+    user = User(email="maint@example.com", username="maint", hashed_password="x")
+    db.add(user)
+    await db.flush()
+
+    for i in range(5):
+        db.add(RefreshToken(token_hash=f"expired-{i}", user_id=user.id, expires_at=past))
+    db.add(RefreshToken(token_hash="live", user_id=user.id, expires_at=future))
+    db.add(
+        RefreshToken(
+            token_hash="revoked-long-ago",
+            user_id=user.id,
+            expires_at=future,
+            is_revoked=True,
+            revoked_at=now - timedelta(days=3),
+        )
+    )
+    db.add(EmailVerificationToken(token_hash="ev-old", user_id=user.id, expires_at=past))
+    db.add(EmailVerificationToken(token_hash="ev-live", user_id=user.id, expires_at=future))
+    db.add(PasswordResetToken(token_hash="pr-old", user_id=user.id, expires_at=past))
+    db.add(RevokedAccessToken(jti=str(uuid.uuid4()), user_id=user.id, expires_at=past))
+    db.add(RevokedAccessToken(jti=str(uuid.uuid4()), user_id=user.id, expires_at=future))
+    db.add(
+        ApprovalNotification(
+            type="APPROVAL", recipient_id=user.id, title="old", is_read=True, read_at=now - timedelta(days=60)
+        )
+    )
+    db.add(ApprovalNotification(type="APPROVAL", recipient_id=user.id, title="unread"))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_deletes_in_batches_and_records_stats(db_session):
+    await _seed(db_session)
+    scheduler = MaintenanceScheduler(
+        session_factory=_session_factory(db_session), batch_size=2, batch_pause=0, owner="worker-a"
+    )
+
+    assert await scheduler.run_due() == 6 + 1 + 1 + 1 + 1
+
+    assert await _count(db_session, RefreshToken) == 1
+    assert await _count(db_session, EmailVerificationToken) == 1
+    assert await _count(db_session, PasswordResetToken) == 0
+    assert await _count(db_session, RevokedAccessToken) == 1
+    assert await _count(db_session, ApprovalNotification) == 1
+
+    stats = scheduler.get_stats()
+    assert stats["refresh_tokens"]["runs"] == 1
+    assert stats["refresh_tokens"]["last_rows"] == 6
+    assert stats["refresh_tokens"]["last_duration_ms"] > 0
+
+    lock = await db_session.get(JobLock, "refresh_tokens")
+    await db_session.refresh(lock)
+    assert lock.locked_until is None
+    assert lock.last_rows == 6
+
+    # 未到间隔时不会重复运行
+    assert await scheduler.run_due() == 0
+
+
+@pytest.mark.asyncio
+async def test_only_one_worker_runs_a_job(db_session):
+    factory = _session_factory(db_session)
+    calls = []
+
+    async def delete_batch(db, limit):
+        calls.append(limit)
+        return 0
+
+    job = MaintenanceJob("demo", delete_batch, interval=3600)
+    worker_a = MaintenanceScheduler(session_factory=factory, jobs=[job], owner="worker-a")
+    worker_b = MaintenanceScheduler(session_factory=factory, jobs=[job], owner="worker-b")
+
+    async with factory() as db:
+        assert await JobLockRepository(db).try_acquire("demo", "worker-a", ttl=60)
+
+    # worker-a 持有租约期间，worker-b 跳过
+    assert await worker_b.run_job(job) is None
+    assert worker_b.get_stats()["demo"]["skipped"] == 1
+
+    # worker-a 完成后，间隔内 worker-b 依旧跳过
+    assert await worker_a.run_job(job) == 0
+    assert await worker_b.run_job(job) is None
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_recompute_job_runs_once_per_run(db_session):
+    calls = []
+
+    async def recompute(db, limit):
+        calls.append(limit)
+        return 5
+
+    job = MaintenanceJob("recompute", recompute, interval=0, batched=False)
+    scheduler = MaintenanceScheduler(
+        session_factory=_session_factory(db_session), jobs=[job], batch_size=2, batch_pause=0
+    )
+
+    # 写入行数超过批大小也不会重复整次重算
+    assert await scheduler.run_job(job) == 5
+    assert len(calls) == 1
+    assert {job.name: job.batched for job in default_jobs()}["approval_counters"] is False
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_can_be_taken_over(db_session):
+    factory = _session_factory(db_session)
+    async with factory() as db:
+        locks = JobLockRepository(db)
+        assert await locks.try_acquire("demo", "worker-a", ttl=-1)
+        assert await locks.try_acquire("demo", "worker-b", ttl=60)
+        assert not await locks.try_acquire("demo", "worker-a", ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_failed_job_releases_lock_and_records_error(db_session):
+    factory = _session_factory(db_session)
+
+    async def broken(db, limit):
+        raise RuntimeError("boom")
+
+    scheduler = MaintenanceScheduler(session_factory=factory, jobs=[MaintenanceJob("broken", broken, interval=0)])
+    assert await scheduler.run_job(scheduler.jobs[0]) == 0
+    stats = scheduler.get_stats()["broken"]
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "boom"
+
+    lock = await db_session.get(JobLock, "broken")
+    assert lock.locked_until is None
+    assert lock.last_error == "boom"
+
+
+def test_default_jobs_cover_all_cleanup_tables():
+    assert {job.name for job in default_jobs()} == {
+        "refresh_tokens",
+        "email_verification_tokens",
+        "password_reset_tokens",
+        "revoked_access_tokens",
+        "read_notifications",
+        "sent_emails",
+        "upload_spool_files",
+        "approval_counters",
+        "dashboard_rollups",
+    }
@@ -0,0 +1,145 @@
+"""Prometheus 指标测试：请求直方图、外部调用、限流拒绝、连接池与多进程汇总。"""
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.instrumentation import RPC, instrumented
+from app.core.metrics import InstrumentedAsyncQueuePool, observe_mint_stage
+from app.core.middleware import TimingMiddleware
+from app.core.rate_limiter import RateLimiter, RateLimitMiddleware, RateLimitPolicyRegistry
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@instrumented(RPC)
+def get_block_number():
+    return 42
+
+
+@pytest.mark.asyncio
+async def test_request_histogram_uses_route_template():
+    async def show(request):
+        return PlainTextResponse(request.path_params["item_id"])
+
+    app = TimingMiddleware(Starlette(routes=[Route("/items/{item_id}", show)]))
+    labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+    before = _sample("http_request_duration_seconds_count", **labels)
+    unmatched = _sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/nowhere/3")
+
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 2
+    assert (
+        _sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404")
+        == unmatched + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_text_format(client):
+    await client.get("/health")
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert "db_pool_checkouts_total" in response.text
+
+
+def test_external_calls_are_labelled_by_operation():
+    labels = {"kind": RPC, "operation": "get_block_number"}
+    before = _sample("external_call_duration_seconds_count", **labels)
+    assert get_block_number() == 42
+    assert _sample("external_call_duration_seconds_count", **labels) == before + 1
+
+
+def test_mint_stage_returns_next_start():
+    before = _sample("mint_stage_duration_seconds_count", stage="preparing", status="success")
+    started = time.perf_counter()
+    assert observe_mint_stage("preparing", "success", started) >= started
+    assert _sample("mint_stage_duration_seconds_count", stage="preparing", status="success") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_rejections_are_counted():
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    limiter = RateLimiter(requests_per_minute=1, requests_per_hour=100, name="metrics_test")
+    app = RateLimitMiddleware(Starlette(routes=[Route("/", ok)]), registry=RateLimitPolicyRegistry(limiter))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        statuses = [(await client.get("/")).status_code for _ in range(3)]
+
+    assert statuses == [200, 429, 429]
+    assert _sample("rate_limit_rejections_total", policy="metrics_test") == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_checkouts_and_wait_time(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/pool.db", poolclass=InstrumentedAsyncQueuePool)
+    checkouts = _sample("db_pool_checkouts_total")
+    waits = _sample("db_pool_wait_seconds_count")
+    try:
+        for _ in range(3):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    assert _sample("db_pool_checkouts_total") == checkouts + 3
+    assert _sample("db_pool_wait_seconds_count") == waits + 3
+
+
+def test_multiprocess_mode_aggregates_workers(tmp_path):
+    script = textwrap.dedent(
+        """
+        import multiprocessing
+
+        def worker():
+            from app.core.metrics import RATE_LIMIT_REJECTIONS
+            RATE_LIMIT_REJECTIONS.labels("auth").inc(5)
+
+        if __name__ == "__main__":
+            ctx = multiprocessing.get_context("spawn")
+            processes = [ctx.Process(target=worker) for _ in range(2)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            from app.core.metrics import render_metrics
+            body, _ = render_metrics()
+            print(body.decode())
+        """
+    )
+    path = tmp_path / "workers.py"
+    path.write_text(script)
+    multiproc_dir = tmp_path / "prom"
+    multiproc_dir.mkdir()
+    result = subprocess.run(
+        [sys.executable, str(path)],
+        cwd=BACKEND_DIR,
+        env={"PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir), "PYTHONPATH": str(BACKEND_DIR), "PATH": ""},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert 'rate_limit_rejections_total{policy="auth"} 10.0' in result.stdout
@@ -0,0 +1,109 @@
+"""纯 ASGI 中间件测试。"""
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.middleware import RequestIdMiddleware, TimingMiddleware, get_request_id
+from app.core.rate_limiter import (
+    RateLimiter,
+    RateLimitMiddleware,
+    RateLimitPolicyRegistry,
+)
+
+
+async def _echo_request_id(request):
+    return PlainTextResponse(f"{request.state.request_id}|{get_request_id()}")
+
+
+async def _stream(request):
+    async def chunks():
+        for i in range(3):
+            yield f"chunk-{i};".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def _build_app(per_minute: int = 100):
+    app = Starlette(routes=[Route("/echo", _echo_request_id), Route("/stream", _stream)])
+    registry = RateLimitPolicyRegistry(RateLimiter(requests_per_minute=per_minute))
+    return RequestIdMiddleware(TimingMiddleware(RateLimitMiddleware(app, registry=registry)))
+
+
+async def _client(app):
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_generated_and_exposed():
+    async with await _client(_build_app()) as client:
+        response = await client.get("/echo")
+
+    request_id = response.headers["X-Request-ID"]
+    assert len(request_id) == 32
+    assert response.text == f"{request_id}|{request_id}"
+    assert response.headers["X-Response-Time"].endswith("ms")
+    assert get_request_id() is None
+
+
+@pytest.mark.asyncio
+async def test_request_id_echoes_safe_incoming_header_only():
+    async with await _client(_build_app()) as client:
+        kept = await client.get("/echo", headers={"X-Request-ID": "trace-123"})
+        replaced = await client.get("/echo", headers={"X-Request-ID": "bad id\r\nx"})
+
+    assert kept.headers["X-Request-ID"] == "trace-123"
+    assert replaced.headers["X-Request-ID"] != "bad id\r\nx"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_headers_and_429():
+    async with await _client(_build_app(per_minute=1)) as client:
+        ok = await client.get("/echo")
+        blocked = await client.get("/echo")
+
+    assert ok.headers["X-RateLimit-Remaining-Minute"] == "0"
+    assert blocked.status_code == 429
+    assert blocked.json()["detail"]["code"] == "RATE_LIMIT_EXCEEDED"
+    assert "Retry-After" in blocked.headers
+    assert "X-Request-ID" in blocked.headers
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_not_buffered():
+    app = _build_app()
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # 客户端保持连接
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+
+    bodies = [m["body"] for m in messages if m["type"] == "http.response.body" and m.get("body")]
+    assert bodies == [b"chunk-0;", b"chunk-1;", b"chunk-2;"]
+    start = messages[0]
+    header_names = {name.lower() for name, _ in start["headers"]}
+    assert {b"x-request-id", b"x-response-time", b"x-ratelimit-remaining-minute"} <= header_names
@@ -0,0 +1,83 @@
+"""密码哈希执行器测试。"""
+import asyncio
+
+import bcrypt
+import pytest
+from sqlalchemy import select
+
+from app.core import password_hasher as password_hasher_module
+from app.core.password_hasher import PasswordHasher, PasswordHasherBusyError
+from app.core.security import (
+    get_password_hash,
+    password_needs_rehash,
+    verify_and_update_password,
+    verify_password,
+)
+from app.models.user import User
+from app.schemas.auth import UserLoginRequest
+from app.services.auth_service import AuthService
+
+
+def _legacy_bcrypt_hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)).decode()
+
+
+def test_verify_and_update_rehashes_legacy_bcrypt():
+    legacy = _legacy_bcrypt_hash("Secret123!")
+
+    ok, new_hash = verify_and_update_password("Secret123!", legacy)
+
+    assert ok
+    assert new_hash.startswith("$pbkdf2-sha256$")
+    assert verify_password("Secret123!", new_hash)
+    assert not password_needs_rehash(new_hash)
+    assert verify_and_update_password("wrong", legacy) == (False, None)
+    assert verify_and_update_password("Secret123!", new_hash) == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_process_pool_round_trip():
+    hasher = PasswordHasher(mode="process", max_workers=1)
+    try:
+        hashed = await hasher.hash("Secret123!")
+        assert await hasher.verify("Secret123!", hashed)
+        assert not await hasher.verify("nope", hashed)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hasher_rejects_when_queue_is_full():
+    hasher = PasswordHasher(mode="thread", max_workers=1, max_pending=2)
+    hashed = get_password_hash("Secret123!")
+    try:
+        results = await asyncio.gather(
+            *(hasher.verify("Secret123!", hashed) for _ in range(4)),
+            return_exceptions=True,
+        )
+    finally:
+        hasher.shutdown()
+
+    assert results.count(True) == 2
+    busy = [r for r in results if isinstance(r, PasswordHasherBusyError)]
+    assert len(busy) == 2
+    assert busy[0].status_code == 503
+    assert hasher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_legacy_hash(db_session, monkeypatch):
+    monkeypatch.setattr(password_hasher_module.password_hasher, "mode", "inline")
+    user = User(
+        email="legacy@example.com",
+        username="legacy",
+        hashed_password=_legacy_bcrypt_hash("Secret123!"),
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    await AuthService(db_session).login(UserLoginRequest(email="legacy@example.com", password="Secret123!"))
+
+    stored = (await db_session.execute(select(User.hashed_password).where(User.id == user.id))).scalar_one()
+    assert stored.startswith("$pbkdf2-sha256$")
+    assert verify_password("Secret123!", stored)
@@ -0,0 +1,123 @@
+"""限流存储后端与路由策略测试。"""
+import multiprocessing
+import time
+
+import pytest
+
+from app.core.rate_limit_store import (
+    MemoryRateLimitStore,
+    RedisRateLimitStore,
+    SharedMemoryRateLimitStore,
+    create_rate_limit_store,
+)
+from app.core.rate_limiter import (
+    RateLimiter,
+    RateLimitPolicy,
+    RateLimitPolicyRegistry,
+    policy_registry,
+)
+
+
+def _hammer_shared_store(path: str, hits: int, queue) -> None:
+    store = SharedMemoryRateLimitStore(path=path, slots=1024, shards=8)
+    limiter = RateLimiter(requests_per_minute=50, requests_per_hour=1000, store=store)
+    queue.put(sum(1 for _ in range(hits) if limiter.check("203.0.113.7").allowed))
+
+
+def test_policy_registry_uses_longest_prefix():
+    default = RateLimiter(name="default")
+    registry = RateLimitPolicyRegistry.from_policies(
+        default,
+        [
+            RateLimitPolicy("auth", "/api/v1/auth", 10, 100),
+            RateLimitPolicy("auth_login", "/api/v1/auth/login", 5, 50),
+        ],
+    )
+
+    assert registry.resolve("/api/v1/auth/login").requests_per_minute == 5
+    assert registry.resolve("/api/v1/auth/refresh").requests_per_minute == 10
+    assert registry.resolve("/api/v1/assets") is default
+
+
+def test_default_registry_keeps_auth_policy():
+    limiter = policy_registry.resolve("/api/v1/auth/login")
+    assert (limiter.requests_per_minute, limiter.requests_per_hour) == (120, 1200)
+
+
+def test_shared_store_namespaces_policies():
+    store = MemoryRateLimitStore()
+    auth = RateLimiter(requests_per_minute=1, store=store, name="auth")
+    default = RateLimiter(requests_per_minute=1, store=store, name="default")
+
+    assert auth.check("198.51.100.1").allowed
+    assert not auth.check("198.51.100.1").allowed
+    assert default.check("198.51.100.1").allowed
+
+
+def test_create_rate_limit_store_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        create_rate_limit_store("memcached")
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "ratelimit.shm")
+    first = RateLimiter(requests_per_minute=3, store=SharedMemoryRateLimitStore(path=path, slots=256, shards=4))
+    second = RateLimiter(requests_per_minute=3, store=SharedMemoryRateLimitStore(path=path, slots=256, shards=4))
+
+    assert first.check("192.0.2.1").allowed
+    assert second.check("192.0.2.1").allowed
+    decision = first.check("192.0.2.1")
+    assert decision.allowed and decision.minute_remaining == 0
+    assert not second.check("192.0.2.1").allowed
+    assert (await second.get_remaining("192.0.2.1"))["minute_remaining"] == 0
+    await first.store.close()
+    await second.store.close()
+
+
+def test_shared_memory_store_evicts_when_full(tmp_path):
+    store = SharedMemoryRateLimitStore(path=str(tmp_path / "small.shm"), slots=4, shards=1)
+    limiter = RateLimiter(requests_per_minute=1, store=store)
+    now = time.time()
+
+    for i in range(10):
+        assert limiter.check(f"192.0.2.{i}", current_time=now + i).allowed
+    assert len(store) <= 4
+
+
+def test_shared_memory_store_enforces_limit_across_processes(tmp_path):
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("需要 fork 启动方式")
+    ctx = multiprocessing.get_context("fork")
+    path = str(tmp_path / "multi.shm")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_hammer_shared_store, args=(path, 40, queue)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert sum(queue.get(timeout=5) for _ in workers) == 50
+
+
+@pytest.mark.asyncio
+async def test_redis_store_runs_gcra_script_atomically():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis()
+    limiter = RateLimiter(requests_per_minute=2, requests_per_hour=100, store=RedisRateLimitStore(client=client))
+    now = 1_000_000.0
+
+    first = await limiter.acquire("192.0.2.50", current_time=now)
+    second = await limiter.acquire("192.0.2.50", current_time=now)
+    blocked = await limiter.acquire("192.0.2.50", current_time=now)
+
+    assert first.allowed and first.minute_remaining == 1 and first.hour_remaining == 99
+    assert second.allowed and second.minute_remaining == 0
+    assert not blocked.allowed
+    assert blocked.retry_after == 30
+    assert await client.pttl("ratelimit:default:192.0.2.50") > 0
+
+    refilled = await limiter.acquire("192.0.2.50", current_time=now + 30)
+    assert refilled.allowed
+    await client.aclose()
@@ -169,6 +169,56 @@ class TestRateLimiter:
         remaining = await limiter.get_remaining(client_ip)
         assert remaining["minute_remaining"] == 7
 
+    def test_rate_limiter_check_returns_remaining_and_refills(self):
+        """Test GCRA decision carries remaining quota and refills over time."""
+        from app.core.rate_limiter import RateLimiter
+        
+        limiter = RateLimiter(requests_per_minute=6, requests_per_hour=100)
+        now = 1_000_000.0
+        
+        decisions = [limiter.check("10.0.0.1", current_time=now) for _ in range(6)]
+        assert [d.minute_remaining for d in decisions] == [5, 4, 3, 2, 1, 0]
+        assert decisions[0].hour_remaining == 99
+        
+        blocked = limiter.check("10.0.0.1", current_time=now)
+        assert not blocked.allowed
+        assert blocked.retry_after == 10
+        
+        # 一个发射间隔（10 秒）后恰好恢复一个额度
+        refilled = limiter.check("10.0.0.1", current_time=now + 10)
+        assert refilled.allowed
+        assert refilled.minute_remaining == 0
+    
+    def test_rate_limiter_hour_window(self):
+        """Test that the hour window is enforced independently."""
+        from app.core.rate_limiter import RateLimiter
+        
+        limiter = RateLimiter(requests_per_minute=100, requests_per_hour=3)
+        now = 1_000_000.0
+        for _ in range(3):
+            assert limiter.check("10.0.0.2", current_time=now).allowed
+        
+        decision = limiter.check("10.0.0.2", current_time=now)
+        assert not decision.allowed
+        assert decision.message == "每小时请求过多"
+        assert decision.retry_after == 1200
+    
+    def test_rate_limiter_constant_memory_for_many_ips(self):
+        """Test 100k distinct IPs keep one entry each and expire via cleanup."""
+        from app.core.rate_limiter import RateLimiter
+        
+        limiter = RateLimiter(requests_per_minute=10, requests_per_hour=100, cleanup_interval=60)
+        now = time.time()
+        for i in range(100_000):
+            assert limiter.check(f"ip-{i}", current_time=now).allowed
+        assert len(limiter) == 100_000
+        
+        # 所有窗口过期后，每个分片在下一次命中时清理自身
+        later = now + 3600 + 61
+        for i in range(100_000, 100_000 + 2000):
+            limiter.check(f"ip-{i}", current_time=later)
+        assert len(limiter) == 2000
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+"""快速启动：延迟导入、结构版本校验、连接池预热与就绪检查测试。"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.blockchain import load_contract_artifact
+from app.core.database import SchemaVersionError, get_migration_heads, verify_schema_revision, warm_up_pool
+from app.core.readiness import DEGRADED, FAILED, OK, ReadinessState, warm_up
+from app.core.wallet import verify_wallet_signature
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_importing_app_does_not_load_heavy_clients():
+    code = (
+        "import sys, app.main; "
+        "print([m for m in ('web3', 'eth_account', 'ipfshttpclient') if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_verify_wallet_signature():
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+
+    account = Account.create()
+    signature = Account.sign_message(encode_defunct(text="login"), account.key).signature.hex()
+
+    assert verify_wallet_signature(account.address, signature, "login")
+    assert verify_wallet_signature(account.address.lower(), signature, "login")
+    assert not verify_wallet_signature(account.address, signature, "other")
+    assert not verify_wallet_signature(account.address, "0xdead", "login")
+
+
+def test_contract_artifact_is_parsed_once(tmp_path):
+    path = tmp_path / "IPNFT.json"
+    path.write_text(json.dumps({"abi": [{"type": "function"}], "bytecode": "0x00"}))
+
+    abi, bytecode = load_contract_artifact(str(path))
+    assert bytecode == "0x00"
+    path.write_text(json.dumps({"abi": [], "bytecode": "0x01"}))
+    assert load_contract_artifact(str(path))[0] is abi
+
+    assert load_contract_artifact(str(tmp_path / "missing.json")) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_schema_revision_check():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        with pytest.raises(SchemaVersionError):
+            await verify_schema_revision(engine)
+
+        (head,) = get_migration_heads()
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO alembic_version VALUES ('20240101_0001')"))
+        with pytest.raises(SchemaVersionError):
+            await verify_schema_revision(engine)
+
+        async with engine.begin() as conn:
+            await conn.execute(text("UPDATE alembic_version SET version_num = :head"), {"head": head})
+        await verify_schema_revision(engine)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_opens_connections(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/warm.db")
+    try:
+        assert await warm_up_pool(3, bind=engine) == 3
+        assert engine.pool.checkedin() == 3
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_readiness_requires_database_but_tolerates_optional_failures():
+    async def ok():
+        return True
+
+    async def unavailable():
+        return False
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    state = ReadinessState()
+    await warm_up(state, {"database": ok, "blockchain": unavailable, "pinata": broken})
+    assert state.is_ready
+    assert state.components == {"database": OK, "blockchain": DEGRADED, "pinata": DEGRADED}
+    assert state.snapshot()["ready_after_ms"] is not None
+
+    state = ReadinessState()
+    await warm_up(state, {"database": broken, "wallet": ok})
+    assert not state.is_ready
+    assert state.components["database"] == FAILED
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_reflects_warm_up_state(client):
+    from app.core.readiness import readiness
+
+    readiness.reset()
+    readiness.register("database", required=True)
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["components"] == {"database": "pending"}
+
+    readiness.mark("database", OK)
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+    readiness.reset()
@@ -0,0 +1,145 @@
+"""访问令牌撤销测试。"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.auth_cache import principal_cache, verified_token_cache
+from app.core.bloom_filter import BloomFilter
+from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.models.user import User
+from app.services.token_revocation_service import RevocationList, revocation_list
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    revocation_list.reset()
+    verified_token_cache.clear()
+    principal_cache.clear()
+    yield
+    revocation_list.reset()
+
+
+async def _create_user(db) -> User:
+    user = User(email=f"{uuid.uuid4().hex[:8]}@example.com", username=uuid.uuid4().hex[:12], hashed_password="x")
+    db.add(user)
+    await db.commit()
+    return user
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    members = [str(uuid.uuid4()) for _ in range(2000)]
+    for item in members:
+        bloom.add(item)
+
+    assert all(item in bloom for item in members)
+    false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(5000))
+    assert false_positives < 5000 * 0.03
+    # 重复加入不改变位数组，也不计数
+    count = len(bloom)
+    assert not bloom.add(members[0])
+    assert len(bloom) == count
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_live_access_tokens(client, db_session):
+    user = await _create_user(db_session)
+    old_token = create_access_token({"sub": str(user.id)})
+    headers = {"Authorization": f"Bearer {old_token}"}
+
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+    assert (await client.post("/api/v1/auth/logout-all", headers=headers)).status_code == 200
+
+    response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 401
+
+    new_token = create_access_token({"sub": str(user.id)})
+    response = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {new_token}"})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_presented_access_token(client, db_session):
+    user = await _create_user(db_session)
+    access_token = create_access_token({"sub": str(user.id)})
+    other_token = create_access_token({"sub": str(user.id)})
+    refresh_token = create_refresh_token({"sub": str(user.id)})
+
+    response = await client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": refresh_token},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+
+    revoked = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {access_token}"})
+    assert revoked.status_code == 401
+    still_valid = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {other_token}"})
+    assert still_valid.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_revocation_propagates_to_other_workers_within_sync_interval(db_session):
+    clock = FakeClock()
+    worker_a = RevocationList(sync_interval=5, clock=clock)
+    worker_b = RevocationList(sync_interval=5, clock=clock)
+    user = await _create_user(db_session)
+    user_payload = decode_token(create_access_token({"sub": str(user.id)}))
+    jti_payload = decode_token(create_access_token({"sub": str(user.id)}))
+
+    assert not await worker_b.is_revoked(db_session, user_payload)
+
+    clock.now += 1
+    await worker_a.revoke_user(db_session, user.id)
+    await worker_a.revoke_token(db_session, jti_payload)
+    await db_session.commit()
+
+    # 写入方立即生效
+    assert await worker_a.is_revoked(db_session, user_payload)
+    # 其他进程在同步间隔内仍使用旧镜像
+    clock.now += 3.9
+    assert not await worker_b.is_revoked(db_session, user_payload)
+    # 超过同步间隔后必定可见
+    clock.now += 0.1
+    assert await worker_b.is_revoked(db_session, user_payload)
+    assert await worker_b.is_revoked(db_session, jti_payload)
+
+
+@pytest.mark.asyncio
+async def test_bloom_false_positive_is_confirmed_against_database(db_session):
+    worker = RevocationList(sync_interval=60)
+    user = await _create_user(db_session)
+    payload = decode_token(create_access_token({"sub": str(user.id)}))
+    await worker.sync(db_session)
+
+    # 只进入过滤器、数据库中并无记录，模拟假阳性
+    worker.record_jti(payload["jti"])
+    assert not await worker.is_revoked(db_session, payload)
+
+
+@pytest.mark.asyncio
+async def test_full_rebuild_drops_expired_revocations(db_session):
+    clock = FakeClock()
+    worker = RevocationList(sync_interval=1, rebuild_interval=10, clock=clock)
+    user = await _create_user(db_session)
+    expired = {
+        "sub": str(user.id),
+        "jti": str(uuid.uuid4()),
+        "exp": (datetime.now(timezone.utc) - timedelta(minutes=1)).timestamp(),
+    }
+    await worker.revoke_token(db_session, expired)
+    await db_session.commit()
+    assert expired["jti"] in worker._bloom
+
+    clock.now += 10
+    await worker.sync(db_session)
+    assert expired["jti"] not in worker._bloom
@@ -0,0 +1,280 @@
+"""附件异步上传队列测试。"""
+import os
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+import requests
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.retry import CircuitBreaker, compute_backoff_delay
+from app.models.asset import Asset, AssetStatus, AssetType, Attachment, AttachmentUploadStatus, LegalStatus
+from app.models.enterprise import Enterprise
+from app.models.upload_task import UploadTask, UploadTaskStatus
+from app.services import upload_queue_service
+from app.services.upload_queue_service import UploadQueueService, UploadWorker
+
+
+class FakePinata:
+    """记录调用并按脚本返回结果的 Pinata 替身。"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = []
+
+    def pin_file(self, content, file_name, metadata=None):
+        self.calls.append((file_name, len(content)))
+        if len(self.calls) <= self.failures:
+            raise requests.ConnectionError("pinata unavailable")
+        return {"cid": f"QmFake{len(self.calls)}{file_name}", "size": len(content)}
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_DIR", str(tmp_path / "spool"))
+    monkeypatch.setattr(settings, "UPLOAD_RETRY_BASE_DELAY", 0.0)
+    monkeypatch.setattr(upload_queue_service, "get_circuit_breaker", lambda *a, **k: breaker)
+    breaker = CircuitBreaker("pinata-test", failure_threshold=100, reset_timeout=60)
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield factory
+    await engine.dispose()
+
+
+async def _enqueue(factory, file_name="doc.pdf", content=b"hello"):
+    async with factory() as db:
+        enterprise = Enterprise(id=uuid4(), name="Upload Enterprise")
+        asset = Asset(
+            id=uuid4(),
+            enterprise_id=enterprise.id,
+            name="Upload Asset",
+            type=AssetType.PATENT,
+            description="desc",
+            creator_name="Creator",
+            inventors=["Creator"],
+            creation_date=date(2024, 1, 1),
+            legal_status=LegalStatus.PENDING,
+            status=AssetStatus.DRAFT,
+        )
+        db.add_all([enterprise, asset])
+        await db.flush()
+        attachment = await UploadQueueService(db).enqueue_attachment(
+            asset=asset,
+            file_name=file_name,
+            content_type="application/pdf",
+            content=content,
+            is_primary=True,
+        )
+        await db.commit()
+        return attachment.id
+
+
+def test_backoff_delay_is_bounded_and_jittered():
+    rng = random.Random(42)
+    delays = [compute_backoff_delay(attempt, 1.0, 30.0, rng) for attempt in range(1, 20)]
+
+    assert all(0 <= d <= 30.0 for d in delays)
+    assert compute_backoff_delay(1, 1.0, 30.0, rng) <= 1.0
+    assert len(set(delays)) > 1
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=3600)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    breaker.reset_timeout = 0.0
+    assert breaker.allow()  # 半开探测
+    assert not breaker.allow()  # 只放行一个探测
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_enqueue_creates_pending_attachment_and_spool_file(session_factory):
+    attachment_id = await _enqueue(session_factory)
+
+    async with session_factory() as db:
+        attachment = await db.get(Attachment, attachment_id)
+        task = (await db.execute(select(UploadTask))).scalar_one()
+
+    assert attachment.upload_status == AttachmentUploadStatus.PENDING_UPLOAD
+    assert attachment.ipfs_cid is None
+    assert task.status == UploadTaskStatus.PENDING
+    with open(task.spool_path, "rb") as fh:
+        assert fh.read() == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_worker_uploads_and_backfills_cid(session_factory):
+    attachment_id = await _enqueue(session_factory)
+    pinata = FakePinata()
+    worker = UploadWorker(session_factory=session_factory, pinata_service=pinata)
+
+    assert await worker.run_once() == 1
+
+    async with session_factory() as db:
+        attachment = await db.get(Attachment, attachment_id)
+        task = (await db.execute(select(UploadTask))).scalar_one()
+
+    assert attachment.upload_status == AttachmentUploadStatus.UPLOADED
+    assert attachment.ipfs_cid == "QmFake1doc.pdf"
+    assert task.status == UploadTaskStatus.SUCCEEDED
+    assert task.attempts == 1
+    assert not os.path.exists(task.spool_path)
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_with_backoff_then_succeeds(session_factory):
+    attachment_id = await _enqueue(session_factory)
+    pinata = FakePinata(failures=1)
+    worker = UploadWorker(session_factory=session_factory, pinata_service=pinata)
+
+    await worker.run_once()
+    async with session_factory() as db:
+        task = (await db.execute(select(UploadTask))).scalar_one()
+        assert task.status == UploadTaskStatus.PENDING
+        assert task.attempts == 1
+        assert task.last_error
+        task.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        await db.commit()
+
+    await worker.run_once()
+    async with session_factory() as db:
+        attachment = await db.get(Attachment, attachment_id)
+    assert attachment.upload_status == AttachmentUploadStatus.UPLOADED
+    assert len(pinata.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_backfills_same_cid_for_identical_content(session_factory):
+    first_id = await _enqueue(session_factory, file_name="a.pdf", content=b"same bytes")
+    second_id = await _enqueue(session_factory, file_name="b.pdf", content=b"same bytes")
+
+    class ContentAddressedPinata(FakePinata):
+        def pin_file(self, content, file_name, metadata=None):
+            self.calls.append((file_name, len(content)))
+            return {"cid": f"QmSame{len(content)}", "size": len(content)}
+
+    worker = UploadWorker(session_factory=session_factory, pinata_service=ContentAddressedPinata())
+    assert await worker.run_once() == 2
+
+    async with session_factory() as db:
+        first = await db.get(Attachment, first_id)
+        second = await db.get(Attachment, second_id)
+        tasks = (await db.execute(select(UploadTask))).scalars().all()
+
+    assert first.ipfs_cid == second.ipfs_cid == "QmSame10"
+    assert first.upload_status == second.upload_status == AttachmentUploadStatus.UPLOADED
+    assert {task.status for task in tasks} == {UploadTaskStatus.SUCCEEDED}
+    assert all(not os.path.exists(task.spool_path) for task in tasks)
+
+
+@pytest.mark.asyncio
+async def test_worker_marks_task_dead_after_max_attempts(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_ATTEMPTS", 1)
+    attachment_id = await _enqueue(session_factory)
+    worker = UploadWorker(session_factory=session_factory, pinata_service=FakePinata(failures=10))
+
+    await worker.run_once()
+
+    async with session_factory() as db:
+        attachment = await db.get(Attachment, attachment_id)
+        task = (await db.execute(select(UploadTask))).scalar_one()
+    assert task.status == UploadTaskStatus.DEAD
+    assert attachment.upload_status == AttachmentUploadStatus.FAILED
+    assert not os.path.exists(task.spool_path)
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_released_when_spool_file_missing(session_factory):
+    await _enqueue(session_factory, file_name="lost.pdf")
+    second_id = await _enqueue(session_factory, file_name="ok.pdf")
+    async with session_factory() as db:
+        lost = (await db.execute(select(UploadTask).where(UploadTask.file_name == "lost.pdf"))).scalar_one()
+        os.remove(lost.spool_path)
+        # 先处理丢失文件的任务，使其成为半开探测
+        lost.next_attempt_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+        await db.commit()
+
+    pinata = FakePinata()
+    worker = UploadWorker(session_factory=session_factory, pinata_service=pinata, batch_size=1)
+    worker.breaker.failure_threshold = 1
+    worker.breaker.record_failure()
+    worker.breaker.reset_timeout = 0.0
+
+    await worker.run_once()
+    async with session_factory() as db:
+        lost = (await db.execute(select(UploadTask).where(UploadTask.file_name == "lost.pdf"))).scalar_one()
+    assert lost.status == UploadTaskStatus.DEAD
+    assert pinata.calls == []
+    assert worker.breaker.state == CircuitBreaker.HALF_OPEN
+
+    # 探测名额已释放，下一个任务可以作为探测上传并关闭熔断器
+    await worker.run_once()
+    async with session_factory() as db:
+        attachment = await db.get(Attachment, second_id)
+    assert attachment.upload_status == AttachmentUploadStatus.UPLOADED
+    assert worker.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_purge_orphan_spool_files_keeps_referenced_and_recent_files(session_factory):
+    await _enqueue(session_factory)
+    spool = upload_queue_service.spool_dir()
+    orphan = spool / "orphan.pdf"
+    partial = spool / "partial.pdf.part"
+    recent = spool / "recent.pdf"
+    for path in (orphan, partial, recent):
+        path.write_bytes(b"x")
+    old = time.time() - 3 * 86400
+    async with session_factory() as db:
+        task = (await db.execute(select(UploadTask))).scalar_one()
+        for path in (orphan, partial, task.spool_path):
+            os.utime(path, (old, old))
+
+        deleted = await UploadQueueService(db).purge_orphan_spool_files(
+            datetime.now(timezone.utc) - timedelta(days=1)
+        )
+
+    assert deleted == 2
+    assert sorted(os.listdir(spool)) == sorted([os.path.basename(task.spool_path), "recent.pdf"])
+
+
+@pytest.mark.asyncio
+async def test_purge_orphan_spool_files_removes_files_of_finished_tasks(session_factory):
+    await _enqueue(session_factory, file_name="dead.pdf")
+    await _enqueue(session_factory, file_name="pending.pdf")
+    old = time.time() - 3 * 86400
+    async with session_factory() as db:
+        tasks = {task.file_name: task for task in (await db.execute(select(UploadTask))).scalars()}
+        # 模拟修复前已 DEAD 却遗留暂存文件的任务
+        tasks["dead.pdf"].status = UploadTaskStatus.DEAD
+        await db.commit()
+        for task in tasks.values():
+            os.utime(task.spool_path, (old, old))
+
+        deleted = await UploadQueueService(db).purge_orphan_spool_files(
+            datetime.now(timezone.utc) - timedelta(days=1)
+        )
+
+    assert deleted == 1
+    assert not os.path.exists(tasks["dead.pdf"].spool_path)
+    assert os.path.exists(tasks["pending.pdf"].spool_path)